@@ -188,6 +188,7 @@ from cmk.fetchers.config import (
 )
 from cmk.fetchers.filecache import FileCacheOptions, MaxAge, NoCache
 from cmk.fetchers.snmp import make_backend as make_snmp_backend
+from cmk.fetchers.snmp_backend import StoredWalkSNMPBackend
 from cmk.helper_interface import AgentRawData, FetcherError, FetcherType, SourceType
 from cmk.inventory import structured_data
 from cmk.inventory.paths import Paths as InventoryPaths
@@ -872,6 +873,10 @@ def _make_compute_check_parameters_of_autocheck(
     return compute_check_parameters_of_autocheck
 
 
+def _all_value_stores_store(host_name: HostName) -> AllValueStoresStore:
+    return AllValueStoresStore(counters_dir / host_name, storage=config.value_stores_storage)
+
+
 def _execute_discovery(
     loaded_config: LoadedConfigFragment,
     ruleset_matcher: RulesetMatcher,
@@ -929,7 +934,7 @@ def _execute_discovery(
 
     with (
         set_value_store_manager(
-            ValueStoreManager(host_name, AllValueStoresStore(counters_dir / host_name)),
+            ValueStoreManager(host_name, _all_value_stores_store(host_name)),
             store_changes=False,
         ) as value_store_manager,
     ):
@@ -1703,7 +1708,7 @@ class AutomationRenameHosts(Automation):
             actions.append("logwatch")
 
         # SNMP walks
-        if self._rename_host_file(str(snmpwalks_dir), oldname, newname):
+        if StoredWalkSNMPBackend.rename_walk(snmpwalks_dir / oldname, snmpwalks_dir / newname):
             actions.append("snmpwalk")
 
         # HW/SW Inventory
@@ -20,13 +20,17 @@ import contextlib
 import copy
 import dataclasses
 import enum
+import hashlib
 import itertools
+import mmap
 import numbers
 import os
 import pickle
 import socket
+import struct
 import sys
 import time
+import types
 from collections.abc import Callable, Container, Iterable, Iterator, Mapping, Sequence
 from pathlib import Path
 from typing import (
@@ -67,7 +71,7 @@ from cmk.base.default_config import *  # noqa: F403
 from cmk.base.parent_scan import ScanConfig as ParentScanConfig
 from cmk.base.snmp_plugin_store import make_plugin_store
 from cmk.base.sources import ParserConfig
-from cmk.ccc import tty
+from cmk.ccc import store, tty
 from cmk.ccc.exceptions import MKGeneralException
 from cmk.ccc.hostaddress import HostAddress, HostName, Hosts
 from cmk.ccc.regex import regex
@@ -158,8 +162,10 @@ from cmk.utils.caching import cache_manager
 from cmk.utils.check_utils import maincheckify, section_name_of
 from cmk.utils.experimental_config import load_experimental_config
 from cmk.utils.host_storage import (
+    ABCHostsStorageLoader,
     apply_hosts_file_to_object,
     get_host_storage_loaders,
+    StorageFormat,
 )
 from cmk.utils.ip_lookup import IPLookup, IPLookupOptional, IPStackConfig
 from cmk.utils.labels import LabelManager, Labels, LabelSources
@@ -582,6 +588,7 @@ def load(
     _initialize_config()
 
     _changed_var_names = _load_config(with_conf_d)
+    _drop_invalid_ssc_rules(globals())
 
     loading_result = _perform_post_config_loading_actions(discovery_rulesets)
 
@@ -640,7 +647,6 @@ def _perform_post_config_loading_actions(
     global_dict = globals()
     discovery_settings = _collect_parameter_rulesets_from_globals(global_dict, discovery_rulesets)
     _transform_plugin_names_from_160_to_170(global_dict)
-    _drop_invalid_ssc_rules(global_dict)
 
     loaded_config = LoadedConfigFragment(
         folder_attributes=folder_attributes,
@@ -782,6 +788,34 @@ def _load_config_file(file_to_load: Path, into_dict: dict[str, Any]) -> None:
 
 
 def _load_config(with_conf_d: bool) -> set[str]:
+    global_dict = globals()
+    pre_load_vars = {**global_dict}
+
+    # Load assorted experimental parameters if any
+    experimental_config = load_experimental_config(cmk.utils.paths.default_config_dir)
+
+    config_file_paths = get_config_file_paths(with_conf_d)
+    snapshot_store = ConfigSnapshotStore(
+        cmk.utils.paths.tmp_dir / "config_snapshots",
+        "with_conf_d" if with_conf_d else "without_conf_d",
+    )
+    snapshot_key = _config_snapshot_key(config_file_paths, experimental_config)
+    if (snapshot := snapshot_store.read(snapshot_key)) is not None:
+        global_dict.update(snapshot)
+    else:
+        _exec_config_files(
+            config_file_paths,
+            get_host_storage_loaders(experimental_config.get("config_storage_format")),
+        )
+        if (snapshot := _config_snapshot(global_dict, pre_load_vars)) is not None:
+            snapshot_store.write(snapshot_key, snapshot)
+
+    return {k for k, v in global_dict.items() if k not in pre_load_vars or v != pre_load_vars[k]}
+
+
+def _exec_config_files(
+    config_file_paths: Iterable[Path], host_storage_loaders: list[ABCHostsStorageLoader]
+) -> None:
     helper_vars = {
         "FOLDER_PATH": None,
     }
@@ -793,17 +827,9 @@ def _load_config(with_conf_d: bool) -> set[str]:
     clusters = SetFolderPathDict(clusters)
 
     global_dict = globals()
-    pre_load_vars = {**global_dict}
-
     global_dict |= helper_vars
 
-    # Load assorted experimental parameters if any
-    experimental_config = load_experimental_config(cmk.utils.paths.default_config_dir)
-
-    host_storage_loaders = get_host_storage_loaders(
-        experimental_config.get("config_storage_format")
-    )
-    for path in get_config_file_paths(with_conf_d):
+    for path in config_file_paths:
         try:
             # Make the config path available as a global variable to be used
             # within the configuration file. The FOLDER_PATH is only used by
@@ -853,7 +879,64 @@ def _load_config(with_conf_d: bool) -> set[str]:
     all_hosts = list(all_hosts)
     clusters = dict(clusters)
 
-    return {k for k, v in global_dict.items() if k not in pre_load_vars or v != pre_load_vars[k]}
+
+def _is_config_value(value: object) -> bool:
+    return not isinstance(value, types.ModuleType | type) and not callable(value)
+
+
+def _config_snapshot_key(
+    config_file_paths: Iterable[Path], experimental_config: Mapping[str, object]
+) -> str:
+    """Identify the configuration files in their current state
+
+    The defaults are part of the key, they are changed by updates and by plug-ins
+    registering their own configuration variables.
+    """
+    key = hashlib.sha256()
+    key.update(
+        repr(
+            (
+                cmk_version.__version__,
+                sorted(experimental_config.items()),
+                sorted((k, v) for k, v in get_default_config().items() if _is_config_value(v)),
+            )
+        ).encode()
+    )
+    for path in config_file_paths:
+        # The hosts of a folder may also be read from one of the experimental formats.
+        for variant in (
+            [path.with_suffix(f.extension()) for f in StorageFormat]
+            if path.name == "hosts.mk"
+            else [path]
+        ):
+            with contextlib.suppress(FileNotFoundError):
+                stat = variant.stat()
+                key.update(f"{variant}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+    return key.hexdigest()
+
+
+def _config_snapshot(
+    global_dict: Mapping[str, Any], pre_load_vars: Mapping[str, Any]
+) -> dict[str, Any] | None:
+    """The variables set by the configuration files
+
+    The configuration files also modify the default values in place, so the
+    variables are compared with fresh defaults.
+
+    None if the files define functions, classes or modules: These cannot be
+    restored from a snapshot, the files have to be executed instead.
+    """
+    defaults = get_default_config()
+    snapshot = {
+        k: v
+        for k, v in global_dict.items()
+        if (
+            v != defaults[k]
+            if k in defaults and _is_config_value(v)
+            else (k not in pre_load_vars or v is not pre_load_vars[k])
+        )
+    }
+    return snapshot if all(_is_config_value(v) for v in snapshot.values()) else None
 
 
 def _transform_plugin_names_from_160_to_170(global_dict: dict[str, Any]) -> None:
@@ -875,6 +958,10 @@ def _drop_invalid_ssc_rules(global_dict: dict[str, Any]) -> None:
     These days, we rely on all values of these type of rules to be Mappings.
     This is ensured by the new ruleset types, but users could have old
     configurations flying around.
+
+    The packed config of the helpers is created from the dropped rules, so they
+    are not dropped again when loading it. This keeps the rulesets of the packed
+    config from being unpickled before they are accessed.
     """
     for ssc_rule_type in ("active_checks", "special_agents"):
         if ssc_rule_type not in global_dict:
@@ -1041,8 +1128,73 @@ class PackedConfigGenerator:
         return helper_config | {str(k): v for k, v in self._discovery_rules.items()}
 
 
+class _LazyRulesets(Mapping[str, Any]):
+    """Rulesets by name, each one unpickled from the packed config on first access"""
+
+    def __init__(self, data: mmap.mmap, index: Mapping[str, tuple[int, int]]) -> None:
+        self._data: Final = data
+        self._index: Final = index
+        self._rulesets: Final[dict[str, Any]] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._rulesets[key]
+        except KeyError:
+            pass
+        offset, length = self._index[key]
+        ruleset = self._rulesets[key] = pickle.loads(  # nosec B301 # BNS:c3c5e9
+            self._data[offset : offset + length]
+        )
+        return ruleset
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __reduce__(self) -> tuple[type[dict[str, Any]], tuple[dict[str, Any]]]:
+        # The memory map cannot be pickled or copied
+        return dict, (dict(self.items()),)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({sorted(self._index)!r})"
+
+
 class PackedConfigStore:
-    """Caring about persistence of the packed configuration"""
+    """Caring about persistence of the packed configuration
+
+    All integers are little endian:
+
+        header:     magic b"CMKPACKC", format version (u16), length of the
+                    table of contents (u64)
+        contents:   pickled tuple of the variables and the locations of the
+                    rulesets of the variables in _LAZY_VARIABLE_NAMES
+        rulesets:   one pickle per ruleset
+
+    The file is memory mapped by the reader. The rulesets are only unpickled on
+    first access, so a helper only pays for the rulesets of the plug-ins it
+    actually executes, and the helpers share the pages of the file.
+    """
+
+    _MAGIC: Final = b"CMKPACKC"
+    _VERSION: Final = 1
+    _HEADER: Final = struct.Struct("<8sHQ")
+
+    # Variables holding rulesets by name, most of them are not needed by a helper
+    _LAZY_VARIABLE_NAMES: Final = frozenset(
+        {
+            "active_checks",
+            "agent_config",
+            "checkgroup_parameters",
+            "extra_host_conf",
+            "extra_service_conf",
+            "inv_parameters",
+            "notification_parameters",
+            "special_agents",
+            "static_checks",
+        }
+    )
 
     def __init__(self, path: Path) -> None:
         self.path: Final = path
@@ -1056,15 +1208,93 @@ class PackedConfigStore:
         return config_path / "precompiled_check_config.mk"
 
     def write(self, helper_config: Mapping[str, Any]) -> None:
+        variables: dict[str, Any] = {}
+        index: dict[str, dict[str, tuple[int, int]]] = {}
+        blocks: list[bytes] = []
+        offset = 0
+        for varname, value in helper_config.items():
+            if varname not in self._LAZY_VARIABLE_NAMES or not isinstance(value, dict):
+                variables[varname] = value
+                continue
+            index[varname] = {}
+            for key, ruleset in value.items():
+                blocks.append(pickle.dumps(ruleset, protocol=pickle.HIGHEST_PROTOCOL))
+                index[varname][key] = (offset, len(blocks[-1]))
+                offset += len(blocks[-1])
+
+        # The rulesets follow the contents, so the offsets are made absolute on reading.
+        contents = pickle.dumps((variables, index), protocol=pickle.HIGHEST_PROTOCOL)
+
         self.path.parent.mkdir(parents=True, exist_ok=True)
         tmp_path = self.path.with_suffix(f"{self.path.suffix}.compiled")
         with tmp_path.open("wb") as compiled_file:
-            pickle.dump(helper_config, compiled_file)
+            compiled_file.write(self._HEADER.pack(self._MAGIC, self._VERSION, len(contents)))
+            compiled_file.write(contents)
+            compiled_file.writelines(blocks)
         tmp_path.rename(self.path)
 
     def read(self) -> Mapping[str, Any]:
         with self.path.open("rb") as f:
-            return pickle.load(f)  # nosec B301 # BNS:c3c5e9
+            if f.read(len(self._MAGIC)) != self._MAGIC:
+                f.seek(0)  # written by a previous version
+                return pickle.load(f)  # nosec B301 # BNS:c3c5e9
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _magic, version, contents_length = self._HEADER.unpack_from(data)
+        if version != self._VERSION:
+            raise MKGeneralException(f"{self.path}: unknown format version {version}")
+        start = self._HEADER.size + contents_length
+        variables, index = pickle.loads(  # nosec B301 # BNS:c3c5e9
+            data[self._HEADER.size : start]
+        )
+        return variables | {
+            varname: _LazyRulesets(
+                data,
+                {key: (start + offset, length) for key, (offset, length) in locations.items()},
+            )
+            for varname, locations in index.items()
+        }
+
+
+class ConfigSnapshotStore:
+    """Caring about persistence of the config snapshot
+
+    The snapshot holds the variables set by all configuration files, so that
+    they do not have to be executed again as long as none of them changes.
+    Snapshots are stored under their key, see _config_snapshot_key(), only the
+    most recent one of each variant is kept. The variants are the different sets
+    of configuration files loaded, they must not evict each other's snapshot.
+    """
+
+    def __init__(self, path: Path, variant: str) -> None:
+        self.path: Final = path
+        self.variant: Final = variant
+
+    def _snapshot_path(self, key: str) -> Path:
+        return self.path / f"{self.variant}-{key}.pkl"
+
+    def read(self, key: str) -> Mapping[str, Any] | None:
+        try:
+            with self._snapshot_path(key).open("rb") as f:
+                return pickle.load(f)  # nosec B301 # BNS:c3c5e9
+        except FileNotFoundError:
+            return None
+        except Exception:
+            if cmk.ccc.debug.enabled():
+                raise
+            return None
+
+    def write(self, key: str, config: Mapping[str, Any]) -> None:
+        try:
+            data = pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return  # For example functions within a configured value
+        self.path.mkdir(parents=True, exist_ok=True)
+        path = self._snapshot_path(key)
+        store.save_bytes_to_file(path, data)
+        for outdated in self.path.glob(f"{self.variant}-*.pkl"):
+            if outdated != path:
+                outdated.unlink(missing_ok=True)
 
 
 @contextlib.contextmanager
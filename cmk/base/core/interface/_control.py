@@ -307,6 +307,11 @@ def _create_active_config(
         cmk.utils.password_store.pending_secrets_path_site(),
     )
 
+    with tracer.span("read_autochecks"):
+        config_cache.autochecks_memoizer.read_all(
+            hosts_config.hosts, cmk.utils.paths.autochecks_cache_file
+        )
+
     with (
         config_path.create(
             cmk.utils.paths.omd_root, is_cmc=core.is_cmc()
@@ -9,17 +9,19 @@
 
 import base64
 import itertools
+import multiprocessing
 import os
+import re
 import socket
 import subprocess
 import sys
 from collections import Counter
-from collections.abc import Callable, Mapping, Sequence
+from collections.abc import Callable, Iterator, Mapping, Sequence
 from contextlib import suppress
 from io import StringIO
 from pathlib import Path
 from socket import AddressFamily
-from typing import Any, assert_never, Final, IO, Literal
+from typing import Any, assert_never, Final, IO, Literal, NamedTuple
 
 import cmk.utils.paths
 from cmk.base import config
@@ -226,6 +228,7 @@ class NagiosCore(MonitoringCore):
             ip_address_of=ip_address_of,
             service_depends_on=service_depends_on,
             timeperiods=self.timeperiods,
+            processes=config.nagios_config_processes,
         )
 
         store.save_text_to_file(self.objects_file_path, config_buffer.getvalue())
@@ -292,6 +295,9 @@ class NagiosConfig:
         self.active_checks_to_define: dict[str, str] = {}
         self.custom_commands_to_define: set[CoreCommandName] = set()
         self.hostcheck_commands_to_define: list[tuple[CoreCommand, str]] = []
+        # The host check commands are numbered over all hosts. Hosts created in another
+        # process name them by a placeholder until their numbers are known.
+        self.hostcheck_command_name = "check-mk-host-custom-%d"
         self.timeperiods: Final = timeperiods
 
     def write_str(self, x: str) -> None:
@@ -300,6 +306,35 @@ class NagiosConfig:
     def write_object(self, name: str, spec: ObjectSpec) -> None:
         self._outfile.write(_format_nagios_object(name, spec))
 
+    def add_hosts_config(self, other: "NagiosConfig") -> None:
+        """Add the configuration of hosts that has been created with another NagiosConfig"""
+        assert isinstance(other._outfile, StringIO)
+        objects = other._outfile.getvalue()
+        offset = len(self.hostcheck_commands_to_define)
+
+        def command_name(match: re.Match[str]) -> str:
+            return self.hostcheck_command_name % (offset + int(match.group(1)))
+
+        if other.hostcheck_commands_to_define:
+            objects = _HOSTCHECK_COMMAND_PLACEHOLDER_RE.sub(command_name, objects)
+            self.hostcheck_commands_to_define.extend(
+                (_HOSTCHECK_COMMAND_PLACEHOLDER_RE.sub(command_name, name), command_line)
+                for name, command_line in other.hostcheck_commands_to_define
+            )
+        self._outfile.write(objects)
+
+        self.hostgroups_to_define.update(other.hostgroups_to_define)
+        self.servicegroups_to_define.update(other.servicegroups_to_define)
+        self.contactgroups_to_define.update(other.contactgroups_to_define)
+        self.checknames_to_define.update(other.checknames_to_define)
+        self.active_checks_to_define.update(other.active_checks_to_define)
+        self.custom_commands_to_define.update(other.custom_commands_to_define)
+
+
+# Nul characters never appear in the configuration otherwise
+_HOSTCHECK_COMMAND_PLACEHOLDER = "\0%d\0"
+_HOSTCHECK_COMMAND_PLACEHOLDER_RE = re.compile("\0(\\d+)\0")
+
 
 def _validate_licensing(
     hosts: Hosts, licensing_handler: LicensingHandler, licensing_counter: Counter
@@ -331,15 +366,22 @@ def create_config(
     ip_address_of: ip_lookup.IPLookup,
     service_depends_on: Callable[[HostAddress, ServiceName], Sequence[ServiceName]],
     timeperiods: TimeperiodSpecs,
+    *,
+    processes: int = 1,
 ) -> NotifyHostFiles:
+    """Write the object configuration of the hosts to `outfile`
+
+    With more than one process, the hosts are split into consecutive shards which are created
+    by forked processes. The result is the same as creating them one by one.
+    """
     cfg = NagiosConfig(outfile, hostnames, timeperiods)
 
     _output_conf_header(cfg)
 
-    licensing_counter = Counter("services")
-    all_notify_host_configs: dict[HostName, NotificationHostConfig] = {}
-    for hostname in hostnames:
-        all_notify_host_configs[hostname] = _create_nagios_config_host(
+    def create_host(
+        cfg: NagiosConfig, hostname: HostName, license_counter: Counter
+    ) -> NotificationHostConfig:
+        return _create_nagios_config_host(
             cfg,
             config_cache,
             final_service_name_config,
@@ -350,11 +392,28 @@ def create_config(
             get_ip_stack_config(hostname),
             default_address_family(hostname),
             passwords,
-            licensing_counter,
+            license_counter,
             ip_address_of,
             service_depends_on,
         )
 
+    licensing_counter = Counter("services")
+    all_notify_host_configs: dict[HostName, NotificationHostConfig] = {}
+    if processes > 1 and len(hostnames) > 1:
+        for hosts_config in _create_nagios_config_hosts_forked(
+            create_host, hostnames, ip_address_of, processes
+        ):
+            cfg.add_hosts_config(hosts_config.cfg)
+            all_notify_host_configs.update(hosts_config.notify_host_configs)
+            licensing_counter.update(hosts_config.license_counter)
+            config_warnings.g_configuration_warnings.extend(hosts_config.warnings)
+            if isinstance(ip_address_of, ip_lookup.ConfiguredIPLookup):
+                for failed_host, exc in hosts_config.failed_ip_lookups.items():
+                    ip_address_of.error_handler(failed_host, exc)
+    else:
+        for hostname in hostnames:
+            all_notify_host_configs[hostname] = create_host(cfg, hostname, licensing_counter)
+
     _validate_licensing(config_cache.hosts_config, licensing_handler, licensing_counter)
 
     notify_host_files = create_notify_host_files(all_notify_host_configs)
@@ -375,6 +434,71 @@ def create_config(
     return notify_host_files
 
 
+_CreateHost = Callable[[NagiosConfig, HostName, Counter], NotificationHostConfig]
+
+
+class _HostsConfig(NamedTuple):
+    cfg: NagiosConfig
+    notify_host_configs: Mapping[HostName, NotificationHostConfig]
+    license_counter: Counter
+    warnings: Sequence[str]
+    failed_ip_lookups: Mapping[HostName, Exception]
+
+
+# Only set in the forked processes, see _create_nagios_config_hosts_forked()
+_worker_create_host: tuple[_CreateHost, ip_lookup.IPLookup] | None = None
+
+
+def _create_nagios_config_hosts_forked(
+    create_host: _CreateHost,
+    hostnames: Sequence[HostName],
+    ip_address_of: ip_lookup.IPLookup,
+    processes: int,
+) -> Iterator[_HostsConfig]:
+    """Create the configuration of the hosts in forked processes, in the order of the hosts
+
+    The processes share the loaded configuration with this process. There are a few shards
+    per process, to keep all of them busy when the hosts differ in size.
+    """
+    shard_size = -(-len(hostnames) // (processes * 4))
+    shards = [hostnames[i : i + shard_size] for i in range(0, len(hostnames), shard_size)]
+    with multiprocessing.get_context("fork").Pool(
+        min(processes, len(shards)),
+        initializer=_init_worker,
+        initargs=(create_host, ip_address_of),
+    ) as pool:
+        yield from pool.imap(_create_nagios_config_hosts, shards)
+
+
+def _init_worker(create_host: _CreateHost, ip_address_of: ip_lookup.IPLookup) -> None:
+    global _worker_create_host
+    _worker_create_host = create_host, ip_address_of
+
+
+def _create_nagios_config_hosts(hostnames: Sequence[HostName]) -> _HostsConfig:
+    assert _worker_create_host is not None
+    create_host, ip_address_of = _worker_create_host
+    config_warnings.initialize()
+    cfg = NagiosConfig(StringIO(), hostnames, timeperiods={})
+    cfg.hostcheck_command_name = _HOSTCHECK_COMMAND_PLACEHOLDER
+    license_counter = Counter("services")
+    notify_host_configs = {
+        hostname: create_host(cfg, hostname, license_counter) for hostname in hostnames
+    }
+    return _HostsConfig(
+        cfg=cfg,
+        notify_host_configs=notify_host_configs,
+        license_counter=license_counter,
+        warnings=list(config_warnings.g_configuration_warnings),
+        failed_ip_lookups=(
+            ip_address_of.error_handler.failed_ip_lookups
+            if isinstance(ip_address_of, ip_lookup.ConfiguredIPLookup)
+            and isinstance(ip_address_of.error_handler, ip_lookup.CollectFailedHosts)
+            else {}
+        ),
+    )
+
+
 def _output_conf_header(cfg: NagiosConfig) -> None:
     cfg.write_str(
         """#
@@ -485,7 +609,7 @@ def create_nagios_host_spec(
             host_spec[key] = value
 
     def host_check_via_service_status(service: ServiceName) -> CoreCommand:
-        command = "check-mk-host-custom-%d" % (len(cfg.hostcheck_commands_to_define) + 1)
+        command = cfg.hostcheck_command_name % (len(cfg.hostcheck_commands_to_define) + 1)
         service_with_hostname = replace_macros_in_str(
             service,
             {"$HOSTNAME$": hostname},
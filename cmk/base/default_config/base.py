@@ -66,6 +66,7 @@ simulation_mode = False
 fake_dns: str | None = None
 perfdata_format: Literal["pnp", "standard"] = "pnp"
 check_mk_perfdata_with_times = True
+value_stores_storage: Literal["json", "journal"] = "journal"
 # TODO: Remove these options?
 debug_log = False  # deprecated
 monitoring_host: str | None = None  # deprecated
@@ -171,6 +172,8 @@ passive_service_template_perf = "check_mk_passive_perf"
 summary_service_template = "check_mk_summarized"
 service_dependency_template = "check_mk"
 generate_hostconf = True
+# Number of processes creating the objects of the hosts
+nagios_config_processes = 1
 generate_dummy_commands = True
 dummy_check_commandline = 'echo "ERROR - you did an active check on this service - please disable active checks" && exit 1'
 nagios_illegal_chars = "`;~!$%^&*|'\"<>?,="
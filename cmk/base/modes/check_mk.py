@@ -2988,7 +2988,11 @@ def run_checking(
         error_handler,
         set_value_store_manager(
             ValueStoreManager(
-                hostname, AllValueStoresStore(cmk.utils.paths.counters_dir / hostname)
+                hostname,
+                AllValueStoresStore(
+                    cmk.utils.paths.counters_dir / hostname,
+                    storage=config.value_stores_storage,
+                ),
             ),
             store_changes=not dry_run,
         ) as value_store_manager,
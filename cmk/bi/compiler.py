@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import os
 import time
+from collections.abc import Mapping, Sequence
 from multiprocessing.pool import Pool
 from pathlib import Path
 from typing import TypedDict
@@ -19,6 +20,12 @@ from livestatus import Query, QuerySpecification
 from cmk.bi import storage
 from cmk.bi.aggregation import BIAggregation
 from cmk.bi.data_fetcher import BIStructureFetcher, SiteProgramStart
+from cmk.bi.dependencies import (
+    AggregationDependencies,
+    changed_hosts,
+    DependencyRecorder,
+    fingerprint_hosts,
+)
 from cmk.bi.filesystem import BIFileSystem, get_default_site_filesystem
 from cmk.bi.lib import SitesCallback
 from cmk.bi.log import LOGGER
@@ -54,9 +61,14 @@ class BICompiler:
         self._fs = fs or get_default_site_filesystem()
 
         self._compiled_aggregations: dict[str, BICompiledAggregation] = {}
+        # The compilation the loaded aggregations belong to
+        self.last_compilation = 0.0
+        # The aggregations compiled by the last compilation, and why
+        self.compilation_report: dict[str, str] = {}
 
         self._aggregation_store = storage.AggregationStore(self._fs.cache)
         self._metadata_store = storage.MetadataStore(self._fs)
+        self._dependency_store = storage.DependencyStore(self._fs.cache)
         self._frozen_store = storage.FrozenAggregationStore(self._fs.var)
         self._lookup_store = storage.LookupStore(redis_client or get_redis_client())
 
@@ -167,6 +179,7 @@ class BICompiler:
         return stored_identifiers - loaded_identifiers
 
     def _load_compiled_aggregations(self) -> None:
+        self.last_compilation = self._metadata_store.get_last_compilation()
         for identifier in self._get_vanished_aggregation_identifiers():
             aggregation = self._aggregation_store.get_by_identifier(identifier)
             LOGGER.debug("Loaded cached aggregation result: %s", aggregation.id)
@@ -190,17 +203,47 @@ class BICompiler:
 
             self.prepare_for_compilation(current_configstatus["online_sites"])
 
-            for aggregation in self._bi_packs.get_all_aggregations():
+            aggregations = self._bi_packs.get_all_aggregations()
+            host_fingerprints = fingerprint_hosts(self._bi_structure_fetcher.hosts)
+            previous_dependencies = self._dependency_store.get()
+            self.compilation_report = self._get_recompilation_reasons(
+                current_configstatus, aggregations, host_fingerprints, previous_dependencies
+            )
+
+            previous_aggregations = (
+                previous_dependencies.aggregations if previous_dependencies else {}
+            )
+            dependencies: dict[str, AggregationDependencies] = {}
+            for aggregation in aggregations:
+                if aggregation.id not in self.compilation_report:
+                    try:
+                        self._compiled_aggregations[aggregation.id] = self._aggregation_store.get(
+                            aggregation.id
+                        )
+                        dependencies[aggregation.id] = previous_aggregations[aggregation.id]
+                        continue
+                    except storage.AggregationNotFound:
+                        self.compilation_report[aggregation.id] = "compiled aggregation is missing"
+
                 start = time.perf_counter()
-                LOGGER.debug(f"Starting compilation for {aggregation.id} ...")
-                self._compiled_aggregations[aggregation.id] = aggregation.compile(self.bi_searcher)
+                LOGGER.debug(
+                    f"Starting compilation for {aggregation.id}, "
+                    f"{self.compilation_report[aggregation.id]} ..."
+                )
+                recorder = DependencyRecorder(self.bi_searcher)
+                self._compiled_aggregations[aggregation.id] = aggregation.compile(recorder)
+                dependencies[aggregation.id] = recorder.dependencies()
                 end = time.perf_counter()
                 LOGGER.debug(f"Compilation of {aggregation.id} took {end - start:f}")
 
+            LOGGER.info(
+                "Compiled %d of %d aggregations", len(self.compilation_report), len(aggregations)
+            )
+
             self._verify_aggregation_title_uniqueness(self._compiled_aggregations)
 
-            for compiled_aggregation in self._compiled_aggregations.values():
-                self._store_compiled_aggregation(compiled_aggregation)
+            for aggr_id in self.compilation_report:
+                self._store_compiled_aggregation(self._compiled_aggregations[aggr_id])
 
             self._compiled_aggregations = self._manage_frozen_branches(self._compiled_aggregations)
             self._lookup_store.generate_aggregation_lookups(self._compiled_aggregations)
@@ -208,6 +251,9 @@ class BICompiler:
             known_sites = {kv[0]: kv[1] for kv in current_configstatus.get("known_sites", set())}
             self._cleanup_vanished_aggregations()
             self._bi_structure_fetcher.cleanup_orphaned_files(known_sites)
+            self._dependency_store.save(
+                storage.CompilationDependencies(host_fingerprints, dependencies)
+            )
             self._metadata_store.update_last_compilation(
                 current_configstatus["configfile_timestamp"]
             )
@@ -278,6 +324,40 @@ class BICompiler:
         finally:
             aggregation.node.restrict_rule_title = None
 
+    def _get_recompilation_reasons(
+        self,
+        current_configstatus: ConfigStatus,
+        aggregations: Sequence[BIAggregation],
+        host_fingerprints: Mapping[str, bytes],
+        previous_dependencies: storage.CompilationDependencies | None,
+    ) -> dict[str, str]:
+        last_compilation = self._metadata_store.get_last_compilation()
+        if current_configstatus["configfile_timestamp"] > last_compilation:
+            return {aggregation.id: "configuration changed" for aggregation in aggregations}
+        if previous_dependencies is None:
+            return {aggregation.id: "no dependencies recorded" for aggregation in aggregations}
+
+        changed_host_names = changed_hosts(
+            previous_dependencies.host_fingerprints, host_fingerprints
+        )
+        LOGGER.debug(f"Detected {len(changed_host_names)} changed hosts")
+        changed_hosts_searcher = BISearcher()
+        changed_hosts_searcher.set_hosts(
+            {
+                host_name: host
+                for host_name in changed_host_names
+                if (host := self._bi_structure_fetcher.hosts.get(host_name)) is not None
+            }
+        )
+
+        reasons = {}
+        for aggregation in aggregations:
+            if (dependencies := previous_dependencies.aggregations.get(aggregation.id)) is None:
+                reasons[aggregation.id] = "not compiled before"
+            elif reason := dependencies.affected_by(changed_host_names, changed_hosts_searcher):
+                reasons[aggregation.id] = reason
+        return reasons
+
     def _compilation_required(self, current_configstatus: ConfigStatus) -> bool:
         # Check BI configuration changes
         last_compilation = self._metadata_store.get_last_compilation()
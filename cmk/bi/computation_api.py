@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""The interface of the BI computation service
+
+The results are sent without the compiled nodes they belong to: Both sides load the same
+compiled aggregations, so a result refers to its node by the position among the nodes of
+the parent node.
+"""
+
+from __future__ import annotations
+
+from typing import Any, TypedDict
+
+from pydantic import BaseModel
+
+from cmk.bi.lib import NodeComputeResult, NodeResultBundle
+
+
+class SerializedNodeResult(TypedDict):
+    actual_result: dict[str, Any]
+    assumed_result: dict[str, Any] | None
+    nested_results: list[tuple[int, SerializedNodeResult]]
+
+
+class BIResultsRequest(BaseModel, frozen=True):
+    last_compilation: float
+    # The titles of the required branches, by aggregation ID
+    branches: dict[str, list[str]]
+
+
+class BIResultsResponse(BaseModel, frozen=True):
+    # The results of the branches the service computes, None if a branch has no result
+    results: dict[str, dict[str, SerializedNodeResult | None]]
+
+
+def serialize_node_result(node_result_bundle: NodeResultBundle) -> SerializedNodeResult:
+    nodes = getattr(node_result_bundle.instance, "nodes", [])
+    return SerializedNodeResult(
+        actual_result=node_result_bundle.actual_result._asdict(),
+        assumed_result=(
+            None
+            if node_result_bundle.assumed_result is None
+            else node_result_bundle.assumed_result._asdict()
+        ),
+        nested_results=[
+            (
+                next(idx for idx, node in enumerate(nodes) if node is nested.instance),
+                serialize_node_result(nested),
+            )
+            for nested in node_result_bundle.nested_results
+        ],
+    )
+
+
+def deserialize_node_result(serialized: SerializedNodeResult, instance: Any) -> NodeResultBundle:
+    """The result of the given compiled node"""
+    return NodeResultBundle(
+        actual_result=NodeComputeResult(**serialized["actual_result"]),
+        assumed_result=(
+            None
+            if serialized["assumed_result"] is None
+            else NodeComputeResult(**serialized["assumed_result"])
+        ),
+        nested_results=[
+            deserialize_node_result(nested, instance.nodes[idx])
+            for idx, nested in serialized["nested_results"]
+        ],
+        instance=instance,
+    )
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Final
+
+import requests
+from pydantic import ValidationError
+
+from cmk.bi.computation_api import BIResultsRequest, BIResultsResponse, deserialize_node_result
+from cmk.bi.lib import NodeResultBundle
+from cmk.bi.log import LOGGER
+from cmk.bi.trees import BICompiledAggregation, BICompiledRule
+from cmk.utils import paths
+from cmk.utils.unixsocket_http import make_session
+
+SOCKET_PATH = paths.omd_root / "tmp" / "run" / "bi-computation.sock"
+
+type ServedResults = dict[tuple[str, str], NodeResultBundle | None]
+
+
+class BIComputationClient:
+    """Fetches the results of branches from the BI computation service
+
+    The service may not run, may not know a branch or may still hold the aggregations of
+    another compilation than the one loaded by the caller, which is identified by
+    last_compilation. Only the results the service knows are returned, the caller computes
+    the remaining branches itself.
+    """
+
+    _BASE_URL: Final = "http://local-bi-computation"
+    _TIMEOUT: Final = 5.0
+
+    def __init__(self, last_compilation: float, socket_path: Path = SOCKET_PATH) -> None:
+        self._last_compilation = last_compilation
+        self._socket_path = socket_path
+
+    def get_results(
+        self, required_aggregations: Sequence[tuple[BICompiledAggregation, list[BICompiledRule]]]
+    ) -> ServedResults:
+        """The results by aggregation ID and branch title"""
+        branches = {
+            compiled_aggregation.id: [branch.properties.title for branch in branches]
+            for compiled_aggregation, branches in required_aggregations
+            if branches
+        }
+        if not branches or not self._socket_path.exists():
+            return {}
+
+        try:
+            response = make_session(self._socket_path, self._BASE_URL).post(
+                f"{self._BASE_URL}/results",
+                json=BIResultsRequest(
+                    last_compilation=self._last_compilation,
+                    branches=branches,
+                ).model_dump(mode="json"),
+                timeout=self._TIMEOUT,
+            )
+            response.raise_for_status()
+            results = BIResultsResponse.model_validate(response.json()).results
+        except (requests.RequestException, ValidationError) as e:
+            LOGGER.debug("BI computation service not available: %s", e)
+            return {}
+
+        served_results: ServedResults = {}
+        try:
+            for compiled_aggregation, required_branches in required_aggregations:
+                if not (aggregation_results := results.get(compiled_aggregation.id)):
+                    continue
+                for branch in required_branches:
+                    title = branch.properties.title
+                    if title in aggregation_results:
+                        serialized = aggregation_results[title]
+                        served_results[(compiled_aggregation.id, title)] = (
+                            None
+                            if serialized is None
+                            else deserialize_node_result(serialized, branch)
+                        )
+        except (IndexError, AttributeError, TypeError) as e:
+            # The results do not fit the loaded branches, e.g. during a compilation
+            LOGGER.debug("BI computation service results do not match: %s", e)
+            return {}
+        return served_results
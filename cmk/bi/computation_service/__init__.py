@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+"""Launches the BI computation service
+
+The service keeps the compiled aggregations of the local site in memory, polls the states
+of their hosts and recomputes the branches of the hosts whose states changed. The GUI
+fetches the results via a unix socket instead of computing them per request, see
+cmk.bi.computation_client.
+"""
+
+import os
+import signal
+import socket
+import sys
+from collections.abc import Generator
+from contextlib import contextmanager
+from pathlib import Path
+
+from setproctitle import setproctitle
+from uvicorn import run as run_uvicorn_server
+
+from livestatus import LivestatusResponse, LivestatusRow, LocalConnection, Query
+
+from cmk.bi.computation_client import SOCKET_PATH
+from cmk.bi.data_fetcher import BIStatusFetcher
+from cmk.bi.filesystem import get_default_site_filesystem
+from cmk.bi.lib import SitesCallback
+from cmk.ccc.daemon import daemonize, pid_file_lock
+from cmk.ccc.i18n import _
+from cmk.ccc.site import omd_site, SiteId
+from cmk.utils.paths import omd_root
+
+from ._app import make_application
+from ._computer import IncrementalBIComputer
+from ._log import configure_logger, LOGGER
+
+_RELATIVE_LOG_DIRECTORY = Path("var", "log", "bi-computation")
+_POLL_INTERVAL = 5.0
+
+
+def main() -> int:
+    try:
+        return _main()
+    except Exception:
+        return 1
+
+
+def _main() -> int:
+    setproctitle("cmk-bi-computation")
+    os.unsetenv("LANG")
+
+    daemonize()
+
+    log_directory = omd_root / _RELATIVE_LOG_DIRECTORY
+    log_directory.mkdir(exist_ok=True, parents=True)
+    SOCKET_PATH.parent.mkdir(exist_ok=True, parents=True)
+    # uvicorn re-raises captured signals after shutting down the server.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    with pid_file_lock(SOCKET_PATH.with_suffix(".pid")):
+        configure_logger(log_directory)
+        site_id = omd_site()
+        app = make_application(
+            computer=IncrementalBIComputer(BIStatusFetcher(_sites_callback(site_id)), site_id),
+            fs=get_default_site_filesystem(),
+            poll_interval=_POLL_INTERVAL,
+        )
+        try:
+            with _provide_unix_socket(SOCKET_PATH) as socket_file_descriptor:
+                run_uvicorn_server(app, fd=socket_file_descriptor, log_config=None)
+        except SystemExit:
+            pass
+
+        LOGGER.info("Received termination signal, shutting down")
+
+    return 0
+
+
+def _sites_callback(site_id: SiteId) -> SitesCallback:
+    connection = LocalConnection()
+
+    def query(
+        query: Query, only_sites: list[SiteId] | None = None, fetch_full_data: bool = False
+    ) -> LivestatusResponse:
+        # Like the GUI does, the rows start with the site
+        return LivestatusResponse(
+            [LivestatusRow([site_id, *row]) for row in connection.query(query)]
+        )
+
+    return SitesCallback(
+        all_sites_with_id_and_online=lambda: [(site_id, True)],
+        query=query,
+        translate=_,
+    )
+
+
+@contextmanager
+def _provide_unix_socket(path: Path) -> Generator[int]:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.bind(str(path))
+            path.chmod(0o600)
+            yield sock.fileno()
+    finally:
+        path.unlink(missing_ok=True)
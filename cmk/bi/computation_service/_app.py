@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import asyncio
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+
+from cmk.bi.computation_api import BIResultsRequest, BIResultsResponse, serialize_node_result
+from cmk.bi.filesystem import BIFileSystem
+from cmk.bi.storage import AggregationNotFound, AggregationStore, MetadataStore
+from cmk.bi.trees import BICompiledAggregation
+
+from ._computer import IncrementalBIComputer
+from ._log import LOGGER
+
+
+@dataclass(frozen=True)
+class _ApplicationDependencies:
+    computer: IncrementalBIComputer
+    aggregation_store: AggregationStore
+    metadata_store: MetadataStore
+    poll_interval: float
+
+
+def make_application(
+    *, computer: IncrementalBIComputer, fs: BIFileSystem, poll_interval: float
+) -> FastAPI:
+    app = FastAPI(
+        lifespan=_lifespan,
+        openapi_url=None,
+        docs_url=None,
+        redoc_url=None,
+    )
+    app.state.dependencies = _ApplicationDependencies(
+        computer=computer,
+        aggregation_store=AggregationStore(fs.cache),
+        metadata_store=MetadataStore(fs),
+        poll_interval=poll_interval,
+    )
+
+    app.post("/results")(_results_endpoint)
+
+    return app
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncGenerator[None]:
+    poller_task = asyncio.create_task(_poller_task(app.state.dependencies))
+    yield
+    poller_task.cancel()
+
+
+async def _poller_task(dependencies: _ApplicationDependencies) -> None:
+    LOGGER.info("[poller] Operational")
+    while True:
+        # The endpoint keeps serving the results of the previous poll meanwhile.
+        await asyncio.to_thread(poll, dependencies)
+        await asyncio.sleep(dependencies.poll_interval)
+
+
+def poll(dependencies: _ApplicationDependencies) -> None:
+    computer = dependencies.computer
+    try:
+        last_compilation = dependencies.metadata_store.get_last_compilation()
+        if last_compilation != computer.last_compilation:
+            LOGGER.info("[poller] Loading the aggregations of compilation %s", last_compilation)
+            computer.set_aggregations(
+                _load_compiled_aggregations(dependencies.aggregation_store), last_compilation
+            )
+
+        start_time = time.time()
+        recomputed = computer.update()
+        LOGGER.debug(
+            "[poller] Recomputed %d branches in %.2f seconds", recomputed, time.time() - start_time
+        )
+    except Exception as e:
+        # Outdated results must not be served, the GUI computes them instead.
+        LOGGER.error("[poller] Error updating the results: %s", e)
+        computer.reset()
+
+
+def _load_compiled_aggregations(
+    aggregation_store: AggregationStore,
+) -> list[BICompiledAggregation]:
+    compiled_aggregations = []
+    for identifier in aggregation_store.yield_stored_identifiers():
+        try:
+            compiled_aggregations.append(aggregation_store.get_by_identifier(identifier))
+        except AggregationNotFound:
+            # Removed by a running compilation, which updates the last compilation afterwards
+            continue
+    return compiled_aggregations
+
+
+async def _results_endpoint(request: Request, payload: BIResultsRequest) -> BIResultsResponse:
+    computer: IncrementalBIComputer = request.app.state.dependencies.computer
+    # Nothing is returned if the GUI has compiled again, the poller loads the new
+    # aggregations soon.
+    return BIResultsResponse(
+        results={
+            aggregation_id: {
+                title: None if result is None else serialize_node_result(result)
+                for title, result in results.items()
+            }
+            for aggregation_id, results in computer.get_results(
+                payload.last_compilation, payload.branches
+            ).items()
+        }
+    )
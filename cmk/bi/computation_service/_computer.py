@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import threading
+from collections.abc import Iterable, Mapping
+
+from cmk.bi.data_fetcher import BIStatusFetcher
+from cmk.bi.lib import BIHostSpec, NodeResultBundle, RequiredBIElement
+from cmk.bi.trees import BICompiledAggregation, BICompiledRule
+from cmk.ccc.site import SiteId
+
+type BranchKey = tuple[str, str]
+
+
+class IncrementalBIComputer:
+    """Keeps the results of branches up to date with the states of their hosts
+
+    Only the branches whose hosts are monitored by the given site are computed. The
+    branches of frozen aggregations are left to the GUI as well.
+
+    The branches are set and updated by one thread, while the results are read by
+    others. The lock ensures that the results are read together with the compilation
+    they have been computed from.
+    """
+
+    def __init__(self, status_fetcher: BIStatusFetcher, site_id: SiteId) -> None:
+        self._status_fetcher = status_fetcher
+        self._site_id = site_id
+        self.last_compilation = 0.0
+        self._branches: dict[BranchKey, tuple[BICompiledAggregation, BICompiledRule]] = {}
+        self._branches_by_host: dict[BIHostSpec, list[BranchKey]] = {}
+        self._required_elements: set[RequiredBIElement] = set()
+        self._results: dict[BranchKey, NodeResultBundle | None] = {}
+        self._outdated: set[BranchKey] = set()
+        self._lock = threading.Lock()
+
+    def set_aggregations(
+        self, compiled_aggregations: Iterable[BICompiledAggregation], last_compilation: float
+    ) -> None:
+        branches: dict[BranchKey, tuple[BICompiledAggregation, BICompiledRule]] = {}
+        branches_by_host: dict[BIHostSpec, list[BranchKey]] = {}
+        required_elements_of_branches: set[RequiredBIElement] = set()
+        for compiled_aggregation in compiled_aggregations:
+            if (
+                compiled_aggregation.frozen_info is not None
+                or compiled_aggregation.computation_options.freeze_aggregations
+            ):
+                continue
+            for branch in compiled_aggregation.branches:
+                required_elements = branch.required_elements()
+                if any(element.site_id != self._site_id for element in required_elements):
+                    continue
+                key = (compiled_aggregation.id, branch.properties.title)
+                branches[key] = (compiled_aggregation, branch)
+                required_elements_of_branches.update(required_elements)
+                for host in branch.get_required_hosts():
+                    branches_by_host.setdefault(host, []).append(key)
+
+        with self._lock:
+            self._branches = branches
+            self._branches_by_host = branches_by_host
+            self._required_elements = required_elements_of_branches
+            self._results = {}
+            self._outdated = set(branches)
+            self.last_compilation = last_compilation
+
+    def reset(self) -> None:
+        """Forgets the states and results, e.g. after the states could not be fetched"""
+        self._status_fetcher.states = {}
+        with self._lock:
+            self._results = {}
+        self._outdated = set(self._branches)
+
+    def update(self) -> int:
+        """Fetches the current states and recomputes the branches of the changed hosts
+
+        Returns the number of recomputed branches.
+        """
+        previous_states = self._status_fetcher.states
+        self._status_fetcher.update_states(self._required_elements)
+        current_states = self._status_fetcher.states
+        for host in previous_states.keys() | current_states.keys():
+            if previous_states.get(host) != current_states.get(host):
+                self._outdated.update(self._branches_by_host.get(host, ()))
+
+        for key in self._outdated:
+            compiled_aggregation, branch = self._branches[key]
+            node_result_bundles = compiled_aggregation.compute_branches(
+                [branch], self._status_fetcher
+            )
+            with self._lock:
+                self._results[key] = node_result_bundles[0] if node_result_bundles else None
+
+        recomputed = len(self._outdated)
+        self._outdated = set()
+        return recomputed
+
+    def get_results(
+        self, last_compilation: float, branches: Mapping[str, Iterable[str]]
+    ) -> dict[str, dict[str, NodeResultBundle | None]]:
+        """The current results of the given branches, as far as they are computed here
+
+        There are no results for any other than the current compilation. The results are
+        replaced while the branches are updated in another thread, they are never modified.
+        """
+        results: dict[str, dict[str, NodeResultBundle | None]] = {}
+        with self._lock:
+            if last_compilation != self.last_compilation:
+                return results
+            for aggregation_id, titles in branches.items():
+                for title in titles:
+                    try:
+                        result = self._results[(aggregation_id, title)]
+                    except KeyError:
+                        continue
+                    results.setdefault(aggregation_id, {})[title] = result
+        return results
@@ -9,6 +9,7 @@ import copy
 from collections.abc import Iterator
 from typing import NamedTuple, override
 
+from cmk.bi.computation_client import BIComputationClient, ServedResults
 from cmk.bi.data_fetcher import BIStatusFetcher
 from cmk.bi.lib import NodeResultBundle, RequiredBIElement
 from cmk.bi.trees import BICompiledAggregation, BICompiledRule
@@ -60,9 +61,12 @@ class BIComputer:
         self,
         compiled_aggregations: dict[str, BICompiledAggregation],
         bi_status_fetcher: BIStatusFetcher,
+        computation_client: BIComputationClient | None = None,
     ) -> None:
         self._compiled_aggregations = compiled_aggregations
         self._bi_status_fetcher = bi_status_fetcher
+        # Only for results independent of the user: all objects visible, nothing assumed
+        self._computation_client = computation_client
         self._legacy_branch_cache: dict = {}
 
     def compute_aggregation_result(
@@ -86,9 +90,29 @@ class BIComputer:
         self, bi_aggregation_filter: BIAggregationFilter
     ) -> list[tuple[BICompiledAggregation, list[NodeResultBundle]]]:
         required_aggregations = self.get_required_aggregations(bi_aggregation_filter)
-        required_elements = self.get_required_elements(required_aggregations)
+        served_results = self._get_served_results(required_aggregations)
+        required_elements = self.get_required_elements(
+            [
+                (
+                    compiled_aggregation,
+                    [
+                        branch
+                        for branch in branches
+                        if (compiled_aggregation.id, branch.properties.title) not in served_results
+                    ],
+                )
+                for compiled_aggregation, branches in required_aggregations
+            ]
+        )
         self._bi_status_fetcher.update_states(required_elements)
-        return self.compute_results(required_aggregations)
+        return self.compute_results(required_aggregations, served_results)
+
+    def _get_served_results(
+        self, required_aggregations: list[tuple[BICompiledAggregation, list[BICompiledRule]]]
+    ) -> ServedResults:
+        if self._computation_client is None or self._bi_status_fetcher.assumed_states:
+            return {}
+        return self._computation_client.get_results(required_aggregations)
 
     def get_required_aggregations(
         self, bi_aggregation_filter: BIAggregationFilter
@@ -111,14 +135,28 @@ class BIComputer:
         return required_elements
 
     def compute_results(
-        self, required_aggregations: list[tuple[BICompiledAggregation, list[BICompiledRule]]]
+        self,
+        required_aggregations: list[tuple[BICompiledAggregation, list[BICompiledRule]]],
+        served_results: ServedResults | None = None,
     ) -> list[tuple[BICompiledAggregation, list[NodeResultBundle]]]:
+        """Computes the branches, except for the ones with served results"""
         results = []
         for compiled_aggregation, branches in required_aggregations:
-            node_result_bundles = compiled_aggregation.compute_branches(
-                branches,
-                self._bi_status_fetcher,
-            )
+            if served_results:
+                node_result_bundles = []
+                for branch in branches:
+                    key = (compiled_aggregation.id, branch.properties.title)
+                    if key not in served_results:
+                        node_result_bundles.extend(
+                            compiled_aggregation.compute_branches([branch], self._bi_status_fetcher)
+                        )
+                    elif (served_result := served_results[key]) is not None:
+                        node_result_bundles.append(served_result)
+            else:
+                node_result_bundles = compiled_aggregation.compute_branches(
+                    branches,
+                    self._bi_status_fetcher,
+                )
 
             # Postprocess results. Custom user plugins may add additional information for each node
             node_result_bundles = list(
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""The host data compiled aggregations depend on
+
+While an aggregation is compiled, a DependencyRecorder stands in for the BI searcher
+and records
+
+* the names of the hosts which were looked up or found by a search, and
+* the host conditions and patterns which were evaluated against all hosts.
+
+After a restart of a site, the fingerprints of the host data of the last compilation
+are compared with the current ones. A changed host (added, removed or with different
+tags, labels, folder, services, parents, children or alias) affects an aggregation if
+the aggregation used it, or if its current data matches one of the recorded conditions.
+This over-approximates: An affected aggregation may compile to the same result, but an
+aggregation that is not affected always does.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable, Iterator, Mapping, Set, ValuesView
+from dataclasses import dataclass
+from typing import override
+
+from cmk.bi.lib import ABCBISearcher, BIHostData, BIHostSearchMatch, BIServiceSearchMatch
+from cmk.bi.searcher import BISearcher
+from cmk.bi.type_defs import HostChoice, HostConditions, HostRegexMatches, HostServiceConditions
+from cmk.utils.labels import LabelGroups
+from cmk.utils.rulesets.ruleset_matcher import TagCondition
+from cmk.utils.tags import TagGroupID
+
+
+def fingerprint_host(host: BIHostData) -> bytes:
+    """A digest of the host data, independent of the order of sets and dicts"""
+    normalized = (
+        host.site_id,
+        sorted(host.tags),
+        sorted(host.labels.items()),
+        host.folder,
+        sorted(
+            (description, sorted(service.tags), sorted(service.labels.items()))
+            for description, service in host.services.items()
+        ),
+        host.children,
+        host.parents,
+        host.alias,
+        host.name,
+    )
+    return hashlib.blake2b(repr(normalized).encode(), digest_size=16).digest()
+
+
+def fingerprint_hosts(hosts: Mapping[str, BIHostData]) -> dict[str, bytes]:
+    return {host_name: fingerprint_host(host) for host_name, host in hosts.items()}
+
+
+def changed_hosts(old: Mapping[str, bytes], new: Mapping[str, bytes]) -> set[str]:
+    """The names of the added, removed and changed hosts
+
+    >>> sorted(changed_hosts({"a": b"1", "b": b"2", "c": b"3"}, {"a": b"1", "b": b"4", "d": b"5"}))
+    ['b', 'c', 'd']
+    """
+    return {
+        host_name
+        for host_name in old.keys() | new.keys()
+        if old.get(host_name) != new.get(host_name)
+    }
+
+
+@dataclass(frozen=True)
+class AggregationDependencies:
+    host_names: frozenset[str]
+    host_conditions: tuple[HostConditions, ...]
+    host_name_patterns: tuple[str, ...]
+
+    def affected_by(self, changed_host_names: Set[str], changed_hosts: BISearcher) -> str | None:
+        """Why the changed hosts affect the aggregation, None if they do not
+
+        The searcher holds the current data of the changed hosts, as far as they still exist.
+        """
+        if used := sorted(self.host_names & changed_host_names):
+            return f"uses changed host {_enumerate(used)}"
+
+        matched: set[str] = set()
+        for conditions in self.host_conditions:
+            matched.update(match.host.name for match in changed_hosts.search_hosts(conditions))
+        all_hosts = list(changed_hosts.hosts.values())
+        for pattern in self.host_name_patterns:
+            matched.update(
+                host.name for host in changed_hosts.get_host_name_matches(all_hosts, pattern)[0]
+            )
+        if matched:
+            return f"changed host {_enumerate(sorted(matched))} matches its searches"
+        return None
+
+
+def _enumerate(host_names: list[str]) -> str:
+    if len(host_names) == 1:
+        return host_names[0]
+    return f"{host_names[0]} (and {len(host_names) - 1} more)"
+
+
+class _RecordingHosts(Mapping[str, BIHostData]):
+    """The hosts of a searcher, recording the names of the hosts looked up
+
+    Iterating over the hosts is not recorded: The hosts are only enumerated to be passed
+    to the searcher, which records the patterns they are matched against.
+    """
+
+    def __init__(self, hosts: Mapping[str, BIHostData], host_names: set[str]) -> None:
+        self._hosts = hosts
+        self._host_names = host_names
+
+    def __getitem__(self, host_name: str) -> BIHostData:
+        self._host_names.add(host_name)
+        return self._hosts[host_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._hosts)
+
+    def __len__(self) -> int:
+        return len(self._hosts)
+
+    @override
+    def values(self) -> ValuesView[BIHostData]:
+        return self._hosts.values()
+
+
+class DependencyRecorder(ABCBISearcher):
+    """Records the dependencies of the compilations using it as searcher"""
+
+    def __init__(self, searcher: ABCBISearcher) -> None:
+        super().__init__()
+        self._searcher = searcher
+        self._host_names: set[str] = set()
+        self._host_conditions: list[HostConditions] = []
+        self._host_name_patterns: set[str] = set()
+        self.hosts = _RecordingHosts(searcher.hosts, self._host_names)
+
+    def dependencies(self) -> AggregationDependencies:
+        return AggregationDependencies(
+            host_names=frozenset(self._host_names),
+            host_conditions=tuple(self._host_conditions),
+            host_name_patterns=tuple(sorted(self._host_name_patterns)),
+        )
+
+    def _record_hosts(self, hosts: list[BIHostData]) -> None:
+        self._host_names.update(host.name for host in hosts)
+
+    def _record_conditions(self, conditions: HostConditions) -> None:
+        if conditions not in self._host_conditions:
+            self._host_conditions.append(conditions)
+
+    @override
+    def search_hosts(self, conditions: HostConditions) -> list[BIHostSearchMatch]:
+        self._record_conditions(conditions)
+        matches = self._searcher.search_hosts(conditions)
+        self._record_hosts([match.host for match in matches])
+        return matches
+
+    @override
+    def search_services(self, conditions: HostServiceConditions) -> list[BIServiceSearchMatch]:
+        # Services are part of the host data, so the host conditions are sufficient.
+        self._record_conditions(conditions)
+        matches = self._searcher.search_services(conditions)
+        self._record_hosts([match.host_match.host for match in matches])
+        return matches
+
+    @override
+    def get_host_name_matches(
+        self, hosts: list[BIHostData], pattern: str
+    ) -> tuple[list[BIHostData], HostRegexMatches]:
+        self._host_name_patterns.add(pattern)
+        matched_hosts, match_groups = self._searcher.get_host_name_matches(hosts, pattern)
+        self._record_hosts(matched_hosts)
+        return matched_hosts, match_groups
+
+    @override
+    def get_service_description_matches(
+        self, host_matches: list[BIHostSearchMatch], pattern: str
+    ) -> list[BIServiceSearchMatch]:
+        return self._searcher.get_service_description_matches(host_matches, pattern)
+
+    @override
+    def filter_host_choice(
+        self, hosts: list[BIHostData], condition: HostChoice
+    ) -> tuple[list[BIHostData], HostRegexMatches]:
+        if condition["type"] == "host_name_regex":
+            # Hosts given by name are looked up among all hosts, not only the given ones.
+            self._host_name_patterns.add(condition["pattern"])
+        matched_hosts, match_groups = self._searcher.filter_host_choice(hosts, condition)
+        matched_hosts = list(matched_hosts)
+        self._record_hosts(matched_hosts)
+        return matched_hosts, match_groups
+
+    @override
+    def filter_host_tags(
+        self, hosts: Iterable[BIHostData], tag_conditions: Mapping[TagGroupID, TagCondition]
+    ) -> Iterable[BIHostData]:
+        return self._searcher.filter_host_tags(hosts, tag_conditions)
+
+    @override
+    def filter_host_folder(
+        self, hosts: Iterable[BIHostData], folder_path: str
+    ) -> Iterable[BIHostData]:
+        return self._searcher.filter_host_folder(hosts, folder_path)
+
+    @override
+    def filter_host_labels(
+        self, hosts: Iterable[BIHostData], required_label_groups: LabelGroups
+    ) -> Iterable[BIHostData]:
+        return self._searcher.filter_host_labels(hosts, required_label_groups)
@@ -429,9 +429,8 @@ def replace_macros_in_string(pattern: str, macros: Mapping[str, str]) -> str:
 class ABCBISearcher(ABC):
     def __init__(self) -> None:
         # The key may be a pattern / regex, so `str` is the correct type for the key.
-        self.hosts: dict[str, BIHostData] = {}
-        self._host_regex_match_cache: dict[str, HostRegexMatches] = {}
-        self._host_regex_miss_cache: dict[str, dict[str, bool]] = {}
+        self.hosts: Mapping[str, BIHostData] = {}
+        self._host_regex_match_cache: dict[str, tuple[list[BIHostData], HostRegexMatches]] = {}
 
     @abstractmethod
     def search_hosts(self, conditions: HostConditions) -> list[BIHostSearchMatch]:
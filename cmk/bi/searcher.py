@@ -5,14 +5,24 @@
 
 # mypy: disable-error-code="type-arg"
 
-from collections.abc import Iterable, Mapping
-from typing import override
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from operator import attrgetter
+from re import Pattern
+from typing import cast, override
 
 from cmk.bi.lib import ABCBISearcher, BIHostData, BIHostSearchMatch, BIServiceSearchMatch
 from cmk.bi.type_defs import HostChoice, HostConditions, HostRegexMatches, HostServiceConditions
+from cmk.ccc.hostaddress import HostName
 from cmk.ccc.regex import regex
-from cmk.utils.labels import LabelGroups
-from cmk.utils.rulesets.ruleset_matcher import matches_labels, matches_tag_condition, TagCondition
+from cmk.utils.labels import AndOrNotLiteral, LabelGroups
+from cmk.utils.rulesets.host_index import HostIndex, HostSet
+from cmk.utils.rulesets.ruleset_matcher import (
+    matches_labels,
+    matches_tag_condition,
+    TagCondition,
+    TagConditionNE,
+    TagConditionOR,
+)
 from cmk.utils.tags import TagGroupID
 
 #   .--Defines-------------------------------------------------------------.
@@ -37,31 +47,154 @@ from cmk.utils.tags import TagGroupID
 
 
 class BISearcher(ABCBISearcher):
+    """Searches the hosts with the help of indexes
+
+    The tags, labels and folders of a host search are looked up in indexes and
+    combined to the candidate hosts, before the host names or aliases are matched.
+    The regex matches of the host names and aliases are memoized until the hosts change.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._host_alias_regex_match_cache: dict[
+            str, tuple[list[BIHostData], HostRegexMatches]
+        ] = {}
+        self._build_indexes()
+
     def set_hosts(self, hosts: dict[str, BIHostData]) -> None:
         self.cleanup()
         # The key may be a pattern / regex, so `str` is the correct type for the key.
         self.hosts = hosts
+        self._build_indexes()
 
     def cleanup(self) -> None:
         # Note: Do not call clear() on hosts
         #       This would clear the reference we've got on set_hosts
         self.hosts = {}
         self._host_regex_match_cache.clear()
-        self._host_regex_miss_cache.clear()
+        self._host_alias_regex_match_cache.clear()
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        self._host_index = HostIndex(
+            [host.name for host in self.hosts.values()],
+            {host.name: host.tags for host in self.hosts.values()},
+        )
+        # All hosts, in the order of the host sets, which is the order of self.hosts
+        self._indexed_hosts = list(self.hosts.values())
+        self._indexed_host_aliases = [host.alias for host in self._indexed_hosts]
+
+        # Most labels are not used in conditions, their host sets are created on demand.
+        self._host_names_by_label: dict[str, list[HostName]] = {}
+        self._host_names_by_folder: dict[str, list[HostName]] = {}
+        for host in self.hosts.values():
+            for key, value in host.labels.items():
+                self._host_names_by_label.setdefault(f"{key}:{value}", []).append(host.name)
+            for folder_path in _folder_paths(host.folder):
+                self._host_names_by_folder.setdefault(folder_path, []).append(host.name)
+        self._hosts_by_label: dict[str, HostSet] = {}
+        self._hosts_by_folder: dict[str, HostSet] = {}
 
     @override
     def search_hosts(self, conditions: HostConditions) -> list[BIHostSearchMatch]:
-        hosts, matched_re_groups = self.filter_host_choice(
-            list(self.hosts.values()), conditions["host_choice"]
+        candidates = self._host_index.all
+        if conditions["host_folder"]:
+            candidates = candidates.intersection(
+                self._hosts_in_folder(f"{conditions['host_folder']}/")
+            )
+        for taggroup_id, tag_condition in conditions["host_tags"].items():
+            candidates = candidates.intersection(
+                self._hosts_with_tag_condition(taggroup_id, tag_condition)
+            )
+        if conditions["host_label_groups"]:
+            candidates = candidates.intersection(
+                self._hosts_with_labels(conditions["host_label_groups"])
+            )
+
+        matched_hosts, matched_re_groups = self._filter_host_choice_of_candidates(
+            candidates, conditions["host_choice"]
         )
-        matched_hosts = self.filter_host_folder(hosts, conditions["host_folder"])
-        matched_hosts = self.filter_host_tags(matched_hosts, conditions["host_tags"])
-        matched_hosts = self.filter_host_labels(matched_hosts, conditions["host_label_groups"])
         return [
             BIHostSearchMatch(host=matched_host, match_groups=matched_re_groups[matched_host.name])
             for matched_host in matched_hosts
         ]
 
+    def _filter_host_choice_of_candidates(
+        self, candidates: HostSet, condition: HostChoice
+    ) -> tuple[list[BIHostData], HostRegexMatches]:
+        if condition["type"] == "host_name_regex" and not _is_regex(condition["pattern"]):
+            # Only the candidates are matched, the filters are applied already.
+            host = self.hosts.get(condition["pattern"])
+            if host and host.name in candidates:
+                return [host], {host.name: (host.name,)}
+            return [], {}
+
+        hosts = (
+            self._indexed_hosts
+            if len(candidates) == len(self._indexed_hosts)
+            else [self.hosts[host_name] for host_name in candidates]
+        )
+        return self.filter_host_choice(hosts, condition)
+
+    def _hosts_in_folder(self, folder_path: str) -> HostSet:
+        if (hosts := self._hosts_by_folder.get(folder_path)) is None:
+            hosts = self._hosts_by_folder[folder_path] = self._host_index.host_set(
+                self._host_names_by_folder.get(folder_path, [])
+            )
+        return hosts
+
+    def _hosts_with_label(self, label: str) -> HostSet:
+        if (hosts := self._hosts_by_label.get(label)) is None:
+            hosts = self._hosts_by_label[label] = self._host_index.host_set(
+                self._host_names_by_label.get(label, [])
+            )
+        return hosts
+
+    def _hosts_with_tag_condition(
+        self, taggroup_id: TagGroupID, tag_condition: TagCondition
+    ) -> HostSet:
+        """The hosts matching the tag condition like matches_tag_condition does"""
+        index = self._host_index
+        if isinstance(tag_condition, dict):
+            if "$ne" in tag_condition:
+                return index.all.difference(
+                    index.with_tag(taggroup_id, cast(TagConditionNE, tag_condition)["$ne"])
+                )
+
+            if "$or" in tag_condition:
+                return _union(
+                    index.empty,
+                    (
+                        index.with_tag(taggroup_id, tag_id)
+                        for tag_id in cast(TagConditionOR, tag_condition)["$or"]
+                    ),
+                )
+
+            if "$nor" in tag_condition:
+                return index.all.difference(
+                    _union(
+                        index.empty,
+                        (index.with_tag(taggroup_id, tag_id) for tag_id in tag_condition["$nor"]),
+                    )
+                )
+
+            raise NotImplementedError()
+
+        return index.with_tag(taggroup_id, tag_condition)
+
+    def _hosts_with_labels(self, required_label_groups: LabelGroups) -> HostSet:
+        """The hosts matching the label groups like matches_labels does"""
+        overall_match = self._host_index.all
+        for group_operator, label_group in required_label_groups:
+            group_match = self._host_index.all
+            for label_operator, label in label_group:
+                if label:
+                    group_match = _combine(
+                        group_match, self._hosts_with_label(label), label_operator
+                    )
+            overall_match = _combine(overall_match, group_match, group_operator)
+        return overall_match
+
     @override
     def filter_host_choice(
         self,
@@ -94,8 +227,7 @@ class BISearcher(ABCBISearcher):
         if pattern == "(.*)":
             return hosts, self._get_host_match_groups_by_name(hosts)
 
-        is_regex_match = any(map(lambda char: char in pattern, ["(", ")", "*", "$", "|", "[", "]"]))
-        if not is_regex_match:
+        if not _is_regex(pattern):
             host = self.hosts.get(pattern)
             if host:
                 return [host], {pattern: (pattern,)}
@@ -106,30 +238,13 @@ class BISearcher(ABCBISearcher):
         if not pattern_with_anchor.endswith("$"):
             pattern_with_anchor += "$"
 
-        matched_hosts: list[BIHostData] = []
-        matched_re_groups: HostRegexMatches = {}
-        regex_pattern = regex(pattern_with_anchor)
-        pattern_match_cache = self._host_regex_match_cache.setdefault(pattern_with_anchor, {})
-        pattern_miss_cache = self._host_regex_miss_cache.setdefault(pattern_with_anchor, {})
-        for host in hosts:
-            if host.name in pattern_miss_cache:
-                continue
-
-            cached_match = pattern_match_cache.get(host.name)
-            if cached_match:
-                matched_hosts.append(host)
-                matched_re_groups[host.name] = cached_match
-                continue
-
-            match = regex_pattern.match(host.name)
-            if match is None:
-                pattern_miss_cache[host.name] = True
-                continue
-            pattern_match_cache[host.name] = match.groups()
-            matched_hosts.append(host)
-            matched_re_groups[host.name] = pattern_match_cache[host.name]
-
-        return matched_hosts, matched_re_groups
+        return self._get_regex_matches(
+            hosts,
+            pattern_with_anchor,
+            self._host_regex_match_cache,
+            attrgetter("name"),
+            self._host_index.hosts,
+        )
 
     def get_host_alias_matches(
         self,
@@ -139,18 +254,42 @@ class BISearcher(ABCBISearcher):
         if pattern == "(.*)":
             return hosts, self._get_host_match_groups_by_alias(hosts)
 
-        # TODO: alias matches currently costs way more performance than the host matches
-        #       requires alias lookup cache to fix
-        matched_hosts: list[BIHostData] = []
-        matched_re_groups: HostRegexMatches = {}
+        return self._get_regex_matches(
+            hosts,
+            pattern,
+            self._host_alias_regex_match_cache,
+            attrgetter("alias"),
+            self._indexed_host_aliases,
+        )
+
+    def _get_regex_matches(
+        self,
+        hosts: list[BIHostData],
+        pattern: str,
+        cache: dict[str, tuple[list[BIHostData], HostRegexMatches]],
+        get_text: Callable[[BIHostData], str],
+        all_texts: Sequence[str],
+    ) -> tuple[list[BIHostData], HostRegexMatches]:
+        """The hosts whose name or alias matches the pattern
+
+        The given hosts are hosts of this searcher. Usually, they are all or many of them,
+        and the same patterns are matched over and over again. So all hosts are matched
+        once, and the matches of the pattern are memoized.
+        """
         regex_pattern = regex(pattern)
-        for host in hosts:
-            match = regex_pattern.match(host.alias)
-            if match is None:
-                continue
-            matched_hosts.append(host)
-            matched_re_groups[host.name] = tuple(match.groups())
-        return matched_hosts, matched_re_groups
+        if (cached := cache.get(pattern)) is None:
+            if len(hosts) * 8 < len(self.hosts):
+                # Matching a few hosts is cheaper than matching all hosts
+                return _get_regex_matches(hosts, map(get_text, hosts), regex_pattern)
+            cached = cache[pattern] = _get_regex_matches(
+                self._indexed_hosts, all_texts, regex_pattern
+            )
+
+        if hosts is self._indexed_hosts:
+            return list(cached[0]), dict(cached[1])
+        match_groups = cached[1]
+        matched_hosts = [host for host in hosts if host.name in match_groups]
+        return matched_hosts, {host.name: match_groups[host.name] for host in matched_hosts}
 
     @override
     def get_service_description_matches(
@@ -160,14 +299,23 @@ class BISearcher(ABCBISearcher):
     ) -> list[BIServiceSearchMatch]:
         matched_services = []
         regex_pattern = regex(pattern)
+        # Many hosts have services with the same descriptions.
+        description_matches: dict[str, tuple | None] = {}
         for host_match in host_matches:
             for service_description in host_match.host.services.keys():
-                if match := regex_pattern.match(service_description):
+                if service_description in description_matches:
+                    match_groups = description_matches[service_description]
+                else:
+                    match = regex_pattern.match(service_description)
+                    match_groups = description_matches[service_description] = (
+                        None if match is None else match.groups()
+                    )
+                if match_groups is not None:
                     matched_services.append(
                         BIServiceSearchMatch(
                             host_match=host_match,
                             service_description=service_description,
-                            match_groups=tuple(match.groups()),
+                            match_groups=match_groups,
                         )
                     )
         return matched_services
@@ -238,3 +386,49 @@ class BISearcher(ABCBISearcher):
             if matches_labels(service_data.labels, required_label_groups):
                 matched_services.append(service)
         return matched_services
+
+
+def _is_regex(pattern: str) -> bool:
+    return any(char in pattern for char in "()*$|[]")
+
+
+def _get_regex_matches(
+    hosts: Iterable[BIHostData], texts: Iterable[str], regex_pattern: Pattern[str]
+) -> tuple[list[BIHostData], HostRegexMatches]:
+    """The hosts whose text (name or alias, in the same order) matches the pattern"""
+    matches = [
+        (host, match)
+        for host, match in zip(hosts, map(regex_pattern.match, texts))
+        if match is not None
+    ]
+    return [host for host, _match in matches], {
+        host.name: match.groups() for host, match in matches
+    }
+
+
+def _folder_paths(folder: str) -> Iterator[str]:
+    """The folder paths the folder is in, as matched by filter_host_folder
+
+    >>> list(_folder_paths("linux/web/"))
+    ['linux/', 'linux/web/']
+    """
+    pos = folder.find("/")
+    while pos != -1:
+        yield folder[: pos + 1]
+        pos = folder.find("/", pos + 1)
+
+
+def _union(hosts: HostSet, others: Iterable[HostSet]) -> HostSet:
+    for other in others:
+        hosts = hosts.union(other)
+    return hosts
+
+
+def _combine(hosts: HostSet, other: HostSet, operator: AndOrNotLiteral) -> HostSet:
+    match operator:
+        case "and":
+            return hosts.intersection(other)
+        case "or":
+            return hosts.union(other)
+        case "not":
+            return hosts.difference(other)
@@ -15,11 +15,12 @@ import uuid
 from collections.abc import Generator
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Final, NewType
+from typing import Final, NamedTuple, NewType
 
 from redis import Redis
 
 from cmk.bi.aggregation import BIAggregation
+from cmk.bi.dependencies import AggregationDependencies
 from cmk.bi.filesystem import BIFileSystem, BIFileSystemCache, BIFileSystemVar
 from cmk.bi.trees import BICompiledAggregation
 from cmk.ccc import store
@@ -101,6 +102,31 @@ class FrozenAggregationStore:
         )
 
 
+class CompilationDependencies(NamedTuple):
+    host_fingerprints: dict[str, bytes]
+    aggregations: dict[str, AggregationDependencies]
+
+
+class DependencyStore:
+    """The dependencies of the aggregations of the last compilation"""
+
+    def __init__(self, fs_cache: BIFileSystemCache) -> None:
+        self.fs_cache = fs_cache
+
+    def get(self) -> CompilationDependencies | None:
+        try:
+            dependencies = store.load_object_from_pickle_file(
+                self.fs_cache.compilation_dependencies, default=None
+            )
+        except (AttributeError, EOFError, pickle.UnpicklingError):
+            # Written by a version with other dependencies
+            return None
+        return dependencies if isinstance(dependencies, CompilationDependencies) else None
+
+    def save(self, dependencies: CompilationDependencies) -> None:
+        store.save_bytes_to_file(self.fs_cache.compilation_dependencies, pickle.dumps(dependencies))
+
+
 class MetadataStore:
     def __init__(self, fs: BIFileSystem) -> None:
         self.fs = fs
@@ -8,14 +8,17 @@
 from __future__ import annotations
 
 import ast
+import os
+import pickle
 from collections import defaultdict
 from collections.abc import Callable, Iterable, Mapping, Sequence
+from pathlib import Path
 from typing import NamedTuple, Protocol
 
 import cmk.utils.paths
 from cmk.ccc.exceptions import MKGeneralException
 from cmk.ccc.hostaddress import HostName
-from cmk.ccc.store import ObjectStore
+from cmk.ccc.store import load_object_from_pickle_file, ObjectStore, save_object_to_pickle_file
 from cmk.checkengine.plugins import AutocheckEntry, CheckPluginName, ServiceID
 from cmk.utils.servicename import ServiceName
 
@@ -59,6 +62,10 @@ class AutochecksStore:
             serializer=_AutochecksSerializer(),
         )
 
+    @property
+    def path(self) -> Path:
+        return self._store.path
+
     def read(self) -> Sequence[AutocheckEntry]:
         try:
             return self._store.read_obj(default=[])
@@ -131,6 +138,61 @@ class AutochecksMemoizer:
             self._raw_autochecks_cache[hostname] = AutochecksStore(hostname).read()
         return self._raw_autochecks_cache[hostname]
 
+    def read_all(self, host_names: Iterable[HostName], cache_file: Path) -> None:
+        """Read the autochecks of many hosts at once, using a site wide cache file
+
+        The autochecks files of the hosts remain the reference and are still written host
+        by host. The cache file holds the autochecks of all hosts, together with the
+        identity of the autochecks file they were read from. Only the files that were
+        changed since are parsed again, and the cache file is only written if something
+        changed.
+        """
+        cached = _load_autochecks_cache(cache_file)
+        updated: _AutochecksCache = {}
+        reparsed = False
+        for host_name in host_names:
+            store = AutochecksStore(host_name)
+            if (stamp := _file_stamp(store.path)) is None:
+                self._raw_autochecks_cache[host_name] = []
+                continue
+
+            if (cached_entry := cached.get(host_name)) is not None and cached_entry[0] == stamp:
+                raw_entries = cached_entry[1]
+                entries: Sequence[AutocheckEntry] = [AutocheckEntry.load(r) for r in raw_entries]
+            else:
+                entries = store.read()
+                raw_entries = [e.dump() for e in entries]
+                reparsed = True
+
+            updated[host_name] = (stamp, raw_entries)
+            self._raw_autochecks_cache[host_name] = entries
+
+        if reparsed or updated.keys() != cached.keys():
+            save_object_to_pickle_file(cache_file, updated)
+
+
+# Identifies a version of an autochecks file. It is atomically replaced on every write,
+# which gives it a new inode.
+_FileStamp = tuple[int, int, int]
+
+_AutochecksCache = dict[HostName, tuple[_FileStamp, Sequence[Mapping[str, object]]]]
+
+
+def _file_stamp(path: Path) -> _FileStamp | None:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _load_autochecks_cache(cache_file: Path) -> _AutochecksCache:
+    try:
+        cache = load_object_from_pickle_file(cache_file, default={})
+    except (MKGeneralException, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
 
 def set_autochecks_of_real_hosts(
     hostname: HostName,
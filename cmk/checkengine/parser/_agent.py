@@ -119,6 +119,10 @@ class ParserState(abc.ABC):
     def on_piggyback_footer(self) -> ParserState:
         raise NotImplementedError()
 
+    def collects_lines(self, selection: SectionNameCollection) -> bool:
+        """Whether the lines up to the next header have to be passed to the parser"""
+        return False
+
     def to_noop_parser(self) -> NOOPParser:
         self._logger.debug("Transition %s -> %s", type(self).__name__, NOOPParser.__name__)
         return NOOPParser(
@@ -359,6 +363,10 @@ class PiggybackSectionParser(ParserState):
         self.current_host: Final = current_host
         self.current_section: Final = current_section
 
+    def collects_lines(self, selection: SectionNameCollection) -> bool:
+        # The piggybacked data is passed on, no matter which sections are selected here.
+        return True
+
     def do_action(self, line: bytes) -> ParserState:
         self.piggyback_sections[self.current_host][-1].section.append(AgentRawData(line))
         return self
@@ -467,6 +475,9 @@ class HostSectionParser(ParserState):
         )
         self.current_section: Final = current_section
 
+    def collects_lines(self, selection: SectionNameCollection) -> bool:
+        return selection is NO_SELECTION or self.current_section.name in selection
+
     def do_action(self, line: bytes) -> ParserState:
         self.sections[-1].section.append(
             AgentRawData(line if self.current_section.nostrip else line.strip())
@@ -548,7 +559,11 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
         raw_data: AgentRawData,
         selection: SectionNameCollection,
     ) -> tuple[ImmutableSection, Mapping[PiggybackMarker, ImmutableSection]]:
-        """Split agent output in chunks, splits lines by whitespaces."""
+        """Split agent output in chunks, splits lines by whitespaces.
+
+        Only the header lines are passed to the parser in any case. The lines in between
+        are not even split unless they belong to a selected section or to piggybacked data.
+        """
         parser: ParserState = NOOPParser(
             self.hostname,
             [],
@@ -557,8 +572,12 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
             encoding_fallback=self.encoding_fallback,
             logger=self._logger,
         )
-        for line in raw_data.split(b"\n"):
-            parser = parser(line.rstrip(b"\r"))
+        for lines, header in _split_at_headers(raw_data):
+            if parser.collects_lines(selection):
+                for line in bytes(lines).split(b"\n"):
+                    parser = parser(line.rstrip(b"\r"))
+            if header is not None:
+                parser = parser(header)
 
         return parser.sections if selection is NO_SELECTION else [
             s for s in parser.sections if s.header.name in selection
@@ -605,6 +624,33 @@ class AgentParser(Parser[AgentRawData, AgentRawDataSection]):
         }
 
 
+def _split_at_headers(raw_data: bytes) -> Iterator[tuple[memoryview, bytes | None]]:
+    """Yields the lines between the section and piggyback headers together with the next header
+
+    The lines are not copied, the header is None after the last lines.
+
+    >>> [(bytes(lines), header) for lines, header in _split_at_headers(
+    ...     b"<<<a>>>\\r\\n1\\n<<<no header\\n<<<<b>>>>\\n2\\n"
+    ... )]
+    [(b'', b'<<<a>>>'), (b'1\\n<<<no header\\n', b'<<<<b>>>>'), (b'2\\n', None)]
+    """
+    view = memoryview(raw_data)
+    lines_start = 0
+    line_start = 0 if raw_data.startswith(b"<<<") else _next_header_candidate(raw_data, 0)
+    while line_start is not None:
+        if (line_end := raw_data.find(b"\n", line_start)) == -1:
+            line_end = len(raw_data)
+        if (line := raw_data[line_start:line_end].rstrip(b"\r")).endswith(b">>>"):
+            yield view[lines_start:line_start], line
+            lines_start = line_end + 1
+        line_start = _next_header_candidate(raw_data, line_end)
+    yield view[lines_start:], None
+
+
+def _next_header_candidate(raw_data: bytes, start: int) -> int | None:
+    return None if (newline := raw_data.find(b"\n<<<", start)) == -1 else newline + 1
+
+
 def make_section_info(
     raw_sections: ImmutableSection,
 ) -> Mapping[SectionName, SectionMarker]:
@@ -16,7 +16,7 @@ from collections.abc import (
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Final
+from typing import Final, Literal
 
 import cmk.utils.paths
 from cmk.ccc import store
@@ -31,10 +31,29 @@ type _ServiceID = tuple[object, _Item]
 type _SerializedValueStore = Mapping[str, str]
 
 
+type ValueStoresStorage = Literal["json", "journal"]
+"""How the value stores of a host are written to disk
+
+"journal":
+    Every update appends a line with the changed value stores only. The file is
+    rewritten once the appended lines have grown as large as the rest of it.
+"json":
+    Every update rewrites the whole file as one JSON list. This is the format
+    of older versions, which cannot read appended lines.
+
+Files written with "json" are journals without appended lines. A journal is only
+readable by older versions again after it has been rewritten once, which the first
+update with "json" does.
+"""
+
+
 @dataclass(frozen=True)
 class _LastState:
     timestamp: float
+    size: int
     data: Mapping[ValueStoreKey, _SerializedValueStore]
+    compacted_size: int
+    """The size of the first line, zero if nothing must be appended to the file"""
 
 
 class AllValueStoresStore:
@@ -42,6 +61,9 @@ class AllValueStoresStore:
 
     Make sure to only update the values we want to update,
     and not to overwrite the whole file.
+
+    The file holds a JSON list of value stores per line, later lines taking
+    precedence. See ValueStoresStorage for how it is written.
     """
 
     def __init__(
@@ -49,8 +71,10 @@ class AllValueStoresStore:
         path: Path,
         *,
         log_debug: Callable[[str], object] | None = None,
+        storage: ValueStoresStorage = "journal",
     ) -> None:
         self.path: Final = path
+        self.storage: Final = storage
         self._log_debug: Final = (
             lambda x: logger.debug("value store: %s", x) if log_debug is None else log_debug
         )
@@ -67,50 +91,92 @@ class AllValueStoresStore:
             for (hn, cn, i), v in json.loads(raw)
         }
 
+    def _load_state(self) -> _LastState:
+        timestamp = self.path.stat().st_mtime
+        content = store.load_text_from_file(self.path, lock=False)
+        lines = content.splitlines()
+        data: dict[ValueStoreKey, _SerializedValueStore] = {}
+        # Files of older versions lack the final newline, they are rewritten first.
+        compacted_size = len(lines[0].encode("utf-8")) + 1 if content.endswith("\n") else 0
+        for nr, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                data.update(self._deserialize(line))
+            except json.JSONDecodeError:
+                if nr < len(lines) - 1:
+                    raise
+                # An append has been interrupted. Forget about it, and about
+                # appending to this file: The next line would be garbled, too.
+                self._log_debug("ignoring incomplete last line")
+                compacted_size = 0
+        return _LastState(timestamp, len(content.encode("utf-8")), data, compacted_size)
+
     def load(self) -> Mapping[ValueStoreKey, _SerializedValueStore]:
         self._log_debug("loading from disk")
         try:
-            self._last_known_state = _LastState(
-                self.path.stat().st_mtime,
-                (
-                    data := (
-                        self._deserialize(content)
-                        if (content := store.load_text_from_file(self.path, lock=False).strip())
-                        else {}
-                    )
-                ),
-            )
+            self._last_known_state = self._load_state()
         except FileNotFoundError:
             self._last_known_state = None
-            data = {}
+            return {}
+        return self._last_known_state.data
 
-        return data
+    def _needs_rewrite(self, last: _LastState) -> bool:
+        # Switching back to "json" has to get rid of the appended lines.
+        return self.storage == "json" and last.size != last.compacted_size
 
     def update(self, updated: Mapping[ValueStoreKey, _SerializedValueStore]) -> None:
         """Re-load and write the changes of the stored values
 
         This method will reload the values from disk, apply the changes
-        as specified by the argument, and then write the result to disk.
+        as specified by the argument, and then write the changes to disk.
         """
         self._log_debug("updating")
 
         self.path.parent.mkdir(parents=True, exist_ok=True)
 
         with store.locked(self.path):
+            stat = self.path.stat()
             if (
                 self._last_known_state is not None
-                and self.path.stat().st_mtime == self._last_known_state.timestamp
+                and stat.st_mtime == self._last_known_state.timestamp
+                and stat.st_size == self._last_known_state.size
             ):
                 self._log_debug("already loaded")
-                data = self._last_known_state.data
             else:
-                self._log_debug("loading from disk")
-                data = self.load()
+                self.load()
+            last = self._last_known_state
 
-            self._log_debug("writing to disk")
-            new_data = {**data, **updated}
-            store.save_text_to_file(self.path, self._serialize(new_data))
-            self._last_known_state = _LastState(timestamp=self.path.stat().st_mtime, data=new_data)
+            data = {} if last is None else last.data
+            changes = {k: v for k, v in updated.items() if data.get(k) != v}
+            if last is not None and not changes and not self._needs_rewrite(last):
+                self._log_debug("nothing changed")
+                return
+
+            new_data = {**data, **changes}
+            if (
+                self.storage == "journal"
+                and last is not None
+                and last.compacted_size
+                and last.size < 2 * last.compacted_size
+            ):
+                self._log_debug("appending to disk")
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.write(self._serialize(changes) + "\n")
+                compacted_size = last.compacted_size
+            else:
+                self._log_debug("writing to disk")
+                content = self._serialize(new_data) + "\n"
+                store.save_text_to_file(self.path, content)
+                compacted_size = len(content.encode("utf-8"))
+
+            stat = self.path.stat()
+            self._last_known_state = _LastState(
+                timestamp=stat.st_mtime,
+                size=stat.st_size,
+                data=new_data,
+                compacted_size=compacted_size,
+            )
 
 
 class _ValueStore(MutableMapping[str, object]):
@@ -9,6 +9,7 @@ from pathlib import Path
 from livestatus import LivestatusResponse, Query
 
 from cmk.bi.compiler import BICompiler
+from cmk.bi.computation_client import BIComputationClient
 from cmk.bi.computer import BIComputer
 from cmk.bi.data_fetcher import BIStatusFetcher
 from cmk.bi.lib import SitesCallback
@@ -20,6 +21,7 @@ from cmk.gui import sites
 from cmk.gui.bi.filesystem import bi_fs
 from cmk.gui.hooks import request_memoize
 from cmk.gui.i18n import _
+from cmk.gui.logged_in import user
 
 
 class BIManager:
@@ -32,7 +34,16 @@ class BIManager:
         self.compiler = BICompiler(self.bi_configuration_file(), sites_callback)
         self.compiler.load_compiled_aggregations()
         self.status_fetcher = BIStatusFetcher(sites_callback)
-        self.computer = BIComputer(self.compiler.compiled_aggregations, self.status_fetcher)
+        self.computer = BIComputer(
+            self.compiler.compiled_aggregations,
+            self.status_fetcher,
+            # The BI computation service sees all objects
+            (
+                BIComputationClient(self.compiler.last_compilation)
+                if user.may("bi.see_all")
+                else None
+            ),
+        )
 
     @classmethod
     def bi_configuration_file(cls) -> Path:
@@ -7,14 +7,13 @@
 
 from __future__ import annotations
 
-import functools
-import operator
 from abc import ABC, abstractmethod
 from collections.abc import Callable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
 from itertools import chain
-from typing import Annotated, assert_never, final, Literal, TypeVar
+from typing import Annotated, assert_never, final, Literal
 
+import numpy as np
 from pydantic import BaseModel, computed_field, PlainValidator, SerializeAsAny
 
 from cmk.ccc.exceptions import MKGeneralException
@@ -28,7 +27,7 @@ from cmk.utils.misc import pnp_cleanup
 from cmk.utils.servicename import ServiceName
 
 from ._from_api import RegisteredMetric
-from ._time_series import TimeSeries, TimeSeriesValues
+from ._time_series import TimeSeries, TimeSeriesArray, TimeSeriesValues
 from ._translated_metrics import TranslatedMetric
 
 GraphConsolidationFunction = Literal["max", "min", "average"]
@@ -140,68 +139,54 @@ def _derive_num_points(rrd_data: RRDData) -> tuple[int, int, int, int]:
     return 1, 0, 60, 60
 
 
-_TOperatorReturn = TypeVar("_TOperatorReturn")
+def clean_time_series_point(tsp: TimeSeries | TimeSeriesValues) -> list[float]:
+    """removes "None" entries from input list"""
+    return [x for x in tsp if x is not None]
 
 
-def op_func_wrapper(
-    op_func: Callable[[TimeSeries | TimeSeriesValues], _TOperatorReturn],
-    tsp: TimeSeries | TimeSeriesValues,
-) -> _TOperatorReturn | None:
-    if tsp.count(None) < len(tsp):  # At least one non-None value
-        try:
-            return op_func(tsp)
-        except ZeroDivisionError:
-            pass
-    return None
+# The operators work on the stacked values of their operands, one row per operand. Missing
+# values are NaN, so is the result of a point without any value.
 
 
-def clean_time_series_point(tsp: TimeSeries | TimeSeriesValues) -> list[float]:
-    """removes "None" entries from input list"""
-    return [x for x in tsp if x is not None]
+def _time_series_operator_sum(operands: TimeSeriesArray) -> TimeSeriesArray:
+    return np.where(np.isnan(operands).all(axis=0), np.nan, np.nansum(operands, axis=0))
 
 
-def _time_series_operator_sum(tsp: TimeSeries | TimeSeriesValues) -> float:
-    return sum(clean_time_series_point(tsp))
+def _time_series_operator_product(operands: TimeSeriesArray) -> TimeSeriesArray:
+    return np.asarray(np.prod(operands, axis=0), dtype=np.float64)
 
 
-def _time_series_operator_product(tsp: TimeSeries | TimeSeriesValues) -> float | None:
-    if None in tsp:
-        return None
-    return functools.reduce(operator.mul, tsp, 1)
+def _time_series_operator_difference(operands: TimeSeriesArray) -> TimeSeriesArray:
+    return np.asarray(operands[0] - operands[1], dtype=np.float64)
 
 
-def _time_series_operator_difference(tsp: TimeSeries | TimeSeriesValues) -> float | None:
-    if None in tsp:
-        return None
-    assert tsp[0] is not None
-    assert tsp[1] is not None
-    return tsp[0] - tsp[1]
+def _time_series_operator_fraction(operands: TimeSeriesArray) -> TimeSeriesArray:
+    return np.where(operands[1] == 0, np.nan, operands[0] / operands[1])
 
 
-def _time_series_operator_fraction(tsp: TimeSeries | TimeSeriesValues) -> float | None:
-    if None in tsp or tsp[1] == 0:
-        return None
-    assert tsp[0] is not None
-    assert tsp[1] is not None
-    return tsp[0] / tsp[1]
+def _time_series_operator_maximum(operands: TimeSeriesArray) -> TimeSeriesArray:
+    return np.asarray(np.fmax.reduce(operands, axis=0), dtype=np.float64)
 
 
-def _time_series_operator_maximum(tsp: TimeSeries | TimeSeriesValues) -> float:
-    return max(clean_time_series_point(tsp))
+def _time_series_operator_minimum(operands: TimeSeriesArray) -> TimeSeriesArray:
+    return np.asarray(np.fmin.reduce(operands, axis=0), dtype=np.float64)
 
 
-def _time_series_operator_minimum(tsp: TimeSeries | TimeSeriesValues) -> float:
-    return min(clean_time_series_point(tsp))
+def _time_series_operator_average(operands: TimeSeriesArray) -> TimeSeriesArray:
+    return np.asarray(
+        np.nansum(operands, axis=0) / np.count_nonzero(~np.isnan(operands), axis=0),
+        dtype=np.float64,
+    )
 
 
-def _time_series_operator_average(tsp: TimeSeries | TimeSeriesValues) -> float:
-    tsp_clean = clean_time_series_point(tsp)
-    return sum(tsp_clean) / len(tsp_clean)
+def _time_series_operator_merge(operands: TimeSeriesArray) -> TimeSeriesArray:
+    first_values = np.argmax(~np.isnan(operands), axis=0)
+    return np.asarray(operands[first_values, np.arange(operands.shape[1])], dtype=np.float64)
 
 
 def time_series_operators() -> dict[
     Operators,
-    tuple[str, Callable[[TimeSeries | TimeSeriesValues], float | None]],
+    tuple[str, Callable[[TimeSeriesArray], TimeSeriesArray]],
 ]:
     return {
         "+": (_("Sum"), _time_series_operator_sum),
@@ -211,10 +196,21 @@ def time_series_operators() -> dict[
         "MAX": (_("Maximum"), _time_series_operator_maximum),
         "MIN": (_("Minimum"), _time_series_operator_minimum),
         "AVERAGE": (_("Average"), _time_series_operator_average),
-        "MERGE": ("First not None", lambda x: next(iter(clean_time_series_point(x)))),
+        "MERGE": ("First not None", _time_series_operator_merge),
     }
 
 
+def apply_time_series_operator(
+    op_func: Callable[[TimeSeriesArray], TimeSeriesArray],
+    operands: Sequence[TimeSeries],
+) -> TimeSeriesArray:
+    """Applies the operator point by point, up to the end of the shortest operand"""
+    num_points = min(len(time_series) for time_series in operands)
+    # Divisions by zero and overflows result in NaN and inf, just like missing values
+    with np.errstate(all="ignore"):
+        return op_func(np.stack([time_series.array[:num_points] for time_series in operands]))
+
+
 @dataclass(frozen=True)
 class TimeSeriesMetaData:
     title: str
@@ -368,7 +364,7 @@ def _time_series_math(
         start=time_series.start,
         end=time_series.end,
         step=time_series.step,
-        values=[op_func_wrapper(op_func, list(tsp)) for tsp in zip(*operands_evaluated)],
+        values=apply_time_series_operator(op_func, operands_evaluated),
     )
 
 
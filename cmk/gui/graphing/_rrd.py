@@ -10,7 +10,6 @@
 # mypy: disable-error-code="unreachable"
 
 import collections
-import contextlib
 import time
 from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
@@ -25,6 +24,7 @@ from cmk.ccc.hostaddress import HostName
 from cmk.ccc.site import SiteId
 from cmk.ccc.version import parse_check_mk_version
 from cmk.gui import sites
+from cmk.gui.ctx_stack import g
 from cmk.gui.i18n import _
 from cmk.gui.type_defs import ColumnName
 from cmk.gui.utils.temperate_unit import TemperatureUnit
@@ -33,8 +33,8 @@ from cmk.utils.servicename import ServiceName
 
 from ._from_api import RegisteredMetric
 from ._graph_metric_expressions import (
+    apply_time_series_operator,
     GraphConsolidationFunction,
-    op_func_wrapper,
     RRDData,
     RRDDataKey,
     time_series_operators,
@@ -106,47 +106,86 @@ def _rrd_columns(
         yield f"rrddata:{metric_prop.metric_name}:{rpn}:{data_range}"
 
 
-def _fetch_time_series_of_service(
-    site_id: SiteId,
-    host_name: HostName,
-    service_description: ServiceName,
-    metric_props: set[MetricProperties],
-    conversion: Callable[[float], float],
+type _ServiceKey = tuple[SiteId, HostName, ServiceName]
+type _RRDCacheKey = tuple[_ServiceKey, MetricProperties, float, float, int | str]
+
+
+def _rrd_query(
+    service_keys: Sequence[_ServiceKey], columns: Sequence[ColumnName], *, for_hosts: bool
+) -> str:
+    if for_hosts:
+        filters = "".join(
+            f"Filter: host_name = {livestatus.lqencode(host_name)}\n"
+            for _site_id, host_name, _service_description in service_keys
+        )
+        query = f"GET hosts\nColumns: {' '.join(['host_name', *columns])}\n{filters}"
+    else:
+        filters = "".join(
+            f"Filter: host_name = {livestatus.lqencode(host_name)}\n"
+            f"Filter: service_description = {livestatus.lqencode(service_description)}\n"
+            "And: 2\n"
+            for _site_id, host_name, service_description in service_keys
+        )
+        query = (
+            "GET services\n"
+            f"Columns: {' '.join(['host_name', 'service_description', *columns])}\n{filters}"
+        )
+    return query + (f"Or: {len(service_keys)}\n" if len(service_keys) > 1 else "")
+
+
+def _fetch_time_series(
+    metric_props_by_service: Mapping[_ServiceKey, Iterable[MetricProperties]],
     *,
     start_time: float,
     end_time: float,
     step: int | str,
-) -> list[tuple[MetricProperties, TimeSeries]]:
-    # assumes str step is well formatted, colon separated step length & rrd point count
-    if not isinstance(step, str):
-        step = max(1, step)
+) -> dict[tuple[_ServiceKey, MetricProperties], TimeSeries]:
+    """Fetches the time series of many services with as few livestatus queries as possible
 
-    with sites.only_sites(site_id):
-        data = sites.live().query_row(
-            livestatus_lql(
-                [host_name],
-                list(
-                    _rrd_columns(metric_props, start_time=start_time, end_time=end_time, step=step)
-                ),
-                service_description,
-            )
+    The services with the same metrics are fetched with one query, which is sent to all
+    their sites in parallel. Hosts and services are queried separately."""
+    services_by_query: dict[tuple[bool, frozenset[MetricProperties]], list[_ServiceKey]] = (
+        collections.defaultdict(list)
+    )
+    for service_key, metric_props in metric_props_by_service.items():
+        services_by_query[(service_key[2] == "_HOST_", frozenset(metric_props))].append(service_key)
+
+    time_series: dict[tuple[_ServiceKey, MetricProperties], TimeSeries] = {}
+    for (for_hosts, metric_props), service_keys in services_by_query.items():
+        ordered_metric_props = list(metric_props)
+        requested = set(service_keys)
+        query = _rrd_query(
+            service_keys,
+            list(
+                _rrd_columns(
+                    ordered_metric_props, start_time=start_time, end_time=end_time, step=step
+                )
+            ),
+            for_hosts=for_hosts,
         )
-
-    return list(
-        zip(
-            metric_props,
-            [
-                TimeSeries(
+        with (
+            sites.only_sites(sorted({site_id for site_id, _h, _s in service_keys})),
+            sites.prepend_site(),
+        ):
+            rows = sites.live().query(query)
+
+        for row in rows:
+            if for_hosts:
+                service_key = (row[0], row[1], ServiceName("_HOST_"))
+                data = row[2:]
+            else:
+                service_key = (row[0], row[1], row[2])
+                data = row[3:]
+            if service_key not in requested:
+                continue
+            for metric_prop, d in zip(ordered_metric_props, data):
+                time_series[(service_key, metric_prop)] = TimeSeries(
                     start=int(d[0]),
                     end=int(d[1]),
                     step=int(d[2]),
                     values=d[3:],
-                    conversion=conversion,
                 )
-                for d in data
-            ],
-        )
-    )
+    return time_series
 
 
 def _align_and_resample_rrds(
@@ -169,14 +208,14 @@ def _align_and_resample_rrds(
             raise MKGeneralException(_("Cannot get RRD data for %s") % spec_title)
 
         time_series.values = (
-            time_series.downsample(
+            time_series.downsample_array(
                 start=target_start,
                 end=target_end,
                 step=target_step,
                 cf=consolidation_function,
             )
             if target_step >= time_series.step
-            else time_series.forward_fill_resample(
+            else time_series.forward_fill_resample_array(
                 start=target_start,
                 end=target_end,
                 step=target_step,
@@ -186,7 +225,7 @@ def _align_and_resample_rrds(
 
 def _chop_end_of_the_curve(rrd_data: RRDData, step: int) -> None:
     for data in rrd_data.values():
-        data.values = data.values[:-1]
+        data.values = data.array[:-1]
         data.end -= step
 
 
@@ -220,31 +259,56 @@ def fetch_time_series_rrd(
     end_time: float,
     step: int | str,
 ) -> RRDData:
+    # assumes str step is well formatted, colon separated step length & rrd point count
+    if not isinstance(step, str):
+        step = max(1, step)
+
+    metric_props_by_service = _metric_props_by_service(keys, consolidation_function)
+
+    # Graphs of the same request, e.g. the dashlets of a dashboard, often share time series.
+    # The unconverted time series are cached, the cached ones are never modified.
+    cache: dict[_RRDCacheKey, TimeSeries | None] = g.setdefault("rrd_time_series_cache", {})
+    uncached = {
+        service_key: missing
+        for service_key, metric_props in metric_props_by_service.items()
+        if (
+            missing := [
+                metric_prop
+                for metric_prop in metric_props
+                if (service_key, metric_prop, start_time, end_time, step) not in cache
+            ]
+        )
+    }
+    if uncached:
+        fetched = _fetch_time_series(uncached, start_time=start_time, end_time=end_time, step=step)
+        for service_key, missing_metric_props in uncached.items():
+            for metric_prop in missing_metric_props:
+                cache[(service_key, metric_prop, start_time, end_time, step)] = fetched.get(
+                    (service_key, metric_prop)
+                )
+
     rrd_data: dict[RRDDataKey, TimeSeries] = {}
-    for (site_id, host_name, service_description), metrics in _metric_props_by_service(
-        keys, consolidation_function
-    ).items():
-        with contextlib.suppress(livestatus.MKLivestatusNotFoundError):
-            for metric_props, time_series in _fetch_time_series_of_service(
-                site_id,
-                host_name,
-                service_description,
-                metrics,
-                conversion,
-                start_time=start_time,
-                end_time=end_time,
-                step=step,
-            ):
-                rrd_data[
-                    RRDDataKey(
-                        site_id,
-                        host_name,
-                        service_description,
-                        metric_props.metric_name,
-                        metric_props.consolidation_function,
-                        metric_props.scale,
-                    )
-                ] = time_series
+    for service_key, metric_props in metric_props_by_service.items():
+        for metric_prop in metric_props:
+            if (cached := cache[(service_key, metric_prop, start_time, end_time, step)]) is None:
+                continue
+            site_id, host_name, service_description = service_key
+            rrd_data[
+                RRDDataKey(
+                    site_id,
+                    host_name,
+                    service_description,
+                    metric_prop.metric_name,
+                    metric_prop.consolidation_function,
+                    metric_prop.scale,
+                )
+            ] = TimeSeries(
+                start=cached.start,
+                end=cached.end,
+                step=cached.step,
+                values=cached.array,
+                conversion=conversion,
+            )
 
     if rrd_data:
         first_rrd_series = next(iter(rrd_data.values()))
@@ -370,7 +434,7 @@ def translate_and_merge_rrd_columns(
 
     timeseries = relevant_ts[0]
     _op_title, op_func = time_series_operators()["MERGE"]
-    single_value_series = [op_func_wrapper(op_func, list(tsp)) for tsp in zip(*relevant_ts)]
+    single_value_series = apply_time_series_operator(op_func, relevant_ts)
 
     return TimeSeries(
         start=timeseries.start,
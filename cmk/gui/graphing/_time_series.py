@@ -4,34 +4,56 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 from collections.abc import Callable, Iterator, Sequence
-from statistics import fmean
+
+import numpy as np
+import numpy.typing as npt
 
 TimeSeriesValue = float | None
 TimeSeriesValues = Sequence[TimeSeriesValue]
+# Gaps are NaN, see TimeSeries.array
+type TimeSeriesArray = npt.NDArray[np.float64]
 
 
 def rrd_timestamps(*, start: int, end: int, step: int) -> list[int]:
     return [] if step == 0 else [t + step for t in range(start, end, step)]
 
 
-def _aggregation_functions(series: TimeSeriesValues, aggr: str | None) -> TimeSeriesValue:
-    """Aggregate data in series list according to aggr
+def values_to_array(values: TimeSeriesValues | TimeSeriesArray) -> TimeSeriesArray:
+    # numpy converts None to NaN for float arrays
+    return np.asarray(values, dtype=np.float64)
+
+
+def array_to_values(array: TimeSeriesArray) -> list[TimeSeriesValue]:
+    values: list[TimeSeriesValue] = list(array.tolist())
+    for idx in np.flatnonzero(np.isnan(array)).tolist():
+        values[idx] = None
+    return values
 
-    If series has None values they are dropped before aggregation"""
-    cleaned_series = [x for x in series if x is not None]
-    if not cleaned_series:
-        return None
 
+def _consolidate(
+    array: TimeSeriesArray, bins: npt.NDArray[np.intp], num_bins: int, aggr: str | None
+) -> TimeSeriesArray:
+    """Aggregate the values of each bin according to aggr
+
+    The bins have to be sorted. NaN values are dropped before aggregation, bins without
+    values are NaN."""
+    consolidated = np.full(num_bins, np.nan)
+    present_bins, bin_starts = np.unique(bins, return_index=True)
     aggr = "max" if aggr is None else aggr.lower()
     match aggr:
         case "average":
-            return fmean(cleaned_series)
+            is_value = ~np.isnan(array)
+            sums = np.add.reduceat(np.where(is_value, array, 0.0), bin_starts)
+            counts = np.add.reduceat(is_value, bin_starts)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                consolidated[present_bins] = np.where(counts > 0, sums / counts, np.nan)
         case "max":
-            return max(cleaned_series)
+            consolidated[present_bins] = np.fmax.reduceat(array, bin_starts)
         case "min":
-            return min(cleaned_series)
+            consolidated[present_bins] = np.fmin.reduceat(array, bin_starts)
         case _:
             raise ValueError(f"Invalid Aggregation function {aggr}, only max, min, average allowed")
+    return consolidated
 
 
 class TimeSeries:
@@ -42,6 +64,8 @@ class TimeSeries:
       which means they are at the end of the interval.
     - The Series describes the interval [start; end[
     - Start has no associated value to it.
+    - The values are kept in a NumPy array with NaN for missing values. `values` provides
+      them as a list with None for missing values.
 
     args:
         data : list
@@ -59,23 +83,49 @@ class TimeSeries:
         start: int,
         end: int,
         step: int,
-        values: TimeSeriesValues,
-        conversion: Callable[[float], float] = lambda v: v,
+        values: TimeSeriesValues | TimeSeriesArray,
+        conversion: Callable[[float], float] | None = None,
     ) -> None:
         self.start = start
         self.end = end
         self.step = step
-        self.values: TimeSeriesValues = [v if v is None else conversion(v) for v in values]
+        self._values: list[TimeSeriesValue] | None = None
+        self.values = values
+        if conversion is not None:
+            array = self._array.copy()
+            is_value = ~np.isnan(array)
+            array[is_value] = [conversion(v) for v in array[is_value].tolist()]
+            self.values = array
+
+    @property
+    def array(self) -> TimeSeriesArray:
+        """The values with NaN for missing values, must not be modified"""
+        return self._array
+
+    @property
+    def values(self) -> TimeSeriesValues:
+        if self._values is None:
+            self._values = array_to_values(self._array)
+        return self._values
+
+    @values.setter
+    def values(self, values: TimeSeriesValues | TimeSeriesArray) -> None:
+        self._array = values_to_array(values)
+        self._values = None
 
     def forward_fill_resample(self, *, start: int, end: int, step: int) -> TimeSeriesValues:
         """Upsample by forward filling values"""
         if start == self.start and end == self.end and step == self.step:
             return self.values
-        idx_max = len(self.values) - 1
-        return [
-            self.values[max(0, min(int((t - self.start) / self.step), idx_max))]
-            for t in range(start, end, step)
-        ]
+        return array_to_values(self.forward_fill_resample_array(start=start, end=end, step=step))
+
+    def forward_fill_resample_array(self, *, start: int, end: int, step: int) -> TimeSeriesArray:
+        """Upsample by forward filling values, see forward_fill_resample"""
+        if start == self.start and end == self.end and step == self.step:
+            return self._array
+        # Like int(), astype truncates towards zero
+        indices = ((np.arange(start, end, step) - self.start) / self.step).astype(np.intp)
+        return self._array[np.clip(indices, 0, len(self._array) - 1)]
 
     def downsample(
         self, *, start: int, end: int, step: int, cf: str | None = "max"
@@ -86,24 +136,24 @@ class TimeSeries:
         """
         if start == self.start and end == self.end and step == self.step:
             return self.values
+        return array_to_values(self.downsample_array(start=start, end=end, step=step, cf=cf))
 
-        dwsa = []
-        co: list[TimeSeriesValue] = []
-        desired_times = rrd_timestamps(start=start, end=end, step=step)
-        i = 0
-        for t, val in self.time_data_pairs():
-            if t > desired_times[i]:
-                dwsa.append(_aggregation_functions(co, cf))
-                co = []
-                i += 1
-            co.append(val)
-
-        diff_len = len(desired_times) - len(dwsa)
-        if diff_len > 0:
-            dwsa.append(_aggregation_functions(co, cf))
-            dwsa += [None] * (diff_len - 1)
-
-        return dwsa
+    def downsample_array(
+        self, *, start: int, end: int, step: int, cf: str | None = "max"
+    ) -> TimeSeriesArray:
+        """Downsample time series by consolidation function, see downsample"""
+        if start == self.start and end == self.end and step == self.step:
+            return self._array
+
+        num_bins = len(range(start, end, step))
+        num_values = min(len(self._array), len(range(self.start, self.end, self.step)))
+        timestamps = self.start + self.step * np.arange(1, num_values + 1)
+        # A value belongs to the first desired timestamp not before its own timestamp.
+        # Values before the first desired timestamp are consolidated into it, values
+        # after the last one are dropped.
+        bins = np.maximum((timestamps - start - 1) // step, 0)
+        in_range = bins < num_bins
+        return _consolidate(self._array[:num_values][in_range], bins[in_range], num_bins, cf)
 
     def time_data_pairs(self) -> list[tuple[int, TimeSeriesValue]]:
         return list(
@@ -121,17 +171,19 @@ class TimeSeries:
             self.start == other.start
             and self.end == other.end
             and self.step == other.step
-            and self.values == other.values
+            and np.array_equal(self._array, other._array, equal_nan=True)
         )
 
     def __getitem__(self, i: int) -> TimeSeriesValue:
         return self.values[i]
 
     def __len__(self) -> int:
-        return len(self.values)
+        return len(self._array)
 
     def __iter__(self) -> Iterator[TimeSeriesValue]:
         yield from self.values
 
     def count(self, /, v: TimeSeriesValue) -> int:
-        return self.values.count(v)
+        if v is None:
+            return int(np.count_nonzero(np.isnan(self._array)))
+        return int(np.count_nonzero(self._array == v))
@@ -18,6 +18,7 @@ from livestatus import (
     MultiSiteConnection,
     NetworkSocketDetails,
     NetworkSocketInfo,
+    QueryCache,
     sanitize_site_configuration,
     SiteConfiguration,
     SiteConfigurations,
@@ -322,6 +323,9 @@ def _connect_multiple_sites(user: LoggedInUser) -> None:
         disabled_sites=disabled_sites,
         only_sites_postprocess=current_app().features.livestatus_only_sites_postprocess,
     )
+    # The connection lives for one request. Pages often send the same queries several
+    # times, e.g. from different snapins or painters, so answer them only once per site.
+    g.live.set_query_cache(QueryCache())
 
     # Fetch status of sites by querying the version of Nagios and livestatus
     # This may be cached by a proxy for up to the next configuration reload.
@@ -215,6 +215,7 @@ def register(
     config_variable_registry.register(ConfigVariablePiggybackMaxCachefileAge)
     config_variable_registry.register(ConfigVariableCheckMKPerfdataWithTimes)
     config_variable_registry.register(ConfigVariableUseDNSCache)
+    config_variable_registry.register(ConfigVariableValueStoresStorage)
     config_variable_registry.register(ConfigVariableChooseSNMPBackend)
     config_variable_registry.register(ConfigVariableSNMPwalkDownloadTimeout)
     config_variable_registry.register(ConfigVariableHTTPProxies)
@@ -2782,6 +2783,28 @@ ConfigVariableUseDNSCache = ConfigVariable(
     ),
 )
 
+ConfigVariableValueStoresStorage = ConfigVariable(
+    group=ConfigVariableGroupCheckExecution,
+    primary_domain=ConfigDomainCore,
+    ident="value_stores_storage",
+    valuespec=lambda context: DropdownChoice(
+        title=_("Storage of counters and other check states"),
+        help=_(
+            "The checks keep counters and other states of the services of a host in one "
+            "file per host. By default only the changed states are appended to this file "
+            "after each check, and it is rewritten once the appended data has grown as "
+            "large as the rest of it. Alternatively the whole file can be rewritten after "
+            "each check, which is the format of older versions of Checkmk. If you want "
+            "to downgrade, switch to rewriting the whole file first and let every host "
+            "be checked once, so that its file is rewritten."
+        ),
+        choices=[
+            ("journal", _("Append the changed states")),
+            ("json", _("Rewrite the whole file")),
+        ],
+    ),
+)
+
 
 def _transform_snmp_backend_from_valuespec(
     backend: SNMPBackendEnum,
@@ -21,9 +21,11 @@ import hashlib
 import io
 import logging
 import os
+import pickle
 import re
 import shutil
 import subprocess
+import threading
 import time
 import traceback
 from collections import Counter
@@ -43,7 +45,7 @@ from html import unescape
 from itertools import filterfalse
 from multiprocessing.pool import AsyncResult, ThreadPool
 from pathlib import Path
-from typing import Any, assert_never, Literal, NamedTuple, TypedDict
+from typing import Any, assert_never, Final, Literal, NamedTuple, TypedDict
 from urllib.parse import urlparse
 
 from pydantic import BaseModel
@@ -706,7 +708,7 @@ def _get_config_sync_state(
     replication_paths: Sequence[ReplicationPath],
     *,
     debug: bool,
-) -> tuple[ConfigSyncFileInfos, int]:
+) -> tuple[ConfigSyncFileInfos, int, Sequence[SyncArchiveCompression]]:
     """Get the config file states from the remote sites
 
     Calls the automation call "get-config-sync-state" on the remote site,
@@ -719,7 +721,12 @@ def _get_config_sync_state(
     )
 
     assert isinstance(response, tuple)
-    return {k: ConfigSyncFileInfo(*v) for k, v in response[0].items()}, response[1]
+    return (
+        {k: ConfigSyncFileInfo(*v) for k, v in response[0].items()},
+        response[1],
+        # Remote sites of older versions only accept uncompressed archives
+        response[2] if len(response) > 2 else (),
+    )
 
 
 def _synchronize_files(
@@ -729,6 +736,7 @@ def _synchronize_files(
     files_to_delete: list[str],
     remote_config_generation: int,
     site_config_dir: Path,
+    compression: SyncArchiveCompression | None,
     *,
     debug: bool,
 ) -> None:
@@ -738,19 +746,23 @@ def _synchronize_files(
     be deleted and the current config generation is handed over using dedicated HTTP parameters.
     """
 
-    sync_archive = _get_sync_archive(files_to_sync, site_config_dir)
-
-    response = cmk.gui.watolib.automations.do_remote_automation(
-        automation_config,
-        "receive-config-sync",
-        [
-            ("site_id", site_id),
-            ("to_delete", repr(files_to_delete)),
-            ("config_generation", "%d" % remote_config_generation),
-        ],
-        files={"sync_archive": io.BytesIO(sync_archive)},
-        debug=debug,
-    )
+    # The compressed archive is read from its file while it is uploaded.
+    with (
+        io.BytesIO(_get_sync_archive(files_to_sync, site_config_dir))
+        if compression is None
+        else _get_shared_sync_archive(files_to_sync, site_config_dir).open("rb")
+    ) as sync_archive:
+        response = cmk.gui.watolib.automations.do_remote_automation(
+            automation_config,
+            "receive-config-sync",
+            [
+                ("site_id", site_id),
+                ("to_delete", repr(files_to_delete)),
+                ("config_generation", "%d" % remote_config_generation),
+            ],
+            files={"sync_archive": sync_archive},
+            debug=debug,
+        )
 
     if response is not True:
         raise MKGeneralException(_("Failed to synchronize with site: %s") % response)
@@ -761,6 +773,7 @@ class SyncState:
     central_file_infos: ConfigSyncFileInfos
     remote_file_infos: ConfigSyncFileInfos
     remote_config_generation: int
+    remote_archive_compressions: Sequence[SyncArchiveCompression] = ()
 
 
 def fetch_sync_state(
@@ -784,7 +797,11 @@ def fetch_sync_state(
             _set_sync_state(site_activation_state, _("Fetching sync state"))
             site_logger.debug("Starting config sync (%r)", site_activation_state)
 
-            remote_file_infos, remote_config_generation = _get_config_sync_state(
+            (
+                remote_file_infos,
+                remote_config_generation,
+                remote_archive_compressions,
+            ) = _get_config_sync_state(
                 automation_config,
                 replication_paths,
                 debug=debug,
@@ -796,6 +813,7 @@ def fetch_sync_state(
                     central_file_infos=central_file_infos,
                     remote_file_infos=remote_file_infos,
                     remote_config_generation=remote_config_generation,
+                    remote_archive_compressions=remote_archive_compressions,
                 ),
                 site_activation_state,
                 sync_start,
@@ -885,6 +903,7 @@ def synchronize_files(
                 sync_delta.to_delete,
                 remote_config_generation,
                 site_config_dir,
+                sync_delta.archive_compression,
                 debug=debug,
             )
             site_logger.debug("Finished config sync")
@@ -2200,7 +2219,7 @@ def _initialize_site_activation_state(
 
 
 def _get_config_sync_file_infos_per_inode(
-    replication_paths: Sequence[ReplicationPath],
+    replication_paths: Sequence[ReplicationPath], file_hashes: ConfigSyncFileHashes
 ) -> Mapping[int, ConfigSyncFileInfo]:
     inode_sync_states = {}
 
@@ -2212,11 +2231,11 @@ def _get_config_sync_file_infos_per_inode(
 
         if replication_path.ty == ReplicationPathType.FILE:
             inode_sync_states[os.stat(replication_path_full).st_ino] = _get_config_sync_file_info(
-                replication_path_full
+                replication_path_full, file_hashes
             )
         elif replication_path.ty == ReplicationPathType.DIR:
             _get_replication_dir_config_sync_file_infos_per_inode(
-                inode_sync_states, replication_path_full, replication_path.is_excluded
+                inode_sync_states, replication_path_full, replication_path.is_excluded, file_hashes
             )
         else:
             raise NotImplementedError()
@@ -2228,6 +2247,7 @@ def _get_replication_dir_config_sync_file_infos_per_inode(
     inode_sync_states: MutableMapping[int, ConfigSyncFileInfo],
     replication_path: str,
     replication_path_excluder: Callable[[str], bool],
+    file_hashes: ConfigSyncFileHashes,
 ) -> None:
     # Use os functionality instead of pathlib since it is faster
     for root, dir_names, file_names in os.walk(replication_path):
@@ -2240,7 +2260,7 @@ def _get_replication_dir_config_sync_file_infos_per_inode(
             try:
                 if os.path.islink(dir_path) and not dir_name == GENERAL_DIR_EXCLUDE:
                     inode_sync_states[os.stat(dir_path).st_ino] = _get_config_sync_file_info(
-                        dir_path
+                        dir_path, file_hashes
                     )
             except FileNotFoundError:
                 pass  # Ignore directories vanishing during processing
@@ -2248,7 +2268,9 @@ def _get_replication_dir_config_sync_file_infos_per_inode(
         for file_name in file_names:
             file_path = os.path.join(root, file_name)
             try:
-                inode_sync_states[os.stat(file_path).st_ino] = _get_config_sync_file_info(file_path)
+                inode_sync_states[os.stat(file_path).st_ino] = _get_config_sync_file_info(
+                    file_path, file_hashes
+                )
             except FileNotFoundError:
                 pass  # Ignore files vanishing during processing
 
@@ -2264,9 +2286,10 @@ def _prepare_for_activation_tasks(
 ) -> tuple[Mapping[SiteId, ConfigSyncFileInfos], Mapping[SiteId, SiteActivationState]]:
     # All activations need to fail if the initialization failed
     initialization_failure: Exception | None = None
+    file_hashes = ConfigSyncFileHashes.load()
     try:
         config_sync_file_infos_per_inode = _get_config_sync_file_infos_per_inode(
-            list(replication_path_registry.values())
+            list(replication_path_registry.values()), file_hashes
         )
     except Exception as e:
         initialization_failure = e
@@ -2301,13 +2324,19 @@ def _prepare_for_activation_tasks(
 
             if activate_changes.is_sync_needed(site_id, snapshot_settings.site_config):
                 central_file_infos_per_site[site_id] = _get_site_central_file_infos(
-                    site_id, snapshot_settings, config_sync_file_infos_per_inode
+                    site_id, snapshot_settings, config_sync_file_infos_per_inode, file_hashes
                 )
         except Exception as e:
             _handle_activation_changes_exception(
                 logger.getChild(f"site[{site_id}]"), e, site_activation_state
             )
             _finalize_activation(site_id, activation_id, source)
+
+    logger.debug(
+        "Config sync file hashes: %d reused, %d computed", file_hashes.hits, file_hashes.rehashes
+    )
+    if initialization_failure is None:
+        file_hashes.save()
     return central_file_infos_per_site, site_activation_states_per_site
 
 
@@ -2315,6 +2344,7 @@ def _get_site_central_file_infos(
     site_id: SiteId,
     snapshot_settings: SnapshotSettings,
     config_sync_file_infos_per_inode: Mapping[int, ConfigSyncFileInfo],
+    file_hashes: ConfigSyncFileHashes,
 ) -> ConfigSyncFileInfos:
     # In case we experience performance issues here, we could postpone the hashing of the
     # central files to only be done ad-hoc in get_file_names_to_sync when the other attributes
@@ -2325,6 +2355,7 @@ def _get_site_central_file_infos(
         snapshot_settings.snapshot_components,
         site_config_dir,
         config_sync_file_infos_per_inode,
+        file_hashes,
     )
 
     logger.getChild(f"site[{site_id}]").debug(
@@ -3154,7 +3185,12 @@ def get_file_names_to_sync(
         to_sync_new = list(filterfalse(file_filter_func, to_sync_new))
         to_sync_changed = list(filterfalse(file_filter_func, to_sync_changed))
         to_delete = list(filterfalse(file_filter_func, to_delete))
-    return SyncDelta(to_sync_new=to_sync_new, to_sync_changed=to_sync_changed, to_delete=to_delete)
+    return SyncDelta(
+        to_sync_new=to_sync_new,
+        to_sync_changed=to_sync_changed,
+        to_delete=to_delete,
+        archive_compression=("gzip" if "gzip" in sync_state.remote_archive_compressions else None),
+    )
 
 
 def _filter_remote_files(remote_files: set[str]) -> set[str]:
@@ -3189,16 +3225,31 @@ def _filter_remote_files(remote_files: set[str]) -> set[str]:
     return remote_files_to_keep
 
 
+def _create_sync_archive(
+    to_sync: Sequence[str], base_dir: Path, archive: Path, options: Sequence[str] = ()
+) -> None:
+    _run_tar_create(to_sync, base_dir, str(archive), options)
+
+
 def _get_sync_archive(to_sync: list[str], base_dir: Path) -> bytes:
+    """The uncompressed archive, for remote sites of older versions"""
+    return _run_tar_create(to_sync, base_dir, "-")
+
+
+def _run_tar_create(
+    to_sync: Sequence[str], base_dir: Path, archive: str, options: Sequence[str] = ()
+) -> bytes:
+    """Create the archive, returns the output of tar (the archive, if it is "-")"""
     # Use native tar instead of python tarfile for performance reasons
     completed_process = subprocess.run(
         [
             "tar",
             "-c",
+            *options,
             "-C",
             str(base_dir),
             "-f",
-            "-",
+            archive,
             "--null",
             "-T",
             "-",
@@ -3211,9 +3262,6 @@ def _get_sync_archive(to_sync: list[str], base_dir: Path) -> bytes:
         check=False,
     )
 
-    # Since we don't stream the archive to the remote site (we could probably do this) it should be
-    # no problem to buffer it in memory for the moment
-
     if completed_process.returncode:
         raise MKGeneralException(
             _("Failed to create sync archive [%d]: %s")
@@ -3223,11 +3271,62 @@ def _get_sync_archive(to_sync: list[str], base_dir: Path) -> bytes:
     return completed_process.stdout
 
 
+_shared_sync_archive_locks: dict[Path, threading.Lock] = {}
+_shared_sync_archive_locks_lock = threading.Lock()
+
+
+def _shared_sync_archive_path(to_sync: Sequence[str], base_dir: Path) -> Path:
+    """The path of the compressed archive with the given files of a site snapshot
+
+    The snapshots of all sites of an activation hard link the same files, so the
+    snapshots of sites receiving the same files lead to the same path. The
+    archives are removed together with the snapshots of the activation.
+    """
+    key = hashlib.sha256()
+    for site_path in sorted(to_sync):
+        try:
+            stat = os.lstat(base_dir / site_path)
+        except FileNotFoundError:
+            key.update(f"{site_path}\n".encode())  # archiving it will fail anyway
+            continue
+        key.update(
+            f"{site_path}\0{stat.st_dev}\0{stat.st_ino}\0{stat.st_mode}\0{stat.st_size}"
+            f"\0{stat.st_mtime_ns}\n".encode()
+        )
+    return base_dir.parent / ".sync_archives" / f"{key.hexdigest()}.tar.gz"
+
+
+def _get_shared_sync_archive(to_sync: Sequence[str], base_dir: Path) -> Path:
+    """The gzip compressed archive of the files, created once for all sites receiving them
+
+    tar writes the compressed archive right to the file, it is never held in memory
+    uncompressed.
+    """
+    path = _shared_sync_archive_path(to_sync, base_dir)
+    with _shared_sync_archive_locks_lock:
+        lock = _shared_sync_archive_locks.setdefault(path, threading.Lock())
+    with lock:
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.new")
+            try:
+                _create_sync_archive(to_sync, base_dir, tmp_path, ["--gzip"])
+            except MKGeneralException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            tmp_path.rename(path)
+    # The lock is only needed until the archive exists.
+    with _shared_sync_archive_locks_lock:
+        _shared_sync_archive_locks.pop(path, None)
+    return path
+
+
 def _unpack_sync_archive(sync_archive: bytes, base_dir: Path) -> None:
     completed_process = subprocess.run(
         [
             "tar",
             "-x",
+            *(["--gzip"] if sync_archive.startswith(_GZIP_MAGIC) else []),
             "-C",
             str(base_dir),
             "-f",
@@ -3250,6 +3349,13 @@ def _unpack_sync_archive(sync_archive: bytes, base_dir: Path) -> None:
         )
 
 
+type SyncArchiveCompression = Literal["gzip"]
+
+# The compressions of sync archives accepted by AutomationReceiveConfigSync
+_SYNC_ARCHIVE_COMPRESSIONS: Sequence[SyncArchiveCompression] = ["gzip"]
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
 class ConfigSyncFileInfo(NamedTuple):
     st_mode: int
     st_size: int
@@ -3263,7 +3369,9 @@ class ConfigSyncFileInfo(NamedTuple):
 #    ("file_infos", dict[str, ConfigSyncFileInfo]),
 #    ("config_generation", int),
 # ])
-GetConfigSyncStateResponse = tuple[dict[str, tuple[int, int, str | None, str | None]], int]
+GetConfigSyncStateResponse = tuple[
+    dict[str, tuple[int, int, str | None, str | None]], int, Sequence[SyncArchiveCompression]
+]
 
 ConfigSyncFileInfos = dict[str, ConfigSyncFileInfo]
 
@@ -3273,6 +3381,7 @@ class SyncDelta:
     to_sync_new: list[str]
     to_sync_changed: list[str]
     to_delete: list[str]
+    archive_compression: SyncArchiveCompression | None = None
 
 
 class AutomationGetConfigSyncState(AutomationCommand[list[ReplicationPath]]):
@@ -3281,7 +3390,8 @@ class AutomationGetConfigSyncState(AutomationCommand[list[ReplicationPath]]):
     The central site hands over the list of replication paths it will try to synchronize later.  The
     remote site computes the list of replication files and sends it back together with the current
     configuration generation ID. The config generation ID is increased on every Setup modification
-    and ensures that nothing is changed between the two config sync steps.
+    and ensures that nothing is changed between the two config sync steps. The compressions of the
+    sync archive accepted by the remote site are sent as well.
     """
 
     def command_name(self) -> str:
@@ -3295,11 +3405,19 @@ class AutomationGetConfigSyncState(AutomationCommand[list[ReplicationPath]]):
 
     def execute(self, api_request: list[ReplicationPath]) -> GetConfigSyncStateResponse:
         with store.lock_checkmk_configuration(configuration_lockfile):
-            file_infos = _get_config_sync_file_infos(api_request, base_dir=cmk.utils.paths.omd_root)
+            file_hashes = ConfigSyncFileHashes.load()
+            file_infos = _get_config_sync_file_infos(
+                api_request, base_dir=cmk.utils.paths.omd_root, file_hashes=file_hashes
+            )
+            file_hashes.save()
             transport_file_infos = {
                 k: (v.st_mode, v.st_size, v.link_target, v.file_hash) for k, v in file_infos.items()
             }
-            return (transport_file_infos, _get_current_config_generation())
+            return (
+                transport_file_infos,
+                _get_current_config_generation(),
+                _SYNC_ARCHIVE_COMPRESSIONS,
+            )
 
 
 def _get_config_sync_paths(
@@ -3335,6 +3453,7 @@ def _get_config_sync_file_infos(
     replication_paths: list[ReplicationPath],
     base_dir: Path,
     config_sync_file_infos_per_inode: Mapping[int, ConfigSyncFileInfo] | None = None,
+    file_hashes: ConfigSyncFileHashes | None = None,
 ) -> ConfigSyncFileInfos:
     """Scans the given replication paths for the information needed for the config sync
 
@@ -3356,7 +3475,7 @@ def _get_config_sync_file_infos(
         match replication_path.ty:
             case ReplicationPathType.FILE:
                 infos[replication_path.site_path] = _get_config_sync_file_info(
-                    replication_path_full
+                    replication_path_full, file_hashes
                 )
 
             case ReplicationPathType.DIR:
@@ -3366,6 +3485,7 @@ def _get_config_sync_file_infos(
                     base_dir,
                     replication_path_full,
                     replication_path.is_excluded,
+                    file_hashes,
                 )
             case _:
                 assert_never(replication_path.ty)
@@ -3378,6 +3498,7 @@ def _get_replication_dir_config_sync_file_infos(
     base_dir: Path,
     replication_path: str,
     replication_path_excluder: Callable[[str], bool],
+    file_hashes: ConfigSyncFileHashes | None,
 ) -> None:
     # Use os functionality instead of pathlib since it is faster
     for root, dir_names, file_names in os.walk(replication_path):
@@ -3397,22 +3518,89 @@ def _get_replication_dir_config_sync_file_infos(
                 ):
                     infos[valid_site_path] = sync_file_info
                 else:
-                    infos[valid_site_path] = _get_config_sync_file_info(config_sync_path)
+                    infos[valid_site_path] = _get_config_sync_file_info(
+                        config_sync_path, file_hashes
+                    )
             except FileNotFoundError:  # e.g. broken symlinks
-                infos[valid_site_path] = _get_config_sync_file_info(config_sync_path)
+                infos[valid_site_path] = _get_config_sync_file_info(config_sync_path, file_hashes)
 
 
-def _get_config_sync_file_info(file_path: str) -> ConfigSyncFileInfo:
+def _get_config_sync_file_info(
+    file_path: str, file_hashes: ConfigSyncFileHashes | None = None
+) -> ConfigSyncFileInfo:
     stat = os.lstat(file_path)
     is_symlink = os.path.islink(file_path)
+    if is_symlink:
+        file_hash = None
+    elif file_hashes is None:
+        file_hash = _create_config_sync_file_hash(file_path)
+    else:
+        file_hash = file_hashes.file_hash(file_path, stat)
     return ConfigSyncFileInfo(
         stat.st_mode,
         stat.st_size,
         os.readlink(str(file_path)) if is_symlink else None,
-        _create_config_sync_file_hash(file_path) if not is_symlink else None,
+        file_hash,
     )
 
 
+type _FileHashKey = tuple[int, int, int, int]
+
+
+class ConfigSyncFileHashes:
+    """The hashes of the files to synchronize, persisted between the activations
+
+    Hashing all replicated files on each activation takes long on large sites,
+    although most of them did not change. A hash is reused as long as the
+    device, inode, size and modification time of the file do not change. The
+    change time cannot be part of this: The hard links of the site snapshots,
+    which are created and removed on each activation, change it.
+
+    Files modified less than _RACY_PERIOD_NS before the scan started are hashed
+    again in the next scan. A later modification within the granularity of the
+    timestamps of the file system would not change their key.
+    """
+
+    _RACY_PERIOD_NS = 2_000_000_000
+
+    def __init__(self, path: Path, hashes: Mapping[_FileHashKey, str]) -> None:
+        self.path: Final = path
+        self._hashes: Final = hashes
+        self._used: Final[dict[_FileHashKey, str]] = {}
+        self._started_ns: Final = time.time_ns()
+        self.hits = 0
+        self.rehashes = 0
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> ConfigSyncFileHashes:
+        path = var_dir / "config_sync_file_hashes.pkl" if path is None else path
+        try:
+            hashes = store.load_object_from_pickle_file(path, default={})
+        except (MKGeneralException, pickle.UnpicklingError, EOFError):
+            hashes = {}  # will be rebuilt
+        return cls(path, hashes)
+
+    def file_hash(self, file_path: str, stat: os.stat_result) -> str:
+        key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if (file_hash := self._used.get(key, self._hashes.get(key))) is not None:
+            self.hits += 1
+            self._used[key] = file_hash
+            return file_hash
+
+        self.rehashes += 1
+        file_hash = _create_config_sync_file_hash(file_path)
+        if stat.st_mtime_ns < self._started_ns - self._RACY_PERIOD_NS:
+            self._used[key] = file_hash
+        return file_hash
+
+    def save(self) -> None:
+        """Persist the hashes of the files seen in this scan, the others are dropped"""
+        if self._used == self._hashes:
+            return
+        self.path.parent.mkdir(mode=0o770, exist_ok=True)
+        store.save_object_to_pickle_file(self.path, self._used)
+
+
 def _create_config_sync_file_hash(file_path: str) -> str:
     sha256 = hashlib.sha256()
     with open(file_path, "rb") as f:
@@ -15,13 +15,15 @@ import functools
 import json
 import os
 import re
+import secrets
 import subprocess
 import time
+from collections import deque
 from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from contextlib import contextmanager
 from dataclasses import asdict, replace
 from io import BytesIO
-from typing import Annotated, Final, NamedTuple
+from typing import Annotated, Final, IO, NamedTuple
 
 import requests
 import urllib3
@@ -304,7 +306,7 @@ def _do_remote_automation_serialized(
     automation_config: RemoteAutomationConfig,
     command: str,
     vars_: Sequence[tuple[str, str]],
-    files: Mapping[str, BytesIO] | None,
+    files: Mapping[str, IO[bytes]] | None,
     timeout: float | None,
     debug: bool,
 ) -> str:
@@ -373,7 +375,7 @@ def do_remote_automation(
     command: str,
     vars_: Sequence[tuple[str, str]],
     debug: bool,
-    files: Mapping[str, BytesIO] | None = None,
+    files: Mapping[str, IO[bytes]] | None = None,
     timeout: float | None = None,
 ) -> object:
     serialized_response = _do_remote_automation_serialized(
@@ -397,12 +399,71 @@ def do_remote_automation(
         )
 
 
+class _MultipartBody:
+    """A multipart/form-data body which reads the files while it is being sent
+
+    requests would read the files into memory to build the body. This body is sent
+    in blocks, its length is known beforehand.
+    """
+
+    def __init__(self, data: Mapping[str, str], files: Mapping[str, IO[bytes]]) -> None:
+        boundary = secrets.token_hex(16)
+        self.content_type: Final = f"multipart/form-data; boundary={boundary}"
+        parts: list[IO[bytes]] = []
+        for name, value in data.items():
+            parts.append(BytesIO(self._part_header(boundary, name) + value.encode() + b"\r\n"))
+        for name, file in files.items():
+            parts.append(BytesIO(self._part_header(boundary, name, filename=name)))
+            parts.append(file)
+            parts.append(BytesIO(b"\r\n"))
+        parts.append(BytesIO(f"--{boundary}--\r\n".encode()))
+        self._length: Final = sum(self._remaining_size(part) for part in parts)
+        self._parts: Final = deque(parts)
+        self._position = 0
+
+    @staticmethod
+    def _part_header(boundary: str, name: str, filename: str | None = None) -> bytes:
+        field = urllib3.fields.RequestField(name, b"", filename=filename)
+        field.make_multipart(content_type=None if filename is None else "application/octet-stream")
+        return f"--{boundary}\r\n{field.render_headers()}".encode()
+
+    @staticmethod
+    def _remaining_size(file: IO[bytes]) -> int:
+        position = file.tell()
+        size = file.seek(0, os.SEEK_END) - position
+        file.seek(position)
+        return size
+
+    def __len__(self) -> int:
+        return self._length
+
+    def tell(self) -> int:
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        while self._parts and size:
+            if not (chunk := self._parts[0].read(size)):
+                self._parts.popleft()
+                continue
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        self._position += sum(len(chunk) for chunk in chunks)
+        return b"".join(chunks)
+
+    def __iter__(self) -> Iterator[bytes]:
+        # requests only streams iterable bodies
+        while chunk := self.read(64 * 1024):
+            yield chunk
+
+
 def get_url_raw(
     url: str,
     insecure: bool,
     auth: tuple[str, str] | None = None,
     data: Mapping[str, str] | None = None,
-    files: Mapping[str, BytesIO] | None = None,
+    files: Mapping[str, IO[bytes]] | None = None,
     timeout: float | None = None,
     add_headers: dict[str, str] | None = None,
 ) -> requests.Response:
@@ -413,13 +474,17 @@ def get_url_raw(
     }
     headers_.update(add_headers or {})
 
+    body: Mapping[str, str] | _MultipartBody | None = data
+    if files:
+        body = _MultipartBody(data or {}, files)
+        headers_["Content-Type"] = body.content_type
+
     try:
         response = requests.post(
             url,
-            data=data,
+            data=body,
             verify=not insecure,
             auth=auth,
-            files=files,
             timeout=timeout,
             headers=headers_,
         )
@@ -546,7 +611,7 @@ def get_url(
     insecure: bool,
     auth: tuple[str, str] | None = None,
     data: Mapping[str, str] | None = None,
-    files: Mapping[str, BytesIO] | None = None,
+    files: Mapping[str, IO[bytes]] | None = None,
     timeout: float | None = None,
 ) -> str:
     return get_url_raw(url, insecure, auth, data, files, timeout).text
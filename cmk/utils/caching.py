@@ -11,9 +11,9 @@ from __future__ import annotations
 import collections
 import itertools
 import sys
-from collections.abc import Callable, Iterator
+from collections.abc import Callable, Hashable, Iterator
 from functools import lru_cache, wraps
-from typing import Any, ParamSpec, TypeVar
+from typing import Any, NamedTuple, ParamSpec, TypeVar
 
 P = ParamSpec("P")
 R = TypeVar("R")
@@ -117,6 +117,71 @@ class DictCache(dict):
         self.set_not_populated()
 
 
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / lookups if (lookups := self.hits + self.misses) else 0.0
+
+
+class LRUCache[K: Hashable, V]:
+    """A cache which evicts the least recently used entries when it is full
+
+    Other than functools.lru_cache it can be used for values which are computed
+    inline, and it keeps statistics about its hits and misses.
+
+    >>> cache = LRUCache[str, int](maxsize=2)
+    >>> cache["a"] = 1
+    >>> cache["b"] = 2
+    >>> cache["a"]
+    1
+    >>> cache["c"] = 3
+    >>> "b" in cache
+    False
+    >>> cache.cache_info()
+    CacheInfo(hits=1, misses=0, maxsize=2, currsize=2)
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._entries: collections.OrderedDict[K, V] = collections.OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __getitem__(self, key: K) -> V:
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self._misses += 1
+            raise
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._hits = self._misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+
+
 # This cache manager holds all caches that rely on the configuration
 # and have to be flushed once the configuration is reloaded in the
 # keepalive mode
@@ -17,6 +17,20 @@ class Eventconsolerules(Table):
     )
     """The times rule matched an incoming message"""
 
+    rule_prefilter_hits = Column(
+        'rule_prefilter_hits',
+        col_type='int',
+        description='The times an incoming message contained the texts or host the rule requires, so that the rule had to be tried',
+    )
+    """The times an incoming message contained the texts or host the rule requires, so that the rule had to be tried"""
+
+    rule_prefilter_misses = Column(
+        'rule_prefilter_misses',
+        col_type='int',
+        description='The times the rule was skipped because an incoming message lacked the texts or host the rule requires',
+    )
+    """The times the rule was skipped because an incoming message lacked the texts or host the rule requires"""
+
     rule_id = Column(
         'rule_id',
         col_type='string',
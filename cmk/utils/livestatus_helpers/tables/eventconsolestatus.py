@@ -31,6 +31,20 @@ class Eventconsolestatus(Table):
     )
     """The average event rate"""
 
+    status_average_ingest_overflow_rate = Column(
+        'status_average_ingest_overflow_rate',
+        col_type='float',
+        description='The average rate of UDP messages dropped because the ingest buffer was full',
+    )
+    """The average rate of UDP messages dropped because the ingest buffer was full"""
+
+    status_average_ingest_stall_rate = Column(
+        'status_average_ingest_stall_rate',
+        col_type='float',
+        description='The average rate of the ingest buffer becoming full',
+    )
+    """The average rate of the ingest buffer becoming full"""
+
     status_average_message_rate = Column(
         'status_average_message_rate',
         col_type='float',
@@ -171,6 +185,34 @@ class Eventconsolestatus(Table):
     )
     """The number of events received since startup of the Event Console"""
 
+    status_ingest_overflow_rate = Column(
+        'status_ingest_overflow_rate',
+        col_type='float',
+        description='The rate of UDP messages dropped because the ingest buffer was full',
+    )
+    """The rate of UDP messages dropped because the ingest buffer was full"""
+
+    status_ingest_overflows = Column(
+        'status_ingest_overflows',
+        col_type='int',
+        description='The number of UDP messages dropped because the ingest buffer was full',
+    )
+    """The number of UDP messages dropped because the ingest buffer was full"""
+
+    status_ingest_stall_rate = Column(
+        'status_ingest_stall_rate',
+        col_type='float',
+        description='The rate of the ingest buffer becoming full',
+    )
+    """The rate of the ingest buffer becoming full"""
+
+    status_ingest_stalls = Column(
+        'status_ingest_stalls',
+        col_type='int',
+        description='The number of times the ingest buffer became full, so that reading from TCP connections, the event socket and the event pipe paused',
+    )
+    """The number of times the ingest buffer became full, so that reading from TCP connections, the event socket and the event pipe paused"""
+
     status_message_rate = Column(
         'status_message_rate',
         col_type='float',
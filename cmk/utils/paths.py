@@ -46,6 +46,7 @@ var_dir = omd_root / relative_var_dir
 log_dir = _omd_path("var/log")
 precompiled_checks_dir = _omd_path("var/check_mk/precompiled_checks")
 autochecks_dir = _omd_path("var/check_mk/autochecks")
+autochecks_cache_file = _omd_path("tmp/check_mk/autochecks.pkl")
 precompiled_hostchecks_dir = _omd_path("var/check_mk/precompiled")
 
 relative_snmpwalks_dir = Path("var/check_mk/snmpwalks")
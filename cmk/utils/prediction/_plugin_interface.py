@@ -6,6 +6,7 @@
 
 # mypy: disable-error-code="unreachable"
 
+import functools
 import logging
 from collections.abc import Callable, Mapping
 from typing import assert_never, Literal
@@ -32,6 +33,8 @@ def make_updated_predictions(
     now: float,
 ) -> Mapping[int, tuple[float | None, tuple[float, float] | None]]:
     store.remove_outdated_predictions(now)
+    # The predictions of a metric, e.g. for both directions, look at the same time slices.
+    get_recorded_data = functools.cache(get_recorded_data)
     return {
         hash(meta): _make_reference_and_prediction(
             meta, valid_prediction or _update_prediction(store, meta, get_recorded_data, now), now
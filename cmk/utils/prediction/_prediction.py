@@ -4,11 +4,12 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 import logging
-import math
 from collections.abc import Callable, Iterable, Iterator, Sequence
 from pathlib import Path
-from typing import Literal, NamedTuple, Protocol, Self
+from typing import Literal, NamedTuple, Protocol
 
+import numpy as np
+import numpy.typing as npt
 from pydantic import BaseModel
 
 from cmk.agent_based.prediction_backend import PredictionInfo
@@ -42,17 +43,6 @@ class DataStat(NamedTuple):
     max_: float
     stdev: float | None
 
-    @classmethod
-    def from_values(cls, values: Sequence[float]) -> Self:
-        """Statistically summarize all the measured values"""
-        average = sum(values) / float(len(values))
-        return cls(
-            average=average,
-            min_=min(values),
-            max_=max(values),
-            stdev=_std_dev(values, average),
-        )
-
 
 class PredictionData(BaseModel, frozen=True):
     points: list[DataStat | None]
@@ -191,7 +181,7 @@ def _calculate_data_for_prediction(
 ) -> PredictionData:
     # Upsample all time slices to same resolution
     # We assume that the youngest slice has the finest resolution.
-    slices = [
+    resampled = [
         _forward_fill_resample(
             current_range,
             values,
@@ -199,6 +189,9 @@ def _calculate_data_for_prediction(
         )
         for current_range, values, shift in raw_slices
     ]
+    # The values of the youngest slice may not cover its whole range.
+    num_points = min(len(array) for array in resampled)
+    slices = np.stack([array[:num_points] for array in resampled])
 
     return PredictionData(
         points=_data_stats(slices),
@@ -209,32 +202,42 @@ def _calculate_data_for_prediction(
 
 def _forward_fill_resample(
     current_range: range, values: Sequence[float | None], new_range: range
-) -> Sequence[float | None]:
+) -> npt.NDArray[np.float64]:
+    """Upsample by forward filling values, missing values are NaN"""
+    array = np.asarray(values, dtype=np.float64)
     if current_range == new_range:
-        return values
+        return array
 
-    idx_max = len(values) - 1
-    return [
-        values[max(0, min(int((t - current_range.start) / current_range.step), idx_max))]
-        for t in new_range
-    ]
+    # Like int(), astype truncates towards zero
+    indices = ((np.asarray(new_range) - current_range.start) / current_range.step).astype(np.intp)
+    return array[np.clip(indices, 0, len(array) - 1)]
 
 
-def _data_stats(slices: Iterable[Iterable[float | None]]) -> list[DataStat | None]:
-    "Statistically summarize all the upsampled RRD data"
-    return [  # can't inline this b/c it is unit tested :-/
-        (
-            DataStat.from_values(point_line)
-            if (point_line := [x for x in time_column if x is not None])
-            else None
-        )
-        for time_column in zip(*slices)
-    ]
+def _data_stats(slices: npt.NDArray[np.float64]) -> list[DataStat | None]:
+    """Statistically summarize all the upsampled RRD data
+
+    The stats are computed for each point in time, i.e. for each column of the slices.
+    Missing values are NaN and are ignored."""
+    if not slices.size:
+        return []
 
+    is_value = ~np.isnan(slices)
+    samples = np.count_nonzero(is_value, axis=0)
+    values = np.where(is_value, slices, 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        averages = values.sum(axis=0) / samples
+        # In the case of a single data-point an unbiased standard deviation is undefined.
+        stdevs = np.sqrt(np.abs((values**2).sum(axis=0) - averages**2 * samples) / (samples - 1))
 
-def _std_dev(point_line: Sequence[float], average: float) -> float | None:
-    samples = len(point_line)
-    # In the case of a single data-point an unbiased standard deviation is undefined.
-    if samples == 1:
-        return None
-    return math.sqrt(abs(sum(p**2 for p in point_line) - average**2 * samples) / float(samples - 1))
+    return [
+        DataStat(average=average, min_=min_, max_=max_, stdev=None if count == 1 else stdev)
+        if count
+        else None
+        for average, min_, max_, stdev, count in zip(
+            averages.tolist(),
+            np.fmin.reduce(slices, axis=0).tolist(),
+            np.fmax.reduce(slices, axis=0).tolist(),
+            stdevs.tolist(),
+            samples.tolist(),
+        )
+    ]
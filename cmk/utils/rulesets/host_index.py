@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Sets of configured hosts as bitsets
+
+Every configured host gets a dense number, a set of hosts is an int with the bits
+of its members set. Combining the host sets of the tags and folders of a rule
+condition is then a matter of a few AND, OR and NOT operations on ints, and a
+host set needs one bit per configured host instead of a hash table entry per
+member.
+"""
+
+import re
+from collections.abc import Iterable, Iterator, Mapping, Set
+from typing import Final
+
+from cmk.ccc.hostaddress import HostName
+from cmk.utils.tags import TagGroupID, TagID
+
+__all__ = ["HostIndex", "HostSet"]
+
+_NON_ZERO_BYTE: Final = re.compile(b"[^\\x00]")
+
+# The bit numbers set in each byte value
+_BITS_OF_BYTE: Final = tuple(
+    tuple(bit for bit in range(8) if byte & (1 << bit)) for byte in range(256)
+)
+
+
+class HostIndex:
+    """Numbers for the configured hosts and the host sets of their tags
+
+    The hosts are numbered in the given order, host sets iterate in that order.
+    """
+
+    def __init__(
+        self,
+        hosts: Iterable[HostName],
+        host_tags: Mapping[HostName, Iterable[tuple[TagGroupID, TagID | None]]],
+    ) -> None:
+        self.hosts: Final = list(hosts)
+        self._numbers: Final[dict[str, int]] = {
+            host_name: nr for nr, host_name in enumerate(self.hosts)
+        }
+        self.num_bytes: Final = (len(self.hosts) + 7) // 8
+        self.empty: Final = HostSet(self, 0)
+        self.all: Final = HostSet(self, (1 << len(self.hosts)) - 1)
+
+        # Setting single bits of ints one by one would be quadratic.
+        tag_bytes: dict[tuple[TagGroupID, TagID | None], bytearray] = {}
+        for nr, host_name in enumerate(self.hosts):
+            for tag in host_tags[host_name]:
+                tag_bytes.setdefault(tag, bytearray(self.num_bytes))[nr >> 3] |= 1 << (nr & 7)
+        self._tag_bits: Final = {
+            tag: int.from_bytes(data, "little") for tag, data in tag_bytes.items()
+        }
+
+    def number(self, host_name: str) -> int | None:
+        return self._numbers.get(host_name)
+
+    def host_set(self, host_names: Iterable[HostName]) -> "HostSet":
+        """The configured hosts among the given ones"""
+        data = bytearray(self.num_bytes)
+        for host_name in host_names:
+            if (nr := self._numbers.get(host_name)) is not None:
+                data[nr >> 3] |= 1 << (nr & 7)
+        return HostSet(self, int.from_bytes(data, "little"))
+
+    def with_tag(self, taggroup_id: TagGroupID, tag_id: TagID | None) -> "HostSet":
+        return HostSet(self, self._tag_bits.get((taggroup_id, tag_id), 0))
+
+
+class HostSet(Set[HostName]):
+    """An immutable set of configured hosts
+
+    >>> index = HostIndex(
+    ...     [HostName("a"), HostName("b"), HostName("c")],
+    ...     {"a": [("os", "linux")], "b": [("os", "windows")], "c": [("os", "linux")]},
+    ... )
+    >>> linux = index.with_tag(TagGroupID("os"), TagID("linux"))
+    >>> sorted(linux)
+    ['a', 'c']
+    >>> sorted(linux.intersection(index.host_set([HostName("b"), HostName("c"), HostName("x")])))
+    ['c']
+    >>> HostName("b") in index.all.difference(linux)
+    True
+    """
+
+    __slots__ = ("_bits", "_data", "_index")
+
+    def __init__(self, index: HostIndex, bits: int) -> None:
+        self._index = index
+        self._bits = bits
+        self._data: bytes | None = None
+
+    @property
+    def bits(self) -> int:
+        return self._bits
+
+    def has(self, nr: int) -> bool:
+        """Membership test by host number, see HostIndex.number"""
+        if self._data is None:
+            self._data = self._bits.to_bytes(self._index.num_bytes, "little")
+        return bool(self._data[nr >> 3] >> (nr & 7) & 1)
+
+    def __contains__(self, host_name: object) -> bool:
+        return (
+            isinstance(host_name, str)
+            and (nr := self._index.number(host_name)) is not None
+            and self.has(nr)
+        )
+
+    def __iter__(self) -> Iterator[HostName]:
+        hosts = self._index.hosts
+        data = self._bits.to_bytes(self._index.num_bytes, "little")
+        # Host sets of rules are mostly sparse, so skip the empty bytes in C.
+        for match in _NON_ZERO_BYTE.finditer(data):
+            byte_nr = match.start()
+            for bit in _BITS_OF_BYTE[data[byte_nr]]:
+                yield hosts[(byte_nr << 3) + bit]
+
+    def __len__(self) -> int:
+        return self._bits.bit_count()
+
+    def __bool__(self) -> bool:
+        return bool(self._bits)
+
+    def intersection(self, other: "HostSet") -> "HostSet":
+        return HostSet(self._index, self._bits & other.bits)
+
+    def union(self, other: "HostSet") -> "HostSet":
+        return HostSet(self._index, self._bits | other.bits)
+
+    def difference(self, other: "HostSet") -> "HostSet":
+        return HostSet(self._index, self._bits & ~other.bits)
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable[HostName]) -> frozenset[HostName]:
+        # Results of the operators inherited from Set
+        return frozenset(it)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, HostSet):
+            return self._bits == other.bits
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash(self._bits)
+
+    def __repr__(self) -> str:
+        return f"HostSet({sorted(self)!r})"
@@ -9,6 +9,7 @@
 # mypy: disable-error-code="redundant-expr"
 
 import contextlib
+import itertools
 from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
 from re import Pattern
@@ -26,6 +27,7 @@ from typing import (
 import cmk.trace
 from cmk.ccc.hostaddress import HostAddress, HostName
 from cmk.ccc.regex import combine_patterns, regex
+from cmk.utils.caching import CacheInfo, LRUCache
 from cmk.utils.global_ident_type import GlobalIdent
 from cmk.utils.labels import (
     AndOrNotLiteral,
@@ -37,6 +39,7 @@ from cmk.utils.servicename import Item, ServiceName
 from cmk.utils.tags import TagGroupID, TagID
 
 from .conditions import HostOrServiceConditions, HostOrServiceConditionsSimple
+from .host_index import HostIndex, HostSet
 
 tracer = cmk.trace.get_tracer()
 
@@ -94,14 +97,55 @@ LabelGroupsCacheId = tuple[tuple[AndOrNotLiteral, tuple[tuple[AndOrNotLiteral, s
 
 PreprocessedPattern: TypeAlias = tuple[bool, Pattern[str]]
 
+# Keep the cache of service condition matches from growing with the number of services
+_SERVICE_MATCH_CACHE_SIZE = 100_000
+
 type _PreprocessedServiceRule[TRuleValue] = tuple[
     TRuleValue,
-    set[HostName],
+    HostSet,
     LabelGroups,
     LabelGroupsCacheId,
     PreprocessedPattern,
 ]
 
+
+class _CompiledServiceRuleset[TRuleValue]:
+    """The preprocessed rules of a service ruleset, bucketed by service prefix
+
+    Most service rules only apply to services starting with some literal text,
+    e.g. "Interface " or "Filesystem /var". Looking up the prefixes of a service
+    in the buckets avoids evaluating the patterns of all other rules. Rules
+    without such a prefix are candidates for every service.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[tuple[_PreprocessedServiceRule[TRuleValue], frozenset[str] | None]],
+    ) -> None:
+        self.rules = [rule for rule, _prefixes in rules]
+        self._unrestricted: list[int] = []
+        self._by_prefix: dict[str, list[int]] = {}
+        for index, (_rule, prefixes) in enumerate(rules):
+            if prefixes is None:
+                self._unrestricted.append(index)
+                continue
+            for prefix in prefixes:
+                self._by_prefix.setdefault(prefix, []).append(index)
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._by_prefix})
+
+    def candidates(self, match_text: str) -> Sequence[int]:
+        """The indices of the rules which may match, in the order of the ruleset"""
+        buckets = [
+            bucket
+            for length in self._prefix_lengths
+            if length <= len(match_text)
+            and (bucket := self._by_prefix.get(match_text[:length])) is not None
+        ]
+        if not buckets:
+            return self._unrestricted
+        return sorted(set(itertools.chain(self._unrestricted, *buckets)))
+
+
 # FIXME: A lot of signatures regarding rules and rule sets are simply lying:
 # They claim to expect a RuleConditionsSpec or Ruleset, but
 # they are silently handling a very chaotic tuple-based structure, too. We
@@ -178,18 +222,18 @@ class RulesetMatcher:
             nodes_of,
         )
 
-        self._service_match_cache: dict[
-            tuple[
-                tuple[ServiceName | None, int], PreprocessedPattern, tuple[tuple[str, object], ...]
-            ],
-            object,
-        ] = {}
+        self._service_match_cache = LRUCache[
+            tuple[tuple[ServiceName, int], PreprocessedPattern, LabelGroupsCacheId], bool
+        ](maxsize=_SERVICE_MATCH_CACHE_SIZE)
 
     def clear_caches(self) -> None:
         # clear caches that don't work properly (the ruleset optimizer ignores host labels).
         # self._service_match_cache works also in the case of changed labels, so we DON'T need to clear it.
         self.ruleset_optimizer.clear_caches()
 
+    def service_match_cache_info(self) -> CacheInfo:
+        return self._service_match_cache.cache_info()
+
     def get_host_bool_value(
         self,
         hostname: HostName,
@@ -327,35 +371,42 @@ class RulesetMatcher:
         labels_of_host: Callable[[HostName], Labels],
     ) -> Iterator[TRuleValue]:
         """Returns a generator of the values of the matched rules"""
-        optimized_ruleset = self.ruleset_optimizer.get_service_ruleset(
+        if match_text is None:
+            return
+
+        # The rules only apply to configured hosts.
+        if (host_nr := self.ruleset_optimizer.host_number(host_name)) is None:
+            return
+
+        compiled_ruleset = self.ruleset_optimizer.get_service_ruleset(
             host_name, ruleset, labels_of_host
         )
+        service_id = (
+            match_text,
+            hash(None if service_labels is None else frozenset(service_labels.items())),
+        )
 
-        for (
-            value,
-            hosts,
-            service_label_groups,
-            service_label_groups_cache_id,
-            service_description_condition,
-        ) in optimized_ruleset:
-            if match_text is None:
-                continue
+        for index in compiled_ruleset.candidates(match_text):
+            (
+                value,
+                hosts,
+                service_label_groups,
+                service_label_groups_cache_id,
+                service_description_condition,
+            ) = compiled_ruleset.rules[index]
 
-            if host_name not in hosts:
+            if not hosts.has(host_nr):
                 continue
 
             service_cache_id = (
-                (
-                    match_text,
-                    hash(None if service_labels is None else frozenset(service_labels.items())),
-                ),
+                service_id,
                 service_description_condition,
                 service_label_groups_cache_id,
             )
 
-            if service_cache_id in self._service_match_cache:
+            try:
                 match = self._service_match_cache[service_cache_id]
-            else:
+            except KeyError:
                 match = _matches_service_conditions(
                     service_description_condition,
                     service_label_groups,
@@ -398,35 +449,19 @@ class RulesetOptimizer:
         self._nodes_of = nodes_of
 
         self._all_configured_hosts = all_configured_hosts
+        self._host_index = HostIndex(sorted(all_configured_hosts), self._host_tags)
 
         # Contains all hostnames which are currently relevant for this cache.
         # Every active host or a subset of the active hosts when multiprocessing
         # is enabled.
         self._all_processed_hosts = self._all_configured_hosts
 
-        # A factor which indicates how much hosts share the same host tag configuration (excluding folders).
-        # len(all_processed_hosts) / len(different tag combinations)
-        # It is used to determine the best rule evualation method
-        self._all_processed_hosts_similarity = 1.0
-
-        self.__service_ruleset_cache: dict[
-            tuple[int, bool], Sequence[_PreprocessedServiceRule[Any]]
-        ] = {}
+        self.__service_ruleset_cache: dict[tuple[int, bool], _CompiledServiceRuleset[Any]] = {}
         self.__host_ruleset_cache: dict[tuple[int, bool], Mapping[HostAddress, Sequence[Any]]] = {}
-        self._all_matching_hosts_match_cache: dict[
-            tuple[_ConditionCacheID, bool], set[HostName]
-        ] = {}
+        self._all_matching_hosts_match_cache: dict[tuple[_ConditionCacheID, bool], HostSet] = {}
 
         # Reference dirname -> hosts in this dir including subfolders
-        self._folder_host_lookup: dict[tuple[bool, str], set[HostName]] = {}
-
-        # Provides a list of hosts with the same hosttags, excluding the folder
-        self._hosts_grouped_by_tags: dict[tuple[tuple[TagGroupID, TagID], ...], set[HostName]] = {}
-        # Reference hostname -> tag group reference
-        self._host_grouped_ref: dict[HostName, tuple[tuple[TagGroupID, TagID], ...]] = {}
-
-        # TODO: Clean this one up?
-        self._initialize_host_lookup()
+        self._folder_host_lookup: dict[tuple[bool, str], HostSet] = {}
 
     def clear_ruleset_caches(self) -> None:
         self.__host_ruleset_cache.clear()
@@ -459,17 +494,9 @@ class RulesetOptimizer:
         # lookup are iterated one by one later on in all_matching_hosts
         self._folder_host_lookup = {}
 
-        used_groups = {
-            self._host_grouped_ref.get(hostname, ()) for hostname in self._all_processed_hosts
-        }
-
-        if not used_groups:
-            self._all_processed_hosts_similarity = 1.0
-            return
-
-        self._all_processed_hosts_similarity = (
-            1.0 * len(self._all_processed_hosts) / len(used_groups)
-        )
+    def host_number(self, host_name: HostName) -> int | None:
+        """The number of a configured host in the host sets of the rules"""
+        return self._host_index.number(host_name)
 
     def get_host_ruleset(
         self,
@@ -510,11 +537,11 @@ class RulesetOptimizer:
         host_name: HostName,
         ruleset: Sequence[RuleSpec[TRuleValue]],
         labels_of_host: Callable[[HostName], Labels],
-    ) -> Sequence[_PreprocessedServiceRule[TRuleValue]]:
+    ) -> _CompiledServiceRuleset[TRuleValue]:
         def _impl(
             ruleset: Iterable[RuleSpec[TRuleValue]], with_foreign_hosts: bool
-        ) -> Sequence[_PreprocessedServiceRule[TRuleValue]]:
-            new_rules: list[_PreprocessedServiceRule[TRuleValue]] = []
+        ) -> _CompiledServiceRuleset[TRuleValue]:
+            new_rules: list[tuple[_PreprocessedServiceRule[TRuleValue], frozenset[str] | None]] = []
             for rule in ruleset:
                 if is_disabled(rule):
                     continue
@@ -535,18 +562,20 @@ class RulesetOptimizer:
                 )
 
                 # And now preprocess the configured patterns in the servlist
+                service_description = rule["condition"].get("service_description")
                 new_rules.append(
                     (
-                        rule["value"],
-                        hosts,
-                        service_label_groups,
-                        service_label_groups_cache_id,
-                        RulesetOptimizer._convert_pattern_list(
-                            rule["condition"].get("service_description")
+                        (
+                            rule["value"],
+                            hosts,
+                            service_label_groups,
+                            service_label_groups_cache_id,
+                            RulesetOptimizer._convert_pattern_list(service_description),
                         ),
+                        RulesetOptimizer._literal_prefixes(service_description),
                     )
                 )
-            return new_rules
+            return _CompiledServiceRuleset(new_rules)
 
         with_foreign_hosts = host_name not in self._all_processed_hosts
 
@@ -577,12 +606,30 @@ class RulesetOptimizer:
 
         return negate, regex(combine_patterns(pattern_parts))
 
+    @staticmethod
+    def _literal_prefixes(patterns: HostOrServiceConditions | None) -> frozenset[str] | None:
+        """The texts one of which every service matching the patterns starts with
+
+        None means that services with any name may match.
+        """
+        if not patterns:
+            return None
+
+        negate, parsed_patterns = parse_negated_condition_list(patterns)
+        if negate:
+            return None
+
+        prefixes = frozenset(
+            literal_prefix(p["$regex"] if isinstance(p, dict) else p) for p in parsed_patterns
+        )
+        return None if "" in prefixes else prefixes
+
     def _all_matching_hosts(
         self,
         condition: RuleConditionsSpec,
         with_foreign_hosts: bool,
         labels_of_host: Callable[[HostName], Labels],
-    ) -> set[HostName]:
+    ) -> HostSet:
         """Returns a set containing the names of hosts that match the given
         tags and hostlist conditions."""
         host_conditions = condition.get("host_name")
@@ -620,17 +667,18 @@ class RulesetOptimizer:
 
     def _all_matching_hosts_computation(
         self,
-        hosts_in_rule_scope: set[HostName],
+        hosts_in_rule_scope: HostSet,
         host_conditions: HostOrServiceConditions | None,
         tag_conditions: Mapping[TagGroupID, TagCondition],
         label_conditions: LabelGroups,
         labels_of_host: Callable[[HostName], Labels],
-    ) -> set[HostName]:
-        if tag_conditions and host_conditions is None and not label_conditions:
-            # TODO: Labels could also be optimized like the tags
-            matched_by_tags = self._match_hosts_by_tags(hosts_in_rule_scope, tag_conditions)
-            if matched_by_tags is not None:
-                return matched_by_tags
+    ) -> HostSet:
+        if host_conditions == []:
+            return self._host_index.empty  # Empty host list -> Nothing matches
+
+        hosts_to_check = hosts_in_rule_scope
+        if tag_conditions:
+            hosts_to_check = hosts_to_check.intersection(self._match_hosts_by_tags(tag_conditions))
 
         only_specific_hosts = (
             host_conditions is not None
@@ -638,49 +686,23 @@ class RulesetOptimizer:
             and all(not isinstance(x, dict) for x in host_conditions)
         )
 
-        if host_conditions == []:
-            return set()  # Empty host list -> Nothing matches
-
-        if not tag_conditions and not label_conditions and not host_conditions:
-            # If no tags are specified and the hostlist only include @all (all hosts)
-            return hosts_in_rule_scope
-
-        if (
-            not tag_conditions
-            and not label_conditions
-            and only_specific_hosts
-            and host_conditions is not None
-        ):
-            # If no tags are specified and there are only specific hosts we already have the matches
-            return hosts_in_rule_scope.intersection(host_conditions)
-
         # If the rule has only exact host restrictions, we can thin out the list of hosts to check
         if only_specific_hosts and host_conditions is not None:
-            hosts_to_check = hosts_in_rule_scope.intersection(host_conditions)
-        else:
-            hosts_to_check = hosts_in_rule_scope
-
-        matching: set[HostName] = set()
-        for hostname in hosts_to_check:
-            # When no tag matching is requested, do not filter by tags. Accept all hosts
-            # and filter only by hostlist
-            if tag_conditions and not matches_host_tags(
-                self._host_tags[hostname],
-                tag_conditions,
-            ):
-                continue
-
-            if label_conditions:
-                host_labels = labels_of_host(hostname)
-                if not matches_labels(host_labels, label_conditions):
-                    continue
-
-            if not matches_host_name(host_conditions, hostname):
-                continue
+            hosts_to_check = hosts_to_check.intersection(
+                self._host_index.host_set(cast(Iterable[HostName], host_conditions))
+            )
+            if not label_conditions:
+                return hosts_to_check
 
-            matching.add(hostname)
+        if not label_conditions and not host_conditions:
+            return hosts_to_check
 
-        return matching
+        return self._host_index.host_set(
+            hostname
+            for hostname in hosts_to_check
+            if (not label_conditions or matches_labels(labels_of_host(hostname), label_conditions))
+            and matches_host_name(host_conditions, hostname)
+        )
 
     @staticmethod
     def _condition_cache_id(
@@ -716,95 +738,55 @@ class RulesetOptimizer:
             rule_path,
         )
 
-    # TODO: Generalize this optimization: Build some kind of key out of the tag conditions
-    # (positive, negative, ...). Make it work with the new tag group based "$or" handling.
-    def _match_hosts_by_tags(
-        self,
-        valid_hosts: set[HostName],
-        tag_conditions: Mapping[TagGroupID, TagCondition],
-    ) -> set[HostName] | None:
-        matching = set()
-        negative_match_tags = set()
-        positive_match_tags = set()
+    def _match_hosts_by_tags(self, tag_conditions: Mapping[TagGroupID, TagCondition]) -> HostSet:
+        matching = self._host_index.all
         for taggroup_id, tag_condition in tag_conditions.items():
-            if isinstance(tag_condition, dict):
-                if "$ne" in tag_condition:
-                    negative_match_tags.add(
-                        (
-                            taggroup_id,
-                            cast(TagConditionNE, tag_condition)["$ne"],
-                        )
+            if not isinstance(tag_condition, dict):
+                matching = matching.intersection(
+                    self._host_index.with_tag(taggroup_id, tag_condition)
+                )
+            elif "$ne" in tag_condition:
+                matching = matching.difference(
+                    self._host_index.with_tag(
+                        taggroup_id, cast(TagConditionNE, tag_condition)["$ne"]
                     )
-                    continue
-
-                if "$or" in tag_condition:
-                    return None  # Can not be optimized, makes _all_matching_hosts proceed
-
-                if "$nor" in tag_condition:
-                    return None  # Can not be optimized, makes _all_matching_hosts proceed
-
+                )
+            elif "$or" in tag_condition:
+                matching = matching.intersection(
+                    self._hosts_with_any_tag(
+                        taggroup_id, cast(TagConditionOR, tag_condition)["$or"]
+                    )
+                )
+            elif "$nor" in tag_condition:
+                matching = matching.difference(
+                    self._hosts_with_any_tag(taggroup_id, tag_condition["$nor"])
+                )
+            else:
                 raise NotImplementedError()
-
-            positive_match_tags.add((taggroup_id, tag_condition))
-
-        # TODO:
-        # if has_specific_folder_tag or self._all_processed_hosts_similarity < 3.0:
-        if self._all_processed_hosts_similarity < 3.0:
-            # Without shared folders
-            for hostname in valid_hosts:
-                if positive_match_tags <= self._host_tags[
-                    hostname
-                ] and not negative_match_tags.intersection(self._host_tags[hostname]):
-                    matching.add(hostname)
-
-            return matching
-
-        # With shared folders
-        checked_hosts: set[str] = set()
-        for hostname in valid_hosts:
-            if hostname in checked_hosts:
-                continue
-
-            hosts_with_same_tag = self._filter_hosts_with_same_tags_as_host(hostname, valid_hosts)
-            checked_hosts.update(hosts_with_same_tag)
-
-            if positive_match_tags <= self._host_tags[
-                hostname
-            ] and not negative_match_tags.intersection(self._host_tags[hostname]):
-                matching.update(hosts_with_same_tag)
-
         return matching
 
-    def _filter_hosts_with_same_tags_as_host(
-        self,
-        hostname: HostName,
-        hosts: set[HostName],
-    ) -> set[HostName]:
-        return self._hosts_grouped_by_tags[self._host_grouped_ref[hostname]].intersection(hosts)
+    def _hosts_with_any_tag(
+        self, taggroup_id: TagGroupID, tag_ids: Iterable[TagID | None]
+    ) -> HostSet:
+        hosts = self._host_index.empty
+        for tag_id in tag_ids:
+            hosts = hosts.union(self._host_index.with_tag(taggroup_id, tag_id))
+        return hosts
 
-    def _get_hosts_within_folder(self, folder_path: str, with_foreign_hosts: bool) -> set[HostName]:
+    def _get_hosts_within_folder(self, folder_path: str, with_foreign_hosts: bool) -> HostSet:
         cache_id = with_foreign_hosts, folder_path
-        if cache_id not in self._folder_host_lookup:
-            hosts_in_folder = set()
-            relevant_hosts = (
-                self._all_configured_hosts if with_foreign_hosts else self._all_processed_hosts
-            )
-
-            for hostname in relevant_hosts:
-                host_path = self._host_paths.get(hostname, "/")
-                if host_path.startswith(folder_path):
-                    hosts_in_folder.add(hostname)
-
-            self._folder_host_lookup[cache_id] = hosts_in_folder
-            return hosts_in_folder
-
-        return self._folder_host_lookup[cache_id]
+        with contextlib.suppress(KeyError):
+            return self._folder_host_lookup[cache_id]
 
-    def _initialize_host_lookup(self) -> None:
-        for hostname in self._all_configured_hosts:
-            group_ref = tuple(sorted(self._host_tags[hostname]))
-            self._hosts_grouped_by_tags.setdefault(group_ref, set()).add(hostname)
-            self._host_grouped_ref[hostname] = group_ref
+        relevant_hosts = (
+            self._all_configured_hosts if with_foreign_hosts else self._all_processed_hosts
+        )
+        hosts_in_folder = self._host_index.host_set(
+            hostname
+            for hostname in relevant_hosts
+            if self._host_paths.get(hostname, "/").startswith(folder_path)
+        )
+        return self._folder_host_lookup.setdefault(cache_id, hosts_in_folder)
 
 
 def _tags_cache_id(tag_or_label_spec: object) -> object:
@@ -835,6 +817,70 @@ def _tags_cache_id(tag_or_label_spec: object) -> object:
     return tag_or_label_spec
 
 
+_REGEX_SPECIAL_CHARS = frozenset(".^$*+?{}[]|()\\")
+
+
+def literal_prefix(pattern: str) -> str:
+    """The literal text every string matched by the pattern from its beginning starts with
+
+    >>> literal_prefix("Interface eth0$")
+    'Interface eth0'
+    >>> literal_prefix(r"Filesystem /var\\.log")
+    'Filesystem /var.log'
+    >>> literal_prefix("CPUs?")
+    'CPU'
+    >>> literal_prefix("Mem|CPU")
+    ''
+    >>> literal_prefix("(?i)cpu")
+    ''
+    """
+    if _has_top_level_alternative(pattern):
+        return ""
+    prefix = []
+    pos = 0
+    while pos < len(pattern):
+        char = pattern[pos]
+        if char == "\\":
+            if pos + 1 == len(pattern) or pattern[pos + 1].isalnum():
+                break  # character classes, back references etc.
+            char = pattern[pos + 1]
+            pos += 2
+        elif char in _REGEX_SPECIAL_CHARS:
+            break
+        else:
+            pos += 1
+        if pos < len(pattern):
+            if pattern[pos] in "*?{":
+                break  # the character is optional
+            if pattern[pos] == "+":
+                prefix.append(char)
+                break
+        prefix.append(char)
+    return "".join(prefix)
+
+
+def _has_top_level_alternative(pattern: str) -> bool:
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+    return False
+
+
 def parse_negated_condition_list(
     entries: HostOrServiceConditions,
 ) -> tuple[bool, HostOrServiceConditionsSimple]:
@@ -41,6 +41,7 @@ from cmk.snmplib import (
 
 from ._abstract import Fetcher, Mode
 from ._snmpscan import gather_available_raw_section_names, SNMPScanConfig
+from ._walk_cache_file import encode_rows, WalkCacheFile, WalkCacheFileError, write_walk_cache_file
 from .snmp import make_backend, SNMPPluginStore
 
 __all__ = [
@@ -80,25 +81,30 @@ class WalkCache(MutableMapping[tuple[str, str, bool], SNMPRowInfo]):
     The fetched data is always saved to a file *if* the respective OID is marked as being cached
     by the plug-in using `OIDCached` (that is: if the save_to_cache attribute of the OID object
     is true).
+
+    All persisted walks of a host are kept in one file, see `WalkCacheFile`. Loading only
+    maps the file, a walk is decoded when it is looked up for the first time.
     """
 
-    __slots__ = ("_store", "_path", "_logger")
+    __slots__ = ("_store", "_path", "_logger", "_file", "_deleted", "_modified")
+
+    FILE_NAME = "walks"
 
     def __init__(self, walk_cache: Path, logger: logging.Logger) -> None:
         self._store: dict[tuple[str, str, bool], SNMPRowInfo] = {}
         self._path = walk_cache
         self._logger = logger
+        self._file: WalkCacheFile | None = None
+        self._deleted: set[tuple[str, str, bool]] = set()
+        self._modified = False
+
+    @property
+    def _file_path(self) -> Path:
+        return self._path / self.FILE_NAME
 
     def _read_row(self, path: Path) -> SNMPRowInfo:
         return store.load_object_from_file(path, default=None)
 
-    def _write_row(self, path: Path, rowinfo: SNMPRowInfo) -> None:
-        return store.save_object_to_file(path, rowinfo, pprint_value=False)
-
-    @staticmethod
-    def _oid2name(fetchoid: str, context_hash: str) -> str:
-        return f"OID{fetchoid}-{context_hash}"
-
     @staticmethod
     def _name2oid(basename: str) -> tuple[str, str]:
         name_parts = basename[3:].split("-", 1)
@@ -107,31 +113,71 @@ class WalkCache(MutableMapping[tuple[str, str, bool], SNMPRowInfo]):
     def _iterfiles(self) -> Iterable[Path]:
         return self._path.iterdir() if self._path.is_dir() else ()
 
+    def _iter_legacy_files(self) -> Iterable[Path]:
+        """The files of the format of older versions, one per fetch OID"""
+        return (path for path in self._iterfiles() if path.name.startswith("OID"))
+
+    def _stored_keys(self) -> Iterator[tuple[str, str, bool]]:
+        if self._file is None:
+            return
+        for fetchoid, context_hash in self._file.keys():
+            key = (fetchoid, context_hash, True)
+            if key not in self._store and key not in self._deleted:
+                yield key
+
     def __repr__(self) -> str:
         return f"{type(self).__name__}({self._store!r})"
 
     def __getitem__(self, key: tuple[str, str, bool]) -> SNMPRowInfo:
-        return self._store.__getitem__(key)
+        try:
+            return self._store[key]
+        except KeyError:
+            pass
+        fetchoid, context_hash, save_flag = key
+        if not save_flag or self._file is None or key in self._deleted:
+            raise KeyError(key)
+        if (rowinfo := self._file.get((fetchoid, context_hash))) is None:
+            raise KeyError(key)
+        self._logger.debug(f"  Loaded {fetchoid} from walk cache {self._file_path}")
+        return self._store.setdefault(key, rowinfo)
 
     def __setitem__(self, key: tuple[str, str, bool], value: SNMPRowInfo) -> None:
+        self._deleted.discard(key)
+        self._modified |= key[2]
         return self._store.__setitem__(key, value)
 
     def __delitem__(self, key: tuple[str, str, bool]) -> None:
-        return self._store.__delitem__(key)
+        if key not in self:
+            raise KeyError(key)
+        self._store.pop(key, None)
+        self._deleted.add(key)
+        self._modified |= key[2]
 
     def __iter__(self) -> Iterator[tuple[str, str, bool]]:
-        return self._store.__iter__()
+        yield from self._store
+        yield from self._stored_keys()
 
     def __len__(self) -> int:
-        return self._store.__len__()
+        return len(self._store) + sum(1 for _ in self._stored_keys())
 
     def clear(self) -> None:
+        self._file = None
         for path in self._iterfiles():
             path.unlink(missing_ok=True)
 
     def load(self) -> None:
         """Try to read the OIDs data from cache files"""
-        for path in self._iterfiles():
+        try:
+            self._file = WalkCacheFile(self._file_path)
+            return
+        except FileNotFoundError:
+            pass
+        except WalkCacheFileError as e:
+            self._logger.debug(f"  Failed to load walk cache: {e}")
+            return
+
+        # Convert the files of older versions on the next save.
+        for path in self._iter_legacy_files():
             fetchoid, context_hash = self._name2oid(path.name)
 
             self._logger.debug(f"  Loading {fetchoid} from walk cache {path}")
@@ -144,18 +190,27 @@ class WalkCache(MutableMapping[tuple[str, str, bool], SNMPRowInfo]):
                 continue
 
             if read_walk is not None:
-                self._store[(fetchoid, context_hash, True)] = read_walk
+                self[(fetchoid, context_hash, True)] = read_walk
 
     def save(self) -> None:
-        self._path.mkdir(parents=True, exist_ok=True)
-
+        if not self._modified:
+            return
+
+        walks: dict[tuple[str, str], bytes] = {}
+        if self._file is not None:
+            for fetchoid, context_hash, _save_flag in self._stored_keys():
+                if (raw := self._file.get_raw((fetchoid, context_hash))) is not None:
+                    walks[(fetchoid, context_hash)] = raw
         for (fetchoid, context_hash, save_flag), rowinfo in self._store.items():
-            if not save_flag:
-                continue
+            if save_flag:
+                walks[(fetchoid, context_hash)] = encode_rows(rowinfo)
 
-            path = self._path / self._oid2name(fetchoid, context_hash)
-            self._logger.debug(f"  Saving walk of {fetchoid} to walk cache {path}")
-            self._write_row(path, rowinfo)
+        self._path.mkdir(parents=True, exist_ok=True)
+        self._logger.debug(f"  Saving {len(walks)} walks to walk cache {self._file_path}")
+        write_walk_cache_file(self._file_path, walks)
+        for path in self._iter_legacy_files():
+            path.unlink(missing_ok=True)
+        self._modified = False
 
 
 class ConfiguredFetchIntervallCache:
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""The persisted SNMP walks of a host in one binary file
+
+Layout (all integers little endian):
+
+    header:  magic b"CMKWALKC", format version (u16), number of walks (u32)
+    index:   per walk, sorted by fetch OID and context hash:
+             key length (u16), data offset (u64), data length (u64), key
+    data:    per walk: number of rows (u32),
+             per row: OID length (u16), value length (u32), OID, value
+
+The key is the fetch OID and the context hash, separated by a NUL byte. The
+file is memory mapped, and only the walks that are actually looked up are
+decoded. Files of other format versions are treated like missing ones.
+"""
+
+import bisect
+import mmap
+import struct
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Final
+
+from cmk.ccc import store
+from cmk.snmplib import SNMPRowInfo
+
+__all__ = [
+    "decode_rows",
+    "encode_rows",
+    "WalkCacheFile",
+    "WalkCacheFileError",
+    "WalkKey",
+    "write_walk_cache_file",
+]
+
+_MAGIC: Final = b"CMKWALKC"
+_VERSION: Final = 1
+_HEADER: Final = struct.Struct("<8sHI")
+_INDEX_ENTRY: Final = struct.Struct("<HQQ")
+_NUM_ROWS: Final = struct.Struct("<I")
+_ROW: Final = struct.Struct("<HI")
+
+type WalkKey = tuple[str, str]
+"""The fetch OID and the context hash"""
+
+
+class WalkCacheFileError(Exception):
+    pass
+
+
+def _encode_key(key: WalkKey) -> bytes:
+    return f"{key[0]}\0{key[1]}".encode()
+
+
+def _decode_key(raw: bytes) -> WalkKey:
+    fetchoid, context_hash = raw.decode().split("\0", 1)
+    return fetchoid, context_hash
+
+
+def encode_rows(rowinfo: SNMPRowInfo) -> bytes:
+    parts = [_NUM_ROWS.pack(len(rowinfo))]
+    for oid, value in rowinfo:
+        raw_oid = oid.encode()
+        parts.append(_ROW.pack(len(raw_oid), len(value)))
+        parts.append(raw_oid)
+        parts.append(value)
+    return b"".join(parts)
+
+
+def decode_rows(data: bytes) -> SNMPRowInfo:
+    """
+    >>> decode_rows(encode_rows([(".1.3.6.1.2.1.1.1.0", b"Linux"), (".1.2", b"")]))
+    [('.1.3.6.1.2.1.1.1.0', b'Linux'), ('.1.2', b'')]
+    """
+    (num_rows,) = _NUM_ROWS.unpack_from(data)
+    pos = _NUM_ROWS.size
+    rowinfo: SNMPRowInfo = []
+    for _nr in range(num_rows):
+        oid_length, value_length = _ROW.unpack_from(data, pos)
+        pos += _ROW.size
+        oid_end = pos + oid_length
+        value_end = oid_end + value_length
+        rowinfo.append((data[pos:oid_end].decode(), data[oid_end:value_end]))
+        pos = value_end
+    return rowinfo
+
+
+def write_walk_cache_file(path: Path, walks: Mapping[WalkKey, bytes]) -> None:
+    """Atomically replace the file by one with the given encoded walks"""
+    keys = sorted(walks)
+    raw_keys = [_encode_key(key) for key in keys]
+    offset = _HEADER.size + sum(_INDEX_ENTRY.size + len(raw_key) for raw_key in raw_keys)
+    index = []
+    for key, raw_key in zip(keys, raw_keys):
+        index.append(_INDEX_ENTRY.pack(len(raw_key), offset, len(walks[key])))
+        index.append(raw_key)
+        offset += len(walks[key])
+    store.save_bytes_to_file(
+        path,
+        b"".join(
+            [_HEADER.pack(_MAGIC, _VERSION, len(keys)), *index, *(walks[key] for key in keys)]
+        ),
+    )
+
+
+class WalkCacheFile:
+    """Read access to a walk cache file
+
+    >>> import tempfile
+    >>> path = Path(tempfile.mkdtemp()) / "walks"
+    >>> write_walk_cache_file(path, {(".1.3", "abc"): encode_rows([(".1.3.1", b"23")])})
+    >>> walks = WalkCacheFile(path)
+    >>> list(walks.keys())
+    [('.1.3', 'abc')]
+    >>> walks.get((".1.3", "abc"))
+    [('.1.3.1', b'23')]
+    >>> walks.get((".1.4", "abc")) is None
+    True
+    """
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as f:
+            try:
+                self._data: Final = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # empty file
+                raise WalkCacheFileError(f"{path}: {e}") from e
+        try:
+            magic, version, num_walks = _HEADER.unpack_from(self._data)
+            if magic != _MAGIC or version != _VERSION:
+                raise WalkCacheFileError(f"{path}: unknown format version")
+            self._keys: Final[list[WalkKey]] = []
+            self._locations: Final[list[tuple[int, int]]] = []
+            pos = _HEADER.size
+            for _nr in range(num_walks):
+                key_length, offset, length = _INDEX_ENTRY.unpack_from(self._data, pos)
+                pos += _INDEX_ENTRY.size
+                self._keys.append(_decode_key(self._data[pos : pos + key_length]))
+                self._locations.append((offset, length))
+                pos += key_length
+                if offset + length > len(self._data):
+                    raise WalkCacheFileError(f"{path}: truncated")
+        except (struct.error, UnicodeDecodeError, ValueError) as e:
+            raise WalkCacheFileError(f"{path}: {e}") from e
+
+    def keys(self) -> Iterator[WalkKey]:
+        return iter(self._keys)
+
+    def __contains__(self, key: WalkKey) -> bool:
+        return self._find(key) is not None
+
+    def _find(self, key: WalkKey) -> int | None:
+        nr = bisect.bisect_left(self._keys, key)
+        return nr if nr < len(self._keys) and self._keys[nr] == key else None
+
+    def get_raw(self, key: WalkKey) -> bytes | None:
+        if (nr := self._find(key)) is None:
+            return None
+        offset, length = self._locations[nr]
+        return self._data[offset : offset + length]
+
+    def get(self, key: WalkKey) -> SNMPRowInfo | None:
+        return None if (raw := self.get_raw(key)) is None else decode_rows(raw)
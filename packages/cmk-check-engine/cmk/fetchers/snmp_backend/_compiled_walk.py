@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Stored walks compiled for lookups by OID
+
+A text walk is compiled once into a binary file ".compiled/<name>" next to it,
+which is recompiled when the modification time or size of the walk changes.
+All integers are little endian:
+
+    header:         magic b"CMKSWALK", format version (u16), padding,
+                    mtime (ns) and size of the walk, number of OIDs,
+                    number of OID components
+    OID offsets:    (u64) * (number of OIDs + 1), into the OID components
+    components:     (u32) * number of OID components, padded to 8 bytes
+    value offsets:  (u64) * (number of OIDs + 1), into the values
+    values:         the stripped values
+
+The OIDs are sorted, so the OIDs of a subtree are found by bisection. The
+compiled files are memory mapped, and shared between the backends of one
+process: Hosts simulated with the same walk (for example via symlinks) use
+the same pages. The mappings of the recently used walks are kept open, and are
+closed as soon as their walk changes. If the compiled file cannot be written,
+the walk is compiled in memory.
+
+The compiled file only knows the modification time and size of its walk, so it
+has to be renamed and removed together with the walk: Otherwise it would be
+used for a different walk which happens to get the same name, time and size.
+"""
+
+import bisect
+import logging
+import mmap
+import os
+import struct
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Final
+
+from cmk.ccc import store
+from cmk.ccc.exceptions import MKGeneralException
+from cmk.snmplib import OID, SNMPRawValue
+
+from ._utils import strip_snmp_value
+
+__all__ = ["CompiledWalk", "compiled_walk", "rename_walk"]
+
+_MAGIC: Final = b"CMKSWALK"
+_VERSION: Final = 1
+_HEADER: Final = struct.Struct("<8sH6xqqQQ")
+
+type _Buffer = bytes | mmap.mmap
+
+
+def _padded(size: int) -> int:
+    return (size + 7) & ~7
+
+
+class _OIDs:
+    """The OIDs of a compiled walk as tuples of ints, for bisect"""
+
+    def __init__(self, offsets: memoryview, components: memoryview) -> None:
+        self._offsets = offsets
+        self._components = components
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, nr: int) -> tuple[int, ...]:
+        return tuple(self._components[self._offsets[nr] : self._offsets[nr + 1]])
+
+
+class CompiledWalk:
+    """
+    >>> walk = CompiledWalk(compile_walk([".1.2.3 foo\\n", ".1.2.10 bar\\n", ".1.2.4 \\"\\"\\n"]))
+    >>> [walk.row(nr) for nr in walk.subtree((1, 2))]
+    [('.1.2.3', b'foo'), ('.1.2.4', b''), ('.1.2.10', b'bar')]
+    >>> walk.subtree((1, 2, 1))
+    range(0, 0)
+    """
+
+    def __init__(self, data: _Buffer) -> None:
+        magic, version, mtime_ns, size, num_oids, num_components = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("unknown format version")
+        self.source_mtime_ns: Final[int] = mtime_ns
+        self.source_size: Final[int] = size
+
+        view = memoryview(data)
+        pos = _HEADER.size
+        oid_offsets = view[pos : (pos := pos + 8 * (num_oids + 1))].cast("Q")
+        components = view[pos : pos + 4 * num_components].cast("I")
+        pos += _padded(4 * num_components)
+        self._value_offsets: Final = view[pos : (pos := pos + 8 * (num_oids + 1))].cast("Q")
+        self._values: Final = view[pos:]
+        if len(self._values) < self._value_offsets[-1]:
+            raise ValueError("truncated")
+        self._oids: Final = _OIDs(oid_offsets, components)
+        self._data: Final = data
+        self._views: Final = (oid_offsets, components, self._value_offsets, self._values, view)
+
+    def close(self) -> None:
+        """Release the data of the walk, it must not be used afterwards"""
+        for view in self._views:
+            view.release()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def is_compiled_from(self, stat: os.stat_result) -> bool:
+        return self.source_mtime_ns == stat.st_mtime_ns and self.source_size == stat.st_size
+
+    def subtree(self, prefix: tuple[int, ...]) -> range:
+        """The numbers of the OIDs starting with the given one, in order"""
+        begin = bisect.bisect_left(self._oids, prefix)
+        if not prefix:
+            return range(begin, len(self._oids))
+        return range(begin, bisect.bisect_left(self._oids, (*prefix[:-1], prefix[-1] + 1)))
+
+    def row(self, nr: int) -> tuple[OID, SNMPRawValue]:
+        return (
+            "." + ".".join(map(str, self._oids[nr])),
+            bytes(self._values[self._value_offsets[nr] : self._value_offsets[nr + 1]]),
+        )
+
+
+def _parse_oid(raw: str) -> tuple[int, ...] | None:
+    try:
+        return tuple(map(int, raw.strip(".").split(".")))
+    except ValueError:
+        return None
+
+
+def compile_walk(lines: Iterable[str], source_mtime_ns: int = 0, source_size: int = 0) -> bytes:
+    """Compile the lines of a walk as returned by StoredWalkSNMPBackend.read_walk_from_path"""
+    rows: list[tuple[tuple[int, ...], SNMPRawValue]] = []
+    for line in lines:
+        parts = line.split(None, 1)
+        if (oid := _parse_oid(parts[0])) is not None:
+            rows.append((oid, strip_snmp_value(parts[1] if len(parts) > 1 else "")))
+    rows.sort(key=lambda row: row[0])
+
+    oid_offsets = array("Q", [0])
+    components = array("I")
+    value_offsets = array("Q", [0])
+    for oid, value in rows:
+        components.extend(oid)
+        oid_offsets.append(len(components))
+        value_offsets.append(value_offsets[-1] + len(value))
+
+    raw_components = components.tobytes()
+    return b"".join(
+        [
+            _HEADER.pack(
+                _MAGIC, _VERSION, source_mtime_ns, source_size, len(rows), len(components)
+            ),
+            oid_offsets.tobytes(),
+            raw_components.ljust(_padded(len(raw_components)), b"\0"),
+            value_offsets.tobytes(),
+            *(value for _oid, value in rows),
+        ]
+    )
+
+
+def _compiled_path(path: Path) -> Path:
+    return path.parent / ".compiled" / path.name
+
+
+def _load(path: Path) -> CompiledWalk | None:
+    try:
+        with path.open("rb") as f:
+            return CompiledWalk(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+_MAX_COMPILED_WALKS: Final = 64
+
+# inode, modification time and size of a walk
+type _WalkStamp = tuple[int, int, int]
+
+# The compiled walks by the resolved path of their walk, least recently used first
+_compiled_walks: OrderedDict[Path, tuple[_WalkStamp, CompiledWalk]] = OrderedDict()
+
+
+def _compile(
+    path: Path,
+    stat: os.stat_result,
+    read_lines: Callable[[Path], Iterable[str]],
+    logger: logging.Logger,
+) -> CompiledWalk:
+    compiled_path = _compiled_path(path)
+    logger.debug(f"  Compiling {path} to {compiled_path}")
+    data = compile_walk(read_lines(path), stat.st_mtime_ns, stat.st_size)
+    try:
+        compiled_path.parent.mkdir(exist_ok=True)
+        store.save_bytes_to_file(compiled_path, data)
+    except (OSError, MKGeneralException) as e:
+        logger.debug(f"  Cannot write {compiled_path}: {e}")
+        return CompiledWalk(data)
+    return _load(compiled_path) or CompiledWalk(data)
+
+
+def compiled_walk(
+    path: Path, read_lines: Callable[[Path], Iterable[str]], logger: logging.Logger
+) -> CompiledWalk:
+    """The up to date compiled walk of the given text walk"""
+    path = path.resolve()
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        _remove_compiled_walk(path)
+        raise
+    except OSError:
+        _forget(path)
+        raise
+
+    stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    if (cached := _compiled_walks.get(path)) is not None and cached[0] == stamp:
+        _compiled_walks.move_to_end(path)
+        return cached[1]
+    _forget(path)
+
+    compiled = _load(_compiled_path(path))
+    if compiled is None or not compiled.is_compiled_from(stat):
+        if compiled is not None:
+            compiled.close()
+        compiled = _compile(path, stat, read_lines, logger)
+
+    _compiled_walks[path] = (stamp, compiled)
+    if len(_compiled_walks) > _MAX_COMPILED_WALKS:
+        _stamp, oldest = _compiled_walks.popitem(last=False)[1]
+        oldest.close()
+    return compiled
+
+
+def _forget(path: Path) -> None:
+    if (cached := _compiled_walks.pop(path, None)) is not None:
+        cached[1].close()
+
+
+def _remove_compiled_walk(path: Path) -> None:
+    """Remove the compiled walk of the given, removed or replaced walk"""
+    _forget(path.resolve())
+    _compiled_path(path).unlink(missing_ok=True)
+
+
+def rename_walk(path: Path, new_path: Path) -> bool:
+    """Rename a walk together with its compiled walk, replacing an existing walk"""
+    if not path.exists():
+        return False
+    _forget(path.resolve())
+    _remove_compiled_walk(new_path)
+    path.rename(new_path)
+    try:
+        _compiled_path(path).rename(_compiled_path(new_path))
+    except FileNotFoundError:
+        _compiled_path(path).unlink(missing_ok=True)
+    return True
@@ -12,7 +12,7 @@ from typing import Final
 from cmk.helper_interface import FetcherError
 from cmk.snmplib import OID, SNMPBackend, SNMPContext, SNMPHostConfig, SNMPRawValue, SNMPRowInfo
 
-from ._utils import strip_snmp_value
+from ._compiled_walk import compiled_walk, CompiledWalk, rename_walk
 
 __all__ = ["StoredWalkSNMPBackend"]
 
@@ -54,35 +54,35 @@ class StoredWalkSNMPBackend(SNMPBackend):
             dot_star = False
 
         self._logger.debug(f"  Loading {oid}")
-        lines = self.read_walk_data()
-
-        begin = 0
-        end = len(lines)
-        current = (begin + end) // 2
-        hit = None
-        while end - begin > 0:
-            parts = lines[current].split(None, 1)
-            comp = parts[0]
-            hit = StoredWalkSNMPBackend._compare_oids(oid_prefix, comp)
-            if hit == 0:
-                break
-            if hit == 1:  # we are too low
-                begin = current + 1
-            else:
-                end = current
-            current = (begin + end) // 2
-
-        if hit != 0:
-            return []  # not found
-
-        rowinfo = StoredWalkSNMPBackend._collect_until(oid, oid_prefix, lines, current, -1)
-        rowinfo.reverse()
-        rowinfo += StoredWalkSNMPBackend._collect_until(oid, oid_prefix, lines, current + 1, 1)
+        walk = self.compiled_walk()
+        try:
+            prefix = self._to_bin_string(oid_prefix)
+        except ValueError:
+            return []  # not a numeric OID
+        rows = walk.subtree(prefix)
 
         if dot_star:
-            return [rowinfo[0]]
+            # The OID itself is not below it, like the next OID of a GETNEXT
+            first_rows = [walk.row(nr) for nr in rows[:2]]
+            return [row for row in first_rows if self._to_bin_string(row[0]) != prefix][:1]
+
+        return [walk.row(nr) for nr in rows]
 
-        return rowinfo
+    def compiled_walk(self) -> CompiledWalk:
+        # Not kept: The compiled walk is closed as soon as the walk changes.
+        try:
+            return compiled_walk(
+                self.path,
+                lambda path: self.read_walk_from_path(path, self._logger),
+                self._logger,
+            )
+        except OSError:
+            raise FetcherError(f"No snmpwalk file {self.path}")
+
+    @staticmethod
+    def rename_walk(path: Path, new_path: Path) -> bool:
+        """Rename the walk, if it exists, along with its compiled walk"""
+        return rename_walk(path, new_path)
 
     @staticmethod
     def read_walk_from_path(path: Path, logger: logging.Logger) -> Sequence[str]:
@@ -104,46 +104,6 @@ class StoredWalkSNMPBackend(SNMPBackend):
         except OSError:
             raise FetcherError(f"No snmpwalk file {self.path}")
 
-    @staticmethod
-    def _compare_oids(a: OID, b: OID) -> int:
-        aa = StoredWalkSNMPBackend._to_bin_string(a)
-        bb = StoredWalkSNMPBackend._to_bin_string(b)
-        if len(aa) <= len(bb) and bb[: len(aa)] == aa:
-            result = 0
-        else:
-            result = (aa > bb) - (aa < bb)
-        return result
-
     @staticmethod
     def _to_bin_string(oid: OID) -> tuple[int, ...]:
         return tuple(map(int, oid.strip(".").split(".")))
-
-    @staticmethod
-    def _collect_until(
-        oid: OID, oid_prefix: OID, lines: Sequence[str], index: int, direction: int
-    ) -> SNMPRowInfo:
-        rows = []
-        # Handle case, where we run after the end of the lines list
-        if index >= len(lines):
-            if direction > 0:
-                return []
-            index -= 1
-        while True:
-            line = lines[index]
-            parts = line.split(None, 1)
-            o = parts[0]
-            if o.startswith("."):
-                o = o[1:]
-            if o == oid or o.startswith(oid_prefix + "."):
-                if len(parts) > 1:
-                    value = parts[1]
-                else:
-                    value = ""
-                # Fix for missing starting oids
-                rows.append(("." + o, strip_snmp_value(value)))
-                index += direction
-                if index < 0 or index >= len(lines):
-                    break
-            else:
-                break
-        return rows
@@ -5,12 +5,34 @@
 
 
 import logging
+import os
+from collections import OrderedDict
 from pathlib import Path
 
 import pytest
 
+import cmk.fetchers.snmp_backend._compiled_walk as compiled_walk_module
 import cmk.fetchers.snmp_backend._utils as utils
+from cmk.ccc.hostaddress import HostAddress, HostName
 from cmk.fetchers.snmp_backend import StoredWalkSNMPBackend
+from cmk.helper_interface import FetcherError
+from cmk.snmplib import SNMPBackendEnum, SNMPHostConfig, SNMPRowInfo, SNMPVersion
+
+_SNMP_CONFIG = SNMPHostConfig(
+    is_ipv6_primary=False,
+    hostname=HostName("localhost"),
+    ipaddress=HostAddress("127.0.0.1"),
+    credentials="public",
+    port=161,
+    bulkwalk_enabled=True,
+    snmp_version=SNMPVersion.V2C,
+    bulk_walk_size_of=10,
+    timing={},
+    oid_range_limits={},
+    snmpv3_contexts=[],
+    character_encoding=None,
+    snmp_backend=SNMPBackendEnum.STORED_WALK,
+)
 
 
 @pytest.mark.parametrize(
@@ -26,22 +48,133 @@ def test_strip_snmp_value(value: str, expected: bytes) -> None:
     assert utils.strip_snmp_value(value) == expected
 
 
+@pytest.mark.parametrize(
+    "oid, walked_oid, result",
+    [
+        ("1.2.3", "1.2.3", True),
+        ("1.2.3", ".1.2.3", True),
+        (".1.2.3", "1.2.3", True),
+        (".1.2.3", ".1.2.3", True),
+        ("1.2.3", "1.2.3.4", True),
+        ("1.2.3.4", "1.2.3", False),
+        ("1.2.3", "1.2.30", False),
+        ("1.2.3", "4.5.6", False),
+    ],
+)
+def test_compiled_walk_subtree(oid: str, walked_oid: str, result: bool) -> None:
+    walk = compiled_walk_module.CompiledWalk(
+        compiled_walk_module.compile_walk([f"{walked_oid} foo\n"])
+    )
+    assert bool(walk.subtree(StoredWalkSNMPBackend._to_bin_string(oid))) is result  # noqa: SLF001
+
+
 @pytest.mark.usefixtures("create_files")
 class TestStoredWalkSNMPBackend:
     @pytest.mark.parametrize(
-        "a, b, result",
+        "oid, expected",
         [
-            ("1.2.3", "1.2.3", 0),
-            ("1.2.3", ".1.2.3", 0),
-            (".1.2.3", "1.2.3", 0),
-            (".1.2.3", ".1.2.3", 0),
-            ("1.2.3", "1.2.3.4", 0),
-            ("1.2.3.4", "1.2.3", 1),
-            ("1.2.3", "4.5.6", -1),
+            (".1.2.3", [(".1.2.3", b"foo"), (".1.2.3.1", b"\xb2\xe0},M\x15")]),
+            ("1.2.3", [(".1.2.3", b"foo"), (".1.2.3.1", b"\xb2\xe0},M\x15")]),
+            # The OID itself is not below it
+            (".1.2.3.*", [(".1.2.3.1", b"\xb2\xe0},M\x15")]),
+            (".1.2.3.1", [(".1.2.3.1", b"\xb2\xe0},M\x15")]),
+            (".1.2.4.*", []),
+            (".1.2.*", [(".1.2.3", b"foo")]),
+            (
+                ".1.2",
+                [
+                    (".1.2.3", b"foo"),
+                    (".1.2.3.1", b"\xb2\xe0},M\x15"),
+                    (".1.2.4", b"baz"),
+                    (".1.2.30", b"bar"),
+                ],
+            ),
+            (".1.2.5", []),
+            (".1.2.5.*", []),
+            (".4.5.6", []),
         ],
     )
-    def test_compare_oids(self, a: str, b: str, result: int) -> None:
-        assert StoredWalkSNMPBackend._compare_oids(a, b) == result  # noqa: SLF001
+    def test_walk(self, tmp_path: Path, oid: str, expected: SNMPRowInfo) -> None:
+        backend = StoredWalkSNMPBackend(
+            _SNMP_CONFIG, logging.getLogger("test"), tmp_path / "walkdata" / "3.txt"
+        )
+        assert backend.walk(oid, context="") == expected
+
+    def test_get(self, tmp_path: Path) -> None:
+        backend = StoredWalkSNMPBackend(
+            _SNMP_CONFIG, logging.getLogger("test"), tmp_path / "walkdata" / "3.txt"
+        )
+        assert backend.get(".1.2.4", context="") == b"baz"
+        assert backend.get(".1.2.3", context="") is None
+        assert backend.get(".1.2.3.*", context="") == b"\xb2\xe0},M\x15"
+
+    def test_walk_is_recompiled_on_change(self, tmp_path: Path) -> None:
+        path = tmp_path / "walkdata" / "3.txt"
+        logger = logging.getLogger("test")
+        assert StoredWalkSNMPBackend(_SNMP_CONFIG, logger, path).walk(".1.2.4", context="") == [
+            (".1.2.4", b"baz")
+        ]
+        assert (tmp_path / "walkdata" / ".compiled" / "3.txt").exists()
+
+        path.write_text(".1.2.4 changed\n")
+        os.utime(path, ns=(0, 0))
+        assert StoredWalkSNMPBackend(_SNMP_CONFIG, logger, path).walk(".1.2.4", context="") == [
+            (".1.2.4", b"changed")
+        ]
+
+    def test_compiled_walk_is_closed_on_change(self, tmp_path: Path) -> None:
+        path = tmp_path / "walkdata" / "3.txt"
+        backend = StoredWalkSNMPBackend(_SNMP_CONFIG, logging.getLogger("test"), path)
+        previous = backend.compiled_walk()
+        assert backend.compiled_walk() is previous
+
+        path.write_text(".1.2.4 changed\n")
+        assert backend.walk(".1.2.4", context="") == [(".1.2.4", b"changed")]
+        with pytest.raises(ValueError):
+            previous.row(0)
+
+    def test_compiled_walks_are_limited(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(compiled_walk_module, "_MAX_COMPILED_WALKS", 2)
+        cached: OrderedDict[Path, object] = OrderedDict()
+        monkeypatch.setattr(compiled_walk_module, "_compiled_walks", cached)
+        logger = logging.getLogger("test")
+        walks = [
+            StoredWalkSNMPBackend(
+                _SNMP_CONFIG, logger, tmp_path / "walkdata" / f"{nr}.txt"
+            ).compiled_walk()
+            for nr in (1, 2, 3)
+        ]
+
+        assert len(cached) == 2
+        with pytest.raises(ValueError):
+            walks[0].row(0)
+        assert walks[2].row(0) == (".1.2.3", b"foo")
+
+    def test_rename_walk(self, tmp_path: Path) -> None:
+        walks = tmp_path / "walkdata"
+        logger = logging.getLogger("test")
+        for name in ("1.txt", "3.txt"):
+            StoredWalkSNMPBackend(_SNMP_CONFIG, logger, walks / name).compiled_walk()
+
+        assert StoredWalkSNMPBackend.rename_walk(walks / "3.txt", walks / "1.txt")
+        assert not StoredWalkSNMPBackend.rename_walk(walks / "3.txt", walks / "1.txt")
+
+        assert sorted(p.name for p in (walks / ".compiled").iterdir()) == ["1.txt"]
+        assert StoredWalkSNMPBackend(_SNMP_CONFIG, logger, walks / "1.txt").walk(
+            ".1.2.4", context=""
+        ) == [(".1.2.4", b"baz")]
+
+    def test_compiled_walk_of_removed_walk_is_removed(self, tmp_path: Path) -> None:
+        path = tmp_path / "walkdata" / "3.txt"
+        backend = StoredWalkSNMPBackend(_SNMP_CONFIG, logging.getLogger("test"), path)
+        backend.compiled_walk()
+
+        path.unlink()
+        with pytest.raises(FetcherError):
+            backend.compiled_walk()
+        assert not (tmp_path / "walkdata" / ".compiled" / "3.txt").exists()
 
     def test_read_walk_data(self, tmpdir: Path) -> None:
         assert StoredWalkSNMPBackend.read_walk_from_path(
@@ -65,3 +198,5 @@ def create_files(tmp_path: Path) -> None:
     p1.write_text(".1.2.3 foo\n.1.2.4 bar\nfoobar\n")
     p2 = (tmp_path / "walkdata").joinpath("2.txt")
     p2.write_text(".1.2.3 foo\n\n\n.1.2.5 test\n")
+    p3 = (tmp_path / "walkdata").joinpath("3.txt")
+    p3.write_text('.1.2.3 foo\n.1.2.3.1 "B2 E0 7D 2C 4D 15 "\n.1.2.30 bar\n.1.2.4 baz\n')
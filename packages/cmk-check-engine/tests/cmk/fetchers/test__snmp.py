@@ -5,44 +5,75 @@
 
 
 import logging
-from collections.abc import Iterable, MutableMapping
 from pathlib import Path
 
+from cmk.ccc import store
 from cmk.fetchers._snmp import WalkCache
-from cmk.snmplib import SNMPRowInfo
 
 
-class MockWalkCache(WalkCache):
-    def __init__(self, mockdata: MutableMapping[str, SNMPRowInfo], path: Path) -> None:
-        super().__init__(path, logging.getLogger("test"))
-        self.mock_stored_on_fs = mockdata
-
-    def _read_row(self, path: Path) -> SNMPRowInfo:
-        return self.mock_stored_on_fs[str(path.name)]
-
-    def _write_row(self, path: Path, rowinfo: SNMPRowInfo) -> None:
-        self.mock_stored_on_fs[str(path.name)] = rowinfo
-
-    def _iterfiles(self) -> Iterable[Path]:
-        return (Path(k) for k in self.mock_stored_on_fs)
+def _walk_cache(path: Path) -> WalkCache:
+    cache = WalkCache(path, logging.getLogger("test"))
+    cache.load()
+    return cache
 
 
 class TestWalkCache:
-    def test_oid2name_roundtrip(self) -> None:
-        fetchoid, context_hash = ".3.1.4.1.5.9.2.6.5.3.5", "12c3d4a"
-        assert (fetchoid, context_hash) == WalkCache._name2oid(  # noqa: SLF001
-            WalkCache._oid2name(fetchoid, context_hash)  # noqa: SLF001
+    def test_name2oid(self) -> None:
+        assert WalkCache._name2oid("OID.3.1.4.1.5.9.2.6.5.3.5-12c3d4a") == (  # noqa: SLF001
+            ".3.1.4.1.5.9.2.6.5.3.5",
+            "12c3d4a",
         )
 
     def test_cache_keeps_stored_data(self, tmp_path: Path) -> None:
-        fetchoid, context_hash = ".1.2.3", "12c3d4a"
-        path = f"OID{fetchoid}-{context_hash}"
-        cache = MockWalkCache({path: [("23", b"43")]}, tmp_path)
-
+        cache = _walk_cache(tmp_path)
         assert not cache
 
-        cache.load()
+        cache[(".1.2.3", "12c3d4a", True)] = [("23", b"43")]
+        cache[(".1.2.4", "12c3d4a", False)] = [("24", b"44")]
+        cache.save()
 
-        assert (fetchoid, "12c3d4a", True) in cache
+        assert list(tmp_path.iterdir()) == [tmp_path / WalkCache.FILE_NAME]
+        cache = _walk_cache(tmp_path)
+        assert list(cache) == [(".1.2.3", "12c3d4a", True)]
+        assert cache[(".1.2.3", "12c3d4a", True)] == [("23", b"43")]
+        assert (".1.2.3", "12c3d4a", False) not in cache
+
+    def test_save_keeps_other_walks(self, tmp_path: Path) -> None:
+        cache = _walk_cache(tmp_path)
+        cache[(".1.2.3", "12c3d4a", True)] = [("23", b"43")]
+        cache[(".1.2.4", "12c3d4a", True)] = [("24", b"44")]
+        cache.save()
+
+        cache = _walk_cache(tmp_path)
+        cache[(".1.2.4", "12c3d4a", True)] = [("24", b"45")]
+        del cache[(".1.2.3", "12c3d4a", True)]
+        cache[(".1.2.5", "12c3d4a", True)] = [("25", b"46")]
         cache.save()
-        assert path in cache.mock_stored_on_fs
+
+        assert dict(_walk_cache(tmp_path)) == {
+            (".1.2.4", "12c3d4a", True): [("24", b"45")],
+            (".1.2.5", "12c3d4a", True): [("25", b"46")],
+        }
+
+    def test_load_converts_legacy_files(self, tmp_path: Path) -> None:
+        legacy_file = tmp_path / "OID.1.2.3-12c3d4a"
+        store.save_object_to_file(legacy_file, [("23", b"43")])
+
+        cache = _walk_cache(tmp_path)
+        assert dict(cache) == {(".1.2.3", "12c3d4a", True): [("23", b"43")]}
+        cache.save()
+
+        assert not legacy_file.exists()
+        assert dict(_walk_cache(tmp_path)) == {(".1.2.3", "12c3d4a", True): [("23", b"43")]}
+
+    def test_load_ignores_unknown_format(self, tmp_path: Path) -> None:
+        (tmp_path / WalkCache.FILE_NAME).write_bytes(b"CMKWALKC\xff\xff")
+        assert not _walk_cache(tmp_path)
+
+    def test_clear(self, tmp_path: Path) -> None:
+        cache = _walk_cache(tmp_path)
+        cache[(".1.2.3", "12c3d4a", True)] = [("23", b"43")]
+        cache.save()
+
+        _walk_cache(tmp_path).clear()
+        assert not list(tmp_path.iterdir())
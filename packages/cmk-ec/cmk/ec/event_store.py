@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Indexed storage of the currently open events
+
+The store keeps a primary map by event id plus secondary indexes by rule id,
+by (host, core host) and by state, so that the lookups done while processing
+messages and commands do not have to walk all open events. Each index bucket
+is an insertion-ordered dict used as an ordered set, so the first entry of a
+bucket is always the oldest event in it.
+
+Events are mutable dicts which get changed in place all over the place. The
+index keys of each event are remembered when it is (re-)indexed, so removing
+an event always hits the right buckets. Whoever changes the rule id, host, core
+host or state of a stored event has to call `reindex` afterwards.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import NamedTuple
+
+from cmk.ccc.hostaddress import HostName
+
+from .event import Event
+
+__all__ = ["EventStore"]
+
+HostKey = tuple[HostName, HostName | None]
+
+
+class _IndexKeys(NamedTuple):
+    rule_id: str | None
+    host: HostName
+    core_host: HostName | None
+    state: int | None
+
+
+def _index_keys(event: Event) -> _IndexKeys:
+    return _IndexKeys(
+        event.get("rule_id"),
+        event.get("host", HostName("")),
+        event.get("core_host"),
+        event.get("state"),
+    )
+
+
+class EventStore:
+    """Open events in order of their creation, indexed by id, rule, host and state
+
+    >>> store = EventStore()
+    >>> store.add(Event(id=1, rule_id="r1", host=HostName("h"), core_host=None, state=2))
+    >>> store.add(Event(id=2, rule_id="r2", host=HostName("h"), core_host=None, state=0))
+    >>> [e["id"] for e in store.of_host(HostName("h"))]
+    [1, 2]
+    >>> store.oldest_of_rule("r2")["id"]
+    2
+    >>> store.remove(store.get(1))
+    True
+    >>> len(store), store.count_by_rule()
+    (1, {'r2': 1})
+    """
+
+    def __init__(self, events: Iterable[Event] = ()) -> None:
+        self._by_id: dict[int, Event] = {}
+        self._keys: dict[int, _IndexKeys] = {}
+        self._by_rule: dict[str | None, dict[int, None]] = {}
+        # Two levels: host name first, so that all events of a host name can be
+        # found without knowing the core host.
+        self._by_host: dict[HostName, dict[HostName | None, dict[int, None]]] = {}
+        self._by_state: dict[int | None, dict[int, None]] = {}
+        for event in events:
+            self.add(event)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Event]:
+        """Iterate over all events, oldest first. Do not mutate the store meanwhile."""
+        return iter(self._by_id.values())
+
+    def __contains__(self, event: Event) -> bool:
+        return self._by_id.get(event["id"]) is event
+
+    def get(self, eid: int) -> Event | None:
+        return self._by_id.get(eid)
+
+    def add(self, event: Event) -> None:
+        eid = event["id"]
+        if eid in self._by_id:
+            self._unindex(eid)
+        self._by_id[eid] = event
+        self._index(eid, _index_keys(event))
+
+    def remove(self, event: Event) -> bool:
+        """Remove the given event, return False if it is not in the store"""
+        if event not in self:
+            return False
+        eid = event["id"]
+        self._unindex(eid)
+        del self._by_id[eid]
+        return True
+
+    def reindex(self, event: Event) -> None:
+        """Update the secondary indexes after an event has been changed in place
+
+        The event keeps its age, i.e. its position relative to the other events
+        of the same rule, host or state.
+        """
+        eid = event["id"]
+        if self._by_id.get(eid) is not event:
+            return
+        new_keys = _index_keys(event)
+        if self._keys[eid] == new_keys:
+            return
+        self._unindex(eid)
+        self._index(eid, new_keys, keep_age=True)
+
+    def clear(self) -> None:
+        self._by_id.clear()
+        self._keys.clear()
+        self._by_rule.clear()
+        self._by_host.clear()
+        self._by_state.clear()
+
+    def oldest(self) -> Event | None:
+        return next(iter(self._by_id.values()), None)
+
+    def oldest_of_rule(self, rule_id: str | None) -> Event | None:
+        if bucket := self._by_rule.get(rule_id):
+            return self._by_id[next(iter(bucket))]
+        return None
+
+    def oldest_of_host(self, host: HostName) -> Event | None:
+        if not (buckets := self._by_host.get(host)):
+            return None
+        return self._by_id[min(next(iter(bucket)) for bucket in buckets.values())]
+
+    def of_rule(self, rule_id: str | None) -> list[Event]:
+        """All events of a rule, oldest first"""
+        return [self._by_id[eid] for eid in self._by_rule.get(rule_id, ())]
+
+    def of_host(self, host: HostName) -> list[Event]:
+        """All events of a host name regardless of their core host, oldest first"""
+        buckets = self._by_host.get(host, {}).values()
+        return [self._by_id[eid] for eid in sorted(eid for bucket in buckets for eid in bucket)]
+
+    def of_state(self, state: int | None) -> list[Event]:
+        """All events in the given state, oldest first"""
+        return [self._by_id[eid] for eid in self._by_state.get(state, ())]
+
+    def count_of_rule(self, rule_id: str | None) -> int:
+        return len(self._by_rule.get(rule_id, ()))
+
+    def count_of_host(self, host: HostName, core_host: HostName | None) -> int:
+        return len(self._by_host.get(host, {}).get(core_host, ()))
+
+    def count_by_rule(self) -> Mapping[str | None, int]:
+        return {rule_id: len(bucket) for rule_id, bucket in self._by_rule.items()}
+
+    def count_by_host(self) -> Mapping[HostKey, int]:
+        return {
+            (host, core_host): len(bucket)
+            for host, buckets in self._by_host.items()
+            for core_host, bucket in buckets.items()
+        }
+
+    def _index(self, eid: int, keys: _IndexKeys, keep_age: bool = False) -> None:
+        self._keys[eid] = keys
+        for bucket in (
+            self._by_rule.setdefault(keys.rule_id, {}),
+            self._by_host.setdefault(keys.host, {}).setdefault(keys.core_host, {}),
+            self._by_state.setdefault(keys.state, {}),
+        ):
+            younger_present = keep_age and bucket and next(reversed(bucket)) > eid
+            bucket[eid] = None
+            if younger_present:
+                _sort_bucket(bucket)
+
+    def _unindex(self, eid: int) -> None:
+        keys = self._keys.pop(eid)
+        _discard(self._by_rule, keys.rule_id, eid)
+        host_buckets = self._by_host[keys.host]
+        _discard(host_buckets, keys.core_host, eid)
+        if not host_buckets:
+            del self._by_host[keys.host]
+        _discard(self._by_state, keys.state, eid)
+
+
+def _sort_bucket(bucket: dict[int, None]) -> None:
+    # Event ids are handed out in increasing order, so they reflect the age.
+    ordered = sorted(bucket)
+    bucket.clear()
+    bucket.update(dict.fromkeys(ordered))
+
+
+def _discard[K](index: dict[K, dict[int, None]], key: K, eid: int) -> None:
+    bucket = index[key]
+    del bucket[eid]
+    if not bucket:
+        del index[key]
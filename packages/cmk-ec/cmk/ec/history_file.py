@@ -15,6 +15,7 @@ from typing import Any
 from .config import Config
 from .event import Event, scrub_string
 from .history import _log_event, ActiveHistoryPeriod, get_logfile, History, HistoryWhat, quote_tab
+from .history_file_index import index_path, index_query, IndexedHistoryFile, IndexQuery
 from .log_level import VERBOSE
 from .query import Columns, OperatorName, QueryFilter, QueryGET
 from .settings import Settings
@@ -63,12 +64,13 @@ class FileHistory(History):
                 for colname, defval in self._event_columns
             ]
 
-            with get_logfile(
-                self._config,
-                self._settings.paths.history_dir.value,
-                self._active_history_period,
-            ).open(mode="ab") as f:
-                f.write(b"\t".join(columns) + b"\n")
+            IndexedHistoryFile(
+                get_logfile(
+                    self._config,
+                    self._settings.paths.history_dir.value,
+                    self._active_history_period,
+                )
+            ).append(b"\t".join(columns) + b"\n")
 
     def get(self, query: QueryGET) -> Iterable[Sequence[object]]:
         if not self._settings.paths.history_dir.value.exists():
@@ -79,6 +81,9 @@ class FileHistory(History):
         limit = query.limit
         self._logger.debug("Limit: %r", limit)
 
+        # The index of a history file is used if it can narrow down the lines to
+        # read, otherwise grep is used.
+        index = index_query(filters)
         grep_pipeline = _grep_pipeline(filters)
 
         time_filters = [
@@ -111,17 +116,40 @@ class FileHistory(History):
             if not _intersects(time_range, _get_logfile_timespan(path)):
                 self._logger.debug("skipping history file %s because of time filters", path)
                 continue
-            tac = f"nl -b a {shlex.quote(str(path))} | tac"  # Process younger lines first
-            cmd = " | ".join([tac] + grep_pipeline)
-            self._logger.debug("preprocessing history file with command [%s]", cmd)
-            new_entries = parse_history_file(
-                self._history_columns, path, query.filter_row, cmd, limit, self._logger
-            )
+            if index is None:
+                tac = f"nl -b a {shlex.quote(str(path))} | tac"  # Process younger lines first
+                cmd = " | ".join([tac] + grep_pipeline)
+                self._logger.debug("preprocessing history file with command [%s]", cmd)
+                new_entries = parse_history_file(
+                    self._history_columns, path, query.filter_row, cmd, limit, self._logger
+                )
+            else:
+                new_entries = self._get_indexed(path, index, query.filter_row, limit)
             history_entries += new_entries
             if limit is not None:
                 limit -= len(new_entries)
         return history_entries
 
+    def _get_indexed(
+        self,
+        path: Path,
+        index: IndexQuery,
+        filter_row: Callable[[Sequence[Any]], bool],
+        limit: int | None,
+    ) -> list[Any]:
+        history_file = IndexedHistoryFile(path)
+        with self._lock:
+            history_file.update_index()
+        self._logger.debug("reading history file %s via its index", path)
+        return parse_history_lines(
+            self._history_columns,
+            path,
+            filter_row,
+            (b"%d\t%s" % (nr, line) for nr, line in history_file.read_lines(index)),
+            limit,
+            self._logger,
+        )
+
     def housekeeping(self) -> None:
         _expire_logfiles(self._settings, self._config, self._logger, self._lock, False)
 
@@ -149,6 +177,7 @@ def _expire_logfiles(
                         "Deleting log file %s (age %s)", path, _date_and_time(path.stat().st_mtime)
                     )
                     path.unlink()
+                    index_path(path).unlink(missing_ok=True)
         except Exception as e:
             if settings.options.debug:
                 raise
@@ -269,7 +298,6 @@ def parse_history_file(
     limit: int | None,
     logger: Logger,
 ) -> list[Any]:
-    entries: list[Any] = []
     with subprocess.Popen(
         cmd,
         shell=True,  # nosec B602 # BNS:67522a
@@ -278,18 +306,29 @@ def parse_history_file(
     ) as grep:
         if grep.stdout is None:
             raise Exception("Huh? stdout vanished...")
+        return parse_history_lines(history_columns, path, filter_row, grep.stdout, limit, logger)
 
-        for line in grep.stdout:
-            if limit is not None and len(entries) > limit:
-                break
-            try:
-                parts: list[Any] = line.decode("utf-8").rstrip("\n").split("\t")
-                convert_history_line(history_columns, parts)
-                if filter_row(parts):
-                    entries.append(parts)
-            except Exception:
-                logger.exception("Invalid line '%s' in history file %s", line, path)
 
+def parse_history_lines(
+    history_columns: Sequence[tuple[str, Any]],
+    path: Path,
+    filter_row: Callable[[Sequence[Any]], bool],
+    lines: Iterable[bytes],
+    limit: int | None,
+    logger: Logger,
+) -> list[Any]:
+    """Parse and filter history lines prefixed with their line number"""
+    entries: list[Any] = []
+    for line in lines:
+        if limit is not None and len(entries) > limit:
+            break
+        try:
+            parts: list[Any] = line.decode("utf-8").rstrip("\n").split("\t")
+            convert_history_line(history_columns, parts)
+            if filter_row(parts):
+                entries.append(parts)
+        except Exception:
+            logger.exception("Invalid line '%s' in history file %s", line, path)
     return entries
 
 
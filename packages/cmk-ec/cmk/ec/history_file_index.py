@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Sidecar indexes for the history files of the file backend
+
+Each history file "<period>.log" gets an index file "<period>.idx" with one
+fixed-size binary record per line: the byte offset of the line, the history
+time, the event ID and state, and hashes of the host, core host and rule ID.
+Queries filtering on these columns scan the much smaller index to find the
+candidate lines and read only those from the history file. The index is a
+pure prefilter: Candidates are still filtered with the real query filters, so
+hash collisions only cost a few superfluous reads.
+
+Records are appended together with the lines. Indexes of history files written
+by older versions, or which lag behind because of a crash, are brought up to date
+before they are used.
+"""
+
+import math
+import operator
+import struct
+import zlib
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .query import OperatorName, QueryFilter
+
+__all__ = ["IndexedHistoryFile", "IndexQuery", "index_path", "index_query"]
+
+
+class IndexRecord(NamedTuple):
+    offset: int
+    time: float
+    event_id: int
+    state: int
+    host: int
+    core_host: int
+    rule_id: int
+
+
+_RECORD = struct.Struct("<qdqbIII")
+_OFFSET = struct.Struct("<q")
+
+# Column positions in the history lines, without the line number
+_TIME = 0
+_EVENT_ID = 4
+_EVENT_HOST = 11
+_EVENT_RULE_ID = 17
+_EVENT_STATE = 18
+_EVENT_CORE_HOST = 26  # missing in lines of very old versions
+
+_INVALID = IndexRecord(0, math.nan, -1, -1, 0, 0, 0)
+
+
+def index_path(path: Path) -> Path:
+    return path.with_suffix(".idx")
+
+
+def _hash(value: bytes) -> int:
+    """Hash for case insensitive comparisons, which are looser than case sensitive ones
+
+    >>> _hash(b"Heute") == _hash(b"heute")
+    True
+    """
+    return zlib.crc32(value.decode("utf-8", "replace").lower().encode("utf-8"))
+
+
+def index_record(offset: int, line: bytes) -> bytes:
+    parts = line.rstrip(b"\n").split(b"\t")
+    try:
+        record = IndexRecord(
+            offset=offset,
+            time=float(parts[_TIME]),
+            event_id=int(parts[_EVENT_ID]),
+            state=int(parts[_EVENT_STATE]),
+            host=_hash(parts[_EVENT_HOST]),
+            core_host=_hash(parts[_EVENT_CORE_HOST] if len(parts) > _EVENT_CORE_HOST else b""),
+            rule_id=_hash(parts[_EVENT_RULE_ID]),
+        )
+        return _RECORD.pack(*record)
+    except (IndexError, ValueError, struct.error):
+        # Such lines are not valid history entries, see convert_history_line.
+        return _RECORD.pack(*_INVALID._replace(offset=offset))
+
+
+_COMPARISONS: dict[OperatorName, Callable[[Any, Any], bool]] = {
+    "=": operator.eq,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+_NUMERIC_FIELDS = {
+    "history_time": "time",
+    "event_id": "event_id",
+    "event_state": "state",
+}
+
+_HASHED_FIELDS = {
+    "event_host": "host",
+    "event_core_host": "core_host",
+    "event_rule_id": "rule_id",
+}
+
+
+class _RecordFilter(NamedTuple):
+    field: int
+    accepts: Callable[[Any], bool]
+    keys: frozenset[bytes] | None
+    """The accepted packed values of a hash field"""
+
+
+def _record_filter(f: QueryFilter) -> _RecordFilter | None:
+    if (name := _NUMERIC_FIELDS.get(f.column_name)) is not None:
+        if (compare := _COMPARISONS.get(f.operator_name)) is None:
+            return None
+        argument = f.argument
+        return _RecordFilter(
+            IndexRecord._fields.index(name), lambda value: compare(value, argument), None
+        )
+
+    if (name := _HASHED_FIELDS.get(f.column_name)) is not None:
+        # "=" and "=~" differ in case sensitivity only, "in" is case insensitive anyway.
+        if f.operator_name in ("=", "=~"):
+            hashes = {_hash(str(f.argument).encode("utf-8"))}
+        elif f.operator_name == "in":
+            hashes = {_hash(str(a).encode("utf-8")) for a in f.argument}
+        else:
+            return None
+        return _RecordFilter(
+            IndexRecord._fields.index(name),
+            hashes.__contains__,
+            frozenset(struct.pack("<I", h) for h in hashes),
+        )
+
+    return None
+
+
+# Positions of the fields within a record, "<" plus one character per field
+_FIELD_OFFSETS = [
+    struct.calcsize(_RECORD.format[: nr + 1]) for nr in range(len(IndexRecord._fields))
+]
+
+
+class IndexQuery:
+    """The index records which may belong to lines matching some query filters
+
+    Looking at every record in Python would not be faster than letting grep look
+    at the lines, so the packed hashes of the first hashed column filtered on are
+    searched for in the raw index data.
+
+    >>> query = index_query([QueryFilter("event_host", "=", lambda x: True, "Heute")])
+    >>> data = b"".join(
+    ...     _RECORD.pack(*IndexRecord(0, 0.0, nr, 0, _hash(host), 0, 0))
+    ...     for nr, host in enumerate([b"morgen", b"heute", b"gestern", b"HEUTE"])
+    ... )
+    >>> list(query.record_numbers(data))
+    [3, 1]
+
+    A record may still be being appended while the index is read:
+
+    >>> list(query.record_numbers(data + data[_RECORD.size : _RECORD.size + 29]))
+    [3, 1]
+    """
+
+    def __init__(self, record_filters: Sequence[_RecordFilter]) -> None:
+        self._record_filters = record_filters
+        self._key_filter = next((rf for rf in record_filters if rf.keys is not None), None)
+
+    def record_numbers(self, data: bytes) -> Iterator[int]:
+        """The numbers of the matching records, the youngest ones first"""
+        # The index is read without locking, so only whole records are searched.
+        if rest := len(data) % _RECORD.size:
+            data = data[:-rest]
+        for nr in reversed(self._candidates(data)):
+            record = _RECORD.unpack_from(data, nr * _RECORD.size)
+            if all(rf.accepts(record[rf.field]) for rf in self._record_filters):
+                yield nr
+
+    def _candidates(self, data: bytes) -> Sequence[int]:
+        if self._key_filter is None or self._key_filter.keys is None:
+            return range(len(data) // _RECORD.size)
+        offset = _FIELD_OFFSETS[self._key_filter.field]
+        num_records = len(data) // _RECORD.size
+        numbers: set[int] = set()
+        for key in self._key_filter.keys:
+            # Matches across record boundaries are skipped, they are not hiding
+            # real ones because the search continues right after their start.
+            pos = data.find(key)
+            while pos != -1:
+                nr, rest = divmod(pos - offset, _RECORD.size)
+                if not rest and nr < num_records:
+                    numbers.add(nr)
+                pos = data.find(key, pos + 1)
+        return sorted(numbers)
+
+
+def index_query(filters: Iterable[QueryFilter]) -> IndexQuery | None:
+    """None if the index does not help for the filters
+
+    >>> index_query([QueryFilter("event_text", "~", lambda x: True, "foo")]) is None
+    True
+    """
+    record_filters = [rf for f in filters if (rf := _record_filter(f)) is not None]
+    return IndexQuery(record_filters) if record_filters else None
+
+
+class IndexedHistoryFile:
+    """A history file together with its index"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.index_path = index_path(path)
+
+    def append(self, line: bytes) -> None:
+        with self.path.open(mode="ab") as f:
+            offset = f.tell()
+            f.write(line)
+        if offset == 0:
+            self.index_path.write_bytes(index_record(offset, line))
+        # A missing index is not created here, only on its first use: It would
+        # miss the lines which have been written before.
+        elif self.index_path.exists():
+            if not self._indexes_lines_before(offset):
+                # A record is missing, e.g. because its write failed. Appending
+                # would shift the line numbers of all following records.
+                self.update_index()
+                return
+            with self.index_path.open(mode="ab") as f:
+                f.write(index_record(offset, line))
+
+    def _indexes_lines_before(self, offset: int) -> bool:
+        """Whether the last record belongs to the line ending at the given offset"""
+        with self.index_path.open(mode="rb") as f:
+            size = f.seek(0, 2)
+            if not size or size % _RECORD.size:
+                return False
+            f.seek(size - _RECORD.size)
+            (last,) = _OFFSET.unpack(f.read(_OFFSET.size))
+        if last >= offset:
+            return False
+        with self.path.open(mode="rb") as log:
+            log.seek(last)
+            return last + len(log.readline()) == offset
+
+    def update_index(self) -> None:
+        """Add records for all lines which are not indexed yet"""
+        data = self.index_path.read_bytes() if self.index_path.exists() else b""
+        num_records, rest = divmod(len(data), _RECORD.size)
+        with self.path.open(mode="rb") as log:
+            size = log.seek(0, 2)
+            offset = 0
+            if num_records:
+                (last,) = _OFFSET.unpack_from(data, (num_records - 1) * _RECORD.size)
+                if last < size:
+                    log.seek(last)
+                    offset = last + len(log.readline())
+                else:  # The index belongs to a different file, start from scratch.
+                    num_records = rest = 0
+                    data = b""
+            if not rest and num_records and offset == size:
+                return  # up to date
+            log.seek(offset)
+            new_records = []
+            for line in log:
+                if not line.endswith(b"\n"):
+                    break  # still being written
+                new_records.append(index_record(offset, line))
+                offset += len(line)
+        with self.index_path.open(mode="r+b" if data else "wb") as f:
+            f.truncate(num_records * _RECORD.size)
+            f.seek(num_records * _RECORD.size)
+            f.write(b"".join(new_records))
+
+    def read_lines(self, query: IndexQuery) -> Iterator[tuple[int, bytes]]:
+        """The line numbers and lines of the candidate entries, the youngest ones first"""
+        data = self.index_path.read_bytes()
+        with self.path.open(mode="rb") as log:
+            for nr in query.record_numbers(data):
+                (offset,) = _OFFSET.unpack_from(data, nr * _RECORD.size)
+                log.seek(offset)
+                yield nr + 1, log.readline()
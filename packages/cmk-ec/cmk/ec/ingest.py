@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Decoupling the reception of messages from their processing
+
+The event server thread only drains its sockets, the event pipe and the spool
+directory into an IngestBuffer, while a separate thread takes the messages out
+in batches to parse them and match them against the rules. This way a slow rule
+set does not make the kernel drop UDP datagrams during a burst of messages.
+
+The buffer is bounded. When it is full, sources with flow control (TCP, the
+event socket and the pipe) are not read anymore, so their senders have to wait,
+while datagrams of UDP sources are dropped and counted. There is one consumer
+only, so the messages of each source are processed in the order they came in.
+"""
+
+import socket
+import threading
+from collections import deque
+from collections.abc import Iterator, Sequence
+from typing import Any, Literal, NamedTuple
+
+from .perfcounters import Perfcounters
+
+__all__ = [
+    "INGEST_BATCH_SIZE",
+    "INGEST_BUFFER_SIZE",
+    "IngestBuffer",
+    "IngestItem",
+    "receive_datagrams",
+]
+
+# Messages, not bytes: The buffer stays below ~100MB even for long messages.
+INGEST_BUFFER_SIZE = 50000
+INGEST_BATCH_SIZE = 50
+# Do not starve the other sources during a flood of datagrams.
+_MAX_DATAGRAMS_PER_READ = 1000
+
+
+class IngestItem(NamedTuple):
+    kind: Literal["syslog", "trap"]
+    payload: Sequence[bytes]
+    """Some syslog messages or a single SNMP trap PDU"""
+    address: tuple[str, int] | None
+
+
+class IngestBuffer:
+    """Bounded FIFO of received messages between the receiving and the processing thread
+
+    >>> import logging
+    >>> buffer = IngestBuffer(capacity=2, perfcounters=Perfcounters(logging.getLogger()))
+    >>> buffer.put(IngestItem("syslog", [b"a", b"b"], None))
+    >>> buffer.full
+    True
+    >>> buffer.offer(IngestItem("syslog", [b"c"], ("127.0.0.1", 514)))
+    False
+    >>> [item.payload for item in buffer.take(max_messages=10, timeout=0)]
+    [[b'a', b'b']]
+    """
+
+    def __init__(self, capacity: int, perfcounters: Perfcounters) -> None:
+        self._capacity = capacity
+        self._perfcounters = perfcounters
+        self._items: deque[IngestItem] = deque()
+        self._num_messages = 0
+        self._closed = False
+        self._not_empty = threading.Condition(threading.Lock())
+
+    @property
+    def full(self) -> bool:
+        return self._num_messages >= self._capacity
+
+    def put(self, item: IngestItem) -> None:
+        """Add messages of a source with flow control, check `full` before reading those"""
+        with self._not_empty:
+            self._append(item)
+
+    def offer(self, item: IngestItem) -> bool:
+        """Add messages of a source without flow control, drop them if the buffer is full"""
+        with self._not_empty:
+            if self.full:
+                self._perfcounters.count("ingest_overflows", len(item.payload))
+                return False
+            self._append(item)
+            return True
+
+    def take(self, max_messages: int, timeout: float) -> list[IngestItem]:
+        """Remove the oldest items, wait for some if there are none
+
+        An empty result means that the timeout has been reached or the buffer has
+        been closed.
+        """
+        with self._not_empty:
+            if not self._items and not self._closed:
+                self._not_empty.wait(timeout)
+            batch: list[IngestItem] = []
+            num_messages = 0
+            while self._items and num_messages < max_messages:
+                item = self._items.popleft()
+                batch.append(item)
+                num_messages += len(item.payload)
+            self._num_messages -= num_messages
+            return batch
+
+    def close(self) -> None:
+        """Wake up the consumer, it has to take the remaining items until there are none"""
+        with self._not_empty:
+            self._closed = True
+            self._not_empty.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _append(self, item: IngestItem) -> None:
+        was_full = self.full
+        self._items.append(item)
+        self._num_messages += len(item.payload)
+        if not was_full and self.full:
+            self._perfcounters.count("ingest_stalls")
+        self._not_empty.notify()
+
+
+def receive_datagrams(sock: socket.socket, bufsize: int) -> Iterator[tuple[bytes, Any]]:
+    """The datagrams which can be received without blocking, with their addresses"""
+    for _nr in range(_MAX_DATAGRAMS_PER_READ):
+        try:
+            yield sock.recvfrom(bufsize, socket.MSG_DONTWAIT)
+        except BlockingIOError:
+            return
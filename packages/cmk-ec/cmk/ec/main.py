@@ -62,12 +62,20 @@ from .config import (
 from .core_queries import Connection, HostInfo, query_hosts_scheduled_downtime_depth
 from .crash_reporting import ECCrashReport
 from .event import create_events_from_syslog_messages, Event, scrub_string
+from .event_store import EventStore
 from .helpers import ECLock, parse_bytes_into_syslog_messages
 from .history import ActiveHistoryPeriod, get_logfile, History, HistoryWhat, quote_tab, TimedHistory
 from .history_file import FileHistory
 from .history_mongo import MongoDBHistory
 from .history_sqlite import SQLiteHistory, SQLiteSettings
 from .host_config import HostConfig
+from .ingest import (
+    INGEST_BATCH_SIZE,
+    INGEST_BUFFER_SIZE,
+    IngestBuffer,
+    IngestItem,
+    receive_datagrams,
+)
 from .log_level import VERBOSE, verbosity_to_log_level
 from .perfcounters import Perfcounters
 from .query import (
@@ -80,10 +88,19 @@ from .query import (
     QueryREPLICATE,
     StatusTable,
 )
-from .rule_matcher import compile_rule, match, MatchFailure, MatchResult, MatchSuccess, RuleMatcher
+from .rule_matcher import (
+    compile_rule,
+    match,
+    MatchFailure,
+    MatchResult,
+    MatchSuccess,
+    RuleMatcher,
+    RulePrefilter,
+)
 from .rule_packs import load_active_config
 from .settings import create_settings, FileDescriptor, PortNumber, Settings
 from .snmp import SNMPTrapParser
+from .status_store import PackedEventStatus, StatusJournalRecord, StatusStore
 from .syslog import SyslogFacility, SyslogPriority
 from .timeperiod import TimePeriods
 
@@ -109,13 +126,6 @@ def setup_logging_handler(stream: IO[str]) -> None:
     logger.addHandler(handler)
 
 
-class PackedEventStatus(TypedDict):
-    next_event_id: int
-    events: list[Event]
-    rule_stats: dict[str, int]
-    interval_starts: dict[str, int]
-
-
 class SlaveStatus(TypedDict):
     last_master_down: float | None
     last_sync: float
@@ -392,10 +402,13 @@ class EventServer(ECServerThread):
         self._syslog_udp: socket.socket | None = None
         self._syslog_tcp: socket.socket | None = None
         self._snmp_trap_socket: socket.socket | None = None
+        self._datagram_lock = threading.Lock()
 
         self._rules: list[Rule] = []
+        self._no_rules: list[Rule] = []
         self._rule_by_id: dict[str | None, Rule] = {}
         self._rule_hash: dict[int, dict[int, Any]] = {}
+        self._rule_prefilter = RulePrefilter(self._rules)
         self._hash_stats: list[list[int]] = []  # facility/priority
         for _unused_facility in range(32):
             self._hash_stats.append([0] * 8)
@@ -665,11 +678,22 @@ class EventServer(ECServerThread):
         return os.open(str(self.settings.paths.event_pipe.value), os.O_RDWR | os.O_NONBLOCK)
 
     def serve(self) -> None:
+        ingest_buffer = IngestBuffer(INGEST_BUFFER_SIZE, self._perfcounters)
+        processor = threading.Thread(
+            target=self._process_ingest_buffer, args=(ingest_buffer,), name="EventProcessor"
+        )
+        processor.start()
+        try:
+            self._receive(ingest_buffer)
+        finally:
+            ingest_buffer.close()
+            processor.join()
+
+    def _receive(self, ingest_buffer: IngestBuffer) -> None:
         pipe = self.open_pipe()
-        # We just read()/recvfrom() these, so we create no new FDs via them.
-        pipe_and_datagram_sockets = [
-            f for f in (pipe, self._syslog_udp, self._snmp_trap_socket) if f is not None
-        ]
+        # We just recvfrom() these, so we create no new FDs via them. They are always read, their
+        # messages are dropped when the ingest buffer is full.
+        datagram_sockets = [f for f in (self._syslog_udp, self._snmp_trap_socket) if f is not None]
         # We use accept() on these FDs, so we must be careful to avoid creating too many additional
         # FDs. We use an arbitrary limit below (less than the usual 1024 FD_SETSIZE limit), so we
         # don't accept() any more connections when there are already many of them. Connections get
@@ -677,17 +701,26 @@ class EventServer(ECServerThread):
         # the right thing here.
         stream_sockets = [f for f in (self._syslog_tcp, self._eventsocket) if f is not None]
         client_sockets: dict[FileDescr, tuple[socket.socket, tuple[str, int] | None, bytes]] = {}
-        select_timeout = 1
+        select_timeout: float = 1
         unprocessed_pipe_data = b""
         while not self._terminate_event.is_set():
+            # Sources with flow control are not read while the ingest buffer is full, so
+            # their senders have to wait for the processing to catch up.
+            flow_controlled: list[FileDescr | socket.socket] = (
+                []
+                if ingest_buffer.full
+                else [
+                    pipe,
+                    *(stream_sockets if len(client_sockets) < 900 else []),
+                    *client_sockets.keys(),
+                ]
+            )
             try:
                 readable: list[FileDescr | socket.socket] = select.select(
-                    pipe_and_datagram_sockets
-                    + (stream_sockets if len(client_sockets) < 900 else [])
-                    + list(client_sockets.keys()),
+                    datagram_sockets + flow_controlled,
                     [],
                     [],
-                    select_timeout,
+                    0.1 if ingest_buffer.full else select_timeout,
                 )[0]
             except OSError as e:
                 if e.args[0] != errno.EINTR:
@@ -728,7 +761,8 @@ class EventServer(ECServerThread):
                         messages, unprocessed = parse_bytes_into_syslog_messages(
                             previous_data + new_data
                         )
-                        self.process_syslog_messages(messages, address)
+                        if messages := list(messages):
+                            ingest_buffer.put(IngestItem("syslog", messages, address))
                         client_sockets[fd] = (cs, address, unprocessed)
                     else:  # the other side is gone, no more data will ever come
                         del client_sockets[fd]  # discarding previous_data is OK, it's incomplete
@@ -744,31 +778,81 @@ class EventServer(ECServerThread):
                 messages, unprocessed_pipe_data = parse_bytes_into_syslog_messages(
                     unprocessed_pipe_data
                 )
-                self.process_syslog_messages(messages, None)
-
-            # Read events from builtin syslog server
-            if self._syslog_udp is not None and self._syslog_udp in readable:
-                message, address = self._syslog_udp.recvfrom(4096)
-                self.process_syslog_messages(
-                    [message], parse_address("syslog socket (UDP)", address)
-                )
+                if messages := list(messages):
+                    ingest_buffer.put(IngestItem("syslog", messages, None))
 
-            # Read events from builtin snmptrap server
-            if self._snmp_trap_socket is not None and self._snmp_trap_socket in readable:
-                message, address = self._snmp_trap_socket.recvfrom(65535)
-                self.process_potential_event_instrumented(
-                    self.create_events_from_trap(message, parse_address("SNMP trap", address))
-                )
+            # Read events from builtin syslog and snmptrap server
+            if any(s in readable for s in datagram_sockets):
+                self._receive_datagrams(ingest_buffer)
 
+            if ingest_buffer.full:
+                continue
             if spool_files := sorted(
                 self.settings.paths.spool_dir.value.glob("[!.]*"), key=lambda x: x.stat().st_mtime
             ):
-                self.process_syslog_messages(spool_files[0].read_bytes().splitlines(), None)
+                ingest_buffer.put(
+                    IngestItem("syslog", spool_files[0].read_bytes().splitlines(), None)
+                )
                 spool_files[0].unlink()
                 select_timeout = 0  # enable fast processing to process further files
             else:
                 select_timeout = 1  # restore default select timeout
 
+    def _receive_datagrams(self, ingest_buffer: IngestBuffer, wait: bool = True) -> None:
+        """Move the received UDP messages into the ingest buffer
+
+        The processing thread does this between its batches, too: While it is busy, the
+        receiving thread gets the GIL too rarely to keep up with a burst of messages. The
+        lock keeps the messages in order.
+        """
+        if not self._datagram_lock.acquire(blocking=wait):
+            return
+        try:
+            if self._syslog_udp is not None:
+                for message, address in receive_datagrams(self._syslog_udp, 4096):
+                    ingest_buffer.offer(
+                        IngestItem(
+                            "syslog", [message], parse_address("syslog socket (UDP)", address)
+                        )
+                    )
+            if self._snmp_trap_socket is not None:
+                for message, address in receive_datagrams(self._snmp_trap_socket, 65535):
+                    ingest_buffer.offer(
+                        IngestItem("trap", [message], parse_address("SNMP trap", address))
+                    )
+        finally:
+            self._datagram_lock.release()
+
+    def _process_ingest_buffer(self, ingest_buffer: IngestBuffer) -> None:
+        setthreadtitle("EventProcessor")
+        while True:
+            self._receive_datagrams(ingest_buffer, wait=False)
+            if not (batch := ingest_buffer.take(INGEST_BATCH_SIZE, timeout=1)):
+                if ingest_buffer.closed:
+                    return
+                continue
+            try:
+                self.process_ingested(batch)
+            except Exception:
+                self._logger.exception("Exception while processing received messages")
+
+    def process_ingested(self, batch: Iterable[IngestItem]) -> None:
+        """Process received messages in the order they came in"""
+        # Consecutive messages of a source are parsed together.
+        for (kind, address), items in itertools.groupby(
+            batch, key=lambda item: (item.kind, item.address)
+        ):
+            if kind == "syslog":
+                self.process_syslog_messages(
+                    [message for item in items for message in item.payload], address
+                )
+            elif address is not None:
+                for item in items:
+                    for message in item.payload:
+                        self.process_potential_event_instrumented(
+                            self.create_events_from_trap(message, address)
+                        )
+
     def create_events_from_trap(self, data: bytes, address: tuple[str, int]) -> Iterator[Event]:
         try:
             if varbinds_and_ipaddress := self._snmp_trap_parser(data, address):
@@ -896,6 +980,7 @@ class EventServer(ECServerThread):
                             event["last_token"] = (
                                 last_token + new_tokens * secs_per_token
                             )  # not now! would be unfair
+                            self._event_status.update_event(event)
                             if event["count"] == 0:
                                 self._logger.info(
                                     "Rule %s/%s, event %d: again without allowed rate, dropping event",
@@ -950,6 +1035,7 @@ class EventServer(ECServerThread):
                         self._logger.info(
                             "Cannot do rule action: rule %s not present anymore.", event["rule_id"]
                         )
+                    self._event_status.update_event(event)
 
             # Handle events with a limited lifetime
             elif "live_until" in event and now >= event["live_until"]:
@@ -1005,9 +1091,8 @@ class EventServer(ECServerThread):
                 # First look for case 1: rule that already have at least one hit
                 # and this events in the state "counting" exist.
                 events_to_delete: list[tuple[Event, HistoryWhat]] = []
-                events = self._event_status.events()
-                for event in events:
-                    if event["rule_id"] == rule["id"] and event["phase"] == "counting":
+                for event in self._event_status.events_of_rule(rule["id"]):
+                    if event["phase"] == "counting":
                         # time has elapsed. Now lets see if we have reached
                         # the necessary count:
                         if event["count"] < expect["count"]:  # no -> trigger alarm
@@ -1062,10 +1147,8 @@ class EventServer(ECServerThread):
             merge, reset_ack = merge  # type: ignore[unreachable]
 
         if merge != "never":
-            for event in self._event_status.events():
-                if event["rule_id"] == rule["id"] and (
-                    event["phase"] == "open" or (event["phase"] == "ack" and merge == "acked")
-                ):
+            for event in self._event_status.events_of_rule(rule["id"]):
+                if event["phase"] == "open" or (event["phase"] == "ack" and merge == "acked"):
                     merge_event = event
                     break
 
@@ -1084,6 +1167,7 @@ class EventServer(ECServerThread):
             # Better rewrite (again). Rule might have changed. Also we have changed
             # the text and the user might have his own text added via set_text.
             self.rewrite_event(rule, merge_event, MatchGroups(), set_first=False)
+            self._event_status.update_event(merge_event)
             self._history.add(merge_event, "COUNTFAILED")
         else:
             # Create artificial event from scratch. Make sure that all important
@@ -1192,6 +1276,7 @@ class EventServer(ECServerThread):
                         ):
                             count_unspecific += 1
 
+        self._rule_prefilter = RulePrefilter(self._rules)
         self._logger.info(
             "Compiled %d active rules (ignoring %d disabled rules)", count_rules, count_disabled
         )
@@ -1202,6 +1287,10 @@ class EventServer(ECServerThread):
                 len(self._rules) - count_unspecific,
                 count_unspecific,
             )
+            self._logger.info(
+                "Rule prefilter: %d rules with required message texts or hosts",
+                len(self._rule_prefilter.stats()),
+            )
             for facility in list(range(23)) + [31]:
                 if facility in self._rule_hash:
                     stats = [
@@ -1275,7 +1364,12 @@ class EventServer(ECServerThread):
         # Rule optimizer
         if self._config["rule_optimizer"]:
             self._hash_stats[event["facility"]][event["priority"]] += 1
-            rule_candidates = self._rule_hash.get(event["facility"], {}).get(event["priority"], [])
+            rule_candidates = self._rule_prefilter.candidates(
+                self._rule_hash.get(event["facility"], {}).get(event["priority"], self._no_rules),
+                event,
+            )
+            if self._config["debug_rules"]:
+                self._logger.info("  %d rules left after prefiltering", len(rule_candidates))
         else:
             rule_candidates = self._rules
 
@@ -1383,6 +1477,7 @@ class EventServer(ECServerThread):
                                 existing_event,
                             )
 
+                        self._event_status.update_event(existing_event)
                         self._history.add(existing_event, "COUNTREACHED")
 
                         if "delay" not in rule and rule.get("autodelete"):
@@ -1414,6 +1509,7 @@ class EventServer(ECServerThread):
                             rule,
                             event,
                         )
+                        self._event_status.update_event(event)
                         if rule.get("autodelete"):
                             event["phase"] = "closed"
                             with self._event_status.lock:
@@ -1554,7 +1650,7 @@ class EventServer(ECServerThread):
             # not log.
 
     def get_hosts_with_active_event_limit(self) -> list[str]:
-        hosts = []
+        hosts: list[str] = []
         for (hostname, core_host), count in self._event_status.num_existing_events_by_host.items():
             host_config = self.host_config.get_config_for_host(core_host) if core_host else None
             if count >= self._get_host_event_limit(host_config)[0]:
@@ -1703,6 +1799,12 @@ class EventServer(ECServerThread):
             self._config["event_limit"]["by_host"]["action"],
         )
 
+    def get_rule_prefilter_stats(self) -> Mapping[str, tuple[int, int]]:
+        return self._rule_prefilter.stats()
+
+    def reset_rule_prefilter_stats(self) -> None:
+        self._rule_prefilter.reset_stats()
+
     def get_rule_by_id(self, rule_id: str) -> Rule | None:
         return self._rule_by_id.get(rule_id)
 
@@ -1939,14 +2041,22 @@ class StatusTableRules(StatusTable):
     columns: ClassVar[Columns] = [
         ("rule_id", ""),
         ("rule_hits", 0),
+        ("rule_prefilter_hits", 0),
+        ("rule_prefilter_misses", 0),
     ]
 
-    def __init__(self, logger: Logger, event_status: EventStatus) -> None:
+    def __init__(
+        self, logger: Logger, event_status: EventStatus, event_server: EventServer
+    ) -> None:
         super().__init__(logger)
         self._event_status = event_status
+        self._event_server = event_server
 
     def _enumerate(self, query: QueryGET) -> Iterable[Sequence[object]]:
-        return self._event_status.get_rule_stats()
+        rule_hits = dict(self._event_status.get_rule_stats())
+        prefilter_stats = self._event_server.get_rule_prefilter_stats()
+        for rule_id in sorted(rule_hits.keys() | prefilter_stats.keys()):
+            yield (rule_id, rule_hits.get(rule_id, 0), *prefilter_stats.get(rule_id, (0, 0)))
 
 
 class StatusTableStatus(StatusTable):
@@ -2008,7 +2118,7 @@ class StatusServer(ECServerThread):
 
         self._table_events = StatusTableEvents(logger, event_status)
         self._table_history = StatusTableHistory(logger, history)
-        self._table_rules = StatusTableRules(logger, event_status)
+        self._table_rules = StatusTableRules(logger, event_status, event_server)
         self._table_status = StatusTableStatus(logger, event_server)
         self._perfcounters = perfcounters
         self._lock_configuration = lock_configuration
@@ -2281,16 +2391,14 @@ class StatusServer(ECServerThread):
             raise MKClientError("Wrong number of arguments for DELETE")
         event_ids, user = arguments
         ids = {int(event_id) for event_id in event_ids.split(",")}
-        self._event_status.delete_events_by(
-            lambda event: event["id"] in ids, user, self._event_server.get_rule_by_id
-        )
+        self._event_status.delete_events_by_id(ids, user, self._event_server.get_rule_by_id)
 
     def handle_command_delete_events_of_host(self, arguments: list[str]) -> None:
         if len(arguments) != 2:
             raise MKClientError("Wrong number of arguments for DELETE_EVENTS_OF_HOST")
         hostname, user = arguments
-        self._event_status.delete_events_by(
-            lambda event: event["host"] == hostname, user, self._event_server.get_rule_by_id
+        self._event_status.delete_events_of_host(
+            HostName(hostname), user, self._event_server.get_rule_by_id
         )
 
     def handle_command_update(self, arguments: list[str]) -> None:
@@ -2317,6 +2425,7 @@ class StatusServer(ECServerThread):
                 event["contact"] = contact
             if user:
                 event["owner"] = user
+            self._event_status.update_event(event)
             self._history.add(event, "UPDATE", user)
         if failures:
             raise MKClientError(" ".join(failures))
@@ -2339,6 +2448,7 @@ class StatusServer(ECServerThread):
             event["state"] = int(newstate)
             if user:
                 event["owner"] = user
+            self._event_status.update_event(event)
             self._history.add(event, "CHANGESTATE", user)
         if failures:
             raise MKClientError(" ".join(failures))
@@ -2373,6 +2483,7 @@ class StatusServer(ECServerThread):
         else:
             self._logger.info("Resetting all rule counters")
             self._event_status.reset_counters(None)
+            self._event_server.reset_rule_prefilter_stats()
 
     def handle_command_action(self, arguments: list[str]) -> None:
         event_ids, user, action_id = arguments
@@ -2380,6 +2491,7 @@ class StatusServer(ECServerThread):
             event: Event | None = self._event_status.event(int(event_id))
             if user and event is not None:
                 event["owner"] = user
+                self._event_status.update_event(event)
 
             # TODO: De-duplicate code from do_event_actions()
             if action_id == "@NOTIFY" and event is not None:
@@ -2604,6 +2716,12 @@ class EventStatus:
         self._history = history
         self._logger = logger
         self._connection = connection
+        self._status_store = StatusStore(
+            settings.paths.status_snapshot_file.value,
+            settings.paths.status_journal_file.value,
+            settings.paths.status_file.value,
+            logger,
+        )
         self.flush()
 
     def reload_configuration(self, config: Config, history: History) -> None:
@@ -2611,13 +2729,14 @@ class EventStatus:
         self._history = history
 
     def flush(self) -> None:
-        # TODO: Improve types!
-        self._events: list[Event] = []
+        self._events = EventStore()
         self._next_event_id = 1
         self._rule_stats: dict[str, int] = {}
         # needed for expecting rules
         self._interval_starts: dict[str, int] = {}
-        self._initialize_event_limit_status()
+        # The events changed since the last save, None for removed ones
+        self._changed_events: dict[int, Event | None] = {}
+        self._needs_snapshot = True
 
         # TODO: might introduce some performance counters, like:
         # - number of received messages
@@ -2625,14 +2744,20 @@ class EventStatus:
         # - number of rule misses
 
     def events(self) -> list[Event]:
-        # TODO: Improve type!
-        return self._events
+        """A snapshot of all open events, oldest first, safe against removals"""
+        return list(self._events)
 
     def event(self, eid: int) -> Event | None:
-        for event in self._events:
-            if event["id"] == eid:
-                return event
-        return None
+        return self._events.get(eid)
+
+    def events_of_rule(self, rule_id: str | None) -> list[Event]:
+        return self._events.of_rule(rule_id)
+
+    def update_event(self, event: Event) -> None:
+        """Needs to be called after an open event has been changed in place"""
+        if event in self._events:
+            self._events.reindex(event)
+            self._changed_events[event["id"]] = event
 
     def interval_start(self, rule_id: str, interval: ExpectInterval) -> int:
         """
@@ -2688,30 +2813,39 @@ class EventStatus:
     def pack_status(self) -> PackedEventStatus:
         return PackedEventStatus(
             next_event_id=self._next_event_id,
-            events=self._events,
+            events=list(self._events),
             rule_stats=self._rule_stats,
             interval_starts=self._interval_starts,
         )
 
     def unpack_status(self, status: PackedEventStatus) -> None:
         self._next_event_id = status["next_event_id"]
-        self._events = status["events"]
+        self._events = EventStore(status["events"])
         self._rule_stats = status["rule_stats"]
         self._interval_starts = status["interval_starts"]
+        self._changed_events = {}
+        self._needs_snapshot = True
 
-    def save_status(self) -> None:
+    def save_status(self, snapshot: bool = False) -> None:
+        """Save the changes since the last save or, if requested, the complete status"""
         now = time.time()
-        status = self.pack_status()
-        path = self.settings.paths.status_file.value
-        path_new = path.parent / (path.name + ".new")
-        # Believe it or not: cPickle is more than two times slower than repr()
-        with path_new.open(mode="wb") as f:
-            f.write((repr(status) + "\n").encode("utf-8"))
-            f.flush()
-            os.fsync(f.fileno())
-        path_new.rename(path)
+        if snapshot or self._needs_snapshot:
+            self._status_store.save_snapshot(self.pack_status())
+            what = "snapshot"
+        else:
+            self._status_store.append(
+                StatusJournalRecord(
+                    events=self._changed_events,
+                    next_event_id=self._next_event_id,
+                    rule_stats=self._rule_stats,
+                    interval_starts=self._interval_starts,
+                )
+            )
+            what = f"{len(self._changed_events)} changed events"
+        self._changed_events = {}
+        self._needs_snapshot = False
         elapsed = time.time() - now
-        self._logger.log(VERBOSE, "Saved event state to %s in %.3fms.", path, elapsed * 1000)
+        self._logger.log(VERBOSE, "Saved event state (%s) in %.3fms.", what, elapsed * 1000)
 
     def reset_counters(self, rule_id: str | None) -> None:
         if rule_id:
@@ -2722,21 +2856,15 @@ class EventStatus:
         self.save_status()
 
     def load_status(self, event_server: EventServer) -> None:
-        path = self.settings.paths.status_file.value
-        if path.exists():
-            try:
-                status = ast.literal_eval(path.read_text(encoding="utf-8"))
-                self._next_event_id = status["next_event_id"]
-                self._events = status["events"]
-                self._rule_stats = status["rule_stats"]
-                self._interval_starts = status.get("interval_starts", {})
-                self._logger.info("Loaded event state from %s.", path)
-            except Exception:
-                self._logger.exception("Error loading event state from %s", path)
-                raise
+        events: list[Event] = list(self._events)
+        if (status := self._status_store.load()) is not None:
+            self._next_event_id = status["next_event_id"]
+            events = status["events"]
+            self._rule_stats = status["rule_stats"]
+            self._interval_starts = status["interval_starts"]
 
         # Add new columns and fix broken events
-        for event in self._events:
+        for event in events:
             event.setdefault("ipaddress", "")
             event.setdefault("host", HostName(""))
             event.setdefault("application", "")
@@ -2746,48 +2874,31 @@ class EventStatus:
                 event_server.add_core_host_to_event(event)
                 event["host_in_downtime"] = False
 
-        # core_host is needed to initialize the status
-        self._initialize_event_limit_status()
+        # core_host is needed to index the events
+        self._events = EventStore(events)
+        # Start over with a snapshot of the fixed events and an empty journal.
+        self._changed_events = {}
+        self._needs_snapshot = True
 
-    def _initialize_event_limit_status(self) -> None:
-        """
-        Called on Event Console initialization from status file to initialize
-        the current event limit state -> Sets internal counters which are
-        updated during runtime.
-        """
-        self.num_existing_events = len(self._events)
+    # The event limit state is derived from the indexes of the event store.
+    @property
+    def num_existing_events(self) -> int:
+        return len(self._events)
 
-        self.num_existing_events_by_host: dict[tuple[str, HostName | None], int] = {}
-        self.num_existing_events_by_rule: dict[Any, int] = {}
-        for event in self._events:
-            self._count_event_add(event)
+    @property
+    def num_existing_events_by_host(self) -> Mapping[tuple[HostName, HostName | None], int]:
+        return self._events.count_by_host()
 
-    def _count_event_add(self, event: Event) -> None:
-        host_key = (event["host"], event["core_host"])
-        if host_key not in self.num_existing_events_by_host:
-            self.num_existing_events_by_host[host_key] = 1
-        else:
-            self.num_existing_events_by_host[host_key] += 1
-
-        if event["rule_id"] not in self.num_existing_events_by_rule:
-            self.num_existing_events_by_rule[event["rule_id"]] = 1
-        else:
-            self.num_existing_events_by_rule[event["rule_id"]] += 1
-
-    def _count_event_remove(self, event: Event) -> None:
-        host_key = (event["host"], event["core_host"])
-
-        self.num_existing_events -= 1
-        self.num_existing_events_by_host[host_key] -= 1
-        self.num_existing_events_by_rule[event["rule_id"]] -= 1
+    @property
+    def num_existing_events_by_rule(self) -> Mapping[str | None, int]:
+        return self._events.count_by_rule()
 
     def new_event(self, event: Event) -> None:
         self._perfcounters.count("events")
         event["id"] = self._next_event_id
         self._next_event_id += 1
-        self._events.append(event)
-        self.num_existing_events += 1
-        self._count_event_add(event)
+        self._events.add(event)
+        self._changed_events[event["id"]] = event
         self._history.add(event, "NEW")
 
     def archive_event(self, event: Event) -> None:
@@ -2798,20 +2909,19 @@ class EventStatus:
         self._history.add(event, "ARCHIVED")
 
     def remove_event(self, event: Event, delete_reason: HistoryWhat, user: str = "") -> None:
-        try:
-            self._events.remove(event)
-            self._history.add(event, delete_reason, user)
-            self._count_event_remove(event)
-        except ValueError:
-            self._logger.exception("Cannot remove event %d: not present", event["id"])
+        if not self._events.remove(event):
+            self._logger.error("Cannot remove event %d: not present", event["id"])
+            return
+        self._changed_events[event["id"]] = None
+        self._history.add(event, delete_reason, user)
 
     # protected by self.lock
     def remove_oldest_event(self, ty: LimitKind, event: Event) -> None:
         match ty:
             case "overall":
                 self._logger.log(VERBOSE, "  Removing oldest event")
-                oldest_event = self._events[0]
-                self.remove_event(oldest_event, "AUTODELETE")
+                if (oldest_event := self._events.oldest()) is not None:
+                    self.remove_event(oldest_event, "AUTODELETE")
             case "by_rule":
                 if event["rule_id"] is not None:
                     self._logger.log(
@@ -2824,27 +2934,23 @@ class EventStatus:
 
     # protected by self.lock
     def _remove_oldest_event_of_rule(self, rule_id: str) -> None:
-        for event in self._events:
-            if event["rule_id"] == rule_id:
-                self.remove_event(event, "AUTODELETE")
-                return
+        if (event := self._events.oldest_of_rule(rule_id)) is not None:
+            self.remove_event(event, "AUTODELETE")
 
     # protected by self.lock
-    def _remove_oldest_event_of_host(self, hostname: str) -> None:
-        for event in self._events:
-            if event["host"] == hostname:
-                self.remove_event(event, "AUTODELETE")
-                return
+    def _remove_oldest_event_of_host(self, hostname: HostName) -> None:
+        if (event := self._events.oldest_of_host(hostname)) is not None:
+            self.remove_event(event, "AUTODELETE")
 
     # protected by self.lock
     def get_num_existing_events_by(self, ty: LimitKind, event: Event) -> int:
         match ty:
             case "overall":
-                return self.num_existing_events
+                return len(self._events)
             case "by_rule":
-                return self.num_existing_events_by_rule.get(event["rule_id"], 0)
+                return self._events.count_of_rule(event["rule_id"])
             case "by_host":
-                return self.num_existing_events_by_host.get((event["host"], event["core_host"]), 0)
+                return self._events.count_of_host(event["host"], event["core_host"])
             case _ as unreachable:
                 assert_never(unreachable)
 
@@ -2862,10 +2968,8 @@ class EventStatus:
         """
         with self.lock:
             to_delete = []
-            for event in self._events:
-                if event["rule_id"] == rule["id"] and self.cancelling_match(
-                    match_groups, new_event, event, rule
-                ):
+            for event in self._events.of_rule(rule["id"]):
+                if self.cancelling_match(match_groups, new_event, event, rule):
                     # Fill a few fields of the cancelled event with data from
                     # the cancelling event so that action scripts have useful
                     # values and the logfile entry if more relevant.
@@ -3038,10 +3142,11 @@ class EventStatus:
                 preserve["contact"] = found["contact"]
         found.update(event)
         found.update(preserve)
+        self.update_event(found)
 
     def count_expected_event(self, event_server: EventServer, event: Event) -> None:
-        for ev in self._events:
-            if ev["rule_id"] == event["rule_id"] and ev["phase"] == "counting":
+        for ev in self._events.of_rule(event["rule_id"]):
+            if ev["phase"] == "counting":
                 self.count_event_up(ev, event)
                 return
 
@@ -3058,31 +3163,30 @@ class EventStatus:
         since the event has been created because the count was too
         low in the specified period of time.
         """
-        for ev in self._events:
-            if ev["rule_id"] == event["rule_id"]:
-                if ev["phase"] == "ack" and not count["count_ack"]:
-                    continue  # skip acknowledged events
+        for ev in self._events.of_rule(event["rule_id"]):
+            if ev["phase"] == "ack" and not count["count_ack"]:
+                continue  # skip acknowledged events
 
-                if count["separate_host"] and ev["host"] != event["host"]:
-                    continue  # treat events with separated hosts separately
+            if count["separate_host"] and ev["host"] != event["host"]:
+                continue  # treat events with separated hosts separately
 
-                if count["separate_application"] and ev["application"] != event["application"]:
-                    continue  # same for application
+            if count["separate_application"] and ev["application"] != event["application"]:
+                continue  # same for application
 
-                if count["separate_match_groups"] and ev["match_groups"] != event["match_groups"]:
-                    continue
+            if count["separate_match_groups"] and ev["match_groups"] != event["match_groups"]:
+                continue
 
-                count_duration = count.get("count_duration")
-                if count_duration is not None and ev["first"] + count_duration < event["time"]:
-                    # Counting has been discontinued on this event after a certain time
-                    continue
+            count_duration = count.get("count_duration")
+            if count_duration is not None and ev["first"] + count_duration < event["time"]:
+                # Counting has been discontinued on this event after a certain time
+                continue
 
-                if ev["host_in_downtime"] != event["host_in_downtime"]:
-                    continue  # treat events with different downtime states separately
+            if ev["host_in_downtime"] != event["host_in_downtime"]:
+                continue  # treat events with different downtime states separately
 
-                found = ev
-                self.count_event_up(found, event)
-                break
+            found = ev
+            self.count_event_up(found, event)
+            break
         else:
             event["count"] = 1
             event["phase"] = "counting"
@@ -3093,24 +3197,38 @@ class EventStatus:
         # NOTE: Suppression not needed anymore when https://github.com/python/mypy/pull/19696 has been merged.
         if found["phase"] == "counting" and found["count"] >= count["count"]:  # type: ignore[possibly-undefined]
             found["phase"] = "open"
+            self.update_event(found)
             return found  # do event action, return found copy of event
         return None  # do not do event action
 
-    def delete_events_by(
-        self, predicate: Callable[[Event], bool], user: str, get_rule: Callable[[str], Rule | None]
+    def delete_events_by_id(
+        self, event_ids: Iterable[int], user: str, get_rule: Callable[[str], Rule | None]
     ) -> None:
-        for event in self._events[:]:
-            if predicate(event):
-                event["phase"] = "closed"
-                if user:
-                    event["owner"] = user
-                self.remove_event(event, "DELETE", user)
-                rule_id = event["rule_id"]
-                if event["id"] + 1 == self._next_event_id and rule_id in self._interval_starts:
-                    event_rule = get_rule(rule_id)
-                    if event_rule is not None and "expect" in event_rule:
-                        self.clear_interval_start(rule_id)
-                        self.interval_start(rule_id, event_rule["expect"]["interval"])
+        self._delete_events(
+            [event for eid in sorted(event_ids) if (event := self._events.get(eid)) is not None],
+            user,
+            get_rule,
+        )
+
+    def delete_events_of_host(
+        self, hostname: HostName, user: str, get_rule: Callable[[str], Rule | None]
+    ) -> None:
+        self._delete_events(self._events.of_host(hostname), user, get_rule)
+
+    def _delete_events(
+        self, events: Iterable[Event], user: str, get_rule: Callable[[str], Rule | None]
+    ) -> None:
+        for event in events:
+            event["phase"] = "closed"
+            if user:
+                event["owner"] = user
+            self.remove_event(event, "DELETE", user)
+            rule_id = event["rule_id"]
+            if event["id"] + 1 == self._next_event_id and rule_id in self._interval_starts:
+                event_rule = get_rule(rule_id)
+                if event_rule is not None and "expect" in event_rule:
+                    self.clear_interval_start(rule_id)
+                    self.interval_start(rule_id, event_rule["expect"]["interval"])
 
     def get_events(self) -> Iterable[Event]:
         return self._events
@@ -3591,7 +3709,7 @@ def main(omd_root: Path, argv: Sequence[str]) -> None:
         os.close(pipe)  # Close pipe
 
         logger.log(VERBOSE, "Saving final event state")
-        event_status.save_status()
+        event_status.save_status(snapshot=True)
 
         logger.log(VERBOSE, "Cleaning up sockets")
         settings.paths.unix_socket.value.unlink()
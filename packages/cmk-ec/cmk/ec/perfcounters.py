@@ -28,6 +28,8 @@ class Perfcounters:
         "overflows",
         "events",
         "connects",
+        "ingest_stalls",  # times the ingest buffer became full
+        "ingest_overflows",  # UDP messages dropped because of a full ingest buffer
     ]
 
     # Average processing times
@@ -51,9 +53,9 @@ class Perfcounters:
 
         self._logger = logger.getChild("Perfcounters")
 
-    def count(self, counter: str) -> None:
+    def count(self, counter: str, amount: int = 1) -> None:
         with self._lock:
-            self._counters[counter] += 1
+            self._counters[counter] += amount
 
     def count_time(self, counter: str, ptime: float) -> None:
         with self._lock:
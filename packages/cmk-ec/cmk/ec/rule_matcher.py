@@ -5,9 +5,10 @@
 
 from __future__ import annotations
 
+import heapq
 import ipaddress
 import re
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Mapping, Sequence
 from dataclasses import dataclass
 from logging import Logger
 from typing import Literal
@@ -436,3 +437,275 @@ class RuleMatcher:
             return MatchFailure(reason="did not match, message text does not match")
 
         return MatchSuccess(cancelling=False, match_groups=MatchGroups())
+
+
+type _Trie = dict[str, _Trie]
+
+# Literals shorter than this are too unspecific to be worth a prefilter entry.
+_MIN_LITERAL_LENGTH = 3
+
+_REGEX_QUANTIFIER = re.compile(r"\{\d*(?:,\d*)?\}")
+
+
+def _required_literal(pattern: TextPattern) -> str | None:
+    r"""The longest literal every text matched by the pattern has to contain, lowercased
+
+    >>> _required_literal("disk full")
+    'disk full'
+    >>> _required_literal(re.compile(r"^ERROR: (Disk) .*full$", re.IGNORECASE))
+    'error: '
+    >>> _required_literal(re.compile(r"Disk /dev/sd\w+ at 9\d\.5%", re.IGNORECASE))
+    'disk /dev/sd'
+    >>> _required_literal(re.compile("foo|barbaz", re.IGNORECASE)) is None
+    True
+    """
+    if isinstance(pattern, str):
+        return pattern if len(pattern) >= _MIN_LITERAL_LENGTH else None
+    if pattern.flags & re.VERBOSE or (runs := _literal_runs(pattern.pattern)) is None:
+        return None
+    longest = max(runs, key=len)
+    # Case insensitive matching of non-ASCII characters does not follow str.lower(),
+    # see RulePrefilter, so only pure ASCII literals are used.
+    if len(longest) < _MIN_LITERAL_LENGTH or not longest.isascii():
+        return None
+    return longest.lower()
+
+
+def _literal_runs(regex: str) -> list[str] | None:
+    r"""Runs of literal characters every text matched by the regex has to contain
+
+    Only the top level of the regex is taken into account: groups, character classes,
+    special characters and sequences end a run, and a quantifier also removes the
+    character before it. None if the regex has top level alternatives.
+
+    >>> _literal_runs(r"^disk (sda|sdb) .*ful+ at 9\d\.5%?")
+    ['', 'disk ', '', ' ', '', 'ful', ' at 9', '.5', '']
+    >>> _literal_runs(r"[|(]disk{1,2} full")
+    ['', 'dis', ' full']
+    >>> _literal_runs(r"disk full|disk error") is None
+    True
+    """
+    runs = [""]
+    depth = 0
+    pos = 0
+    while pos < len(regex):
+        char = regex[pos]
+        pos += 1
+        if char == "\\":
+            escaped = regex[pos : pos + 1]
+            pos += 1
+            if depth or not escaped or escaped.isalnum():
+                runs.append("")  # special sequence, e.g. \d or \1
+            else:
+                runs[-1] += escaped
+        elif char == "[":
+            # "]" is a literal right at the start of a class
+            pos += regex.startswith("^", pos)
+            pos += regex.startswith("]", pos)
+            while pos < len(regex) and regex[pos] != "]":
+                pos += 2 if regex[pos] == "\\" else 1
+            pos += 1
+            runs.append("")
+        elif char in "()":
+            depth += 1 if char == "(" else -1
+            runs.append("")
+        elif depth:
+            continue
+        elif char == "|":
+            return None
+        elif char in "*?{":
+            if char == "{":
+                if (quantifier := _REGEX_QUANTIFIER.match(regex, pos - 1)) is None:
+                    runs[-1] += char
+                    continue
+                pos = quantifier.end()
+            runs[-1] = runs[-1][:-1]  # the quantified character may be missing
+            runs.append("")
+        elif char in "+.^$":
+            runs.append("")
+        else:
+            runs[-1] += char
+    return runs
+
+
+def _literal_trie_regex(literals: Iterable[str]) -> re.Pattern[str] | None:
+    """Compile the literals into one regex shaped like a trie
+
+    At every position of a text the regex finds the longest of the literals starting
+    there. All the other literals starting there are prefixes of that one.
+    """
+    trie: _Trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    if not trie:
+        return None
+    return re.compile(f"(?=({_trie_node_regex(trie)}))", re.DOTALL)
+
+
+def _trie_node_regex(node: _Trie) -> str:
+    # Longer continuations come first, the end of a literal (if any) last.
+    branches = [re.escape(char) + _trie_node_regex(child) for char, child in node.items() if char]
+    if not branches:
+        return ""
+    if len(branches) == 1 and "" not in node:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ("|" if "" in node else "") + ")"
+
+
+@dataclass(frozen=True, kw_only=True)
+class _Requirement:
+    # One of these (lowercased) literals has to occur in the lowercased text.
+    literals: frozenset[str] | None
+    # The literals have been taken from a regex, see RulePrefilter.
+    from_regex: bool
+    # The lowercased host has to be equal to this.
+    host: str | None
+
+
+def _requirement(rule: Rule) -> _Requirement | None:
+    """What a text and a host need to have for the rule to match or cancel at all"""
+    if rule.get("invert_matching") or rule.get("disabled"):
+        return None
+    literals: frozenset[str] | None = None
+    from_regex = False
+    if "match" in rule:
+        message_patterns = [rule["match"], *([rule["match_ok"]] if "match_ok" in rule else [])]
+        required = [_required_literal(pattern) for pattern in message_patterns]
+        if None not in required:
+            literals = frozenset(literal for literal in required if literal is not None)
+            from_regex = any(not isinstance(pattern, str) for pattern in message_patterns)
+    host_pattern = rule.get("match_host")
+    host = host_pattern if isinstance(host_pattern, str) else None
+    if literals is None and host is None:
+        return None
+    return _Requirement(literals=literals, from_regex=from_regex, host=host)
+
+
+@dataclass
+class _Bucket:
+    unconstrained: Sequence[int]
+    members: frozenset[int]
+    num_checked_events: int = 0
+
+
+class RulePrefilter:
+    """Find the few rules which can possibly match an event without trying all of them
+
+    For each rule the prefilter extracts what an event has to look like for the rule to
+    match at all (also for cancelling): a literal taken from the message patterns and
+    the host name of a plain host pattern. All literals are compiled into one regex,
+    so a single scan of the message text tells which of them occur. Rules without
+    such a requirement (e.g. inverted rules) always have to be tried.
+
+    Regexes are matched case insensitively, which for a few non-ASCII characters
+    is not the same as comparing the lowercased text, e.g. "ſ" matches "s". For texts
+    with non-ASCII characters the literals taken from regexes are therefore ignored.
+
+    The rules are referenced by their position in the list given to the constructor.
+    Only rules (and lists of rules) from that list may be passed to `candidates`.
+    """
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self._rules = rules
+        self._serials = {id(rule): serial for serial, rule in enumerate(rules)}
+        self._requirements = [_requirement(rule) for rule in rules]
+        self._rules_by_literal: dict[str, list[int]] = {}
+        self._rules_by_host: dict[str, list[int]] = {}
+        for serial, requirement in enumerate(self._requirements):
+            if requirement is None:
+                continue
+            if requirement.literals is not None:
+                for literal in requirement.literals:
+                    self._rules_by_literal.setdefault(literal, []).append(serial)
+            elif requirement.host is not None:
+                self._rules_by_host.setdefault(requirement.host, []).append(serial)
+        self._literal_regex = _literal_trie_regex(self._rules_by_literal)
+        # all literals which occur in a text if the key occurs there, see _literal_trie_regex
+        self._prefixes = {
+            literal: [
+                prefix
+                for n in range(_MIN_LITERAL_LENGTH, len(literal) + 1)
+                if (prefix := literal[:n]) in self._rules_by_literal
+            ]
+            for literal in self._rules_by_literal
+        }
+        self._buckets: dict[int, _Bucket] = {}
+        self._hits = [0] * len(rules)
+
+    def candidates(self, rules: Sequence[Rule], event: Event) -> list[Rule]:
+        """The rules that might match the event, in their original order"""
+        bucket = self._bucket(rules)
+        admitted = self._admitted(event) & bucket.members
+        bucket.num_checked_events += 1
+        for serial in admitted:
+            self._hits[serial] += 1
+        if not admitted:
+            serials: Iterable[int] = bucket.unconstrained
+        else:
+            serials = heapq.merge(bucket.unconstrained, sorted(admitted))
+        return [self._rules[serial] for serial in serials]
+
+    def stats(self) -> Mapping[str, tuple[int, int]]:
+        """Per prefiltered rule: how often did an event fulfill its requirement or not?
+
+        Only the events checked against the rule are counted, i.e. the events for which
+        the rule has been among the rules passed to `candidates`.
+        """
+        num_checked_events = [0] * len(self._rules)
+        for bucket in self._buckets.values():
+            for serial in bucket.members:
+                num_checked_events[serial] += bucket.num_checked_events
+        stats: dict[str, tuple[int, int]] = {}
+        for serial, requirement in enumerate(self._requirements):
+            if requirement is None:
+                continue
+            old_hits, old_misses = stats.get(self._rules[serial]["id"], (0, 0))
+            hits = self._hits[serial]
+            stats[self._rules[serial]["id"]] = (
+                old_hits + hits,
+                old_misses + num_checked_events[serial] - hits,
+            )
+        return stats
+
+    def reset_stats(self) -> None:
+        for bucket in self._buckets.values():
+            bucket.num_checked_events = 0
+        self._hits = [0] * len(self._rules)
+
+    def _bucket(self, rules: Sequence[Rule]) -> _Bucket:
+        # The rule hash of the event server consists of a fixed set of lists.
+        if (bucket := self._buckets.get(id(rules))) is None:
+            serials = [self._serials[id(rule)] for rule in rules]
+            bucket = self._buckets[id(rules)] = _Bucket(
+                unconstrained=[s for s in serials if self._requirements[s] is None],
+                members=frozenset(s for s in serials if self._requirements[s] is not None),
+            )
+        return bucket
+
+    def _admitted(self, event: Event) -> set[int]:
+        """The prefiltered rules whose requirements are fulfilled by the event"""
+        host = event["host"].lower()
+        admitted = set(self._rules_by_host.get(host, ()))
+        if self._literal_regex is None:
+            return admitted
+
+        text = event["text"].lower()
+        found: set[str] = set()
+        for m in self._literal_regex.finditer(text):
+            found.update(self._prefixes[m.group(1)])
+        candidates = {serial for literal in found for serial in self._rules_by_literal[literal]}
+        if not text.isascii():
+            candidates.update(
+                serial
+                for serials in self._rules_by_literal.values()
+                for serial in serials
+                if (requirement := self._requirements[serial]) and requirement.from_regex
+            )
+        for serial in candidates:
+            requirement = self._requirements[serial]
+            if requirement is not None and requirement.host in (None, host):
+                admitted.add(serial)
+        return admitted
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Persistence of the event status as a snapshot plus an append-only journal
+
+Saving the status appends the changes since the last save to the journal, so
+the costs of a save do not depend on the number of open events. As soon as the
+journal has grown larger than the snapshot, it is put aside and merged into a
+new snapshot by a background thread, which needs neither the event status nor
+its lock. Loading replays the journals on top of the snapshot.
+
+Both files consist of pickles: They are much faster to read than the repr()
+based status file of older versions, which is migrated on the first load. A
+record at the end of the journal which has only been written partially, e.g.
+because of a crash, is ignored.
+"""
+
+import ast
+import itertools
+import os
+import pickle
+import threading
+from collections.abc import Iterable, Iterator
+from logging import Logger
+from pathlib import Path
+from typing import TypedDict
+
+from .event import Event
+
+__all__ = ["PackedEventStatus", "StatusJournalRecord", "StatusStore"]
+
+# Do not compact tiny journals, the snapshot might be tiny as well.
+_MIN_COMPACTION_SIZE = 1024 * 1024
+
+
+class PackedEventStatus(TypedDict):
+    next_event_id: int
+    events: list[Event]
+    rule_stats: dict[str, int]
+    interval_starts: dict[str, int]
+
+
+class StatusJournalRecord(TypedDict):
+    events: dict[int, Event | None]
+    """The events changed since the last save by their ID, None for removed ones"""
+    next_event_id: int
+    rule_stats: dict[str, int]
+    interval_starts: dict[str, int]
+
+
+class StatusStore:
+    def __init__(
+        self,
+        snapshot_path: Path,
+        journal_path: Path,
+        legacy_path: Path,
+        logger: Logger,
+        min_compaction_size: int = _MIN_COMPACTION_SIZE,
+    ) -> None:
+        self._snapshot_path = snapshot_path
+        self._journal_path = journal_path
+        # The journal which is currently merged into the snapshot
+        self._compacting_path = journal_path.with_name(journal_path.name + ".compacting")
+        self._legacy_path = legacy_path
+        self._logger = logger
+        self._min_compaction_size = min_compaction_size
+        self._snapshot_size = _file_size(snapshot_path)
+        self._journal_size = _file_size(journal_path)
+        self._compaction: threading.Thread | None = None
+
+    def load(self) -> PackedEventStatus | None:
+        """The stored status, None if nothing has been stored yet"""
+        self.wait_for_compaction()
+        if not any(
+            p.exists() for p in (self._snapshot_path, self._compacting_path, self._journal_path)
+        ):
+            return self._migrate_legacy_status()
+        status = _read_snapshot(self._snapshot_path)
+        _replay(
+            status,
+            itertools.chain(
+                self._read_journal(self._compacting_path), self._read_journal(self._journal_path)
+            ),
+        )
+        self._logger.info("Loaded event state from %s.", self._snapshot_path)
+        return status
+
+    def save_snapshot(self, status: PackedEventStatus) -> None:
+        """Replace the snapshot and all journals with the given status"""
+        self.wait_for_compaction()
+        self._snapshot_size = _write_atomically(self._snapshot_path, status)
+        self._compacting_path.unlink(missing_ok=True)
+        self._journal_path.unlink(missing_ok=True)
+        self._journal_size = 0
+
+    def append(self, record: StatusJournalRecord) -> None:
+        data = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._journal_path.open(mode="ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_size += len(data)
+        if (
+            self._journal_size > max(self._min_compaction_size, self._snapshot_size)
+            and not self._compacting()
+        ):
+            self._start_compaction()
+
+    def wait_for_compaction(self) -> None:
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+
+    def _compacting(self) -> bool:
+        return self._compaction is not None and self._compaction.is_alive()
+
+    def _start_compaction(self) -> None:
+        if self._compacting_path.exists():
+            # A failed compaction has left its journal over: Retry by merging the
+            # current journal into it instead of overwriting it. Should we crash
+            # before the journal is removed, its records are replayed twice,
+            # which does no harm as they contain the complete changed state.
+            with self._compacting_path.open(mode="ab") as f:
+                f.write(self._journal_path.read_bytes())
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_path.unlink()
+        else:
+            self._journal_path.rename(self._compacting_path)
+        self._journal_size = 0
+        self._compaction = threading.Thread(
+            target=self._compact, name="status-compaction", daemon=True
+        )
+        self._compaction.start()
+
+    def _compact(self) -> None:
+        try:
+            status = _read_snapshot(self._snapshot_path)
+            _replay(status, self._read_journal(self._compacting_path))
+            self._snapshot_size = _write_atomically(self._snapshot_path, status)
+            self._compacting_path.unlink()
+            self._logger.debug("Compacted event state journal into %s", self._snapshot_path)
+        except Exception:
+            self._logger.exception("Cannot compact event state journal %s", self._compacting_path)
+
+    def _read_journal(self, path: Path) -> Iterator[StatusJournalRecord]:
+        try:
+            f = path.open(mode="rb")
+        except FileNotFoundError:
+            return
+        with f:
+            while True:
+                try:
+                    record = pickle.load(f)
+                except EOFError:
+                    return
+                except Exception:
+                    self._logger.warning("Ignoring incomplete record at the end of %s", path)
+                    return
+                yield record
+
+    def _migrate_legacy_status(self) -> PackedEventStatus | None:
+        if not self._legacy_path.exists():
+            return None
+        try:
+            legacy = ast.literal_eval(self._legacy_path.read_text(encoding="utf-8"))
+        except Exception:
+            self._logger.exception("Error loading event state from %s", self._legacy_path)
+            raise
+        status = PackedEventStatus(
+            next_event_id=legacy["next_event_id"],
+            events=legacy["events"],
+            rule_stats=legacy["rule_stats"],
+            interval_starts=legacy.get("interval_starts", {}),
+        )
+        self.save_snapshot(status)
+        self._legacy_path.unlink()
+        self._logger.info(
+            "Migrated event state from %s to %s.", self._legacy_path, self._snapshot_path
+        )
+        return status
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _read_snapshot(path: Path) -> PackedEventStatus:
+    try:
+        with path.open(mode="rb") as f:
+            status: PackedEventStatus = pickle.load(f)
+            return status
+    except FileNotFoundError:
+        return PackedEventStatus(next_event_id=1, events=[], rule_stats={}, interval_starts={})
+
+
+def _write_atomically(path: Path, status: PackedEventStatus) -> int:
+    data = pickle.dumps(status, protocol=pickle.HIGHEST_PROTOCOL)
+    path_new = path.parent / (path.name + ".new")
+    with path_new.open(mode="wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    path_new.rename(path)
+    return len(data)
+
+
+def _replay(status: PackedEventStatus, records: Iterable[StatusJournalRecord]) -> None:
+    events = {event["id"]: event for event in status["events"]}
+    for record in records:
+        for eid, event in record["events"].items():
+            if event is None:
+                events.pop(eid, None)
+            else:
+                events[eid] = event
+        status["next_event_id"] = record["next_event_id"]
+        status["rule_stats"] = record["rule_stats"]
+        status["interval_starts"] = record["interval_starts"]
+    status["events"] = sorted(events.values(), key=lambda event: event["id"])
@@ -8,9 +8,16 @@ import logging
 import cmk.ec.export as ec
 from cmk.ccc.hostaddress import HostName
 from cmk.ec.config import Config, MatchGroups, ServiceLevel
-from cmk.ec.main import create_history, EventServer, StatusTableEvents, StatusTableHistory
+from cmk.ec.main import (
+    create_history,
+    EventServer,
+    EventStatus,
+    StatusServer,
+    StatusTableEvents,
+    StatusTableHistory,
+)
 
-from .helpers import new_event
+from .helpers import FakeStatusSocket, new_event
 
 RULE = ec.Rule(
     actions=[],
@@ -60,3 +67,65 @@ def test_event_rewrite(
 
     assert event["text"] == "SUPERWARN"
     assert event["state"] == 2
+
+
+def _pack(pack_id: str, rules: list[ec.Rule]) -> ec.ECRulePackSpec:
+    return ec.ECRulePackSpec(id=pack_id, title=pack_id, disabled=False, rules=rules)
+
+
+def _rule(rule: ec.Rule) -> ec.Rule:
+    return ec.Rule(state=2, sl=ServiceLevel(precedence="message", value=0)) | rule
+
+
+def test_prefilter_keeps_rule_order_and_skip_pack(
+    event_server: EventServer,
+    event_status: EventStatus,
+    status_server: StatusServer,
+    settings: ec.Settings,
+    config: Config,
+) -> None:
+    config_rule_packs: Config = config | {
+        "rule_packs": [
+            _pack(
+                "noise",
+                [
+                    _rule(ec.Rule(id="skip_noise", match="^noise from (.*)$", drop="skip_pack")),
+                    _rule(ec.Rule(id="in_skipped_pack", match="noise")),
+                ],
+            ),
+            _pack(
+                "real",
+                [
+                    _rule(ec.Rule(id="unrelated", match="something else")),
+                    _rule(ec.Rule(id="other_host", match="noise", match_host="other")),
+                    _rule(ec.Rule(id="catch_noise", match="noise")),
+                    _rule(ec.Rule(id="catch_all")),
+                ],
+            ),
+        ]
+    }
+    history = create_history(
+        settings,
+        config_rule_packs,
+        logging.getLogger("cmk.mkeventd"),
+        StatusTableEvents.columns,
+        StatusTableHistory.columns,
+    )
+    event_server.reload_configuration(config_rule_packs, history=history)
+
+    event_server.process_potential_event(
+        new_event(ec.Event(host=HostName("heute"), text="noise from somewhere", core_host=None))
+    )
+
+    assert [event["rule_id"] for event in event_status.events()] == ["catch_noise"]
+
+    s = FakeStatusSocket(b"GET rules\nColumns: rule_id rule_hits rule_prefilter_hits\n")
+    status_server.handle_client(s, True, "127.0.0.1")
+    assert s.get_response() == [
+        ["rule_id", "rule_hits", "rule_prefilter_hits"],
+        ["catch_noise", 1, 1],
+        ["in_skipped_pack", 0, 1],
+        ["other_host", 0, 0],
+        ["skip_noise", 1, 1],
+        ["unrelated", 0, 0],
+    ]
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Indexed store of the open events"""
+
+import cmk.ec.export as ec
+from cmk.ccc.hostaddress import HostName
+from cmk.ec.event_store import EventStore
+from cmk.ec.main import EventStatus
+
+from .helpers import new_event
+
+
+def _event(eid: int, rule_id: str, host: str, core_host: str | None, state: int) -> ec.Event:
+    return ec.Event(
+        id=eid,
+        rule_id=rule_id,
+        host=HostName(host),
+        core_host=None if core_host is None else HostName(core_host),
+        state=state,
+    )
+
+
+def _ids(events: list[ec.Event]) -> list[int]:
+    return [event["id"] for event in events]
+
+
+def test_indexes_keep_age_order() -> None:
+    store = EventStore(
+        [
+            _event(1, "r1", "h1", "h1", 2),
+            _event(2, "r2", "h1", None, 1),
+            _event(3, "r1", "h2", "h2", 2),
+            _event(4, "r1", "h1", "h1", 0),
+        ]
+    )
+    assert len(store) == 4
+    assert _ids(list(store)) == [1, 2, 3, 4]
+    assert _ids(store.of_rule("r1")) == [1, 3, 4]
+    assert _ids(store.of_host(HostName("h1"))) == [1, 2, 4]
+    assert _ids(store.of_state(2)) == [1, 3]
+    assert store.count_of_host(HostName("h1"), HostName("h1")) == 2
+    assert store.count_by_host() == {
+        (HostName("h1"), HostName("h1")): 2,
+        (HostName("h1"), None): 1,
+        (HostName("h2"), HostName("h2")): 1,
+    }
+    assert store.count_by_rule() == {"r1": 3, "r2": 1}
+
+
+def test_oldest() -> None:
+    store = EventStore([_event(1, "r1", "h1", None, 0), _event(2, "r2", "h2", None, 0)])
+    assert (oldest := store.oldest()) is not None and oldest["id"] == 1
+    assert (oldest := store.oldest_of_rule("r2")) is not None and oldest["id"] == 2
+    assert (oldest := store.oldest_of_host(HostName("h2"))) is not None and oldest["id"] == 2
+    assert store.oldest_of_rule("nope") is None
+    assert store.oldest_of_host(HostName("nope")) is None
+    assert EventStore().oldest() is None
+
+
+def test_remove_cleans_up_all_indexes() -> None:
+    event = _event(1, "r1", "h1", None, 2)
+    store = EventStore([event])
+    assert store.remove(event)
+    assert not store.remove(event)
+    assert len(store) == 0
+    assert not store.of_rule("r1")
+    assert not store.of_host(HostName("h1"))
+    assert not store.of_state(2)
+    assert store.count_by_rule() == {}
+    assert store.count_by_host() == {}
+
+
+def test_remove_uses_identity_not_equality() -> None:
+    store = EventStore([_event(1, "r1", "h1", None, 2)])
+    assert not store.remove(_event(1, "r1", "h1", None, 2))
+    assert len(store) == 1
+
+
+def test_reindex_after_in_place_change() -> None:
+    changed = _event(1, "r1", "h1", None, 2)
+    store = EventStore([changed, _event(2, "r1", "h2", None, 2), _event(3, "r1", "h2", None, 0)])
+
+    changed["host"] = HostName("h2")
+    changed["state"] = 0
+    store.reindex(changed)
+
+    assert not store.of_host(HostName("h1"))
+    assert _ids(store.of_host(HostName("h2"))) == [1, 2, 3]
+    assert _ids(store.of_state(0)) == [1, 3]
+    assert _ids(store.of_state(2)) == [2]
+
+    assert store.remove(changed)
+    assert _ids(store.of_host(HostName("h2"))) == [2, 3]
+
+
+def test_event_status_limit_counters(event_status: EventStatus) -> None:
+    for host in ("h1", "h1", "h2"):
+        event_status.new_event(new_event(ec.Event(host=HostName(host), core_host=None)))
+
+    assert event_status.num_existing_events == 3
+    assert event_status.num_existing_events_by_rule == {"815": 3}
+    assert event_status.num_existing_events_by_host == {
+        (HostName("h1"), None): 2,
+        (HostName("h2"), None): 1,
+    }
+
+    event_status.remove_oldest_event("by_host", new_event(ec.Event(host=HostName("h2"))))
+    assert _ids(event_status.events()) == [1, 2]
+
+    event_status.remove_oldest_event("overall", new_event(ec.Event()))
+    assert _ids(event_status.events()) == [2]
+    assert event_status.num_existing_events_by_host == {(HostName("h1"), None): 1}
+
+
+def test_event_status_pack_and_unpack(event_status: EventStatus) -> None:
+    for host in ("h1", "h2"):
+        event_status.new_event(new_event(ec.Event(host=HostName(host), core_host=None)))
+    status = event_status.pack_status()
+    event_status.flush()
+    assert event_status.num_existing_events == 0
+
+    event_status.unpack_status(status)
+    assert _ids(event_status.events()) == [1, 2]
+    assert (event := event_status.event(2)) is not None and event["host"] == "h2"
@@ -140,3 +140,75 @@ def test_history_parse(tmp_path: Path) -> None:
 
     assert len(new_entries) == 4
     assert new_entries[0][1] == 1666942292.3000507
+
+
+def _query_history(history: FileHistory, *filters: str) -> list[tuple[object, ...]]:
+    logger = logging.getLogger("cmk.mkeventd")
+    query = QueryGET(
+        lambda _name: StatusTableHistory(logger, history),
+        ["GET history", *(f"Filter: {f}" for f in filters)],
+        logger,
+    )
+    column_index = StatusTableHistory.columns.index
+    return [
+        (
+            row[column_index(("history_line", 0))],
+            row[column_index(("event_id", 1))],
+            row[column_index(("event_host", ""))],
+        )
+        for row in history.get(query)
+    ]
+
+
+def test_file_get_via_index(history: FileHistory, settings: ec.Settings) -> None:
+    for nr in range(1, 7):
+        history.add(
+            event=ec.Event(
+                id=nr, host=HostName(f"Host{nr % 3}"), text=f"text {nr}", core_host=None
+            ),
+            what="NEW",
+        )
+    (history_file,) = settings.paths.history_dir.value.glob("*.log")
+    assert history_file.with_suffix(".idx").exists()
+
+    assert _query_history(history, "event_host = Host1") == [(4, 4, "Host1"), (1, 1, "Host1")]
+    assert _query_history(history, "event_host =~ host1", "event_text ~ 4") == [(4, 4, "Host1")]
+    assert _query_history(history, "event_id >= 5") == [(6, 6, "Host0"), (5, 5, "Host2")]
+    assert _query_history(history, "event_host in host2 HOST0", "event_id < 5") == [
+        (3, 3, "Host0"),
+        (2, 2, "Host2"),
+    ]
+
+
+def test_file_index_is_created_on_demand(history: FileHistory, settings: ec.Settings) -> None:
+    history.add(event=ec.Event(id=1, host=HostName("Host1"), core_host=None), what="NEW")
+    (history_file,) = settings.paths.history_dir.value.glob("*.log")
+    history_file.with_suffix(".idx").unlink()  # e.g. written by an older version
+    history.add(event=ec.Event(id=2, host=HostName("Host1"), core_host=None), what="NEW")
+    assert not history_file.with_suffix(".idx").exists()
+
+    assert _query_history(history, "event_host = Host1") == [(2, 2, "Host1"), (1, 1, "Host1")]
+    history.add(event=ec.Event(id=3, host=HostName("Host1"), core_host=None), what="NEW")
+    assert _query_history(history, "event_host = Host1", "event_id > 1") == [
+        (3, 3, "Host1"),
+        (2, 2, "Host1"),
+    ]
+
+    history.flush()
+    assert not list(settings.paths.history_dir.value.iterdir())
+
+
+def test_file_index_missing_record_is_added(history: FileHistory, settings: ec.Settings) -> None:
+    history.add(event=ec.Event(id=1, host=HostName("Host1"), core_host=None), what="NEW")
+    history.add(event=ec.Event(id=2, host=HostName("Host1"), core_host=None), what="NEW")
+    (history_file,) = settings.paths.history_dir.value.glob("*.log")
+    # The record of the second line has not been written, e.g. because of a full disk.
+    index_file = history_file.with_suffix(".idx")
+    index_file.write_bytes(index_file.read_bytes()[: index_file.stat().st_size // 2])
+
+    history.add(event=ec.Event(id=3, host=HostName("Host1"), core_host=None), what="NEW")
+    assert _query_history(history, "event_host = Host1") == [
+        (3, 3, "Host1"),
+        (2, 2, "Host1"),
+        (1, 1, "Host1"),
+    ]
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Buffering received messages between the receiving and the processing thread"""
+
+import os
+import threading
+import time
+
+import pytest
+
+import cmk.ec.export as ec
+from cmk.ec.ingest import IngestBuffer, IngestItem
+from cmk.ec.main import EventServer
+from cmk.ec.perfcounters import Perfcounters
+
+
+def _counters(perfcounters: Perfcounters) -> dict[str, float]:
+    return {
+        name: value
+        for (name, _default), value in zip(
+            Perfcounters.status_columns(), perfcounters.get_status(), strict=True
+        )
+    }
+
+
+def test_buffer_backpressure_and_overflows(perfcounters: Perfcounters) -> None:
+    buffer = IngestBuffer(capacity=3, perfcounters=perfcounters)
+    assert buffer.offer(IngestItem("syslog", [b"1"], ("1.2.3.4", 514)))
+    buffer.put(IngestItem("syslog", [b"2", b"3"], None))
+    assert buffer.full
+    assert not buffer.offer(IngestItem("syslog", [b"4"], ("1.2.3.4", 514)))
+    buffer.put(IngestItem("syslog", [b"5"], None))
+
+    assert _counters(perfcounters)["status_ingest_stalls"] == 1
+    assert _counters(perfcounters)["status_ingest_overflows"] == 1
+
+    assert [item.payload for item in buffer.take(max_messages=2, timeout=0)] == [
+        [b"1"],
+        [b"2", b"3"],
+    ]
+    assert buffer.offer(IngestItem("syslog", [b"6"], ("1.2.3.4", 514)))
+    assert [item.payload for item in buffer.take(max_messages=2, timeout=0)] == [[b"5"], [b"6"]]
+    assert buffer.take(max_messages=2, timeout=0) == []
+
+
+def test_buffer_close_wakes_up_consumer(perfcounters: Perfcounters) -> None:
+    buffer = IngestBuffer(capacity=3, perfcounters=perfcounters)
+    batches: list[list[IngestItem]] = []
+    consumer = threading.Thread(target=lambda: batches.append(buffer.take(10, timeout=60)))
+    consumer.start()
+    buffer.close()
+    consumer.join(timeout=10)
+    assert not consumer.is_alive()
+    assert batches == [[]]
+    assert buffer.closed
+
+
+def test_process_ingested_keeps_order(
+    event_server: EventServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    processed: list[tuple[str, str]] = []
+    monkeypatch.setattr(
+        event_server,
+        "process_potential_event",
+        lambda event: processed.append((event["ipaddress"], event["text"])),
+    )
+    event_server.process_ingested(
+        [
+            IngestItem("syslog", [b"<78>Jan 1 12:00:00 host1 app: one"], ("1.2.3.4", 514)),
+            IngestItem("syslog", [b"<78>Jan 1 12:00:00 host2 app: two"], ("5.6.7.8", 514)),
+            IngestItem("syslog", [b"<78>Jan 1 12:00:00 host1 app: three"], ("1.2.3.4", 514)),
+            IngestItem("syslog", [b"<78>Jan 1 12:00:00 host1 app: four"], ("1.2.3.4", 514)),
+        ]
+    )
+    assert processed == [
+        ("1.2.3.4", "one"),
+        ("5.6.7.8", "two"),
+        ("1.2.3.4", "three"),
+        ("1.2.3.4", "four"),
+    ]
+
+
+def test_serve_processes_pipe_messages(
+    settings: ec.Settings, event_server: EventServer, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    processed: list[str] = []
+    monkeypatch.setattr(
+        event_server, "process_potential_event", lambda event: processed.append(event["text"])
+    )
+    settings.paths.event_pipe.value.parent.mkdir(parents=True)
+    event_server.create_pipe()
+    event_server.open_eventsocket()
+    server = threading.Thread(target=event_server.serve)
+    server.start()
+    try:
+        pipe = os.open(str(settings.paths.event_pipe.value), os.O_WRONLY)
+        try:
+            os.write(pipe, b"".join(b"message %d\n" % nr for nr in range(100)))
+        finally:
+            os.close(pipe)
+        deadline = time.time() + 10
+        while len(processed) < 100 and time.time() < deadline:
+            time.sleep(0.01)
+    finally:
+        event_server.terminate()
+        server.join(timeout=10)
+
+    assert not server.is_alive()
+    assert processed == [f"message {nr}" for nr in range(100)]
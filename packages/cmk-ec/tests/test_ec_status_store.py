@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+"""Snapshot and journal based persistence of the event status"""
+
+import logging
+import pickle
+
+import cmk.ec.export as ec
+from cmk.ccc.hostaddress import HostName
+from cmk.ec.main import EventServer, EventStatus
+from cmk.ec.status_store import PackedEventStatus, StatusJournalRecord, StatusStore
+
+from .helpers import new_event
+
+
+def _status_store(settings: ec.Settings, min_compaction_size: int = 1024 * 1024) -> StatusStore:
+    settings.paths.status_file.value.parent.mkdir(parents=True, exist_ok=True)
+    return StatusStore(
+        settings.paths.status_snapshot_file.value,
+        settings.paths.status_journal_file.value,
+        settings.paths.status_file.value,
+        logging.getLogger("cmk.mkeventd"),
+        min_compaction_size,
+    )
+
+
+def _record(eid: int, event: ec.Event | None) -> StatusJournalRecord:
+    return StatusJournalRecord(
+        events={eid: event}, next_event_id=eid + 1, rule_stats={}, interval_starts={}
+    )
+
+
+def _ids(status: PackedEventStatus | None) -> list[int]:
+    assert status is not None
+    return [event["id"] for event in status["events"]]
+
+
+def test_save_changes_to_journal(
+    settings: ec.Settings, event_status: EventStatus, event_server: EventServer
+) -> None:
+    settings.paths.status_file.value.parent.mkdir(parents=True, exist_ok=True)
+    for host in ("h1", "h2", "h3"):
+        event_status.new_event(new_event(ec.Event(host=HostName(host), core_host=None)))
+    event_status.save_status()
+    snapshot_size = settings.paths.status_snapshot_file.value.stat().st_size
+
+    event_status.new_event(new_event(ec.Event(host=HostName("h4"), core_host=None)))
+    assert (event := event_status.event(2)) is not None
+    event["comment"] = "changed"
+    event_status.update_event(event)
+    assert (event := event_status.event(3)) is not None
+    event_status.remove_event(event, "DELETE")
+    event_status.count_rule_match("815")
+    event_status.save_status()
+
+    assert settings.paths.status_snapshot_file.value.stat().st_size == snapshot_size
+    assert settings.paths.status_journal_file.value.exists()
+
+    event_status.flush()
+    event_status.load_status(event_server)
+    assert [event["id"] for event in event_status.events()] == [1, 2, 4]
+    assert (event := event_status.event(2)) is not None and event["comment"] == "changed"
+    assert event_status.pack_status()["next_event_id"] == 5
+    assert list(event_status.get_rule_stats()) == [("815", 1)]
+
+
+def test_snapshot_replaces_journal(settings: ec.Settings, event_status: EventStatus) -> None:
+    settings.paths.status_file.value.parent.mkdir(parents=True, exist_ok=True)
+    event_status.save_status()
+    event_status.new_event(new_event(ec.Event(host=HostName("h1"), core_host=None)))
+    event_status.save_status()
+    assert settings.paths.status_journal_file.value.exists()
+
+    event_status.save_status(snapshot=True)
+    assert not settings.paths.status_journal_file.value.exists()
+    assert _ids(_status_store(settings).load()) == [1]
+
+
+def test_compaction(settings: ec.Settings) -> None:
+    store = _status_store(settings, min_compaction_size=0)
+    store.save_snapshot(
+        PackedEventStatus(
+            next_event_id=2,
+            events=[ec.Event(id=1, text="old")],
+            rule_stats={},
+            interval_starts={},
+        )
+    )
+    store.append(_record(1, None))
+    for _nr in range(10):
+        store.append(_record(2, ec.Event(id=2, text="new")))
+    store.wait_for_compaction()
+
+    with settings.paths.status_snapshot_file.value.open("rb") as f:
+        snapshot = pickle.load(f)
+    assert snapshot["events"] == [ec.Event(id=2, text="new")]
+    assert not (
+        settings.paths.status_journal_file.value.parent / "status.journal.compacting"
+    ).exists()
+    assert (status := _status_store(settings).load()) is not None
+    assert status["events"] == [ec.Event(id=2, text="new")]
+    assert status["next_event_id"] == 3
+
+
+def test_compaction_is_retried_after_failure(settings: ec.Settings) -> None:
+    store = _status_store(settings, min_compaction_size=0)
+    store.save_snapshot(
+        PackedEventStatus(next_event_id=1, events=[], rule_stats={}, interval_starts={})
+    )
+    snapshot_path = settings.paths.status_snapshot_file.value
+    # Writing the new snapshot fails as long as a directory is in the way.
+    blocker = snapshot_path.with_name(snapshot_path.name + ".new")
+    blocker.mkdir()
+    store.append(_record(1, ec.Event(id=1)))
+    store.wait_for_compaction()
+    compacting_path = settings.paths.status_journal_file.value.parent / "status.journal.compacting"
+    assert compacting_path.exists()
+
+    blocker.rmdir()
+    store.append(_record(2, ec.Event(id=2)))
+    store.wait_for_compaction()
+
+    assert not compacting_path.exists()
+    assert not settings.paths.status_journal_file.value.exists()
+    with snapshot_path.open("rb") as f:
+        assert _ids(pickle.load(f)) == [1, 2]
+
+
+def test_incomplete_journal_record_is_ignored(settings: ec.Settings) -> None:
+    store = _status_store(settings)
+    store.append(_record(1, ec.Event(id=1)))
+    store.append(_record(2, ec.Event(id=2)))
+    journal = settings.paths.status_journal_file.value
+    journal.write_bytes(journal.read_bytes()[:-5])
+
+    assert _ids(_status_store(settings).load()) == [1]
+
+
+def test_nothing_stored(settings: ec.Settings) -> None:
+    assert _status_store(settings).load() is None
+
+
+def test_migrate_legacy_status(settings: ec.Settings) -> None:
+    store = _status_store(settings)
+    legacy_path = settings.paths.status_file.value
+    legacy_path.write_text(
+        repr(
+            {
+                "next_event_id": 3,
+                "events": [ec.Event(id=1, match_groups=("a",)), ec.Event(id=2)],
+                "rule_stats": {"815": 2},
+            }
+        )
+        + "\n"
+    )
+
+    assert (status := store.load()) is not None
+    assert status == PackedEventStatus(
+        next_event_id=3,
+        events=[ec.Event(id=1, match_groups=("a",)), ec.Event(id=2)],
+        rule_stats={"815": 2},
+        interval_starts={},
+    )
+    assert not legacy_path.exists()
+    assert _status_store(settings).load() == status
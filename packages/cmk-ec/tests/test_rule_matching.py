@@ -8,9 +8,16 @@ import re
 import pytest
 
 import cmk.ec.export as ec
+from cmk.ccc.hostaddress import HostName
 from cmk.ccc.site import SiteId
 from cmk.ec.config import MatchGroups, TextMatchResult
-from cmk.ec.rule_matcher import compile_matching_value, MatchPriority
+from cmk.ec.rule_matcher import (
+    compile_matching_value,
+    compile_rule,
+    MatchPriority,
+    RuleMatcher,
+    RulePrefilter,
+)
 
 
 @pytest.mark.parametrize(
@@ -462,3 +469,126 @@ def test_compile_matching_value_different_key(key: str) -> None:
     assert isinstance(compiled_pattern, re.Pattern)
     # Expect the original pattern since the key is not in {"match", "match_ok"}
     assert compiled_pattern.pattern == original_value
+
+
+def _compiled_rules(*rules: ec.Rule) -> list[ec.Rule]:
+    compiled = []
+    for rule in rules:
+        rule = rule.copy()
+        rule.setdefault("pack", "pack")
+        compile_rule(rule)
+        compiled.append(rule)
+    return compiled
+
+
+PREFILTER_RULES = _compiled_rules(
+    ec.Rule(id="plain", match="disk full"),
+    ec.Rule(id="regex", match="^ERROR: (Disk) .*full$"),
+    ec.Rule(id="alternatives", match="foo|barbaz"),
+    ec.Rule(id="cancel", match="link down", match_ok="link up"),
+    ec.Rule(id="host", match_host="Switch01"),
+    ec.Rule(id="host_and_text", match_host="switch01", match="fan failure"),
+    ec.Rule(id="inverted", match="something", invert_matching=True),
+    ec.Rule(id="everything"),
+)
+
+
+@pytest.mark.parametrize(
+    "host, text, expected",
+    [
+        pytest.param(
+            "h", "nothing of interest", ["alternatives", "inverted", "everything"], id="none"
+        ),
+        pytest.param(
+            "h",
+            "Warning: disk full",
+            ["plain", "alternatives", "inverted", "everything"],
+            id="plain",
+        ),
+        pytest.param(
+            "h",
+            "ERROR: DISK sda full",
+            ["regex", "alternatives", "inverted", "everything"],
+            id="regex",
+        ),
+        pytest.param(
+            "h",
+            "eth0: LINK UP",
+            ["alternatives", "cancel", "inverted", "everything"],
+            id="cancelling",
+        ),
+        pytest.param(
+            "SWITCH01",
+            "Fan failure",
+            ["alternatives", "host", "host_and_text", "inverted", "everything"],
+            id="host",
+        ),
+        pytest.param(
+            "other",
+            "Fan failure",
+            ["alternatives", "inverted", "everything"],
+            id="text without host",
+        ),
+        pytest.param(
+            "h",
+            "\N{LATIN SMALL LETTER LONG S}ome disk is full",
+            ["regex", "alternatives", "inverted", "everything"],
+            id="non-ASCII",
+        ),
+    ],
+)
+def test_rule_prefilter_candidates(host: str, text: str, expected: list[str]) -> None:
+    event = ec.Event(host=HostName(host), text=text)
+    candidates = RulePrefilter(PREFILTER_RULES).candidates(PREFILTER_RULES, event)
+    assert [rule["id"] for rule in candidates] == expected
+
+
+def test_rule_prefilter_candidates_include_all_matching_rules() -> None:
+    matcher = RuleMatcher(None, SiteId("test_site"), lambda _time_period_name: True)
+    prefilter = RulePrefilter(PREFILTER_RULES)
+    for host in ("h", "switch01"):
+        for text in (
+            "disk full",
+            "error: disk is full",
+            "ERROR: Disk really full",
+            "foo",
+            "link down",
+            "link up",
+            "FAN FAILURE",
+            "something",
+        ):
+            event = ec.Event(
+                host=HostName(host), text=text, ipaddress="", facility=1, priority=2, application=""
+            )
+            candidates = prefilter.candidates(PREFILTER_RULES, event)
+            for rule in PREFILTER_RULES:
+                if isinstance(matcher.event_rule_matches(rule, event), ec.MatchSuccess):
+                    assert rule in candidates, (rule["id"], host, text)
+
+
+def test_rule_prefilter_subset_of_rules() -> None:
+    prefilter = RulePrefilter(PREFILTER_RULES)
+    subset = PREFILTER_RULES[3:6]
+    event = ec.Event(host=HostName("switch01"), text="link down, fan failure")
+    assert [rule["id"] for rule in prefilter.candidates(subset, event)] == [
+        "cancel",
+        "host",
+        "host_and_text",
+    ]
+
+
+def test_rule_prefilter_stats() -> None:
+    prefilter = RulePrefilter(PREFILTER_RULES)
+    for text in ("disk full", "disk full again", "link up"):
+        prefilter.candidates(PREFILTER_RULES, ec.Event(host=HostName("h"), text=text))
+
+    # Events of other facilities or priorities are not checked against all rules
+    prefilter.candidates(PREFILTER_RULES[3:6], ec.Event(host=HostName("h"), text="disk full"))
+
+    stats = prefilter.stats()
+    assert stats["plain"] == (2, 1)
+    assert stats["cancel"] == (1, 3)
+    assert "everything" not in stats
+
+    prefilter.reset_stats()
+    assert prefilter.stats()["plain"] == (0, 0)
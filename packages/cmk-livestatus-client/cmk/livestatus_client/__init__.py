@@ -12,11 +12,12 @@ import json
 import os
 import re
 import select
+import selectors
 import socket
 import ssl
 import threading
 import time
-from collections.abc import Callable, Iterator, Mapping, Sequence
+from collections.abc import Callable, Generator, Iterator, Mapping, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -180,9 +181,15 @@ persistent_connections: dict[str, socket.socket] = {}
 # Regular expression for removing Cache: headers if caching is not allowed
 remove_cache_regex = re.compile("\nCache:[^\n]*")
 
+# Regular expression for removing the Localtime: header from the keys of cached queries
+remove_localtime_regex = re.compile("\nLocaltime:[^\n]*")
+
 # Pattern for allowed UserId values
 validate_user_id_regex = re.compile(r"^[\w$][-@.+\w$]*$", re.UNICODE)
 
+# Timeout in seconds for receiving the data of a response once its header arrived
+_RESPONSE_DATA_TIMEOUT = 30
+
 
 class MKLivestatusException(Exception):
     pass
@@ -822,86 +829,65 @@ class SingleSiteConnection(Helpers):
     ) -> bytes:
         try:
             # Headers are always ASCII encoded
-            resp = self.receive_data(16)
-            code = resp[0:3].decode("ascii")
-            try:
-                length = int(resp[4:15].lstrip())
-            except Exception:
-                self.disconnect()
-                raise MKLivestatusSocketError(
-                    f"Malformed response header {resp!r}. Livestatus TCP socket might be "
-                    "unreachable or wrong encryption settings are used."
-                )
+            code, length = self.parse_response_header(self.receive_data(16))
 
             # Apply a lower timeout for the content because the data is already available
             # in the socket. The liveproxyd (same system) has the complete data available
             # while the data from a standard connection can still take some time.
             # 30 seconds should be more than enough for the maximum telegram size of 100MB
-            data = self.receive_data(length, 30)
-
-            if code == "200":
-                return data
-
-            error_info = data.decode("utf-8")
-            if code == "404":
-                raise MKLivestatusTableNotFoundError(f"Not Found ({code}): {error_info!r}")
+            return _response_data(code, self.receive_data(length, _RESPONSE_DATA_TIMEOUT))
 
-            if code == "413":
-                raise MKLivestatusPayloadTooLargeError(error_info)
+        except (MKLivestatusSocketClosed, OSError) as e:
+            return self.retry_raw_response(query, suppress_exceptions, e, timeout_at)
 
-            if code == "495":
-                raise MKLivestatusCertificateError(error_info)
+        except Exception as e:
+            raise _response_error(e, suppress_exceptions)
 
-            if code == "502":
-                raise MKLivestatusBadGatewayError(error_info)
+    def retry_raw_response(
+        self,
+        query: str,
+        suppress_exceptions: tuple[type[Exception], ...],
+        error: MKLivestatusSocketClosed | OSError,
+        timeout_at: float | None = None,
+    ) -> bytes:
+        # In case of an IO error or the other side having
+        # closed the socket do a reconnect and try again
+        self.disconnect()
+
+        # In case of unix socket connections, do not start any reconnection attempts
+        # The other side (liveproxyd) might have had a good reason to disconnect
+        # Note: In most scenarios the liveproxyd still tries to send back a reasonable
+        # error response back to the client
+        if self.socket and self.socket.family == socket.AF_UNIX:
+            raise MKLivestatusSocketError("Unix socket was closed by peer")
+
+        now = time.time()
+        if not timeout_at or timeout_at > now:
+            if timeout_at is None:
+                # Try until timeout reached in case there was a timeout configured.
+                # Otherwise only retry once.
+                timeout_at = now
+                if self.timeout:
+                    timeout_at += self.timeout
 
-            raise MKLivestatusQueryError(f"{code}: {error_info}")
+            time.sleep(0.1)
+            self.connect()
+            self.send_query(query)
+            # do not send query again -> danger of infinite loop
+            return self.receive_raw_response(query, suppress_exceptions, timeout_at)
+        raise MKLivestatusSocketError(str(error))
 
-        except (MKLivestatusSocketClosed, OSError) as e:
-            # In case of an IO error or the other side having
-            # closed the socket do a reconnect and try again
+    def parse_response_header(self, header: bytes) -> tuple[str, int]:
+        """Returns the status code and the length of the data of a fixed16 response header"""
+        try:
+            return header[0:3].decode("ascii"), int(header[4:15].lstrip())
+        except Exception:
             self.disconnect()
-
-            # In case of unix socket connections, do not start any reconnection attempts
-            # The other side (liveproxyd) might have had a good reason to disconnect
-            # Note: In most scenarios the liveproxyd still tries to send back a reasonable
-            # error response back to the client
-            if self.socket and self.socket.family == socket.AF_UNIX:
-                raise MKLivestatusSocketError("Unix socket was closed by peer")
-
-            now = time.time()
-            if not timeout_at or timeout_at > now:
-                if timeout_at is None:
-                    # Try until timeout reached in case there was a timeout configured.
-                    # Otherwise only retry once.
-                    timeout_at = now
-                    if self.timeout:
-                        timeout_at += self.timeout
-
-                time.sleep(0.1)
-                self.connect()
-                self.send_query(query)
-                # do not send query again -> danger of infinite loop
-                return self.receive_raw_response(query, suppress_exceptions, timeout_at)
-            raise MKLivestatusSocketError(str(e))
-
-        except suppress_exceptions:
-            raise
-
-        except MKLivestatusCertificateError as e:
-            raise MKLivestatusCertificateError(
-                "SSL certificate verification failed. "
-                "The remote certificate(s) might not be trusted. Edit this site's Livestatus encryption to trust them. "
-                "Technical error: %s" % e
+            raise MKLivestatusSocketError(
+                f"Malformed response header {header!r}. Livestatus TCP socket might be "
+                "unreachable or wrong encryption settings are used."
             )
 
-        except Exception as e:
-            # Catches
-            # MKLivestatusQueryError
-            # MKLivestatusSocketError
-            # FIXME: ? self.disconnect()
-            raise MKLivestatusSocketError("Unhandled exception: %s" % e)
-
     def parse_raw_response(self, raw_response: bytes, query: Query) -> LivestatusResponse:
         data = raw_response.decode("utf-8")
         try:
@@ -1034,6 +1020,123 @@ class ConnectedSite(NamedTuple):
 ConnectedSites = list[ConnectedSite]
 
 
+class QueryCache:
+    """Remembers the responses of the sites to the queries sent by a MultiSiteConnection
+
+    The responses are kept until the cache is cleared, so a cache should not live longer
+    than outdated results are acceptable, e.g. for a single GUI request. The queries are
+    compared including their headers, so the responses are not shared between different
+    auth users or limits. Queries waiting for a state change are never answered from the
+    cache. Sending a command via the connection clears the cache.
+
+    To limit the memory used, responses larger than max_response_size are not cached and
+    no more responses are cached once the cached responses reach max_size bytes.
+    """
+
+    def __init__(
+        self, max_response_size: int = 1024 * 1024, max_size: int = 16 * 1024 * 1024
+    ) -> None:
+        self._max_response_size = max_response_size
+        self._max_size = max_size
+        self._responses: dict[tuple[SiteId, str], bytes] = {}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(site_id: SiteId, str_query: str) -> tuple[SiteId, str] | None:
+        if "\nWait" in str_query:
+            return None
+        return site_id, remove_localtime_regex.sub("", str_query)
+
+    def get(self, site_id: SiteId, str_query: str) -> bytes | None:
+        if (key := self._key(site_id, str_query)) is None:
+            return None
+        if (raw_response := self._responses.get(key)) is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return raw_response
+
+    def add(self, site_id: SiteId, str_query: str, raw_response: bytes) -> None:
+        if (key := self._key(site_id, str_query)) is None:
+            return
+        if len(raw_response) > self._max_response_size:
+            return
+        size = self._size + len(raw_response) - len(self._responses.get(key, b""))
+        if size > self._max_size:
+            return
+        self._responses[key] = raw_response
+        self._size = size
+
+    def clear(self) -> None:
+        self._responses.clear()
+        self._size = 0
+
+
+@dataclass
+class _PendingResponse:
+    """The response of a site which is received while other sites are still answering"""
+
+    str_query: str
+    request_span: trace.Span
+    connected_site: ConnectedSite
+    sock: socket.socket
+    code: str | None = None
+    missing: int = 16
+    data: BytesIO = field(default_factory=BytesIO)
+    data_since: float | None = None
+
+    def receive(self, suppress_exceptions: tuple[type[Exception], ...]) -> bytes | None:
+        """Reads the available data, returns the response data once it is complete
+
+        Like SingleSiteConnection.receive_raw_response, the query is sent again in case the
+        site closed the connection in the meantime.
+        """
+        connection = self.connected_site.connection
+        try:
+            while (response_data := self._receive()) is None:
+                # SSL sockets may hold decrypted data which select does not know about
+                if not (isinstance(self.sock, ssl.SSLSocket) and self.sock.pending()):
+                    break
+            return response_data
+
+        except (MKLivestatusSocketClosed, OSError) as e:
+            return connection.retry_raw_response(self.str_query, suppress_exceptions, e)
+
+        except Exception as e:
+            raise _response_error(e, suppress_exceptions)
+
+    def _receive(self) -> bytes | None:
+        packet = self.sock.recv(self.missing)
+        if not packet:
+            raise MKLivestatusSocketClosed(
+                "Read zero data from socket, remote peer closed connection."
+            )
+        self.missing -= len(packet)
+        self.data.write(packet)
+        if self.missing:
+            return None
+
+        if self.code is not None:
+            return _response_data(self.code, self.data.getvalue())
+
+        self.code, self.missing = self.connected_site.connection.parse_response_header(
+            self.data.getvalue()
+        )
+        self.data = BytesIO()
+        self.data_since = time.time()
+        return None if self.missing else _response_data(self.code, b"")
+
+    def check_timeout(self, now: float) -> None:
+        if self.data_since is not None and now - self.data_since > _RESPONSE_DATA_TIMEOUT:
+            raise MKLivestatusSocketError(
+                f"Unhandled exception: {_RESPONSE_DATA_TIMEOUT}s while reading data from "
+                f"socket. Received data: {self.data.getbuffer().nbytes}/"
+                f"{self.data.getbuffer().nbytes + self.missing} bytes"
+            )
+
+
 class MultiSiteConnection(Helpers):
     def __init__(
         self,
@@ -1053,6 +1156,7 @@ class MultiSiteConnection(Helpers):
         self.only_sites: OnlySites = None
         self.limit: int | None = None
         self.parallelize = True
+        self.query_cache: QueryCache | None = None
         self._only_sites_postprocess = only_sites_postprocess
 
         # Status host: A status host helps to prevent trying to connect
@@ -1225,6 +1329,13 @@ class MultiSiteConnection(Helpers):
         """Impose Limit on number of returned datasets (distributed among sites)"""
         self.limit = limit
 
+    def set_query_cache(self, query_cache: QueryCache | None) -> None:
+        """Answer repeated queries from the given cache, see QueryCache
+
+        Only the parallelized queries use the cache.
+        """
+        self.query_cache = query_cache
+
     def dead_sites(self) -> dict[SiteId, DeadSite]:
         return self.deadsites
 
@@ -1305,7 +1416,27 @@ class MultiSiteConnection(Helpers):
         Limit: is simply applied to all sites - resulting in possibly more results then Limit
         requests.
         """
-        stillalive = []
+        site_rows = dict(self.iter_query_parallel(query, add_headers))
+        # Keep the order of the sites, no matter which site answered first
+        return LivestatusResponse(
+            [
+                row
+                for connected_site in self.connections
+                for row in site_rows.get(connected_site.id, [])
+            ]
+        )
+
+    def iter_query_parallel(
+        self, query: Query, add_headers: str = ""
+    ) -> Iterator[tuple[SiteId, LivestatusResponse]]:
+        """Yields the rows of each site as soon as the response of the site is complete
+
+        All sites are queried in parallel, like with query_parallel(). The responses are
+        received from all sites at once, so the rows of the sites which answer quickly can
+        be processed while the slower sites are still answering. The connections to the
+        sites which did not answer yet are closed in case the iteration is stopped early.
+        """
+        stillalive: ConnectedSites = []
         if self.only_sites is not None:
             connect_to_sites = [c for c in self.connections if c[0] in self.only_sites]
             # Unused sites are assumed to be alive
@@ -1313,26 +1444,64 @@ class MultiSiteConnection(Helpers):
         else:
             connect_to_sites = self.connections
 
-        with tracer.span("query_parallel", attributes={"cmk.livestatus.query": str(query)}):
-            # First send all queries
+        cached_responses: list[tuple[ConnectedSite, bytes]] = []
+        with (
+            tracer.span(
+                "query_parallel", attributes={"cmk.livestatus.query": str(query)}
+            ) as query_span,
+            _livestatus_output_format_switcher(query, self),
+        ):
             retrieve_responses = self._send_queries(
                 query,
                 add_headers,
                 connect_to_sites,
                 limit_header="Limit: %d\n" % self.limit if self.limit is not None else "",
+                cached_responses=cached_responses,
             )
+            if self.query_cache is not None:
+                query_span.set_attribute("cmk.livestatus.cache_hits", len(cached_responses))
+                query_span.set_attribute("cmk.livestatus.cache_misses", len(retrieve_responses))
 
-            # Then retrieve all raw responses. We will be as slow as the slowest of all connections.
-            site_responses = self._retrieve_responses(query, retrieve_responses, stillalive)
-
-            # Convert responses to python format
-            result = self._parse_responses(query, site_responses, stillalive)
-
-        self.connections = stillalive
-        return LivestatusResponse(result)
+        connections = self.connections
+        raw_responses = self._iter_raw_responses(query, retrieve_responses, stillalive)
+        try:
+            for connected_site, raw_response in cached_responses:
+                rows = self._parse_response(query, connected_site, raw_response, stillalive)
+                if rows is not None:
+                    yield connected_site.id, rows
+
+            for pending_response, raw_response in raw_responses:
+                with tracer.span(
+                    f"receive_from_site[{pending_response.connected_site.id}]",
+                    kind=trace.SpanKind.CONSUMER,
+                    links=[trace.Link(pending_response.request_span.get_span_context())],
+                    attributes={
+                        "cmk.livestatus.query": pending_response.str_query,
+                        "cmk.livestatus.target_site_id": str(pending_response.connected_site.id),
+                    },
+                ):
+                    rows = self._parse_response(
+                        query, pending_response.connected_site, raw_response, stillalive
+                    )
+                if rows is None:
+                    continue
+                if self.query_cache is not None:
+                    self.query_cache.add(
+                        pending_response.connected_site.id, pending_response.str_query, raw_response
+                    )
+                yield pending_response.connected_site.id, rows
+        finally:
+            raw_responses.close()
+            alive_sites = {connected_site.id for connected_site in stillalive}
+            self.connections = [c for c in connections if c.id in alive_sites]
 
     def _send_queries(
-        self, query: Query, add_headers: str, connect_to_sites: ConnectedSites, limit_header: str
+        self,
+        query: Query,
+        add_headers: str,
+        connect_to_sites: ConnectedSites,
+        limit_header: str,
+        cached_responses: list[tuple[ConnectedSite, bytes]],
     ) -> list[tuple[str, trace.Span, ConnectedSite]]:
         retrieve_responses: list[tuple[str, trace.Span, ConnectedSite]] = []
         for connected_site in connect_to_sites:
@@ -1348,6 +1517,13 @@ class MultiSiteConnection(Helpers):
                         query, add_headers + limit_header
                     )
                     span.set_attribute("cmk.livestatus.query", str_query)
+                    if (
+                        self.query_cache is not None
+                        and (cached_response := self.query_cache.get(connected_site.id, str_query))
+                        is not None
+                    ):
+                        cached_responses.append((connected_site, cached_response))
+                        continue
                     connected_site.connection.send_query(str_query)
                     retrieve_responses.append((str_query, span, connected_site))
                 except LivestatusTestingError:
@@ -1359,64 +1535,59 @@ class MultiSiteConnection(Helpers):
                     }
         return retrieve_responses
 
-    def _retrieve_responses(
+    def _iter_raw_responses(
         self,
         query: Query,
         retrieve_responses: list[tuple[str, trace.Span, ConnectedSite]],
         stillalive: ConnectedSites,
-    ) -> list[tuple[ConnectedSite, bytes]]:
-        site_responses: list[tuple[ConnectedSite, bytes]] = []
-        for str_query, request_span, connected_site in retrieve_responses:
-            with tracer.span(
-                f"receive_from_site[{connected_site.id}]",
-                kind=trace.SpanKind.CONSUMER,
-                links=[trace.Link(request_span.get_span_context())],
-                attributes={
-                    "cmk.livestatus.query": str_query,
-                    "cmk.livestatus.target_site_id": str(connected_site.id),
-                },
-            ):
-                try:
-                    site_responses.append(
-                        (
-                            connected_site,
-                            connected_site.connection.receive_raw_response(
-                                str_query, query.suppress_exceptions
-                            ),
-                        )
-                    )
-                except query.suppress_exceptions:
-                    # Mostly handles exception types MKLivestatusTableNotFoundError
-                    stillalive.append(connected_site)
-                    continue
-                except LivestatusTestingError:
-                    raise
-                except Exception as e:
-                    connected_site.connection.disconnect()
+    ) -> Generator[tuple[_PendingResponse, bytes]]:
+        """Reads from the sockets of all sites as data arrives, yields the complete responses"""
+        with selectors.DefaultSelector() as selector:
+            for str_query, request_span, connected_site in retrieve_responses:
+                if (sock := connected_site.connection.socket) is None:
                     self.deadsites[connected_site.id] = {
-                        "exception": e,
+                        "exception": MKLivestatusSocketError(
+                            "Socket to '%s' is not connected" % connected_site.connection.socketurl
+                        ),
                         "site": connected_site.config,
                     }
-        return site_responses
+                    continue
+                sock.settimeout(None)
+                selector.register(
+                    sock,
+                    selectors.EVENT_READ,
+                    _PendingResponse(str_query, request_span, connected_site, sock),
+                )
 
-    def _parse_responses(
-        self,
-        query: Query,
-        site_responses: list[tuple[ConnectedSite, bytes]],
-        stillalive: ConnectedSites,
-    ) -> list[LivestatusRow]:
-        result: list[LivestatusRow] = []
-        for connected_site, raw_response in site_responses:
             try:
-                rows = connected_site.connection.parse_raw_response(raw_response, query)
-                stillalive.append(connected_site)
-                if self.prepend_site:
-                    for row in rows:
-                        row.insert(0, connected_site.id)
-                result.extend(rows)
+                while selector.get_map():
+                    yield from self._receive_ready_responses(query, selector, stillalive)
+            finally:
+                # Responses which are only partially read would spoil the next query
+                for key in list(selector.get_map().values()):
+                    key.data.connected_site.connection.disconnect()
+                    stillalive.append(key.data.connected_site)
+
+    def _receive_ready_responses(
+        self, query: Query, selector: selectors.BaseSelector, stillalive: ConnectedSites
+    ) -> list[tuple[_PendingResponse, bytes]]:
+        ready = {key.fd for key, _events in selector.select(timeout=0.1)}
+        now = time.time()
+        site_responses: list[tuple[_PendingResponse, bytes]] = []
+        for key in list(selector.get_map().values()):
+            pending_response: _PendingResponse = key.data
+            connected_site = pending_response.connected_site
+            try:
+                pending_response.check_timeout(now)
+                if key.fd not in ready:
+                    continue
+                raw_response = pending_response.receive(query.suppress_exceptions)
+                if raw_response is None:
+                    continue
+                site_responses.append((pending_response, raw_response))
             except query.suppress_exceptions:
+                # Mostly handles exception types MKLivestatusTableNotFoundError
                 stillalive.append(connected_site)
-                continue
             except LivestatusTestingError:
                 raise
             except Exception as e:
@@ -1425,7 +1596,36 @@ class MultiSiteConnection(Helpers):
                     "exception": e,
                     "site": connected_site.config,
                 }
-        return result
+            selector.unregister(key.fileobj)
+        return site_responses
+
+    def _parse_response(
+        self,
+        query: Query,
+        connected_site: ConnectedSite,
+        raw_response: bytes,
+        stillalive: ConnectedSites,
+    ) -> LivestatusResponse | None:
+        try:
+            rows = connected_site.connection.parse_raw_response(raw_response, query)
+        except query.suppress_exceptions:
+            stillalive.append(connected_site)
+            return None
+        except LivestatusTestingError:
+            raise
+        except Exception as e:
+            connected_site.connection.disconnect()
+            self.deadsites[connected_site.id] = {
+                "exception": e,
+                "site": connected_site.config,
+            }
+            return None
+
+        stillalive.append(connected_site)
+        if self.prepend_site:
+            for row in rows:
+                row.insert(0, connected_site.id)
+        return rows
 
     def command(self, command: str, sitename: SiteId | None = SiteId("local")) -> None:
         if sitename in self.deadsites:
@@ -1437,6 +1637,9 @@ class MultiSiteConnection(Helpers):
             raise MKLivestatusConfigError(
                 "Cannot send command to unconfigured site '%s'" % sitename
             )
+        if self.query_cache is not None:
+            # The command is likely to change the results of the cached queries
+            self.query_cache.clear()
         conn[0].command(command)
 
     def command_obj(self, command: Command, sitename: SiteId | None = SiteId("local")) -> None:
@@ -1572,6 +1775,46 @@ def is_socket_readable(sock: socket.socket, select_timeout: float = 1.0) -> bool
     return sock in fd_sets[0]
 
 
+def _response_data(code: str, data: bytes) -> bytes:
+    if code == "200":
+        return data
+
+    error_info = data.decode("utf-8")
+    if code == "404":
+        raise MKLivestatusTableNotFoundError(f"Not Found ({code}): {error_info!r}")
+
+    if code == "413":
+        raise MKLivestatusPayloadTooLargeError(error_info)
+
+    if code == "495":
+        raise MKLivestatusCertificateError(error_info)
+
+    if code == "502":
+        raise MKLivestatusBadGatewayError(error_info)
+
+    raise MKLivestatusQueryError(f"{code}: {error_info}")
+
+
+def _response_error(
+    error: Exception, suppress_exceptions: tuple[type[Exception], ...]
+) -> Exception:
+    if isinstance(error, suppress_exceptions):
+        return error
+
+    if isinstance(error, MKLivestatusCertificateError):
+        return MKLivestatusCertificateError(
+            "SSL certificate verification failed. "
+            "The remote certificate(s) might not be trusted. Edit this site's Livestatus encryption to trust them. "
+            "Technical error: %s" % error
+        )
+
+    # Catches
+    # MKLivestatusQueryError
+    # MKLivestatusSocketError
+    # FIXME: ? self.disconnect()
+    return MKLivestatusSocketError("Unhandled exception: %s" % error)
+
+
 @dataclass(frozen=True)
 class RRDResponse:
     window: range
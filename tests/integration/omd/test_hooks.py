@@ -39,6 +39,7 @@ def test_hooks(site: Site) -> None:
         "RABBITMQ_MANAGEMENT_PORT",
         "RABBITMQ_DIST_PORT",
         "AUTOMATION_HELPER",
+        "BI_COMPUTATION",
     ]
 
     if not site.edition.is_community_edition():
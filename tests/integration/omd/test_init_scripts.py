@@ -11,6 +11,7 @@ def test_init_scripts(site: Site) -> None:
         "agent-receiver",
         "apache",
         "automation-helper",
+        "bi-computation",
         "ui-job-scheduler",
         "core",
         "crontab",
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# mypy: disable-error-code="misc"
+
+"""Parsing the output of a Linux agent, depending on the selected sections
+
+The agent output resembles the one of a busy server: a few small sections, thousands of
+processes, a large logwatch section and piggybacked data of a few containers. The
+section selection of a check of "mem" and "cpu" is compared to parsing everything.
+
+$ pytest tests/performance/test_agent_parser.py --benchmark-verbose
+"""
+
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from cmk.ccc.hostaddress import HostName
+from cmk.ccc.translations import TranslationOptions
+from cmk.checkengine.parser import (
+    AgentParser,
+    AgentRawDataSectionElem,
+    NO_SELECTION,
+    SectionNameCollection,
+    SectionStore,
+)
+from cmk.checkengine.plugins import SectionName
+from cmk.helper_interface import AgentRawData
+
+
+def _agent_output(num_processes: int, num_log_lines: int) -> AgentRawData:
+    lines = [
+        b"<<<check_mk>>>",
+        b"Version: 2.4.0",
+        b"AgentOS: linux",
+        b"<<<mem>>>",
+        *(b"%s: %d kB" % (name, 1024 * nr) for nr, name in enumerate((b"MemTotal", b"MemFree"))),
+        b"<<<cpu>>>",
+        b"0.26 0.47 0.52 2/1074 3614 16",
+        b"<<<df>>>",
+        *(
+            b"/dev/sda%d ext4 30832548 10573316 18670260 37%% /mnt/%d" % (nr, nr)
+            for nr in range(20)
+        ),
+        b"<<<ps_lnx>>>",
+        b"[header] CGROUP USER VSZ RSS TIME ELAPSED PID COMMAND",
+        *(
+            b"12:pids:/system.slice/cron.service root 5528 1000 00:00:00 09:12:35 %d "
+            b"/usr/sbin/cron -f --option %d" % (nr, nr)
+            for nr in range(num_processes)
+        ),
+        b"<<<logwatch>>>",
+        b"[[[/var/log/syslog]]]",
+        *(
+            b"W Oct 18 12:00:%02d server kernel: [%d] something happened here" % (nr % 60, nr)
+            for nr in range(num_log_lines)
+        ),
+        b"<<<<>>>>",
+    ]
+    for container in range(5):
+        lines += [
+            b"<<<<container-%d>>>>" % container,
+            b"<<<mem>>>",
+            b"MemTotal: 1024 kB",
+            b"<<<ps_lnx>>>",
+            *(b"root 5528 1000 00:00:00 09:12:35 %d /bin/sleep" % nr for nr in range(100)),
+            b"<<<<>>>>",
+        ]
+    return AgentRawData(b"\n".join(lines) + b"\n")
+
+
+@pytest.mark.parametrize("num_processes, num_log_lines", [(1000, 10000), (5000, 100000)])
+@pytest.mark.parametrize(
+    "selection",
+    [
+        pytest.param(frozenset({SectionName("mem"), SectionName("cpu")}), id="selected"),
+        pytest.param(NO_SELECTION, id="all"),
+    ],
+)
+def test_parse_agent_output(
+    num_processes: int,
+    num_log_lines: int,
+    selection: SectionNameCollection,
+    tmp_path: Path,
+    benchmark: BenchmarkFixture,
+) -> None:
+    logger = logging.getLogger("test")
+    parser = AgentParser(
+        HostName("heute"),
+        SectionStore[Sequence[AgentRawDataSectionElem]](tmp_path / "store", logger=logger),
+        host_check_interval=60,
+        keep_outdated=True,
+        translation=TranslationOptions(),
+        encoding_fallback="ascii",
+        logger=logger,
+    )
+    raw_data = _agent_output(num_processes, num_log_lines)
+
+    host_sections = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        parser.parse, args=(raw_data,), kwargs={"selection": selection}, rounds=5, iterations=1
+    )
+
+    assert host_sections.sections[SectionName("mem")] == [
+        ["MemTotal:", "0", "kB"],
+        ["MemFree:", "1024", "kB"],
+    ]
+    assert len(host_sections.piggybacked_raw_data) == 5
+    benchmark.extra_info["size"] = len(raw_data)
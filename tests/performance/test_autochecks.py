@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# mypy: disable-error-code="misc"
+
+"""Reading the autochecks of all hosts, like the creation of the core configuration does
+
+Each host has 20 autochecks. The autochecks are read host by host from their autochecks
+files, and once with the site wide cache file, which has been written by a previous run.
+
+$ pytest tests/performance/test_autochecks.py --benchmark-verbose
+"""
+
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+import cmk.utils.paths
+from cmk.ccc.hostaddress import HostName
+from cmk.checkengine.discovery import AutochecksMemoizer, AutochecksStore
+from cmk.checkengine.plugins import AutocheckEntry, CheckPluginName
+
+
+def _read_host_by_host(host_names: Sequence[HostName], cache_file: Path) -> AutochecksMemoizer:
+    memoizer = AutochecksMemoizer()
+    for host_name in host_names:
+        memoizer.read(host_name)
+    return memoizer
+
+
+def _read_all(host_names: Sequence[HostName], cache_file: Path) -> AutochecksMemoizer:
+    memoizer = AutochecksMemoizer()
+    memoizer.read_all(host_names, cache_file)
+    return memoizer
+
+
+@pytest.mark.parametrize("num_hosts", [1000, 5000])
+@pytest.mark.parametrize(
+    "read",
+    [
+        pytest.param(_read_host_by_host, id="host_by_host"),
+        pytest.param(_read_all, id="all"),
+    ],
+)
+def test_read_autochecks(
+    num_hosts: int,
+    read: Callable[[Sequence[HostName], Path], AutochecksMemoizer],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    benchmark: BenchmarkFixture,
+) -> None:
+    monkeypatch.setattr(cmk.utils.paths, "autochecks_dir", tmp_path)
+    entries = [
+        AutocheckEntry(
+            CheckPluginName("df"),
+            f"/mnt/volume{nr}",
+            {"item_appearance": "mountpoint", "mountpoint_for_block_devices": "volume_name"},
+            {"cmk/device_type": "vd", "cmk/fs_type": "ext4"},
+        )
+        for nr in range(20)
+    ]
+    host_names = [HostName(f"host{nr}") for nr in range(num_hosts)]
+    for host_name in host_names:
+        AutochecksStore(host_name).write(entries)
+    cache_file = tmp_path / "cache" / "autochecks.pkl"
+    _read_all(host_names, cache_file)
+
+    memoizer = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        read, args=(host_names, cache_file), rounds=3, iterations=1
+    )
+
+    assert memoizer.read(host_names[-1]) == sorted(entries, key=lambda e: str(e.item))
+    benchmark.extra_info["hosts"] = num_hosts
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# mypy: disable-error-code="misc"
+
+"""Host searches of the BI searcher, depending on the number of hosts
+
+The hosts are spread over folders and carry a few tags and labels. Each round
+runs the searches of a compilation: one per folder with tag and label conditions,
+and one host name regex per folder.
+
+$ pytest tests/performance/test_bi_searcher.py --benchmark-verbose
+"""
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from cmk.bi.lib import BIHostData, BIServiceData
+from cmk.bi.searcher import BISearcher
+from cmk.bi.type_defs import HostConditions
+from cmk.ccc.hostaddress import HostName
+from cmk.utils.tags import TagGroupID, TagID
+
+NUM_FOLDERS = 100
+
+
+def _hosts(num_hosts: int) -> dict[str, BIHostData]:
+    services = {f"Service {nr}": BIServiceData(set(), {}) for nr in range(20)}
+    hosts = {}
+    for nr in range(num_hosts):
+        name = HostName(f"host{nr % NUM_FOLDERS}-{nr}")
+        hosts[name] = BIHostData(
+            site_id="site",
+            tags={
+                (TagGroupID("criticality"), TagID("prod" if nr % 3 else "test")),
+                (TagGroupID("tcp"), TagID("tcp")),
+            },
+            labels={"os": "linux" if nr % 2 else "windows"},
+            folder=f"folder{nr % NUM_FOLDERS}/",
+            services=services,
+            children=(),
+            parents=(),
+            alias=f"alias {name}",
+            name=name,
+        )
+    return hosts
+
+
+def _conditions() -> list[HostConditions]:
+    conditions: list[HostConditions] = []
+    for nr in range(NUM_FOLDERS):
+        conditions.append(
+            {
+                "host_choice": {"type": "all_hosts", "pattern": ""},
+                "host_folder": f"folder{nr}",
+                "host_label_groups": [("and", [("and", "os:linux")])],
+                "host_tags": {TagGroupID("criticality"): TagID("prod")},
+            }
+        )
+        conditions.append(
+            {
+                "host_choice": {"type": "host_name_regex", "pattern": f"host{nr}-.*"},
+                "host_folder": "",
+                "host_label_groups": [],
+                "host_tags": {TagGroupID("tcp"): TagID("tcp")},
+            }
+        )
+    return conditions
+
+
+@pytest.mark.parametrize("num_hosts", [10_000, 50_000])
+def test_search_hosts(num_hosts: int, benchmark: BenchmarkFixture) -> None:
+    hosts = _hosts(num_hosts)
+    conditions = _conditions()
+    searcher = BISearcher()
+
+    def search() -> int:
+        searcher.set_hosts(hosts)
+        return sum(len(searcher.search_hosts(condition)) for condition in conditions)
+
+    assert benchmark.pedantic(  # type: ignore[no-untyped-call]
+        search, rounds=3, iterations=1
+    ) == num_hosts + sum(1 for nr in range(num_hosts) if nr % 2 and nr % 3)
+    benchmark.extra_info["hosts"] = num_hosts
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# mypy: disable-error-code="misc"
+
+"""Loading the configuration files of cmk.base.config, depending on the number of hosts
+
+The configuration is spread over WATO folders with a hosts.mk and a rules.mk each.
+The first load executes the files, the following ones use the configuration
+snapshot, unless the snapshot is removed before each load.
+
+$ pytest tests/performance/test_config_loading.py --benchmark-verbose
+"""
+
+import shutil
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+import cmk.utils.paths
+from cmk.base import config
+
+HOSTS_PER_FOLDER = 500
+
+_HOSTS_FILE = """
+all_hosts += [{hosts}]
+
+host_tags.update({{{tags}}})
+
+ipaddresses.update({{{addresses}}})
+
+host_attributes.update({{{attributes}}})
+"""
+
+_TAGS = (
+    "{'piggyback': 'auto-piggyback', 'networking': 'lan', 'agent': 'cmk-agent',"
+    " 'criticality': 'prod', 'snmp_ds': 'no-snmp', 'address_family': 'ip-v4-only',"
+    " 'ip-v4': 'ip-v4', 'tcp': 'tcp', 'site': 'unit'}"
+)
+
+_RULES_FILE = """
+checkgroup_parameters.setdefault('filesystem', [])
+
+checkgroup_parameters['filesystem'] = [
+{{'id': '{folder}-1', 'value': {{'levels': (80.0, 90.0)}}, 'condition': {{'host_folder': '/%s/' % FOLDER_PATH}}}},
+] + checkgroup_parameters['filesystem']
+
+extra_host_conf.setdefault('check_interval', [])
+
+extra_host_conf['check_interval'] = [
+{{'id': '{folder}-2', 'value': 2.0, 'condition': {{'host_folder': '/%s/' % FOLDER_PATH}}}},
+] + extra_host_conf['check_interval']
+"""
+
+
+def _write_config(num_hosts: int) -> None:
+    cmk.utils.paths.main_config_file.write_text("")
+    for folder_nr in range(num_hosts // HOSTS_PER_FOLDER):
+        folder = cmk.utils.paths.check_mk_config_dir / "wato" / f"folder{folder_nr}"
+        folder.mkdir(parents=True)
+        hosts = [
+            f"host{folder_nr}-{nr}"
+            for nr in range(folder_nr * HOSTS_PER_FOLDER, (folder_nr + 1) * HOSTS_PER_FOLDER)
+        ]
+        (folder / "hosts.mk").write_text(
+            _HOSTS_FILE.format(
+                hosts=", ".join(f"'{host}'" for host in hosts),
+                tags=", ".join(f"'{host}': {_TAGS}" for host in hosts),
+                addresses=", ".join(f"'{host}': '127.0.0.1'" for host in hosts),
+                attributes=", ".join(f"'{host}': {{'alias': '{host}'}}" for host in hosts),
+            )
+        )
+        (folder / "rules.mk").write_text(_RULES_FILE.format(folder=folder_nr))
+
+
+def _load() -> None:
+    config._initialize_config()
+    config._load_config(with_conf_d=True)
+
+
+@pytest.fixture(name="config_files")
+def _config_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(cmk.utils.paths, "main_config_file", tmp_path / "main.mk")
+    monkeypatch.setattr(cmk.utils.paths, "check_mk_config_dir", tmp_path / "conf.d")
+    monkeypatch.setattr(cmk.utils.paths, "final_config_file", tmp_path / "final.mk")
+    monkeypatch.setattr(cmk.utils.paths, "local_config_file", tmp_path / "local.mk")
+    monkeypatch.setattr(cmk.utils.paths, "default_config_dir", tmp_path)
+    monkeypatch.setattr(cmk.utils.paths, "tmp_dir", tmp_path / "tmp")
+    return tmp_path / "tmp" / "config_snapshots"
+
+
+@pytest.mark.parametrize("num_hosts", [10_000, 50_000])
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_load_config(
+    num_hosts: int, snapshot: bool, config_files: Path, benchmark: BenchmarkFixture
+) -> None:
+    _write_config(num_hosts)
+    _load()
+    assert len(config.all_hosts) == num_hosts
+    benchmark.pedantic(  # type: ignore[no-untyped-call]
+        _load,
+        setup=None if snapshot else lambda: shutil.rmtree(config_files, ignore_errors=True),
+        rounds=5,
+        iterations=1,
+    )
+    assert len(config.all_hosts) == num_hosts
+    benchmark.extra_info["hosts"] = num_hosts
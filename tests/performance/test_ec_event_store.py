@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# mypy: disable-error-code="misc"
+
+"""Event Console throughput depending on the number of open events
+
+Each round creates a batch of new events on top of an event status which already
+holds the given number of open events, cancels one event per rule and enforces the
+"delete oldest" limit per host. The reported events/s should stay roughly constant
+when the number of open events grows.
+
+$ pytest tests/performance/test_ec_event_store.py --benchmark-verbose
+"""
+
+import logging
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+import cmk.ec.export as ec
+from cmk.ccc.hostaddress import HostName
+from cmk.ec.history_sqlite import SQLiteHistory, SQLiteSettings
+from cmk.ec.main import EventStatus, make_config, StatusTableEvents, StatusTableHistory
+from cmk.ec.perfcounters import Perfcounters
+from cmk.ec.settings import create_settings
+
+NUM_HOSTS = 1000
+NUM_RULES = 200
+BATCH_SIZE = 1000
+
+
+class _NoConnection:
+    def query(self, query: str) -> Sequence[Sequence[Any]]:
+        raise RuntimeError("no livestatus available")
+
+
+def _event(nr: int, now: float) -> ec.Event:
+    host = HostName(f"host{nr % NUM_HOSTS}")
+    return ec.Event(
+        rule_id=f"rule{nr % NUM_RULES}",
+        text=f"message {nr}",
+        phase="open",
+        state=nr % 4,
+        count=1,
+        time=now,
+        first=now,
+        last=now,
+        comment="",
+        host=host,
+        core_host=host,
+        host_in_downtime=False,
+        ipaddress="127.0.0.1",
+        application="",
+        pid=0,
+        priority=3,
+        facility=1,
+        match_groups=(),
+    )
+
+
+def _event_status(tmp_path: Path, num_open_events: int) -> EventStatus:
+    config = make_config(ec.default_config())
+    settings = create_settings("1.2.3i45", tmp_path, ["mkeventd"])
+    logger = logging.getLogger("cmk.mkeventd")
+    event_status = EventStatus(
+        settings,
+        config,
+        Perfcounters(logger),
+        SQLiteHistory(
+            SQLiteSettings.from_settings(settings, database=":memory:"),
+            config,
+            logger,
+            StatusTableEvents.columns,
+            StatusTableHistory.columns,
+        ),
+        logger,
+        _NoConnection(),
+    )
+    now = time.time()
+    for nr in range(num_open_events):
+        event_status.new_event(_event(nr, now))
+    return event_status
+
+
+def _process_batch(event_status: EventStatus) -> None:
+    now = time.time()
+    for nr in range(BATCH_SIZE):
+        event = _event(nr, now)
+        event_status.new_event(event)
+        if nr % 10 == 0:
+            # cancel the oldest open event of the rule
+            if cancelled := event_status.events_of_rule(event["rule_id"])[:1]:
+                event_status.remove_event(cancelled[0], "CANCELLED")
+        else:
+            event_status.remove_oldest_event("by_host", event)
+    for nr in range(0, BATCH_SIZE, 100):
+        if (changed := event_status.event(nr)) is not None:
+            changed["state"] = 2
+            event_status.update_event(changed)
+            event_status.delete_events_by_id([nr], "benchmark", lambda rule_id: None)
+
+
+@pytest.mark.parametrize("num_open_events", [1_000, 10_000, 50_000])
+def test_ec_event_throughput(
+    num_open_events: int, benchmark: BenchmarkFixture, tmp_path: Path
+) -> None:
+    event_status = _event_status(tmp_path, num_open_events)
+    benchmark.pedantic(  # type: ignore[no-untyped-call]
+        _process_batch, args=[event_status], rounds=5, iterations=1
+    )
+    assert benchmark.stats is not None
+    benchmark.extra_info["open_events"] = num_open_events
+    benchmark.extra_info["events_per_second"] = BATCH_SIZE / benchmark.stats.stats.mean
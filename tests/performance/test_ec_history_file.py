@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# mypy: disable-error-code="misc"
+
+"""Costs of querying the history of a single host from the file backend
+
+An exact host filter is answered via the index of the history files, while the
+equivalent regex filter still has to go through grep and all of the lines.
+
+$ pytest tests/performance/test_ec_history_file.py --benchmark-verbose
+"""
+
+import logging
+import time
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+import cmk.ec.export as ec
+from cmk.ec.history_file import FileHistory
+from cmk.ec.main import make_config, StatusTableEvents, StatusTableHistory
+from cmk.ec.query import QueryGET
+from cmk.ec.settings import create_settings
+
+from .test_ec_event_store import _event
+
+NUM_ENTRIES = 200_000
+
+
+@pytest.fixture(name="history", scope="module")
+def fixture_history(tmp_path_factory: pytest.TempPathFactory) -> FileHistory:
+    tmp_path: Path = tmp_path_factory.mktemp("history")
+    settings = create_settings("1.2.3i45", tmp_path, ["mkeventd"])
+    settings.paths.history_dir.value.mkdir(parents=True)
+    history = FileHistory(
+        settings,
+        make_config(ec.default_config()),
+        logging.getLogger("cmk.mkeventd"),
+        StatusTableEvents.columns,
+        StatusTableHistory.columns,
+    )
+    now = time.time()
+    for nr in range(NUM_ENTRIES):
+        history.add(_event(nr, now) | {"id": nr}, "NEW")
+    return history
+
+
+@pytest.mark.parametrize(
+    "host_filter", ["event_host = host7", r"event_host ~ host7\b"], ids=["index", "grep"]
+)
+def test_ec_history_file_host_query(
+    host_filter: str, history: FileHistory, benchmark: BenchmarkFixture
+) -> None:
+    logger = logging.getLogger("cmk.mkeventd")
+    query = QueryGET(
+        lambda _name: StatusTableHistory(logger, history),
+        ["GET history", f"Filter: {host_filter}"],
+        logger,
+    )
+    rows = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        lambda: list(history.get(query)), rounds=5, iterations=1
+    )
+    assert len(rows) == NUM_ENTRIES // 1000
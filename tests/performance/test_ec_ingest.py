@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# mypy: disable-error-code="misc"
+
+"""Sustained syslog message rate of the Event Console
+
+A load generator process sends syslog messages at a given rate via UDP to a
+running event server. The server matches them against a rule set, where only the last rule
+matches and drops them. The reported messages/s are the messages processed per
+second. Messages which did not make it are dropped either by the kernel or
+because the ingest buffer was full (status_ingest_overflows).
+
+$ pytest tests/performance/test_ec_ingest.py --benchmark-verbose
+"""
+
+import logging
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+import cmk.ec.export as ec
+from cmk.ccc.site import SiteId
+from cmk.ec.helpers import ECLock
+from cmk.ec.main import (
+    default_slave_status_master,
+    EventServer,
+    make_config,
+    StatusTableEvents,
+)
+from cmk.ec.perfcounters import Perfcounters
+from cmk.ec.settings import create_settings
+
+from .test_ec_event_store import _event_status, _NoConnection
+
+NUM_RULES = 100
+DURATION = 2.0  # seconds per round
+
+
+def _counters(perfcounters: Perfcounters) -> dict[str, float]:
+    return {
+        name: value
+        for (name, _default), value in zip(
+            Perfcounters.status_columns(), perfcounters.get_status(), strict=True
+        )
+    }
+
+
+def _config() -> ec.ConfigFromWATO:
+    rules = [
+        ec.Rule(id=f"rule{nr}", match=f"^error {nr} in (.*)$", state=2) for nr in range(NUM_RULES)
+    ]
+    rules.append(ec.Rule(id="drop_all", drop=True))
+    return ec.default_config() | {
+        "rule_packs": [ec.ECRulePackSpec(id="load", title="load", disabled=False, rules=rules)]
+    }
+
+
+def _event_server(tmp_path: Path, syslog_socket: socket.socket) -> EventServer:
+    settings = create_settings(
+        "1.2.3i45", tmp_path, ["mkeventd", "--syslog", "--syslog-fd", str(syslog_socket.fileno())]
+    )
+    settings.paths.event_pipe.value.parent.mkdir(parents=True)
+    config = make_config(_config())
+    logger = logging.getLogger("cmk.mkeventd")
+    event_status = _event_status(tmp_path, 0)
+    event_server = EventServer(
+        logger,
+        settings,
+        config,
+        default_slave_status_master(),
+        Perfcounters(logger),
+        ECLock(logger),
+        event_status._history,
+        event_status,
+        StatusTableEvents.columns,
+        _NoConnection(),
+        SiteId("load"),
+    )
+    event_server.compile_rules(config["rule_packs"])
+    return event_server
+
+
+# Runs in a separate process, like a real syslog sender would be.
+_LOAD_GENERATOR = """
+import socket, sys, time
+
+host, port, rate, duration = sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4])
+sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+start = time.time()
+sent = 0
+while (elapsed := time.time() - start) < duration:
+    # catch up with the requested rate every millisecond
+    while sent < rate * elapsed:
+        sender.sendto(
+            b"<78>Jan  1 12:00:00 host%d app[123]: warning %d from the load generator"
+            % (sent % 100, sent),
+            (host, port),
+        )
+        sent += 1
+    time.sleep(0.001)
+print(sent)
+"""
+
+
+def _generate_load(address: tuple[str, int], rate: int) -> int:
+    """Send syslog messages at the given rate, return the number of messages sent"""
+    return int(
+        subprocess.run(
+            [sys.executable, "-c", _LOAD_GENERATOR, *map(str, address), str(rate), str(DURATION)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    )
+
+
+def _wait_until_processed(perfcounters: Perfcounters, expected: float) -> None:
+    # Stop waiting when nothing happens anymore: The kernel might have dropped messages.
+    last_seen, last_change = -1.0, time.time()
+    while time.time() - last_change < 1:
+        counters = _counters(perfcounters)
+        if (seen := counters["status_messages"] + counters["status_ingest_overflows"]) >= expected:
+            return
+        if seen != last_seen:
+            last_seen, last_change = seen, time.time()
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("rate", [1_000, 5_000, 20_000])
+def test_ec_sustained_message_rate(rate: int, benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    syslog_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    syslog_socket.bind(("127.0.0.1", 0))
+    address = syslog_socket.getsockname()
+    event_server = _event_server(tmp_path, syslog_socket)
+    syslog_socket.detach()  # the event server has taken over the file descriptor
+    perfcounters = event_server._perfcounters
+    event_server.start()
+    sent = 0
+
+    def run_load_generator() -> None:
+        nonlocal sent
+        sent += _generate_load(address, rate)
+        _wait_until_processed(perfcounters, sent)
+
+    try:
+        benchmark.pedantic(  # type: ignore[no-untyped-call]
+            run_load_generator, rounds=3, iterations=1
+        )
+    finally:
+        event_server.terminate()
+        event_server.join()
+
+    assert benchmark.stats is not None
+    counters = _counters(perfcounters)
+    benchmark.extra_info["sent_messages_per_second"] = sent / benchmark.stats.stats.total
+    benchmark.extra_info["messages_per_second"] = (
+        counters["status_messages"] / benchmark.stats.stats.total
+    )
+    benchmark.extra_info["ingest_overflows"] = counters["status_ingest_overflows"]
+    benchmark.extra_info["kernel_drops"] = (
+        sent - counters["status_messages"] - counters["status_ingest_overflows"]
+    )
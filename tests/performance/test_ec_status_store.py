@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# mypy: disable-error-code="misc"
+
+"""Costs of saving and loading the Event Console status
+
+Each saving round changes a few events on top of the given number of open events.
+The time needed per save should not depend on the number of open events.
+
+$ pytest tests/performance/test_ec_status_store.py --benchmark-verbose
+"""
+
+import time
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+import cmk.ec.export as ec
+from cmk.ec.main import EventStatus
+
+from .test_ec_event_store import _event, _event_status
+
+CHANGES_PER_SAVE = 100
+
+
+def _change_and_save(event_status: EventStatus, created: list[ec.Event]) -> None:
+    # delete half of the events created in the previous round
+    for event in created[::2]:
+        event_status.remove_event(event, "DELETE")
+    created.clear()
+    now = time.time()
+    for nr in range(CHANGES_PER_SAVE):
+        event = _event(nr, now)
+        event_status.new_event(event)
+        created.append(event)
+    event_status.save_status()
+
+
+@pytest.mark.parametrize("num_open_events", [1_000, 10_000, 50_000])
+def test_ec_status_save(num_open_events: int, benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    event_status = _event_status(tmp_path, num_open_events)
+    event_status.settings.paths.status_file.value.parent.mkdir(parents=True)
+    event_status.save_status()
+    benchmark.pedantic(  # type: ignore[no-untyped-call]
+        _change_and_save, args=[event_status, []], rounds=10, iterations=1
+    )
+    benchmark.extra_info["open_events"] = num_open_events
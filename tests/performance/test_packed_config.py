@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# mypy: disable-error-code="misc"
+
+"""Reading the packed config in a helper, depending on the number of rules
+
+Each round reads the packed config and looks up the rulesets a helper needs for
+checking a typical host, which is a small fraction of all rulesets.
+
+$ pytest tests/performance/test_packed_config.py --benchmark-verbose
+"""
+
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from cmk.base.config import PackedConfigStore
+
+NUM_RULESETS = 500
+USED_RULESETS = 20
+
+
+def _rule(nr: int) -> dict[str, object]:
+    return {
+        "id": f"rule-{nr}",
+        "value": {"levels": (80.0, 90.0), "magic": 0.8, "trend_range": 24},
+        "condition": {
+            "host_name": [f"host{nr}", f"host{nr + 1}"],
+            "host_tags": {"criticality": "prod"},
+            "host_folder": f"/wato/folder{nr % 100}/",
+        },
+    }
+
+
+def _read(store: PackedConfigStore) -> None:
+    checkgroup_parameters = store.read()["checkgroup_parameters"]
+    for nr in range(0, NUM_RULESETS, NUM_RULESETS // USED_RULESETS):
+        assert checkgroup_parameters[f"ruleset{nr}"]
+
+
+@pytest.mark.parametrize("num_rules", [10_000, 100_000])
+def test_read_packed_config(num_rules: int, benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    rules_per_ruleset = num_rules // NUM_RULESETS
+    store = PackedConfigStore(tmp_path / "precompiled_check_config.mk")
+    store.write(
+        {
+            "all_hosts": [f"host{nr}" for nr in range(num_rules)],
+            "checkgroup_parameters": {
+                f"ruleset{ruleset_nr}": [
+                    _rule(nr)
+                    for nr in range(
+                        ruleset_nr * rules_per_ruleset, (ruleset_nr + 1) * rules_per_ruleset
+                    )
+                ]
+                for ruleset_nr in range(NUM_RULESETS)
+            },
+        }
+    )
+    benchmark.pedantic(  # type: ignore[no-untyped-call]
+        _read, args=[store], rounds=10, iterations=1
+    )
+    benchmark.extra_info["rules"] = num_rules
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# mypy: disable-error-code="misc"
+
+"""Computing an hourly prediction, depending on the horizon in days
+
+There is one slice per day of the horizon. The youngest slice has one minute values, the
+older ones have five minute values, like the RRDs of the metrics usually have. Every 20th
+value is missing.
+
+$ pytest tests/performance/test_prediction.py --benchmark-verbose
+"""
+
+from collections.abc import Sequence
+from typing import NamedTuple
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from cmk.agent_based.prediction_backend import PredictionInfo, PredictionParameters
+from cmk.utils.prediction._prediction import compute_prediction, PredictionData
+
+NOW = 1735732800
+
+
+class _Record(NamedTuple):
+    window: range
+    values: Sequence[float | None]
+
+
+_VALUES = [None if nr % 20 == 0 else float(nr % 100) for nr in range(2 * 1440)]
+
+
+def _get_recorded_data(metric: str, start: int, end: int) -> _Record:
+    step = 60 if end > NOW - 86400 else 300
+    return _Record(range(start, end, step), _VALUES[: len(range(start, end, step))])
+
+
+@pytest.mark.parametrize("horizon", [30, 90, 365])
+def test_compute_prediction(horizon: int, benchmark: BenchmarkFixture) -> None:
+    info = PredictionInfo.make(
+        "load1",
+        "upper",
+        PredictionParameters(period="hour", horizon=horizon, levels=("absolute", (1.0, 2.0))),
+        NOW,
+    )
+
+    prediction: PredictionData | None = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        compute_prediction, args=(info, _get_recorded_data, NOW), rounds=3, iterations=1
+    )
+
+    assert prediction is not None
+    assert prediction.step == 60
+    benchmark.extra_info["horizon"] = horizon
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# mypy: disable-error-code="misc"
+
+"""Costs of fetching the tables of a simulated host from a stored walk
+
+Each round creates a new backend, like a fetch of a host, and walks the same few
+tables of a walk of the given size.
+The compiled walk is only created in the first round, afterwards the time needed
+per round should not depend on the size of the walk.
+
+$ pytest tests/performance/test_snmp_stored_walk.py --benchmark-verbose
+"""
+
+import logging
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from cmk.ccc.hostaddress import HostAddress, HostName
+from cmk.fetchers.snmp_backend import StoredWalkSNMPBackend
+from cmk.snmplib import SNMPBackendEnum, SNMPHostConfig, SNMPVersion
+
+ROWS_PER_TABLE = 100
+FETCHED_TABLES = 10
+
+_SNMP_CONFIG = SNMPHostConfig(
+    is_ipv6_primary=False,
+    hostname=HostName("simulated"),
+    ipaddress=HostAddress("127.0.0.1"),
+    credentials="public",
+    port=161,
+    bulkwalk_enabled=True,
+    snmp_version=SNMPVersion.V2C,
+    bulk_walk_size_of=10,
+    timing={},
+    oid_range_limits={},
+    snmpv3_contexts=[],
+    character_encoding=None,
+    snmp_backend=SNMPBackendEnum.STORED_WALK,
+)
+
+
+def _write_walk(path: Path, num_rows: int) -> None:
+    with path.open("w") as f:
+        for nr in range(num_rows):
+            table, row = divmod(nr, ROWS_PER_TABLE)
+            f.write(f'.1.3.6.1.4.1.{table}.1.{row} "value {nr}"\n')
+
+
+def _fetch(path: Path) -> None:
+    backend = StoredWalkSNMPBackend(_SNMP_CONFIG, logging.getLogger("test"), path)
+    for table in range(FETCHED_TABLES):
+        backend.walk(f".1.3.6.1.4.1.{table}.1", context="")
+
+
+@pytest.mark.parametrize("num_rows", [1_000, 10_000, 100_000])
+def test_stored_walk_fetch(num_rows: int, benchmark: BenchmarkFixture, tmp_path: Path) -> None:
+    path = tmp_path / "simulated"
+    _write_walk(path, num_rows)
+    benchmark.pedantic(  # type: ignore[no-untyped-call]
+        _fetch, args=[path], rounds=10, iterations=1
+    )
+    benchmark.extra_info["rows"] = num_rows
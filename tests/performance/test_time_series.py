@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# mypy: disable-error-code="misc"
+
+"""Resampling and combining the time series of a graph
+
+Each round downsamples the time series of a graph with a week of one minute values to
+the resolution of the graph and sums them up, once with the array based TimeSeries and
+once with the former list based implementation, which is kept here for the comparison.
+
+$ pytest tests/performance/test_time_series.py --benchmark-verbose
+"""
+
+import random
+from collections.abc import Callable, Sequence
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from cmk.gui.graphing._graph_metric_expressions import (
+    apply_time_series_operator,
+    time_series_operators,
+)
+from cmk.gui.graphing._time_series import (
+    array_to_values,
+    rrd_timestamps,
+    TimeSeries,
+    TimeSeriesValue,
+    TimeSeriesValues,
+)
+
+START = 0
+END = 7 * 24 * 3600
+STEP = 60
+GRAPH_STEP = 600
+
+
+def _time_series(num_series: int) -> list[TimeSeries]:
+    rng = random.Random(42)
+    return [
+        TimeSeries(
+            start=START,
+            end=END,
+            step=STEP,
+            values=[
+                None if rng.random() < 0.05 else rng.uniform(0, 100)
+                for _t in range(START, END, STEP)
+            ],
+        )
+        for _nr in range(num_series)
+    ]
+
+
+def _list_downsample(
+    time_series: TimeSeries, *, start: int, end: int, step: int
+) -> list[float | None]:
+    dwsa = []
+    co: list[TimeSeriesValue] = []
+    desired_times = rrd_timestamps(start=start, end=end, step=step)
+    i = 0
+    for t, val in time_series.time_data_pairs():
+        if t > desired_times[i]:
+            dwsa.append(max((x for x in co if x is not None), default=None))
+            co = []
+            i += 1
+        co.append(val)
+
+    diff_len = len(desired_times) - len(dwsa)
+    if diff_len > 0:
+        dwsa.append(max((x for x in co if x is not None), default=None))
+        dwsa += [None] * (diff_len - 1)
+    return dwsa
+
+
+def _list_sum(operands: Sequence[TimeSeriesValues]) -> list[float | None]:
+    return [
+        sum(x for x in tsp if x is not None) if tsp.count(None) < len(tsp) else None
+        for tsp in zip(*operands)
+    ]
+
+
+def _compute_with_lists(series: Sequence[TimeSeries]) -> list[float | None]:
+    return _list_sum([_list_downsample(ts, start=START, end=END, step=GRAPH_STEP) for ts in series])
+
+
+def _compute_with_arrays(series: Sequence[TimeSeries]) -> list[float | None]:
+    _op_title, op_func = time_series_operators()["+"]
+    downsampled = [
+        TimeSeries(
+            start=START,
+            end=END,
+            step=GRAPH_STEP,
+            values=ts.downsample_array(start=START, end=END, step=GRAPH_STEP, cf="max"),
+        )
+        for ts in series
+    ]
+    return array_to_values(apply_time_series_operator(op_func, downsampled))
+
+
+@pytest.mark.parametrize("num_series", [10, 100])
+@pytest.mark.parametrize(
+    "compute",
+    [
+        pytest.param(_compute_with_lists, id="lists"),
+        pytest.param(_compute_with_arrays, id="arrays"),
+    ],
+)
+def test_downsample_and_sum(
+    num_series: int,
+    compute: Callable[[Sequence[TimeSeries]], list[float | None]],
+    benchmark: BenchmarkFixture,
+) -> None:
+    series = _time_series(num_series)
+
+    result = benchmark.pedantic(  # type: ignore[no-untyped-call]
+        compute, args=(series,), rounds=3, iterations=1
+    )
+
+    assert result == pytest.approx(_compute_with_lists(series))
+    benchmark.extra_info["series"] = num_series
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+# mypy: disable-error-code="misc"
+
+"""Costs of saving the value stores of a host
+
+Each saving round changes a tenth of the given number of value stores, like a check
+cycle of a host whose services only partly keep changing counters. With the
+"journal" storage the time needed per save should grow with the number of changed
+value stores only, not with the number of stored ones.
+
+$ pytest tests/performance/test_value_store.py --benchmark-verbose
+"""
+
+import itertools
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from cmk.ccc.hostaddress import HostName
+from cmk.checkengine.value_store import AllValueStoresStore, ValueStoreKey, ValueStoresStorage
+
+CHANGE_EVERY_NTH_STORE = 10
+
+
+def _value_store(nr: int, round_nr: int) -> Mapping[str, str]:
+    return {
+        "in_octets": f"({round_nr * 60.0}, {nr * round_nr * 1234567})",
+        "out_octets": f"({round_nr * 60.0}, {nr * round_nr * 7654321})",
+        "errors": f"({round_nr * 60.0}, 0)",
+    }
+
+
+def _changes(
+    keys: Sequence[ValueStoreKey], rounds: Iterator[int]
+) -> tuple[tuple[Mapping[ValueStoreKey, Mapping[str, str]]], dict[str, object]]:
+    round_nr = next(rounds)
+    changed = range(round_nr % CHANGE_EVERY_NTH_STORE, len(keys), CHANGE_EVERY_NTH_STORE)
+    return ({keys[nr]: _value_store(nr, round_nr) for nr in changed},), {}
+
+
+@pytest.mark.parametrize("storage", ["json", "journal"])
+@pytest.mark.parametrize("num_stores", [100, 1_000, 10_000])
+def test_value_store_save(
+    num_stores: int, storage: ValueStoresStorage, benchmark: BenchmarkFixture, tmp_path: Path
+) -> None:
+    keys = [(HostName("switch"), "interfaces", f"Port {nr}") for nr in range(num_stores)]
+    store = AllValueStoresStore(tmp_path / "switch", storage=storage)
+    store.update({key: _value_store(nr, 0) for nr, key in enumerate(keys)})
+    store.load()
+    rounds = itertools.count(1)
+    benchmark.pedantic(  # type: ignore[no-untyped-call]
+        store.update, setup=lambda: _changes(keys, rounds), rounds=50
+    )
+    benchmark.extra_info["value_stores"] = num_stores
@@ -1238,6 +1238,7 @@ COMPONENTS: Mapping[Component, ImportCheckerProtocol] = {
 _EXPLICIT_FILE_TO_COMPONENT = {
     ModulePath("bin/check_mk"): Component("cmk.base"),
     ModulePath("bin/cmk-automation-helper"): Component("cmk.base"),
+    ModulePath("bin/cmk-bi-computation"): Component("cmk.bi"),
     ModulePath("bin/cmk-cert"): Component("cmk.gui.cmkcert"),
     ModulePath("bin/message-broker-certs"): Component("cmk.message_broker_certs"),
     ModulePath("bin/cmk-convert-rrds"): Component("cmk.rrd"),
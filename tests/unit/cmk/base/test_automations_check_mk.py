@@ -26,6 +26,7 @@ from cmk.base.automations import check_mk
 from cmk.base.config import ConfigCache
 from cmk.ccc.hostaddress import HostAddress, HostName
 from cmk.checkengine.plugins import AgentBasedPlugins
+from cmk.checkengine.value_store import ValueStoresStorage
 from cmk.discover_plugins import PluginLocation
 from cmk.fetchers import AdHocSecrets, Fetcher, Mode, PiggybackFetcher, PlainFetcherTrigger
 from cmk.server_side_calls.v1 import ActiveCheckCommand, ActiveCheckConfig, replace_macros
@@ -317,3 +318,11 @@ def test_automation_active_check_invalid_args(
     )
 
     assert error_message == capsys.readouterr().err
+
+
+@pytest.mark.parametrize("storage", ["json", "journal"])
+def test_all_value_stores_store_storage(
+    monkeypatch: pytest.MonkeyPatch, storage: ValueStoresStorage
+) -> None:
+    monkeypatch.setattr(config, "value_stores_storage", storage)
+    assert check_mk._all_value_stores_store(HostName("heute")).storage == storage
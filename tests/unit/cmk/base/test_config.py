@@ -7,7 +7,9 @@
 # mypy: disable-error-code="type-arg"
 
 
+import copy
 import itertools
+import pickle
 import re
 import shutil
 import socket
@@ -2643,6 +2645,68 @@ def test_load_config_folder_paths(folder_path_test_config: LoadedConfigFragment)
     ]
 
 
+def test_load_config_from_snapshot(
+    folder_path_test_config: LoadedConfigFragment, monkeypatch: MonkeyPatch
+) -> None:
+    def _fail(*args: object) -> None:
+        raise AssertionError("configuration files executed")
+
+    with monkeypatch.context() as m:
+        m.setattr(config, "_exec_config_files", _fail)
+        loaded_config = config.load(discovery_rulesets=()).loaded_config
+
+    assert loaded_config.all_hosts == folder_path_test_config.all_hosts
+    assert loaded_config.host_tags == folder_path_test_config.host_tags
+    assert config.host_paths[HostName("lvl2-host")] == "/wato/lvl1/lvl2/hosts.mk"
+    assert [rule["value"] for rule in config.cmc_host_rrd_config] == [
+        "LVL1aaa",
+        "LVL2",
+        "LVL1",
+        "LVL0",
+        "MAIN",
+    ]
+
+    _add_rule_in_folder(cmk.utils.paths.check_mk_config_dir / "wato" / "lvl1", "CHANGED")
+    config.load(discovery_rulesets=())
+    assert [rule["value"] for rule in config.cmc_host_rrd_config] == [
+        "LVL1aaa",
+        "LVL2",
+        "CHANGED",
+        "LVL0",
+        "MAIN",
+    ]
+
+
+def test_load_config_keeps_snapshot_of_other_files(
+    folder_path_test_config: LoadedConfigFragment, monkeypatch: MonkeyPatch
+) -> None:
+    def _fail(*args: object) -> None:
+        raise AssertionError("configuration files executed")
+
+    config.load(discovery_rulesets=(), with_conf_d=False)
+    config.load(discovery_rulesets=(), with_conf_d=False)
+
+    with monkeypatch.context() as m:
+        m.setattr(config, "_exec_config_files", _fail)
+        loaded_config = config.load(discovery_rulesets=()).loaded_config
+        config.load(discovery_rulesets=(), with_conf_d=False)
+
+    assert loaded_config.all_hosts == folder_path_test_config.all_hosts
+
+
+def test_load_config_without_snapshot_of_functions(
+    folder_path_test_config: LoadedConfigFragment,
+) -> None:
+    with cmk.utils.paths.main_config_file.open("a", encoding="utf-8") as f:
+        f.write("\ndef _my_host_name(name):\n    return name + '-custom'\n")
+
+    config.load(discovery_rulesets=())
+    del config._my_host_name  # type: ignore[attr-defined]
+    config.load(discovery_rulesets=())
+
+    assert config._my_host_name("main-host") == "main-host-custom"  # type: ignore[attr-defined]
+
+
 @pytest.fixture(name="folder_path_test_config")
 def folder_path_test_config_fixture(
     monkeypatch: MonkeyPatch,
@@ -2832,6 +2896,21 @@ def test_load_packed_config(config_path: Path) -> None:
     del config.__dict__["abcd"]
 
 
+def test_load_packed_config_does_not_read_rulesets(
+    monkeypatch: MonkeyPatch, config_path: Path
+) -> None:
+    rules = [{"id": "1", "condition": {}, "value": {"param": 1}}]
+    config.PackedConfigStore.from_serial(config_path).write({"active_checks": {"http": rules}})
+    monkeypatch.setattr(config, "active_checks", {})
+
+    config.load_packed_config(config_path, discovery_rulesets=())
+
+    # The rulesets are still to be read on access
+    active_checks: Mapping[str, object] = config.active_checks
+    assert not isinstance(active_checks, dict)
+    assert active_checks["http"] == rules
+
+
 class TestPackedConfigStore:
     @pytest.fixture()
     def store(self, config_path: Path) -> config.PackedConfigStore:
@@ -2850,6 +2929,28 @@ class TestPackedConfigStore:
         assert precompiled_check_config.exists()
         assert store.read() == {"abc": 1}
 
+    def test_rulesets_are_read_on_access(self, store: config.PackedConfigStore) -> None:
+        rules = [{"id": "1", "condition": {}, "value": {"levels": (80.0, 90.0)}}]
+        store.write({"abc": 1, "checkgroup_parameters": {"filesystem": rules, "memory": []}})
+
+        helper_config = store.read()
+
+        assert helper_config["abc"] == 1
+        checkgroup_parameters = helper_config["checkgroup_parameters"]
+        assert isinstance(checkgroup_parameters, Mapping)
+        assert sorted(checkgroup_parameters) == ["filesystem", "memory"]
+        assert checkgroup_parameters["filesystem"] == rules
+        assert checkgroup_parameters["filesystem"] is checkgroup_parameters["filesystem"]
+        assert checkgroup_parameters.get("cpu_load") is None
+        assert copy.deepcopy(checkgroup_parameters) == {"filesystem": rules, "memory": []}
+
+    def test_read_previous_format(self, store: config.PackedConfigStore, config_path: Path) -> None:
+        config_path.mkdir(parents=True, exist_ok=True)
+        with (config_path / "precompiled_check_config.mk").open("wb") as f:
+            pickle.dump({"abc": 1, "static_checks": {"df": []}}, f)
+
+        assert store.read() == {"abc": 1, "static_checks": {"df": []}}
+
 
 def test__extract_check_plugins(monkeypatch: MonkeyPatch) -> None:
     duplicate_legacy_plugin = LegacyCheckDefinition(
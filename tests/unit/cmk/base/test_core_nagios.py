@@ -32,6 +32,7 @@ from cmk.base import config
 from cmk.base.configlib.servicename import make_final_service_name_config
 from cmk.base.core.nagios._create_config import (
     _format_nagios_object,
+    create_config,
     create_nagios_config_commands,
     create_nagios_host_spec,
     create_nagios_servicedefs,
@@ -48,11 +49,13 @@ from cmk.checkengine.plugins import AgentBasedPlugins, AutocheckEntry, CheckPlug
 from cmk.discover_plugins import PluginLocation
 from cmk.server_side_calls.v1 import ActiveCheckCommand, ActiveCheckConfig
 from cmk.server_side_calls_backend import load_active_checks
-from cmk.utils import ip_lookup, paths
+from cmk.utils import config_warnings, ip_lookup, paths
 from cmk.utils.labels import ABCLabelConfig, LabelManager, Labels
+from cmk.utils.notify import NotifyHostFiles
 from cmk.utils.servicename import ServiceName
 from tests.testlib.unit.base_configuration_scenario import Scenario
 from tests.unit.cmk.base.empty_config import EMPTY_CONFIG
+from tests.unit.mocks_and_helpers import DummyLicensingHandler
 
 _TEST_LOCATION = PluginLocation(
     cmk.plugins.collection.server_side_calls.ftp.__name__,
@@ -385,6 +388,80 @@ def test_create_nagios_host_spec_service_period(monkeypatch: MonkeyPatch) -> Non
     assert "service_period" not in host_spec
 
 
+def test_create_config_in_processes_equals_sequential(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(config, config.load_resource_cfg_macros.__name__, lambda *a: {})
+    hostnames = [HostName(f"host{nr:03}") for nr in range(100)]
+    ts = Scenario()
+    for hostname in hostnames:
+        ts.add_host(hostname)
+    ts.set_ruleset(
+        "host_check_commands",
+        [
+            {"id": "01", "condition": {"host_name": hostnames[::7]}, "value": "agent"},
+            {"id": "02", "condition": {"host_name": hostnames[1::3]}, "value": "ok"},
+        ],
+    )
+    ts.set_ruleset(
+        "host_contactgroups",
+        [{"id": "03", "condition": {"host_name": hostnames[::2]}, "value": "admins"}],
+    )
+    ts.set_ruleset(
+        "custom_checks",
+        [
+            {
+                "id": "04",
+                "condition": {"host_name": hostnames[::5]},
+                "value": {"service_description": "Custom", "command_line": "echo 1"},
+            }
+        ],
+    )
+    config_cache = ts.apply(monkeypatch)
+    final_service_name_config = make_final_service_name_config(
+        config_cache._loaded_config, config_cache.ruleset_matcher
+    )
+
+    def lookup(
+        host_name: HostName,
+        family: Literal[socket.AddressFamily.AF_INET, socket.AddressFamily.AF_INET6],
+    ) -> HostAddress:
+        if host_name == HostName("host042"):
+            raise ip_lookup.MKIPAddressLookupError("no such host")
+        return HostAddress("127.0.0.1")
+
+    def create(processes: int) -> tuple[str, NotifyHostFiles, Sequence[str]]:
+        config_warnings.initialize()
+        ip_address_of = ip_lookup.ConfiguredIPLookup(
+            lookup, allow_empty=(), error_handler=ip_lookup.CollectFailedHosts()
+        )
+        outfile = io.StringIO()
+        notify_host_files = create_config(
+            outfile,
+            config_cache,
+            final_service_name_config,
+            config_cache.make_passive_service_name_config(final_service_name_config),
+            enforced_services_table=lambda hn: {},
+            plugins={},
+            hostnames=hostnames,
+            licensing_handler=DummyLicensingHandler(),
+            passwords={},
+            get_ip_stack_config=lambda hn: ip_lookup.IPStackConfig.IPv4,
+            default_address_family=lambda hn: socket.AddressFamily.AF_INET,
+            ip_address_of=ip_address_of,
+            service_depends_on=lambda *a: (),
+            timeperiods={},
+            processes=processes,
+        )
+        return outfile.getvalue(), notify_host_files, ip_address_of.error_handler.format_errors()
+
+    objects, notify_host_files, ip_lookup_errors = create(1)
+    assert "check-mk-host-custom-15" in objects
+    assert ip_lookup_errors == [
+        "Cannot lookup IP address of 'host042' (no such host). "
+        "The host will not be monitored correctly."
+    ]
+    assert create(3) == (objects, notify_host_files, ip_lookup_errors)
+
+
 @pytest.fixture(name="config_path")
 def fixture_config_path(tmp_path: Path) -> Path:
     return Path(VersionedConfigPath(tmp_path, 42))
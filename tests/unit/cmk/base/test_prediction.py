@@ -9,13 +9,22 @@ import math
 import time
 from collections.abc import Callable, Sequence
 from pathlib import Path
+from typing import NamedTuple
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import pytest
 import time_machine
 
+from cmk.agent_based.prediction_backend import PredictionInfo, PredictionParameters
 from cmk.ccc.hostaddress import HostName
-from cmk.utils.prediction import _grouping, _prediction, DataStat, PredictionStore
+from cmk.utils.prediction import (
+    _grouping,
+    _prediction,
+    DataStat,
+    make_updated_predictions,
+    PredictionStore,
+)
 
 Timestamp = int
 
@@ -206,7 +215,58 @@ def approx(value_in: float) -> float:
 def test_data_stats(
     slices: list[Sequence[float | None]], result: Sequence[DataStat | None]
 ) -> None:
-    assert _prediction._data_stats(slices) == result
+    assert _prediction._data_stats(np.array(slices, dtype=np.float64)) == result
+
+
+class _Record(NamedTuple):
+    window: range
+    values: Sequence[float | None]
+
+
+_NOW = 1531022400
+_PARAMS = PredictionParameters(period="hour", horizon=2, levels=("absolute", (1.0, 2.0)))
+
+
+def test_compute_prediction_forward_fills_coarser_slices() -> None:
+    requested: list[tuple[str, int, int]] = []
+
+    def get_recorded_data(metric: str, start: int, end: int) -> _Record:
+        requested.append((metric, start, end))
+        if len(requested) == 1:
+            return _Record(range(start, end, 43200), [1.0, None])
+        return _Record(range(start, end, 86400), [3.0])
+
+    prediction = _prediction.compute_prediction(
+        PredictionInfo.make("load1", "upper", _PARAMS, _NOW), get_recorded_data, _NOW
+    )
+
+    assert [metric for metric, _start, _end in requested] == ["load1.max", "load1.max"]
+    assert prediction is not None
+    assert prediction.start == requested[0][1]
+    assert prediction.step == 43200
+    assert prediction.points == [
+        DataStat(2.0, 1.0, 3.0, approx(math.sqrt(2))),
+        DataStat(3.0, 3.0, 3.0, None),
+    ]
+
+
+def test_make_updated_predictions_fetches_slices_once(tmp_path: Path) -> None:
+    store = PredictionStore(HostName("foo"), "bar")
+    store.path = tmp_path
+    for direction in ("upper", "lower"):
+        meta = PredictionInfo.make("load1", direction, _PARAMS, _NOW)
+        info_file = store.path / store.relative_data_file(meta).with_suffix(store.INFO_FILE_SUFFIX)
+        info_file.parent.mkdir(parents=True, exist_ok=True)
+        info_file.write_text(meta.model_dump_json())
+
+    requested: list[tuple[str, int, int]] = []
+
+    def get_recorded_data(metric: str, start: int, end: int) -> _Record:
+        requested.append((metric, start, end))
+        return _Record(range(start, end, 43200), [1.0, 2.0])
+
+    assert len(make_updated_predictions(store, get_recorded_data, _NOW)) == 2
+    assert len(requested) == len(set(requested)) == 2
 
 
 class TestPredictionStore:
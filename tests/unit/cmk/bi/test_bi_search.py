@@ -192,3 +192,84 @@ def test_service_search(
     search = BIServiceSearch(schema_config)
     results = search.execute({}, bi_searcher_with_sample_config)
     assert len(results) == expected_matches
+
+
+@pytest.mark.parametrize(
+    "conditions",
+    [
+        pytest.param({"host_tags": {"clone-tag": {"$ne": "clone-tag"}}}, id="tag not equal"),
+        pytest.param({"host_tags": {"clone-tag": {"$or": ["clone-tag", "x"]}}}, id="tag or"),
+        pytest.param({"host_tags": {"tcp": {"$nor": ["tcp", "x"]}}}, id="tag nor"),
+        pytest.param({"host_tags": {"tcp": "tcp", "clone-tag": None}}, id="tag missing"),
+        pytest.param(
+            {"host_label_groups": [("and", [("not", "cmk/check_mk_server:yes")])]},
+            id="label not",
+        ),
+        pytest.param(
+            {
+                "host_label_groups": [
+                    ("and", [("and", "cmk/check_mk_server:no")]),
+                    ("or", [("and", "cmk/check_mk_server:yes"), ("or", "os:linux")]),
+                ]
+            },
+            id="label groups",
+        ),
+        pytest.param({"host_folder": "subfolder/nested"}, id="nested folder"),
+        pytest.param({"host_folder": "sub"}, id="folder name prefix"),
+        pytest.param(
+            {
+                "host_folder": "subfolder",
+                "host_choice": {"type": "host_name_regex", "pattern": "heute_clone"},
+            },
+            id="host name and folder",
+        ),
+        pytest.param(
+            {"host_choice": {"type": "host_alias_regex", "pattern": "heute_"}}, id="alias"
+        ),
+    ],
+)
+def test_indexed_host_search(conditions, bi_searcher_with_sample_config):
+    hosts = dict(bi_searcher_with_sample_config.hosts)
+    hosts["morgen"] = hosts["heute"]._replace(
+        name="morgen", folder="subfolder/nested/", labels={}, alias="morgen_alias"
+    )
+    bi_searcher_with_sample_config.set_hosts(hosts)
+    schema = BIHostSearch.schema()()
+    search = BIHostSearch(schema.load(schema.dump({"conditions": conditions})))
+
+    # The same hosts as filtering host by host
+    reference = BISearcher()
+    reference.set_hosts(hosts)
+    chosen_hosts, _match_groups = reference.filter_host_choice(
+        list(hosts.values()), search.conditions["host_choice"]
+    )
+    matched_hosts = reference.filter_host_folder(chosen_hosts, search.conditions["host_folder"])
+    matched_hosts = reference.filter_host_tags(matched_hosts, search.conditions["host_tags"])
+    matched_hosts = reference.filter_host_labels(
+        matched_hosts, search.conditions["host_label_groups"]
+    )
+    assert [
+        match.host.name for match in bi_searcher_with_sample_config.search_hosts(search.conditions)
+    ] == [host.name for host in matched_hosts]
+
+
+@pytest.mark.parametrize(
+    "host_choice",
+    [
+        pytest.param({"type": "all_hosts"}, id="all hosts"),
+        pytest.param({"type": "host_name_regex", "pattern": "(.*)_host"}, id="host name regex"),
+        pytest.param({"type": "host_alias_regex", "pattern": ".*"}, id="alias regex"),
+    ],
+)
+def test_host_search_keeps_order_of_hosts(host_choice, bi_searcher_with_sample_config):
+    heute = bi_searcher_with_sample_config.hosts["heute"]
+    names = ["zulu_host", "alpha_host", "mike_host"]
+    bi_searcher_with_sample_config.set_hosts(
+        {name: heute._replace(name=name, alias=name) for name in names}
+    )
+    schema = BIHostSearch.schema()()
+    search = BIHostSearch(schema.load(schema.dump({"conditions": {"host_choice": host_choice}})))
+
+    assert [
+        match.host.name for match in bi_searcher_with_sample_config.search_hosts(search.conditions)
+    ] == names
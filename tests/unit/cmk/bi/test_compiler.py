@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import copy
+from collections.abc import Mapping
+from typing import Any
+
+from fakeredis import FakeRedis
+
+from livestatus import LivestatusResponse, LivestatusRow, Query
+
+from cmk.bi.compiler import BICompiler
+from cmk.bi.filesystem import BIFileSystem
+from cmk.bi.lib import SitesCallback
+from cmk.ccc import store
+from cmk.ccc.site import SiteId
+
+from .bi_test_data import sample_config
+
+
+def _write_config(fs: BIFileSystem) -> None:
+    config: dict[str, Any] = copy.deepcopy(sample_config.bi_packs_config)
+    clone_aggregation = copy.deepcopy(config["packs"][0]["aggregations"][0])
+    clone_aggregation["id"] = "clone_aggregation"
+    clone_aggregation["node"]["action"]["rule_id"] = "general"
+    clone_aggregation["node"]["search"]["conditions"]["host_choice"] = {
+        "type": "host_name_regex",
+        "pattern": "heute_clone",
+    }
+    config["packs"][0]["aggregations"].append(clone_aggregation)
+    store.save_object_to_file(fs.etc.config, config)
+
+
+def _start_site(program_start: int, hosts: Mapping[str, tuple[Any, ...]]) -> SitesCallback:
+    def query(
+        query: Query, only_sites: list[SiteId] | None = None, fetch_full_data: bool = False
+    ) -> LivestatusResponse:
+        if str(query).startswith("GET hosts"):
+            return LivestatusResponse(
+                [
+                    LivestatusRow(
+                        [
+                            site,
+                            name,
+                            dict(tags),
+                            labels,
+                            list(children),
+                            list(parents),
+                            alias,
+                            folder,
+                        ]
+                    )
+                    for site, tags, labels, folder, _services, children, parents, alias, name in (
+                        hosts.values()
+                    )
+                ]
+            )
+        if str(query).startswith("GET services"):
+            return LivestatusResponse(
+                [
+                    LivestatusRow([values[0], name, description, tags, labels])
+                    for name, values in hosts.items()
+                    for description, (tags, labels) in values[4].items()
+                ]
+            )
+        return LivestatusResponse([LivestatusRow(["heute", program_start])])
+
+    sites_callback = SitesCallback(
+        all_sites_with_id_and_online=lambda: [(SiteId("heute"), True)],
+        query=query,
+        translate=lambda s: s,
+    )
+    return sites_callback
+
+
+def _compile(fs: BIFileSystem, sites_callback: SitesCallback) -> BICompiler:
+    compiler = BICompiler(fs.etc.config, sites_callback, fs, FakeRedis())
+    compiler.load_compiled_aggregations()
+    assert set(compiler.compiled_aggregations) == {"default_aggregation", "clone_aggregation"}
+    return compiler
+
+
+def test_recompile_affected_aggregations(fs: BIFileSystem) -> None:
+    _write_config(fs)
+    hosts = {str(name): values for name, values in sample_config.bi_structure_states.items()}
+
+    assert _compile(fs, _start_site(1, hosts)).compilation_report == {
+        "default_aggregation": "configuration changed",
+        "clone_aggregation": "configuration changed",
+    }
+    assert not _compile(fs, _start_site(1, hosts)).compilation_report
+    assert not _compile(fs, _start_site(2, hosts)).compilation_report
+
+    heute = hosts["heute"]
+    hosts["heute"] = heute[:4] + ({**heute[4], "New service": ({}, {})},) + heute[5:]
+    compiler = _compile(fs, _start_site(3, hosts))
+    assert compiler.compilation_report == {"default_aggregation": "uses changed host heute"}
+    assert any(
+        service == "New service"
+        for branch in compiler.compiled_aggregations["default_aggregation"].branches
+        for _site, _host, service in branch.required_elements()
+    )
+
+    hosts["morgen"] = heute[:-1] + ("morgen",)
+    compiler = _compile(fs, _start_site(4, hosts))
+    assert compiler.compilation_report == {
+        "default_aggregation": "changed host morgen matches its searches"
+    }
+    assert len(compiler.compiled_aggregations["default_aggregation"].branches) == 3
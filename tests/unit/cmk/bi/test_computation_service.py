@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import copy
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from livestatus import LivestatusResponse, LivestatusRow, Query
+
+import cmk.bi.computation_client
+from cmk.bi.computation_api import deserialize_node_result, serialize_node_result
+from cmk.bi.computation_client import BIComputationClient
+from cmk.bi.computation_service._app import make_application, poll
+from cmk.bi.computation_service._computer import IncrementalBIComputer
+from cmk.bi.computer import BIComputer
+from cmk.bi.data_fetcher import BIStatusFetcher
+from cmk.bi.filesystem import BIFileSystem
+from cmk.bi.lib import SitesCallback
+from cmk.bi.packs import BIAggregationPacks
+from cmk.bi.searcher import BISearcher
+from cmk.bi.storage import AggregationStore, MetadataStore
+from cmk.bi.trees import BICompiledAggregation
+from cmk.ccc.site import SiteId
+
+from .bi_test_data import sample_config
+
+
+def _compile_default_aggregation(
+    bi_packs_sample_config: BIAggregationPacks, bi_searcher: BISearcher
+) -> BICompiledAggregation:
+    aggregation = bi_packs_sample_config.get_aggregation("default_aggregation")
+    assert aggregation is not None
+    return aggregation.compile(bi_searcher)
+
+
+def _status_fetcher(rows: LivestatusResponse) -> BIStatusFetcher:
+    def query(
+        query: Query, only_sites: list[SiteId] | None = None, fetch_full_data: bool = False
+    ) -> LivestatusResponse:
+        return rows
+
+    return BIStatusFetcher(
+        SitesCallback(
+            all_sites_with_id_and_online=lambda: [(SiteId("heute"), True)],
+            query=query,
+            translate=lambda s: s,
+        )
+    )
+
+
+def test_recompute_branches_of_changed_hosts(
+    bi_packs_sample_config: BIAggregationPacks, bi_searcher_with_sample_config: BISearcher
+) -> None:
+    compiled_aggregation = _compile_default_aggregation(
+        bi_packs_sample_config, bi_searcher_with_sample_config
+    )
+    rows = LivestatusResponse(copy.deepcopy(sample_config.bi_status_rows))
+    computer = IncrementalBIComputer(_status_fetcher(rows), SiteId("heute"))
+    computer.set_aggregations([compiled_aggregation], 1.0)
+
+    assert computer.update() == 2
+    assert computer.update() == 0
+    branches = {"default_aggregation": ["Host heute", "Host heute_clone", "Host morgen"]}
+    assert computer.get_results(1.0, branches)["default_aggregation"].keys() == {
+        "Host heute",
+        "Host heute_clone",
+    }
+
+    rows[0] = LivestatusRow(rows[0][:6] + [1] + rows[0][7:])
+    assert computer.update() == 1
+    heute_result = computer.get_results(1.0, branches)["default_aggregation"]["Host heute"]
+    assert heute_result is not None
+    assert heute_result.actual_result.in_downtime
+    # Results of other compilations are not served
+    assert not computer.get_results(2.0, branches)
+
+    # Branches of other sites are computed by the GUI
+    computer = IncrementalBIComputer(_status_fetcher(rows), SiteId("morgen"))
+    computer.set_aggregations([compiled_aggregation], 1.0)
+    assert computer.update() == 0
+    assert not computer.get_results(1.0, branches)
+
+
+def test_serialize_node_result(
+    bi_packs_sample_config: BIAggregationPacks,
+    bi_searcher_with_sample_config: BISearcher,
+    bi_status_fetcher: BIStatusFetcher,
+) -> None:
+    compiled_aggregation = _compile_default_aggregation(
+        bi_packs_sample_config, bi_searcher_with_sample_config
+    )
+    bi_status_fetcher.states = bi_status_fetcher.create_bi_status_data(sample_config.bi_status_rows)
+    branch = compiled_aggregation.branches[0]
+    [node_result_bundle] = compiled_aggregation.compute_branches([branch], bi_status_fetcher)
+
+    assert deserialize_node_result(serialize_node_result(node_result_bundle), branch) == (
+        node_result_bundle
+    )
+
+
+def test_results_endpoint(
+    fs: BIFileSystem,
+    bi_packs_sample_config: BIAggregationPacks,
+    bi_searcher_with_sample_config: BISearcher,
+) -> None:
+    compiled_aggregation = _compile_default_aggregation(
+        bi_packs_sample_config, bi_searcher_with_sample_config
+    )
+    AggregationStore(fs.cache).save(compiled_aggregation)
+    MetadataStore(fs).update_last_compilation(1.0)
+    computer = IncrementalBIComputer(_status_fetcher(sample_config.bi_status_rows), SiteId("heute"))
+    app = make_application(computer=computer, fs=fs, poll_interval=60.0)
+    poll(app.state.dependencies)
+
+    client = TestClient(app)
+    payload = {"last_compilation": 1.0, "branches": {"default_aggregation": ["Host heute"]}}
+    results = client.post("/results", json=payload).json()["results"]
+    assert results["default_aggregation"]["Host heute"]["actual_result"]["state"] == 1
+
+    payload["last_compilation"] = 2.0
+    assert client.post("/results", json=payload).json() == {"results": {}}
+
+
+# The client passes a timeout, which the test client of the service ignores
+@pytest.mark.filterwarnings("ignore:You should not use the 'timeout' argument")
+def test_client_get_results(
+    fs: BIFileSystem,
+    bi_packs_sample_config: BIAggregationPacks,
+    bi_searcher_with_sample_config: BISearcher,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    compiled_aggregation = _compile_default_aggregation(
+        bi_packs_sample_config, bi_searcher_with_sample_config
+    )
+    AggregationStore(fs.cache).save(compiled_aggregation)
+    MetadataStore(fs).update_last_compilation(1.0)
+    computer = IncrementalBIComputer(_status_fetcher(sample_config.bi_status_rows), SiteId("heute"))
+    app = make_application(computer=computer, fs=fs, poll_interval=60.0)
+    poll(app.state.dependencies)
+    monkeypatch.setattr(
+        cmk.bi.computation_client,
+        "make_session",
+        lambda socket_path, base_url: TestClient(app, base_url=base_url),
+    )
+    socket_path = tmp_path / "bi-computation.sock"
+    socket_path.touch()
+    heute = compiled_aggregation.branches[0]
+    required_aggregations = [(compiled_aggregation, [heute])]
+
+    served_results = BIComputationClient(1.0, socket_path).get_results(required_aggregations)
+    served_heute = served_results[("default_aggregation", "Host heute")]
+    assert served_heute is not None
+    assert served_heute.instance is heute
+
+    # The service holds another compilation than the one loaded by the GUI
+    assert not BIComputationClient(2.0, socket_path).get_results(required_aggregations)
+
+    # The results do not fit the loaded branch
+    changed_heute = copy.deepcopy(heute)
+    changed_heute.nodes = []
+    assert not BIComputationClient(1.0, socket_path).get_results(
+        [(compiled_aggregation, [changed_heute])]
+    )
+
+
+def test_compute_served_results(
+    fs: BIFileSystem,
+    bi_packs_sample_config: BIAggregationPacks,
+    bi_searcher_with_sample_config: BISearcher,
+) -> None:
+    compiled_aggregation = _compile_default_aggregation(
+        bi_packs_sample_config, bi_searcher_with_sample_config
+    )
+    status_fetcher = _status_fetcher(sample_config.bi_status_rows)
+    status_fetcher.update_states(
+        {
+            element
+            for branch in compiled_aggregation.branches
+            for element in branch.required_elements()
+        }
+    )
+    heute, heute_clone = compiled_aggregation.compute_branches(
+        compiled_aggregation.branches, status_fetcher
+    )
+    required_aggregations = [(compiled_aggregation, compiled_aggregation.branches)]
+
+    # Without a running service, everything is computed here
+    computer = BIComputer(
+        {compiled_aggregation.id: compiled_aggregation},
+        status_fetcher,
+        BIComputationClient(1.0, Path("/no/such/socket")),
+    )
+    assert computer.compute_results(required_aggregations) == [
+        (compiled_aggregation, [heute, heute_clone])
+    ]
+
+    served_heute = heute._replace(actual_result=heute.actual_result._replace(state=2))
+    assert computer.compute_results(
+        required_aggregations, {("default_aggregation", "Host heute"): served_heute}
+    ) == [(compiled_aggregation, [served_heute, heute_clone])]
+    assert computer.compute_results(
+        required_aggregations, {("default_aggregation", "Host heute_clone"): None}
+    ) == [(compiled_aggregation, [heute])]
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+from cmk.bi.dependencies import (
+    AggregationDependencies,
+    DependencyRecorder,
+    fingerprint_host,
+)
+from cmk.bi.lib import BIServiceData
+from cmk.bi.packs import BIAggregationPacks
+from cmk.bi.searcher import BISearcher
+from cmk.ccc.hostaddress import HostName
+from cmk.utils.tags import TagGroupID, TagID
+
+
+def _compile_default_aggregation(
+    bi_packs_sample_config: BIAggregationPacks, bi_searcher: BISearcher
+) -> AggregationDependencies:
+    aggregation = bi_packs_sample_config.get_aggregation("default_aggregation")
+    assert aggregation is not None
+    recorder = DependencyRecorder(bi_searcher)
+    assert len(aggregation.compile(recorder).branches) == 2
+    return recorder.dependencies()
+
+
+def test_recorded_dependencies(
+    bi_packs_sample_config: BIAggregationPacks, bi_searcher_with_sample_config: BISearcher
+) -> None:
+    dependencies = _compile_default_aggregation(
+        bi_packs_sample_config, bi_searcher_with_sample_config
+    )
+
+    assert dependencies.host_names == {"heute", "heute_clone"}
+    assert dependencies.host_conditions[0]["host_tags"] == {"tcp": "tcp"}
+    assert {"heute", "heute_clone"} <= set(dependencies.host_name_patterns)
+
+
+def test_affected_by_changed_hosts(
+    bi_packs_sample_config: BIAggregationPacks, bi_searcher_with_sample_config: BISearcher
+) -> None:
+    dependencies = _compile_default_aggregation(
+        bi_packs_sample_config, bi_searcher_with_sample_config
+    )
+    heute = bi_searcher_with_sample_config.hosts["heute"]
+    changed_hosts = BISearcher()
+
+    changed_hosts.set_hosts({"heute": heute})
+    assert dependencies.affected_by({"heute"}, changed_hosts) == "uses changed host heute"
+
+    # Vanished hosts are used hosts
+    changed_hosts.set_hosts({})
+    assert dependencies.affected_by({"heute"}, changed_hosts) == "uses changed host heute"
+
+    udp_host = heute._replace(
+        name=HostName("morgen"), tags={(TagGroupID("tcp"), TagID("no-agent"))}
+    )
+    changed_hosts.set_hosts({"morgen": udp_host})
+    assert dependencies.affected_by({"morgen"}, changed_hosts) is None
+
+    tcp_host = heute._replace(name=HostName("morgen"))
+    changed_hosts.set_hosts({"morgen": tcp_host})
+    assert (
+        dependencies.affected_by({"morgen"}, changed_hosts)
+        == "changed host morgen matches its searches"
+    )
+
+
+def test_fingerprint_host(bi_searcher_with_sample_config: BISearcher) -> None:
+    heute = bi_searcher_with_sample_config.hosts["heute"]
+    same = heute._replace(tags=set(reversed(sorted(heute.tags))), services=dict(heute.services))
+    assert fingerprint_host(heute) == fingerprint_host(same)
+
+    services = {**heute.services, "New service": BIServiceData(set(), {})}
+    assert fingerprint_host(heute) != fingerprint_host(heute._replace(services=services))
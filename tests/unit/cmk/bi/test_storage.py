@@ -7,12 +7,15 @@ import pytest
 from fakeredis import FakeRedis
 
 from cmk.bi.aggregation_functions import BIAggregationFunctionWorst
+from cmk.bi.dependencies import AggregationDependencies
 from cmk.bi.filesystem import BIFileSystem
 from cmk.bi.lib import BIAggregationComputationOptions, BIAggregationGroups
 from cmk.bi.rule_interface import BIRuleProperties
 from cmk.bi.storage import (
     AggregationNotFound,
     AggregationStore,
+    CompilationDependencies,
+    DependencyStore,
     FrozenAggregationStore,
     generate_identifier,
     LookupStore,
@@ -116,6 +119,25 @@ class TestFrozenAggregationStore:
         frozen_store.delete("heute")  # shouldn't raise
 
 
+class TestDependencyStore:
+    @pytest.fixture
+    def dependency_store(self, fs: BIFileSystem) -> DependencyStore:
+        return DependencyStore(fs.cache)
+
+    def test_save_and_get(self, dependency_store: DependencyStore) -> None:
+        assert dependency_store.get() is None
+        dependencies = CompilationDependencies(
+            {"heute": b"fingerprint"},
+            {"heute": AggregationDependencies(frozenset({"heute"}), (), ("heute",))},
+        )
+        dependency_store.save(dependencies)
+        assert dependency_store.get() == dependencies
+
+    def test_unreadable(self, dependency_store: DependencyStore) -> None:
+        dependency_store.fs_cache.compilation_dependencies.write_bytes(b"garbage")
+        assert dependency_store.get() is None
+
+
 class TestMetadataStore:
     @pytest.fixture
     def metadata_store(self, fs: BIFileSystem) -> MetadataStore:
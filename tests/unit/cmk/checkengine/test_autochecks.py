@@ -6,6 +6,7 @@
 # mypy: disable-error-code="no-untyped-call"
 
 
+import os
 from collections.abc import Sequence
 from pathlib import Path
 
@@ -13,7 +14,11 @@ import pytest
 
 import cmk.utils.paths
 from cmk.ccc.hostaddress import HostName
-from cmk.checkengine.discovery import AutocheckServiceWithNodes, AutochecksStore
+from cmk.checkengine.discovery import (
+    AutocheckServiceWithNodes,
+    AutochecksMemoizer,
+    AutochecksStore,
+)
 from cmk.checkengine.discovery._autochecks import _AutochecksSerializer as AutochecksSerializer
 from cmk.checkengine.discovery._autochecks import _consolidate_autochecks_of_real_hosts
 from cmk.checkengine.discovery._utils import DiscoveredItem
@@ -108,6 +113,37 @@ def test_memoizer_get_autochecks_of(
     assert result == expected_result
 
 
+def test_memoizer_read_all_uses_cache_of_unchanged_files(tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache" / "autochecks.pkl"
+    herbert, hugo, heinz = HostName("herbert"), HostName("hugo"), HostName("heinz")
+    AutochecksStore(herbert).write(_entries())
+    AutochecksStore(hugo).write([_entry("df", {"levels": "high"})])
+
+    memoizer = AutochecksMemoizer()
+    memoizer.read_all([herbert, hugo, heinz], cache_file)
+    assert memoizer.read(herbert) == _entries()
+    assert memoizer.read(heinz) == []
+    assert cache_file.exists()
+
+    # An invalid file is not parsed, as long as it is not changed
+    hugo_path = AutochecksStore(hugo).path
+    stat = hugo_path.stat()
+    hugo_path.write_bytes(b"[" * stat.st_size)
+    os.utime(hugo_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    AutochecksStore(herbert).write([_entry("uptime")])
+
+    memoizer = AutochecksMemoizer()
+    memoizer.read_all([herbert, hugo, heinz], cache_file)
+    assert memoizer.read(herbert) == [_entry("uptime")]
+    assert memoizer.read(hugo) == [_entry("df", {"levels": "high"})]
+
+    # A broken cache file is ignored
+    cache_file.write_bytes(b"broken")
+    memoizer = AutochecksMemoizer()
+    memoizer.read_all([herbert], cache_file)
+    assert memoizer.read(herbert) == [_entry("uptime")]
+
+
 def _entry(name: str, params: dict[str, str] | None = None) -> AutocheckEntry:
     return AutocheckEntry(CheckPluginName(name), None, params or {}, {})
 
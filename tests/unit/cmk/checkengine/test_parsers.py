@@ -673,6 +673,35 @@ class TestAgentParser:
         }
         assert not store.load()
 
+    def test_section_filtering_finds_headers_in_deselected_sections(
+        self, parser: AgentParser, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(time, "time", lambda c=itertools.count(1000, 50): next(c))
+        raw_data = AgentRawData(
+            b"\r\n".join(
+                (
+                    b"<<<deselected>>>",
+                    b"<<<no header",
+                    b"<<<selected>>> trailing garbage",
+                    b"<<<<piggyback_header>>>>",
+                    b"<<<deselected>>>",
+                    b"1st line",
+                    b"<<<<>>>>",
+                    b"<<<selected>>>",
+                    b"2nd line",
+                    b"<<<deselected>>>",
+                    b"3rd line",
+                )
+            )
+        )
+
+        ahs = parser.parse(raw_data, selection=frozenset({SectionName("selected")}))
+
+        assert ahs.sections == {SectionName("selected"): [["2nd", "line"]]}
+        assert ahs.piggybacked_raw_data == {
+            "piggyback_header": [b"<<<deselected:cached(1000,0)>>>", b"1st line"]
+        }
+
     def test_section_lines_are_correctly_ordered_with_different_separators(
         self, parser: AgentParser, store: SectionStore[Sequence[AgentRawDataSectionElem]]
     ) -> None:
@@ -5,6 +5,7 @@
 
 # mypy: disable-error-code="unreachable"
 
+import json
 from collections.abc import Mapping
 from pathlib import Path
 
@@ -72,6 +73,96 @@ class TestAllValueStoresStore:
             (HostName("host1"), "service2", None): {"key": "new_value2"},
         }
 
+    def test_update_appends_changes(self, tmp_path: Path) -> None:
+        file = tmp_path / "file"
+        avss = self._get_avss(file)
+        avss.update({(HostName("host1"), "service1", "item"): {"key": "new_value1"}})
+        # The file of the JSON format has been rewritten
+        assert len(file.read_text().splitlines()) == 1
+
+        avss.update(
+            {
+                (HostName("host1"), "service1", "item"): {"key": "new_value1"},
+                (HostName("host1"), "service2", None): {"key": "new_value2"},
+            }
+        )
+        assert file.read_text().splitlines()[1:] == [
+            '[[["host1", "service2", null], {"key": "new_value2"}]]'
+        ]
+        assert value_store.AllValueStoresStore(file).load() == {
+            (HostName("host1"), "service1", "item"): {"key": "new_value1"},
+            (HostName("host1"), "service2", None): {"key": "new_value2"},
+        }
+
+    def test_update_compacts(self, tmp_path: Path) -> None:
+        file = tmp_path / "file"
+        avss = self._get_avss(file)
+        for nr in range(10):
+            avss.update({(HostName("host1"), "service1", "item"): {"key": f"value{nr}"}})
+            assert len(file.read_text().splitlines()) <= 3
+
+        assert value_store.AllValueStoresStore(file).load() == {
+            (HostName("host1"), "service1", "item"): {"key": "value9"},
+            (HostName("host1"), "service2", None): {"key": "value2"},
+        }
+
+    def test_update_json_storage(self, tmp_path: Path) -> None:
+        file = tmp_path / "file"
+        avss = value_store.AllValueStoresStore(file, storage="json")
+        avss.update({(HostName("host1"), "service1", "item"): {"key": "value1"}})
+        avss.update({(HostName("host1"), "service2", None): {"key": "value2"}})
+
+        assert len(file.read_text().splitlines()) == 1
+        assert json.loads(file.read_text())
+        assert value_store.AllValueStoresStore(file).load() == {
+            (HostName("host1"), "service1", "item"): {"key": "value1"},
+            (HostName("host1"), "service2", None): {"key": "value2"},
+        }
+
+    def test_update_json_storage_rewrites_journal(self, tmp_path: Path) -> None:
+        file = tmp_path / "file"
+        avss = self._get_avss(file)
+        avss.update({(HostName("host1"), "service1", "item"): {"key": "new_value1"}})
+        avss.update({(HostName("host1"), "service2", None): {"key": "new_value2"}})
+        assert len(file.read_text().splitlines()) == 2
+
+        avss = value_store.AllValueStoresStore(file, storage="json")
+        avss.load()
+        avss.update({(HostName("host1"), "service2", None): {"key": "new_value2"}})
+        assert len(file.read_text().splitlines()) == 1
+        assert value_store.AllValueStoresStore(file).load() == {
+            (HostName("host1"), "service1", "item"): {"key": "new_value1"},
+            (HostName("host1"), "service2", None): {"key": "new_value2"},
+        }
+
+    def test_load_file_with_only_a_newline(self, tmp_path: Path) -> None:
+        file = tmp_path / "file"
+        file.write_text("\n")
+        avss = value_store.AllValueStoresStore(file)
+        assert avss.load() == {}
+        avss.update({(HostName("host1"), "service1", "item"): {"key": "value1"}})
+        assert value_store.AllValueStoresStore(file).load() == {
+            (HostName("host1"), "service1", "item"): {"key": "value1"},
+        }
+
+    def test_load_ignores_interrupted_append(self, tmp_path: Path) -> None:
+        file = tmp_path / "file"
+        avss = self._get_avss(file)
+        avss.update({(HostName("host1"), "service1", "item"): {"key": "new_value1"}})
+        with file.open("a") as f:
+            f.write('[[["host1", "service2", null], {"key": "ne')
+
+        avss = value_store.AllValueStoresStore(file)
+        assert avss.load() == {
+            (HostName("host1"), "service1", "item"): {"key": "new_value1"},
+            (HostName("host1"), "service2", None): {"key": "value2"},
+        }
+        avss.update({(HostName("host1"), "service2", None): {"key": "new_value2"}})
+        assert value_store.AllValueStoresStore(file).load() == {
+            (HostName("host1"), "service1", "item"): {"key": "new_value1"},
+            (HostName("host1"), "service2", None): {"key": "new_value2"},
+        }
+
 
 class _BrokenRepr(str):
     def __repr__(self) -> str:
@@ -32,3 +32,26 @@ def test__time_series_math_stable_singles(operator: Operators) -> None:
         values=[6, 5, 10, None, -2, -3.14],
     )
     assert _time_series_math(operator, [test_ts]) == test_ts
+
+
+@pytest.mark.parametrize(
+    "operator, result",
+    [
+        pytest.param("+", [3, 3, None, 4, 6], id="sum"),
+        pytest.param("*", [2, None, None, None, 0], id="product"),
+        pytest.param("-", [-1, None, None, None, 6], id="difference"),
+        pytest.param("/", [0.5, None, None, None, None], id="fraction"),
+        pytest.param("MAX", [2, 3, None, 4, 6], id="maximum"),
+        pytest.param("MIN", [1, 3, None, 4, 0], id="minimum"),
+        pytest.param("AVERAGE", [1.5, 3, None, 4, 3], id="average"),
+        pytest.param("MERGE", [1, 3, None, 4, 6], id="merge"),
+    ],
+)
+def test__time_series_math_missing_values(operator: Operators, result: list[float | None]) -> None:
+    assert _time_series_math(
+        operator,
+        [
+            TimeSeries(start=0, end=300, step=60, values=[1, None, None, 4, 6]),
+            TimeSeries(start=0, end=300, step=60, values=[2, 3, None, None, 0, 7]),
+        ],
+    ) == TimeSeries(start=0, end=300, step=60, values=result)
@@ -15,6 +15,7 @@ from cmk.gui.graphing._from_api import RegisteredMetric
 from cmk.gui.graphing._graph_metric_expressions import (
     AugmentedTimeSeries,
     GraphMetricRRDSource,
+    RRDDataKey,
     TimeSeriesMetaData,
 )
 from cmk.gui.graphing._graph_specification import (
@@ -26,6 +27,7 @@ from cmk.gui.graphing._graph_templates import TemplateGraphSpecification
 from cmk.gui.graphing._legacy import CheckMetricEntry
 from cmk.gui.graphing._rrd import (
     _reverse_translate_into_all_potentially_relevant_metrics,
+    fetch_time_series_rrd,
     translate_and_merge_rrd_columns,
 )
 from cmk.gui.graphing._time_series import TimeSeries, TimeSeriesValues
@@ -52,9 +54,10 @@ def _setup_livestatus(mock_livestatus: MockLiveStatusConnection) -> Iterator[Non
         )
         mock_live.expect_query(
             """GET services
-Columns: rrddata:temp:temp.max:1681985455:1681999855:20
+Columns: host_name service_description rrddata:temp:temp.max:1681985455:1681999855:20
 Filter: host_name = my-host
 Filter: service_description = Temperature Zone 6
+And: 2
 ColumnHeaders: off
 
             """,
@@ -151,6 +154,62 @@ def test_fetch_augmented_time_series_with_conversion(
         ]
 
 
+def test_fetch_time_series_rrd_batches_and_caches_services(
+    mock_livestatus: MockLiveStatusConnection, request_context: None
+) -> None:
+    keys = [
+        RRDDataKey(
+            site_id=SiteId("NO_SITE"),
+            host_name=HostName("my-host"),
+            service_name=f"Temperature Zone {zone}",
+            metric_name="temp",
+            consolidation_function="max",
+            scale=1,
+        )
+        for zone in (6, 7)
+    ]
+    with mock_livestatus(expect_status_query=True) as mock_live:
+        mock_live.add_table(
+            "services",
+            [
+                {
+                    "host_name": "my-host",
+                    "service_description": f"Temperature Zone {zone}",
+                    "rrddata:temp:temp.max:1681985455:1681999855:20": [1, 2, 3, 4, zone, None],
+                }
+                for zone in (5, 6, 7)
+            ],
+        )
+        mock_live.expect_query(
+            """GET services
+Columns: host_name service_description rrddata:temp:temp.max:1681985455:1681999855:20
+Filter: host_name = my-host
+Filter: service_description = Temperature Zone 6
+And: 2
+Filter: host_name = my-host
+Filter: service_description = Temperature Zone 7
+And: 2
+Or: 2
+ColumnHeaders: off
+
+            """,
+            sites=["NO_SITE"],
+        )
+        for _fetch in range(2):
+            # The second fetch is served from the cache of the request
+            assert fetch_time_series_rrd(
+                keys,
+                "max",
+                lambda v: v,
+                start_time=1681985455,
+                end_time=1681999855,
+                step=20,
+            ) == {
+                keys[0]: TimeSeries(start=1, end=2, step=3, values=[4, 6, None]),
+                keys[1]: TimeSeries(start=1, end=2, step=3, values=[4, 7, None]),
+            }
+
+
 def test_translate_and_merge_rrd_columns() -> None:
     assert translate_and_merge_rrd_columns(
         MetricName("my_metric"),
@@ -4,6 +4,8 @@
 # conditions defined in the file COPYING, which is part of this source code package.
 
 
+import math
+
 import pytest
 
 from cmk.gui.graphing._time_series import rrd_timestamps, TimeSeries, TimeSeriesValues
@@ -151,6 +153,22 @@ def test_time_series_upsampling(
             "average",
             [17.5, 27.5, 40.0],
         ),
+        (
+            TimeSeries(start=10, end=45, step=5, values=[15, 20, None, None, 35, 40, 45]),
+            10,
+            40,
+            10,
+            "min",
+            [15, None, 35],
+        ),
+        (
+            TimeSeries(start=30, end=45, step=5, values=[35, 40, 45]),
+            0,
+            60,
+            10,
+            "max",
+            [None, None, None, 40, 45, None],
+        ),
     ],
 )
 def test_time_series_downsampling(
@@ -164,6 +182,13 @@ def test_time_series_downsampling(
     assert time_series.downsample(start=start, end=end, step=step, cf=cf) == downsampled
 
 
+def test_time_series_downsampling_invalid_cf() -> None:
+    with pytest.raises(ValueError, match="Invalid Aggregation function"):
+        TimeSeries(start=10, end=25, step=5, values=[15, 20, 25]).downsample(
+            start=10, end=30, step=10, cf="sum"
+        )
+
+
 class TestTimeseries:
     def test_conversion(self) -> None:
         assert TimeSeries(
@@ -196,3 +221,16 @@ class TestTimeseries:
             ).count(None)
             == 2
         )
+
+    def test_array(self) -> None:
+        time_series = TimeSeries(start=0, end=30, step=10, values=[1, None, 3])
+        assert time_series.array[0] == 1
+        assert math.isnan(time_series.array[1])
+        assert time_series.array[2] == 3
+
+    def test_set_values_from_array(self) -> None:
+        time_series = TimeSeries(start=0, end=30, step=10, values=[1, None, 3])
+        time_series.values = time_series.array[:-1]
+        assert time_series.values == [1, None]
+        assert len(time_series) == 2
+        assert time_series == TimeSeries(start=0, end=30, step=10, values=[1.0, None])
@@ -379,7 +379,6 @@ def test_get_aggregation_state_empty(
     live: MockLiveStatusConnection = mock_livestatus
     live.set_sites(["NO_SITE"])
     live.expect_query("GET status\nColumns: program_start")
-    live.expect_query("GET status\nColumns: program_start")
     live.expect_query(
         "GET hosts\nColumns: host_name host_tags host_labels host_childs host_parents host_alias host_filename"
     )
@@ -399,7 +398,6 @@ def test_get_aggregation_state_filter_names(
     live: MockLiveStatusConnection = mock_livestatus
     live.set_sites(["NO_SITE"])
     live.expect_query("GET status\nColumns: program_start")
-    live.expect_query("GET status\nColumns: program_start")
     live.expect_query(
         "GET hosts\nColumns: host_name host_tags host_labels host_childs host_parents host_alias host_filename"
     )
@@ -447,7 +445,6 @@ def test_get_aggregation_state_should_not_update_config_generation(
     live: MockLiveStatusConnection = mock_livestatus
     live.set_sites(["NO_SITE"])
     live.expect_query("GET status\nColumns: program_start")
-    live.expect_query("GET status\nColumns: program_start")
     live.expect_query(
         "GET hosts\nColumns: host_name host_tags host_labels host_childs host_parents host_alias host_filename"
     )
@@ -522,7 +519,6 @@ def test_aggregation_state_empty_with_get_method(
     live: MockLiveStatusConnection = mock_livestatus
     live.set_sites(["NO_SITE"])
     live.expect_query("GET status\nColumns: program_start")
-    live.expect_query("GET status\nColumns: program_start")
     live.expect_query(
         "GET hosts\nColumns: host_name host_tags host_labels host_childs host_parents host_alias host_filename"
     )
@@ -542,7 +538,6 @@ def test_aggregation_state_filter_names_with_get_method(
     live: MockLiveStatusConnection = mock_livestatus
     live.set_sites(["NO_SITE"])
     live.expect_query("GET status\nColumns: program_start")
-    live.expect_query("GET status\nColumns: program_start")
     live.expect_query(
         "GET hosts\nColumns: host_name host_tags host_labels host_childs host_parents host_alias host_filename"
     )
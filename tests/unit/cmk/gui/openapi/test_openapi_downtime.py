@@ -92,7 +92,6 @@ def test_openapi_schedule_host_downtime(
     clients: ClientRegistry,
     mock_livestatus: MockLiveStatusConnection,
 ) -> None:
-    mock_livestatus.expect_query("GET hosts\nColumns: name\nFilter: name = example.com")
     mock_livestatus.expect_query("GET hosts\nColumns: name\nFilter: name = example.com")
     mock_livestatus.expect_query(
         "COMMAND [...] SCHEDULE_HOST_DOWNTIME;example.com;1577836800;1577923200;1;0;0;test123-...;Downtime for ...",
@@ -124,7 +123,6 @@ def test_openapi_schedule_host_downtime_for_host_without_config(
         ],
     )
 
-    mock_livestatus.expect_query("GET hosts\nColumns: name\nFilter: name = %s" % host_name)
     mock_livestatus.expect_query("GET hosts\nColumns: name\nFilter: name = %s" % host_name)
     mock_livestatus.expect_query(
         "COMMAND [...] SCHEDULE_HOST_DOWNTIME;%s;1577836800;1577923200;1;0;0;test123-...;Downtime for ..."
@@ -1676,7 +1674,6 @@ def test_openapi_schedule_flexible_downtime(
     clients: ClientRegistry,
     mock_livestatus: MockLiveStatusConnection,
 ) -> None:
-    mock_livestatus.expect_query("GET hosts\nColumns: name\nFilter: name = example.com")
     mock_livestatus.expect_query("GET hosts\nColumns: name\nFilter: name = example.com")
     mock_livestatus.expect_query(
         "COMMAND [...] SCHEDULE_HOST_DOWNTIME;example.com;1577836800;1577923200;0;0;7200;test123-...;Downtime for ...",
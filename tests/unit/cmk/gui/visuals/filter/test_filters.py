@@ -1346,30 +1346,31 @@ def test_filters_filter_inv_table(test: FilterTableTest) -> None:
 def test_filters_display_with_empty_request(
     live: MockLiveStatusConnection, request_context: None, patch_theme: None
 ) -> None:
+    expected_queries: set[str] = set()
     with live:
         for filt in filter_registry.values():
             with output_funnel.plugged():
-                _set_expected_queries(filt.ident, live)
+                # The results of the queries are cached for the whole request
+                if (query := _expected_query(filt.ident)) and query not in expected_queries:
+                    live.expect_query(query)
+                    expected_queries.add(query)
                 filt.display({k: "" for k in filt.htmlvars})
 
 
-def _set_expected_queries(filt_ident, live):
+def _expected_query(filt_ident):
     if filt_ident in ["hostgroups"]:
-        live.expect_query("GET hostgroups\nCache: reload\nColumns: name alias\n")
-        return
+        return "GET hostgroups\nCache: reload\nColumns: name alias\n"
 
     if filt_ident in ["servicegroups"]:
-        live.expect_query("GET servicegroups\nCache: reload\nColumns: name alias\n")
-        return
+        return "GET servicegroups\nCache: reload\nColumns: name alias\n"
 
     if filt_ident in [
         "contactgroups",
         "optcontactgroup",
     ]:
-        live.expect_query("GET contactgroups\nCache: reload\nColumns: name alias\n")
-        if filt_ident == "contactgroups":
-            live.expect_query("GET contactgroups\nCache: reload\nColumns: name alias\n")
-        return
+        return "GET contactgroups\nCache: reload\nColumns: name alias\n"
+
+    return None
 
 
 class TestFilterCMKSiteStatisticsByCorePIDs:
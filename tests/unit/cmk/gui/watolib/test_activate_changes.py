@@ -449,6 +449,7 @@ def test_automation_get_config_sync_state(request_context: None) -> None:
             ),
         },
         0,
+        ["gzip"],
     )
 
 
@@ -559,6 +560,43 @@ def test_get_config_sync_file_infos() -> None:
     }
 
 
+def test_config_sync_file_hashes_are_reused(tmp_path: Path) -> None:
+    file_path = tmp_path / "file"
+    file_path.write_text("Däng")
+    os.utime(file_path, (1000, 1000))
+    hashes_path = tmp_path / "hashes.pkl"
+
+    file_hashes = activate_changes.ConfigSyncFileHashes.load(hashes_path)
+    file_hash = file_hashes.file_hash(str(file_path), file_path.stat())
+    file_hashes.save()
+    assert (file_hashes.hits, file_hashes.rehashes) == (0, 1)
+
+    file_hashes = activate_changes.ConfigSyncFileHashes.load(hashes_path)
+    assert file_hashes.file_hash(str(file_path), file_path.stat()) == file_hash
+    assert (file_hashes.hits, file_hashes.rehashes) == (1, 0)
+
+    file_path.write_text("Dong")
+    os.utime(file_path, (2000, 2000))
+    assert file_hashes.file_hash(str(file_path), file_path.stat()) != file_hash
+    assert (file_hashes.hits, file_hashes.rehashes) == (1, 1)
+
+
+def test_config_sync_file_hashes_of_recently_modified_files_are_not_reused(
+    tmp_path: Path,
+) -> None:
+    file_path = tmp_path / "file"
+    file_path.write_text("Däng")
+    hashes_path = tmp_path / "hashes.pkl"
+
+    file_hashes = activate_changes.ConfigSyncFileHashes.load(hashes_path)
+    file_hashes.file_hash(str(file_path), file_path.stat())
+    file_hashes.save()
+
+    file_hashes = activate_changes.ConfigSyncFileHashes.load(hashes_path)
+    file_hashes.file_hash(str(file_path), file_path.stat())
+    assert (file_hashes.hits, file_hashes.rehashes) == (0, 1)
+
+
 def _create_get_config_sync_file_infos_test_config(base_dir: Path) -> None:
     base_dir.joinpath("etc/d1").mkdir(parents=True, exist_ok=True)
 
@@ -599,6 +637,52 @@ def _create_get_config_sync_file_infos_test_config(base_dir: Path) -> None:
     base_dir.joinpath("links/working-symlink-to-file").symlink_to("../etc/d3/xyz")
 
 
+def test_shared_sync_archive(tmp_path: Path) -> None:
+    activation_dir = tmp_path / "activation"
+    (activation_dir / "site1/etc").mkdir(parents=True)
+    (activation_dir / "site1/etc/global.mk").write_text("x = 1\n")
+    (activation_dir / "site1/etc/site.mk").write_text("site = 1\n")
+    (activation_dir / "site2/etc").mkdir(parents=True)
+    (activation_dir / "site2/etc/global.mk").hardlink_to(activation_dir / "site1/etc/global.mk")
+    (activation_dir / "site2/etc/site.mk").write_text("site = 2\n")
+
+    archive = activate_changes._get_shared_sync_archive(["etc/global.mk"], activation_dir / "site1")
+    assert not activate_changes._shared_sync_archive_locks
+    assert (
+        activate_changes._get_shared_sync_archive(["etc/global.mk"], activation_dir / "site2")
+        == archive
+    )
+    assert activate_changes._get_shared_sync_archive(
+        ["etc/global.mk", "etc/site.mk"], activation_dir / "site1"
+    ) != activate_changes._get_shared_sync_archive(
+        ["etc/global.mk", "etc/site.mk"], activation_dir / "site2"
+    )
+
+    remote_dir = tmp_path / "remote"
+    remote_dir.mkdir()
+    activate_changes._unpack_sync_archive(archive.read_bytes(), remote_dir)
+    assert (remote_dir / "etc/global.mk").read_text() == "x = 1\n"
+    assert not (remote_dir / "etc/site.mk").exists()
+
+
+def test_get_file_names_to_sync_archive_compression(request_context: None) -> None:
+    remote, central = _get_test_file_infos()
+    assert (
+        activate_changes.get_file_names_to_sync(
+            site_logger=logger,
+            sync_state=activate_changes.SyncState(
+                central_file_infos=central,
+                remote_file_infos=remote,
+                remote_config_generation=0,
+                remote_archive_compressions=["gzip"],
+            ),
+            file_sync_enabled=False,
+            file_filter_func=None,
+        ).archive_compression
+        == "gzip"
+    )
+
+
 def test_get_file_names_to_sync_without_file_sync(request_context: None) -> None:
     remote, central = _get_test_file_infos()
     sync_delta = activate_changes.get_file_names_to_sync(
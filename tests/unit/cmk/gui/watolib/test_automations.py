@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+import io
+
+from werkzeug.formparser import parse_form_data
+from werkzeug.test import EnvironBuilder
+
+from cmk.gui.watolib.automations import _MultipartBody as MultipartBody
+
+
+def test_multipart_body() -> None:
+    archive = io.BytesIO(b"\x1f\x8b" + bytes(range(256)) * 100)
+    body = MultipartBody(
+        {"site_id": "remote", "to_delete": "['etc/a\"b.mk']"}, {"sync_archive": archive}
+    )
+
+    chunks = [body.read(1000)]
+    assert body.tell() == 1000
+    chunks.extend(body)
+    raw = b"".join(chunks)
+    assert len(raw) == len(body)
+
+    _stream, form, files = parse_form_data(
+        EnvironBuilder(method="POST", data=raw, content_type=body.content_type).get_environ()
+    )
+    assert dict(form) == {"site_id": "remote", "to_delete": "['etc/a\"b.mk']"}
+    assert files["sync_archive"].read() == archive.getvalue()
@@ -206,6 +206,7 @@ def test_registered_configvars() -> None:
         "user_downtime_timeranges",
         "user_icons_and_actions",
         "user_localizations",
+        "value_stores_storage",
         "acknowledge_problems",
         "virtual_host_trees",
         "wato_activation_method",
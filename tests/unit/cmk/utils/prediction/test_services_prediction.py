@@ -208,3 +208,21 @@ def test_calculate_data_for_prediction(
     assert len(expected_reference.points) == len(data_for_pred.points)
     for cal, ref in zip(data_for_pred.points, expected_reference.points):
         assert cal == pytest.approx(ref, rel=1e-12, abs=1e-12)
+
+
+def test_calculate_data_for_prediction_short_slice() -> None:
+    raw_slices = [
+        (range(1000, 1040, 10), [1.0, 2.0, 3.0], 0),
+        (range(900, 940, 10), [3.0, 4.0, 5.0, 6.0], 100),
+    ]
+
+    data_for_pred = _prediction._calculate_data_for_prediction(raw_slices[0][0], raw_slices)
+
+    assert (data_for_pred.start, data_for_pred.step) == (1000, 10)
+    points = [point for point in data_for_pred.points if point is not None]
+    assert [(p.average, p.min_, p.max_) for p in points] == [
+        (2.0, 1.0, 3.0),
+        (3.0, 2.0, 4.0),
+        (4.0, 3.0, 5.0),
+    ]
+    assert [p.stdev for p in points] == pytest.approx([2**0.5] * 3)
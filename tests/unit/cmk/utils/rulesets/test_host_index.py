@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# Copyright (C) 2025 Checkmk GmbH - License: GNU General Public License v2
+# This file is part of Checkmk (https://checkmk.com). It is subject to the terms and
+# conditions defined in the file COPYING, which is part of this source code package.
+
+from cmk.ccc.hostaddress import HostName
+from cmk.utils.rulesets.host_index import HostIndex
+from cmk.utils.tags import TagGroupID, TagID
+
+
+def _index(num_hosts: int) -> HostIndex:
+    hosts = [HostName(f"host{nr}") for nr in range(num_hosts)]
+    return HostIndex(
+        hosts,
+        {
+            host: {(TagGroupID("parity"), TagID("even" if nr % 2 == 0 else "odd"))}
+            for nr, host in enumerate(hosts)
+        },
+    )
+
+
+def test_host_set_operations() -> None:
+    index = _index(20)
+    even = index.with_tag(TagGroupID("parity"), TagID("even"))
+    some = index.host_set([HostName("host1"), HostName("host2"), HostName("unknown")])
+
+    assert len(even) == 10
+    assert set(even.intersection(some)) == {"host2"}
+    assert set(even.union(some)) == set(even) | {"host1"}
+    assert set(some.difference(even)) == {"host1"}
+    assert index.all.difference(even) == index.with_tag(TagGroupID("parity"), TagID("odd"))
+    assert not index.with_tag(TagGroupID("parity"), TagID("prime"))
+    assert index.empty == set()
+
+
+def test_host_set_membership() -> None:
+    index = _index(20)
+    even = index.with_tag(TagGroupID("parity"), TagID("even"))
+
+    assert HostName("host18") in even
+    assert HostName("host19") not in even
+    assert HostName("unknown") not in even
+    assert (nr := index.number(HostName("host4"))) is not None and even.has(nr)
+    assert even == {HostName(f"host{nr}") for nr in range(0, 20, 2)}
@@ -925,3 +925,86 @@ class TestSingleRulesetMatcher:
             host_ruleset=self._ruleset(),
             labels_of_host=lambda x: {},
         )(HostName("testhost2")) == ["lala", "lulu"]
+
+
+service_description_ruleset: Sequence[RuleSpec[str]] = [
+    {
+        "id": "id0",
+        "value": "interface",
+        "condition": {"service_description": [{"$regex": "Interface "}]},
+        "options": {},
+    },
+    {
+        "id": "id1",
+        "value": "any",
+        "condition": {},
+        "options": {},
+    },
+    {
+        "id": "id2",
+        "value": "filesystem var or interface 1",
+        "condition": {
+            "service_description": [{"$regex": "Filesystem /var"}, {"$regex": r"Interface 1\b"}]
+        },
+        "options": {},
+    },
+    {
+        "id": "id3",
+        "value": "not interface",
+        "condition": {"service_description": {"$nor": [{"$regex": "Interface"}]}},
+        "options": {},
+    },
+    {
+        "id": "id4",
+        "value": "case insensitive cpu",
+        "condition": {"service_description": [{"$regex": "(?i)cpu"}]},
+        "options": {},
+    },
+    {
+        "id": "id5",
+        "value": "interface again",
+        "condition": {"service_description": [{"$regex": "Interfaces?"}]},
+        "options": {},
+    },
+]
+
+
+@pytest.mark.parametrize(
+    "service_description, expected_result",
+    [
+        (
+            ServiceName("Interface 1"),
+            ["interface", "any", "filesystem var or interface 1", "interface again"],
+        ),
+        (ServiceName("Interface 10"), ["interface", "any", "interface again"]),
+        (
+            ServiceName("Filesystem /var/log"),
+            ["any", "filesystem var or interface 1", "not interface"],
+        ),
+        (ServiceName("CPU load"), ["any", "not interface", "case insensitive cpu"]),
+        (ServiceName("Interfac"), ["any", "not interface"]),
+    ],
+)
+def test_ruleset_matcher_get_service_ruleset_values_service_description(
+    monkeypatch: MonkeyPatch,
+    service_description: ServiceName,
+    expected_result: Sequence[str],
+) -> None:
+    ts = Scenario()
+    ts.add_host(HostName("host1"))
+    config_cache = ts.apply(monkeypatch)
+    matcher = config_cache.ruleset_matcher
+
+    for _round in range(2):  # the second time from the cache
+        assert (
+            matcher.get_service_values_all(
+                HostName("host1"),
+                service_description,
+                {},
+                ruleset=service_description_ruleset,
+                labels_of_host=config_cache.label_manager.labels_of_host,
+            )
+            == expected_result
+        )
+    cache_info = matcher.service_match_cache_info()
+    assert cache_info.hits == cache_info.misses
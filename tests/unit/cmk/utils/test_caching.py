@@ -45,3 +45,37 @@ def test_populated() -> None:
     assert cache.is_populated()
     cache.clear()
     assert not cache.is_populated()
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    cache = cmk.utils.caching.LRUCache[str, int](maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1
+    cache["c"] = 3
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+
+
+def test_lru_cache_info() -> None:
+    cache = cmk.utils.caching.LRUCache[str, int](maxsize=10)
+    assert cache.cache_info().hit_rate == 0.0
+
+    cache["a"] = 1
+    for key in ("a", "a", "a", "b"):
+        try:
+            cache[key]
+        except KeyError:
+            pass
+
+    info = cache.cache_info()
+    assert info == cmk.utils.caching.CacheInfo(hits=3, misses=1, maxsize=10, currsize=1)
+    assert info.hit_rate == 0.75
+
+    cache.clear()
+    assert cache.cache_info() == cmk.utils.caching.CacheInfo(
+        hits=0, misses=0, maxsize=10, currsize=0
+    )
@@ -7,6 +7,7 @@
 import errno
 import socket
 import ssl
+import threading
 from collections.abc import Sequence
 from contextlib import closing
 from pathlib import Path
@@ -334,3 +335,130 @@ def test_livestatus_lql(
     result: str,
 ) -> None:
     assert livestatus.livestatus_lql(*args) == result
+
+
+def _serve_livestatus(path: Path, rows: bytes, answer: threading.Event) -> socket.socket:
+    server = socket.socket(socket.AF_UNIX)
+    server.bind(str(path))
+    server.listen(1)
+
+    def _answer_query() -> None:
+        conn, _addr = server.accept()
+        with conn:
+            query = b""
+            while not query.endswith(b"\n\n"):
+                query += conn.recv(4096)
+            answer.wait(5)
+            conn.sendall(b"200 %11d\n%s" % (len(rows), rows))
+            conn.recv(1)
+
+    threading.Thread(target=_answer_query, daemon=True).start()
+    return server
+
+
+def test_iter_query_parallel_yields_rows_before_slow_site_answers(tmp_path: Path) -> None:
+    fast_answers, slow_answers = threading.Event(), threading.Event()
+    fast_answers.set()
+    with (
+        closing(_serve_livestatus(tmp_path / "slow", b'[["slow-host"]]\n', slow_answers)),
+        closing(_serve_livestatus(tmp_path / "fast", b'[["fast-host"]]\n', fast_answers)),
+    ):
+        live = livestatus.MultiSiteConnection(
+            livestatus.SiteConfigurations(
+                {
+                    SiteId(name): livestatus.SiteConfiguration(  # type: ignore[typeddict-item]
+                        socket=f"unix:{tmp_path / name}"
+                    )
+                    for name in ("slow", "fast")
+                }
+            )
+        )
+        live.set_prepend_site(True)
+        site_rows = live.iter_query_parallel(livestatus.Query("GET hosts\nColumns: name"))
+
+        assert next(site_rows) == (SiteId("fast"), [["fast", "fast-host"]])
+        slow_answers.set()
+        assert list(site_rows) == [(SiteId("slow"), [["slow", "slow-host"]])]
+
+    assert live.alive_sites() == [SiteId("slow"), SiteId("fast")]
+    assert not live.dead_sites()
+
+
+def test_query_parallel_keeps_order_of_sites(mock_livestatus: MockLiveStatusConnection) -> None:
+    mock_livestatus.set_sites(["heute", "morgen"])
+    mock_livestatus.add_table("hosts", [{"name": "heute-host"}], site="heute")
+    mock_livestatus.add_table("hosts", [{"name": "morgen-host"}], site="morgen")
+    mock_livestatus.expect_query("GET hosts\nColumns: name", sites=["heute", "morgen"])
+    live = livestatus.MultiSiteConnection(
+        livestatus.SiteConfigurations(
+            {
+                SiteId(name): livestatus.SiteConfiguration(  # type: ignore[typeddict-item]
+                    socket="unix:"
+                )
+                for name in ("heute", "morgen")
+            }
+        )
+    )
+    live.set_prepend_site(True)
+
+    with mock_livestatus(expect_status_query=False):
+        assert live.query(livestatus.Query("GET hosts\nColumns: name")) == [
+            ["heute", "heute-host"],
+            ["morgen", "morgen-host"],
+        ]
+
+
+def test_query_cache_answers_repeated_queries(mock_livestatus: MockLiveStatusConnection) -> None:
+    mock_livestatus.set_sites(["heute", "morgen"])
+    mock_livestatus.add_table("hosts", [{"name": "heute-host"}], site="heute")
+    mock_livestatus.add_table("hosts", [{"name": "morgen-host"}], site="morgen")
+    mock_livestatus.expect_query("GET hosts\nColumns: name", sites=["heute", "morgen"])
+    mock_livestatus.expect_query("GET hosts\nColumns: name\nAuthUser: hans", sites=["heute"])
+    mock_livestatus.expect_query("COMMAND [...] START_EXECUTING_HOST_CHECKS", match_type="ellipsis")
+    mock_livestatus.expect_query("GET hosts\nColumns: name\nAuthUser: hans", sites=["heute"])
+    live = livestatus.MultiSiteConnection(
+        livestatus.SiteConfigurations(
+            {
+                SiteId(name): livestatus.SiteConfiguration(  # type: ignore[typeddict-item]
+                    socket="unix:"
+                )
+                for name in ("heute", "morgen")
+            }
+        )
+    )
+    query_cache = livestatus.QueryCache()
+    live.set_query_cache(query_cache)
+    query = livestatus.Query("GET hosts\nColumns: name")
+
+    with mock_livestatus(expect_status_query=False):
+        assert live.query(query) == [["heute-host"], ["morgen-host"]]
+        live.set_prepend_site(True)
+        assert live.query(query) == [["heute", "heute-host"], ["morgen", "morgen-host"]]
+        live.set_prepend_site(False)
+        # Different headers, e.g. auth users, are not answered from the cache
+        live.set_auth_user("read", livestatus.UserId("hans"))
+        live.set_auth_domain("read")
+        live.set_only_sites([SiteId("heute")])
+        assert live.query(query) == [["heute-host"]]
+        live.command("[1] START_EXECUTING_HOST_CHECKS", SiteId("heute"))
+        assert live.query(query) == [["heute-host"]]
+
+    assert (query_cache.hits, query_cache.misses) == (2, 4)
+
+
+def test_query_cache_does_not_cache_large_responses() -> None:
+    query_cache = livestatus.QueryCache(max_response_size=10, max_size=15)
+    site_id = SiteId("heute")
+
+    query_cache.add(site_id, "GET hosts", b"x" * 11)
+    assert query_cache.get(site_id, "GET hosts") is None
+
+    query_cache.add(site_id, "GET hosts", b"x" * 10)
+    assert query_cache.get(site_id, "GET hosts") == b"x" * 10
+    # The cache is full
+    query_cache.add(site_id, "GET services", b"x" * 6)
+    assert query_cache.get(site_id, "GET services") is None
+
+    query_cache.clear()
+    query_cache.add(site_id, "GET services", b"x" * 6)
+    assert query_cache.get(site_id, "GET services") == b"x" * 6